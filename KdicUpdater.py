@@ -1,88 +1,34 @@
+import time
+STARTED = time.perf_counter()  # 시작 시간 분석 기준 (--profile-startup)
+
 import sys
-import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-
-from modules.view import View
-from modules.worker import Worker
-from modules.scanner import ScannerWorker
-
-class MainController:
-    def __init__(self):
-        self.view = View()
-        self.scanner = None  # Scanner 스레드
-        self.updater = None  # Worker -> Updater로 이름 변경
-
-        self.connect_signals()
-
-    def connect_signals(self):
-        """시그널 연결"""
-        # View -> Controller
-        self.view.folder_selected.connect(self.on_folder_selected)
-        self.view.start_update.connect(self.on_start_update)
-        self.view.cancel_update.connect(self.on_cancel_update)
-
-    def on_folder_selected(self, folder_path):
-        """View에서 폴더 선택 신호를 받았을 때"""
-        # 기존 스캐너가 실행 중이면 중지 시도
-        if self.scanner and self.scanner.isRunning():
-            self.scanner.stop()
-            self.scanner.wait() # 스레드가 완전히 종료될 때까지 대기
-
-        self.scanner = ScannerWorker(folder_path)
-
-        # Scanner -> View 시그널 연결
-        self.scanner.scan_started.connect(lambda: self.view.set_scan_mode(True))
-        self.scanner.scan_complete.connect(self.on_scan_completed)
-        self.scanner.log_message.connect(self.view.add_log)
-
-        # 스캐너가 종료되면 스스로 삭제되도록 설정
-        self.scanner.finished.connect(self.scanner.deleteLater)
-        self.scanner.start()
-
-    def on_scan_completed(self, wim_info_list):
-        """스캔 완료 시"""
-        self.view.update_wim_list(wim_info_list)
-        self.view.set_scan_mode(False)
-        self.scanner = None
-
-    def on_start_update(self, file_list):
-        """View에서 업데이트 시작 신호를 받았을 때"""
-        self.updater = Worker(file_list)  # Worker 스레드 생성
-
-        # Updater -> View 시그널 연결
-        self.updater.progress.connect(self.view.update_progress)
-        self.updater.finished.connect(self.on_update_finished)
-        self.updater.log_message.connect(self.view.add_log)
-
-        self.updater.finished.connect(self.updater.deleteLater)
-        self.updater.start()
-        self.view.set_update_mode(True)
-
-    def on_cancel_update(self):
-        """View에서 업데이트 취소 신호를 받았을 때"""
-        if self.updater and self.updater.isRunning():
-            self.updater.stop()
-            # self.view.add_log("사용자에 의해 업데이트가 중단되었습니다.") # worker에서 처리
-            # self.view.reset_ui_immediately() # worker에서 처리
-
-    def on_update_finished(self):
-        """Updater 스레드 작업 완료 시"""
-        if self.updater and self.updater.is_running: # 정상 종료 시에만
-            self.view.add_log("모든 업데이트 작업이 완료되었습니다.")
-            self.view.reset_ui_after_completion()
-        else: # 사용자에 의해 중단된 경우
-             self.view.add_log("사용자에 의해 업데이트가 중단되었습니다.")
-             self.view.reset_ui_immediately()
-
-        self.updater = None
-
-    def show(self):
-        """GUI 표시"""
-        self.view.show()
-
-def main():
-    """메인 함수"""
+import json
+
+from modules.cli import COMMANDS
+from modules.paths import find_resource
+from modules.startup import StartupProfiler
+
+# 시작 단계별 소요 시간을 출력하고 종료 (표는 stderr, JSON은 stdout)
+PROFILE_STARTUP_FLAG = '--profile-startup'
+# 스캔/업데이트 구간을 계측하여 앱 데이터 폴더의 trace 폴더에 Chrome trace/Prometheus 파일로 저장
+TRACE_FLAG = '--trace'
+# 상주 DISM 도우미로 실행 (helper_pool이 PyInstaller 빌드에서 도우미를 시작할 때 사용)
+DISM_HELPER_FLAG = '--dism-helper'
+
+
+def run_gui(profile_startup=False, trace=False):
+    """GUI 실행"""
+    profiler = StartupProfiler(STARTED)
+    profiler.mark("기본 모듈 로드")
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon
+    from PyQt6.QtCore import QTimer
+    profiler.mark("PyQt6 로드")
+
+    from modules.controller import MainController
+    profiler.mark("View/Controller 모듈 로드")
+
     app = QApplication(sys.argv)
 
     # 애플리케이션 정보 설정
@@ -92,28 +38,50 @@ def main():
     app.setOrganizationName("Software")
     app.setOrganizationDomain("kdic.local")
 
-    # 아이콘 설정
-    icon_path = "icon/kdic.ico"
-    if os.path.exists(icon_path):
+    # 아이콘 설정 (모든 창에 적용)
+    icon_path = find_resource("icon", "kdic.ico")
+    if icon_path:
         app.setWindowIcon(QIcon(icon_path))
     else:
-        # 절대 경로로 다시 시도
-        try:
-            base_path = sys._MEIPASS # PyInstaller 임시 경로
-        except Exception:
-            base_path = os.path.abspath(".")
-
-        icon_path = os.path.join(base_path, "icon", "kdic.ico")
-        if os.path.exists(icon_path):
-            app.setWindowIcon(QIcon(icon_path))
-        else:
-            print(f"⚠️ 아이콘 파일을 찾을 수 없습니다: {icon_path}")
+        print("⚠️ 아이콘 파일을 찾을 수 없습니다: icon/kdic.ico")
+    profiler.mark("QApplication 생성")
 
     # 메인 컨트롤러 생성 및 실행
     controller = MainController()
-    controller.show()
+    if trace:
+        controller.enable_tracing()
+    profiler.mark("창 구성")
 
-    return app.exec()
+    controller.show()
+    app.processEvents()  # 첫 프레임을 먼저 그림
+    profiler.mark("첫 프레임 표시")
+
+    def finish_startup():
+        controller.deferred_setup()
+        profiler.mark("지연 초기화")
+        controller.log(f"시작 완료 ({profiler.total:.3f}초)", level='debug', stage='startup',
+                       duration=profiler.total)
+        if profile_startup:
+            print(profiler.report(), file=sys.stderr)
+            print(json.dumps(profiler.to_dict(), ensure_ascii=False))
+            app.quit()
+
+    QTimer.singleShot(0, finish_startup)
+
+    exit_code = app.exec()
+    controller.close()
+    return exit_code
+
+def main(argv=None):
+    """메인 함수 (scan/update/plan 명령이면 Qt 없이 CLI로 실행, --dism-helper면 DISM 도우미로 실행)"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == DISM_HELPER_FLAG:
+        from modules.dism_helper import main as helper_main
+        return helper_main(argv[1:])
+    if argv and argv[0] in COMMANDS:
+        from modules.cli import main as cli_main
+        return cli_main(argv)
+    return run_gui(profile_startup=PROFILE_STARTUP_FLAG in argv, trace=TRACE_FLAG in argv)
 
 if __name__ == '__main__':
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""이미지 내용 보기 벤치마크
+
+먼저 fixtures/chunks 의 압축된 청크(다른 구현으로 교차 검증한 XPRESS/LZX, LZX는 창 크기 32KB~2MB)를
+풀어 expected.json의 SHA-1과 비교한다. 그다음 내용이 있는 합성 WIM(압축 없음/XPRESS/LZX)을 만들어
+WimImageReader로 루트 열기, 경로 조회(처음/캐시된 뒤), 전체 디렉터리 펼치기, 크기 합계, 파일 읽기에
+걸린 시간을 측정한다. 풀린 청크나 읽은 트리, 파일 내용이 기대와 다르면 RuntimeError를 발생시킨다.
+
+    python -m benchmarks.bench_browse [--dirs N] [--files N] [--lookups N]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+from benchmarks.image_corpus import make_tree, tree_totals, write_image_wim
+from modules.wim import WimFormatError
+from modules.wim_compression import decompress_chunk
+from modules.wim_image import WimImageReader
+
+COMPRESSIONS = ('none', 'xpress', 'lzx')
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'chunks')
+
+
+def verify_chunk_fixtures():
+    """expected.json의 청크를 풀어 SHA-1 비교 -> (불일치 fixture 이름 목록, 청크 수, 압축 해제 시간)"""
+    with open(os.path.join(FIXTURE_DIR, 'expected.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    mismatched = []
+    elapsed = 0.0
+    for name, info in expected.items():
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            data = f.read()
+        start = time.perf_counter()
+        try:
+            output = decompress_chunk(info['compression'], data, info['size'], info['chunk_size'])
+        except WimFormatError:
+            output = None
+        elapsed += time.perf_counter() - start
+        if output is None or hashlib.sha1(output).hexdigest() != info['sha1']:
+            mismatched.append(name)
+    return mismatched, len(expected), elapsed
+
+
+def _file_paths(tree, prefix=''):
+    """트리의 (경로, 내용) 목록"""
+    paths = []
+    for name, value in tree.items():
+        path = f"{prefix}\\{name}"
+        if isinstance(value, dict):
+            paths.extend(_file_paths(value, path))
+        else:
+            paths.append((path, value[0] if isinstance(value, tuple) else value))
+    return paths
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, round(time.perf_counter() - start, 4)
+
+
+def _lookup_all(image, paths):
+    return [image.lookup(path) for path in paths]
+
+
+def _read_all(image, paths):
+    return [image.read_file(entry) for entry in _lookup_all(image, paths)]
+
+
+def bench_image(path, tree, lookups):
+    """WIM 파일 하나에 대한 측정 결과 dict"""
+    files = _file_paths(tree)
+    sample = random.Random(0).sample(files, min(lookups, len(files)))
+    expected = tree_totals(tree)
+
+    with WimImageReader(path) as reader:
+        image, open_seconds = _timed(reader.image, 1)
+        entries, cold_lookup = _timed(_lookup_all, image, [p for p, _ in sample])
+        _, warm_lookup = _timed(_lookup_all, image, [p for p, _ in sample])
+        if any(entry is None or entry.size != len(content) for entry, (_, content) in zip(entries, sample)):
+            raise RuntimeError(f"{os.path.basename(path)}: 경로 조회 결과가 만든 트리와 다릅니다.")
+        lookup_stats = reader.cache.stats()
+
+    with WimImageReader(path) as reader:
+        image = reader.image(1)
+        totals, walk_seconds = _timed(image.tree_size)
+        if totals != expected:
+            raise RuntimeError(f"{os.path.basename(path)}: 크기 합계가 다릅니다: {totals} != {expected}")
+        contents, read_seconds = _timed(_read_all, image, [p for p, _ in sample])
+        if contents != [content for _, content in sample]:
+            raise RuntimeError(f"{os.path.basename(path)}: 읽은 파일 내용이 다릅니다.")
+        stats = reader.cache.stats()
+
+    return {
+        'file_bytes': os.path.getsize(path),
+        'open_seconds': open_seconds,
+        'cold_lookup_seconds': cold_lookup,
+        'warm_lookup_seconds': warm_lookup,
+        'lookup_chunks_decompressed': lookup_stats['misses'],
+        'walk_seconds': walk_seconds,
+        'read_seconds': read_seconds,
+        'read_bytes': sum(len(content) for content in contents),
+        'cache_hits': stats['hits'],
+        'cache_misses': stats['misses'],
+    }
+
+
+def run(dirs=20, files_per_dir=30, lookups=200, seed=0):
+    """청크 fixture를 검증하고 압축 방식별로 같은 트리의 WIM을 만들어 측정한 결과 dict 반환"""
+    mismatched, chunks, decode_seconds = verify_chunk_fixtures()
+    if mismatched:
+        raise RuntimeError(f"압축 해제 결과가 expected.json과 다릅니다: {', '.join(mismatched)}")
+    rng = random.Random(seed)
+    tree = make_tree(rng, dirs, files_per_dir)
+    files, directories, total = tree_totals(tree)
+    results = {'files': files, 'directories': directories, 'data_bytes': total, 'lookups': lookups,
+               'fixtures': {'chunks': chunks, 'decode_seconds': round(decode_seconds, 4)}}
+    with tempfile.TemporaryDirectory(prefix='kdic-bench-browse-') as work:
+        for compression in COMPRESSIONS:
+            path = os.path.join(work, f"{compression}.wim")
+            write_image_wim(path, [tree], compression, guid=uuid.UUID(int=rng.getrandbits(128)))
+            results[compression] = bench_image(path, tree, lookups)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이미지 내용 보기 벤치마크")
+    parser.add_argument('--dirs', type=int, default=20, help="드라이버 폴더 수")
+    parser.add_argument('--files', type=int, default=30, help="폴더당 파일 수")
+    parser.add_argument('--lookups', type=int, default=200, help="조회할 파일 경로 수")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.dirs, args.files, args.lookups), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""리소스 중복 분석 벤치마크
+
+lookup 테이블이 있는 합성 WIM 코퍼스를 만들어 DedupAnalyzer의 처음 색인, 변경 없는 재분석,
+파일 하나만 바뀐 재분석에 걸린 시간을 측정한다.
+
+    python -m benchmarks.bench_dedup [--count N] [--resources N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import make_corpus
+from modules.dedup import DedupAnalyzer, DedupIndex
+
+
+def timed_analyze(analyzer, paths):
+    start = time.perf_counter()
+    report = analyzer.analyze(paths)
+    return report, round(time.perf_counter() - start, 4)
+
+
+def run(count=50, resources_per_file=20000, shared_fraction=0.8, max_workers=None):
+    """코퍼스를 만들고 세 가지 경우를 측정한 결과 dict 반환"""
+    with tempfile.TemporaryDirectory(prefix='kdic-bench-dedup-') as work:
+        paths = make_corpus(os.path.join(work, 'images'), count, 0, resources_per_file=resources_per_file,
+                            shared_fraction=shared_fraction)
+        index = DedupIndex(os.path.join(work, 'dedup.db'))
+        try:
+            analyzer = DedupAnalyzer(index, max_workers=max_workers)
+            report, first = timed_analyze(analyzer, paths)
+            _, unchanged = timed_analyze(analyzer, paths)
+            os.utime(paths[0])
+            _, one_changed = timed_analyze(analyzer, paths)
+        finally:
+            index.close()
+
+    return {
+        'files': count,
+        'resources_per_file': resources_per_file,
+        'first_seconds': first,
+        'unchanged_seconds': unchanged,
+        'one_changed_seconds': one_changed,
+        'resources_per_second': round(count * resources_per_file / first, 1) if first else 0.0,
+        'savings_fraction': round(report.savings_fraction, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리소스 중복 분석 벤치마크")
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--resources', type=int, default=20000, help="파일당 lookup 테이블 리소스 수")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.count, args.resources, max_workers=args.workers), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""상주 DISM 도우미 벤치마크
+
+같은 /Get-WimInfo 조회를 명령마다 가짜 dism 프로세스를 만드는 SubprocessRunner와
+상주 도우미 스텁(fake_dism_helper)에 파이프로 보내는 HelperRunner로 실행해 비교한다.
+스텁은 프로세스를 만들지 않으므로 차이가 곧 명령마다 드는 프로세스 생성/초기화 비용이다.
+
+    python -m benchmarks.bench_helper [--calls N] [--helpers N] [--workers N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import write_fake_dism
+from benchmarks.fake_dism_helper import stub_command
+from modules.helper_pool import HelperPool, HelperRunner
+from modules.runner import SubprocessRunner
+
+
+def _run_calls(runner, calls, workers):
+    def query(i):
+        return runner.dism('/Get-WimInfo', f'/WimFile:image{i:05d}.wim')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(query, range(calls)))
+    elapsed = time.perf_counter() - start
+    if not all(result.ok for result in results):
+        raise RuntimeError("dism 조회가 실패했습니다.")
+    return elapsed
+
+
+def bench_helper(calls=200, helpers=2, workers=4):
+    """calls개 조회를 workers개 스레드에서 실행 (프로세스 직접 실행 vs 도우미 helpers개)"""
+    with tempfile.TemporaryDirectory(prefix='kdic-bench-helper-') as work:
+        runner = SubprocessRunner(dism_executable=write_fake_dism(os.path.join(work, 'bin')))
+        spawn = _run_calls(runner, calls, workers)
+
+    env = dict(os.environ, KDIC_FAKE_DISM_LATENCY='0')
+    pool = HelperPool(helpers, stub_command(), env)
+    try:
+        start = time.perf_counter()
+        _run_calls(HelperRunner(pool), helpers, helpers)  # 도우미 시작 (첫 요청)
+        warmup = time.perf_counter() - start
+        helper = _run_calls(HelperRunner(pool), calls, workers)
+        sequential = _run_calls(HelperRunner(pool), calls, 1)
+    finally:
+        pool.close()
+
+    return {
+        'calls': calls,
+        'helpers': helpers,
+        'workers': workers,
+        'spawn_seconds': round(spawn, 3),
+        'helper_seconds': round(helper, 3),
+        'helper_sequential_seconds': round(sequential, 3),
+        'helper_start_seconds': round(warmup, 3),
+        'spawn_calls_per_second': round(calls / spawn, 1),
+        'helper_calls_per_second': round(calls / helper, 1),
+        'speedup': round(spawn / helper, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="상주 DISM 도우미 벤치마크")
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--helpers', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+    print(json.dumps(bench_helper(args.calls, args.helpers, args.workers), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
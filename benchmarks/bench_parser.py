@@ -0,0 +1,75 @@
+"""DISM 출력 파서 벤치마크
+
+fixtures/dism 의 캡처된 DISM 출력으로 parse_dism_output 결과를 검증한 뒤
+MB당 파싱 시간을 측정한다.
+
+    python -m benchmarks.bench_parser [--repeat N]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+
+from modules.dism_parser import parse_dism_output
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'dism')
+
+
+def load_fixtures():
+    """fixture 파일 이름 -> DISM 출력 텍스트"""
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.txt'))):
+        with open(path, encoding='utf-8') as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def verify_fixtures(fixtures):
+    """expected.json 과 파싱 결과 비교 (불일치 fixture 이름 목록 반환)"""
+    with open(os.path.join(FIXTURE_DIR, 'expected.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    return [name for name, text in fixtures.items()
+            if [asdict(r) for r in parse_dism_output(text)] != expected.get(name)]
+
+
+def bench_parser(fixtures, repeat=2000):
+    """전체 fixture를 repeat번 파싱하는 데 걸린 시간 측정"""
+    texts = list(fixtures.values())
+    total_bytes = sum(len(text.encode('utf-8')) for text in texts) * repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            parse_dism_output(text)
+    elapsed = time.perf_counter() - start
+
+    mb = total_bytes / (1024 * 1024)
+    return {
+        'fixtures': len(texts),
+        'repeat': repeat,
+        'megabytes': round(mb, 3),
+        'seconds': round(elapsed, 4),
+        'seconds_per_mb': round(elapsed / mb, 4) if mb else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DISM 출력 파서 벤치마크")
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures()
+    mismatched = verify_fixtures(fixtures)
+    if mismatched:
+        print(f"파싱 결과가 expected.json과 다릅니다: {', '.join(mismatched)}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(bench_parser(fixtures, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""성능 계측 오버헤드 벤치마크
+
+계측이 꺼져 있을 때와 켜져 있을 때 구간 하나(span/traced)를 기록하는 비용과,
+켜진 상태로 모은 구간을 Chrome trace/Prometheus 형식으로 만드는 시간을 측정한다.
+꺼져 있을 때의 비용이 계측 지점을 코드에 남겨 둘 수 있을 만큼 작은지 확인하는 용도이다.
+
+    python -m benchmarks.bench_trace [--spans N]
+"""
+import argparse
+import json
+import sys
+import time
+
+from modules.tracing import Tracer, traced
+from modules import tracing
+
+
+def _loop(count):
+    start = time.perf_counter()
+    for _ in range(count):
+        pass
+    return time.perf_counter() - start
+
+
+def _spans(count):
+    start = time.perf_counter()
+    for i in range(count):
+        with tracing.span('bench', 'bench', file='image.wim'):
+            pass
+    return time.perf_counter() - start
+
+
+@traced('bench.traced', 'bench')
+def _traced_call():
+    pass
+
+
+def _traced(count):
+    start = time.perf_counter()
+    for _ in range(count):
+        _traced_call()
+    return time.perf_counter() - start
+
+
+def bench_trace(spans=200000):
+    """구간 spans개 기록 비용 (빈 반복문 시간을 뺀 값)"""
+    previous = tracing.tracer
+    tracing.tracer = Tracer()
+    try:
+        baseline = _loop(spans)
+        disabled = _spans(spans) - baseline
+        disabled_traced = _traced(spans) - baseline
+
+        tracing.tracer.enable()
+        enabled = _spans(spans) - baseline
+        start = time.perf_counter()
+        trace = json.dumps(tracing.tracer.chrome_trace())
+        metrics = tracing.tracer.prometheus_text()
+        export = time.perf_counter() - start
+    finally:
+        tracing.tracer = previous
+
+    return {
+        'spans': spans,
+        'disabled_seconds': round(disabled, 4),
+        'disabled_traced_seconds': round(disabled_traced, 4),
+        'enabled_seconds': round(enabled, 4),
+        'disabled_ns_per_span': round(disabled / spans * 1e9, 1),
+        'enabled_ns_per_span': round(enabled / spans * 1e9, 1),
+        'export_seconds': round(export, 4),
+        'trace_megabytes': round((len(trace) + len(metrics)) / (1024 * 1024), 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="성능 계측 오버헤드 벤치마크")
+    parser.add_argument('--spans', type=int, default=200000)
+    args = parser.parse_args(argv)
+    print(json.dumps(bench_trace(args.spans), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
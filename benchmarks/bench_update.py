@@ -0,0 +1,192 @@
+"""업데이트 파이프라인 처리량 벤치마크
+
+FakeBackend로 단계별 소요 시간을 흉내 내어, 단계를 겹치지 않는 순차 실행과
+UpdatePipeline의 겹친 실행을 비교한다. 이어서 Worker가 실행하는 흐름(core.run_update +
+DismBackend)을 가짜 dism 프로세스로 끝까지 실행한 처리량도 측정한다.
+크기가 고르지 않은 이미지 목록에서는 처리 순서 정책별 전체 시간, 첫 이미지 완료 시간,
+남은 시간 추정 오차를 비교한다. 오래 걸리는 dism 명령(자식 프로세스 포함)을 취소하거나
+제한 시간으로 끊을 때 실제로 반환되기까지 걸린 시간도 측정한다.
+
+    python -m benchmarks.bench_update [--images N] [--packages N] [--scale S] [--latency SEC]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.corpus import make_corpus, write_fake_dism
+from modules.core import create_update_jobs, run_update
+from modules.runner import SubprocessRunner
+from modules.scheduling import EtaEstimator, ORDER_POLICIES
+from modules.update_engine import UpdatePipeline, UpdateJob, FakeBackend, DismBackend, STAGES, JOB_DONE
+
+GB = 1024 ** 3
+
+
+def make_jobs(count, packages):
+    return [UpdateJob(f"image{i:03d}.wim", 1, [f"kb{n}.msu" for n in range(packages)]) for i in range(count)]
+
+
+def bench_pipeline(images=8, packages=2, time_scale=0.1, stage_limits=None, max_in_flight=3):
+    """이미지 images개를 처리하는 데 걸린 시간과 처리량 측정"""
+    backend = FakeBackend(time_scale=time_scale)
+    pipeline = UpdatePipeline(backend, stage_limits=stage_limits, max_in_flight=max_in_flight)
+    jobs = make_jobs(images, packages)
+
+    start = time.perf_counter()
+    pipeline.run(jobs)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'images': images,
+        'stage_limits': stage_limits or 'default',
+        'max_in_flight': max_in_flight,
+        'seconds': round(elapsed, 3),
+        'images_per_second': round(images / elapsed, 3),
+        'completed': sum(1 for job in jobs if job.status == JOB_DONE),
+        'left_mounted': len(backend.mounted),
+    }
+
+
+def skewed_sizes(count):
+    """대부분 작은 이미지이고 목록 끝에 큰 이미지가 있는 크기 목록 (목록 순서로 실행하면 꼬리가 길어짐)"""
+    large = max(1, count // 8)
+    return [GB * 3 // 10] * (count - large) + [6 * GB] * large
+
+
+def bench_order(images=16, time_scale=0.1, order=ORDER_POLICIES[0], max_in_flight=3):
+    """처리 순서 정책 하나로 크기가 고르지 않은 이미지들을 처리한 결과
+
+    단계 소요 시간은 이미지 크기 1 GB당 시간으로 계산한다.
+    eta_error_fraction: 진행 중에 추정한 남은 시간과 실제 남은 시간의 평균 상대 오차
+    """
+    backend = FakeBackend(time_scale=time_scale, size_unit=GB)
+    pipeline_eta = EtaEstimator(half_life=2.0 * time_scale / 0.1, warmup=0.0)
+    estimates = []   # (시각, 추정한 남은 시간)
+    first_done = []
+
+    def on_progress(done, total, job, stage):
+        now = time.perf_counter()
+        if job is None:
+            pipeline_eta.reset(done, total)
+            return
+        pipeline_eta.update(done, total, measured=stage is not None)
+        remaining = pipeline_eta.eta()
+        if remaining is not None and done < total:
+            estimates.append((now, remaining))
+        if stage == STAGES[3] and not first_done:
+            first_done.append(now)
+
+    # 단계별 제한 없이 동시 실행 수만 제한해야 처리 순서에 따른 꼬리 시간 차이가 드러남
+    pipeline = UpdatePipeline(backend, stage_limits={stage: max_in_flight for stage in STAGES},
+                              max_in_flight=max_in_flight, on_progress=on_progress, order=order)
+    jobs = [UpdateJob(f"image{i:03d}.wim", 1, ['kb1.msu'], size=size) for i, size in enumerate(skewed_sizes(images))]
+
+    start = time.perf_counter()
+    pipeline.run(jobs)
+    end = time.perf_counter()
+
+    # 앞 10% 구간은 속도를 재는 중이므로 오차 계산에서 제외
+    errors = [abs(remaining - (end - at)) / (end - at) for at, remaining in estimates
+              if end - at > 0 and at - start > (end - start) * 0.1]
+    return {
+        'order': order,
+        'images': images,
+        'seconds': round(end - start, 3),
+        'first_done_seconds': round(first_done[0] - start, 3) if first_done else None,
+        'eta_error_fraction': round(sum(errors) / len(errors), 3) if errors else None,
+        'completed': sum(1 for job in jobs if job.status == JOB_DONE),
+    }
+
+
+def bench_orders(images=16, time_scale=0.1):
+    """처리 순서 정책별 결과 (정책 이름 -> 결과)"""
+    return {order: bench_order(images, time_scale, order) for order in ORDER_POLICIES}
+
+
+def bench_dism_update(images=8, packages=2, latency=0.02):
+    """가짜 dism으로 합성 WIM images개를 업데이트하는 데 걸린 시간 측정 (프로세스 실행 비용 포함)"""
+    with tempfile.TemporaryDirectory(prefix='kdic-bench-update-') as work:
+        paths = make_corpus(os.path.join(work, 'images'), images, images_per_file=1, files_per_dir=0)
+        backend = DismBackend(
+            runner=SubprocessRunner(dism_executable=write_fake_dism(os.path.join(work, 'bin'), latency)),
+            mount_root=os.path.join(work, 'mount')
+        )
+        jobs = create_update_jobs(paths, packages=[f"kb{n}.msu" for n in range(packages)])
+
+        start = time.perf_counter()
+        outcome = run_update(jobs, backend)
+        elapsed = time.perf_counter() - start
+
+    commands = images * (3 + packages)  # 마운트, 패키지별 적용, 정리, 커밋
+    return {
+        'images': images,
+        'dism_latency': latency,
+        'dism_commands': commands,
+        'seconds': round(elapsed, 3),
+        'images_per_second': round(images / elapsed, 3),
+        'commands_per_second': round(commands / elapsed, 1),
+        'completed': outcome.done,
+    }
+
+
+def bench_cancel(repeat=5, latency=30.0, delay=0.2, timeout=0.3):
+    """실행 중인 dism 명령을 취소/시간 초과로 종료하는 데 걸린 시간 측정
+
+    가짜 dism은 자식 프로세스에서 latency초 동안 기다리므로 프로세스 트리 전체를 종료해야
+    출력 파이프가 닫혀 바로 반환된다.
+    """
+    cancel_latency = []
+    timeout_overshoot = []
+    with tempfile.TemporaryDirectory(prefix='kdic-bench-cancel-') as work:
+        dism = write_fake_dism(os.path.join(work, 'bin'), latency, child=True)
+        for _ in range(repeat):
+            runner = SubprocessRunner(dism_executable=dism)
+            timer = threading.Timer(delay, runner.cancel)
+            start = time.perf_counter()
+            timer.start()
+            result = runner.dism('/Add-Package')
+            cancel_latency.append(time.perf_counter() - start - delay)
+            if not result.cancelled:
+                raise RuntimeError("dism 명령이 취소되지 않았습니다.")
+
+            runner = SubprocessRunner(dism_executable=dism, timeout=timeout)
+            start = time.perf_counter()
+            result = runner.dism('/Add-Package')
+            timeout_overshoot.append(time.perf_counter() - start - timeout)
+            if not result.timed_out:
+                raise RuntimeError("dism 명령이 제한 시간에 종료되지 않았습니다.")
+    return {
+        'repeat': repeat,
+        'cancel_seconds': round(max(cancel_latency), 3),
+        'timeout_overshoot_seconds': round(max(timeout_overshoot), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="업데이트 파이프라인 처리량 벤치마크")
+    parser.add_argument('--images', type=int, default=8)
+    parser.add_argument('--packages', type=int, default=2)
+    parser.add_argument('--scale', type=float, default=0.1, help="단계 소요 시간 배율")
+    parser.add_argument('--latency', type=float, default=0.02, help="가짜 dism 명령 하나의 지연 시간(초)")
+    args = parser.parse_args(argv)
+
+    sequential = bench_pipeline(args.images, args.packages, args.scale,
+                                stage_limits={stage: 1 for stage in STAGES}, max_in_flight=1)
+    pipelined = bench_pipeline(args.images, args.packages, args.scale)
+    print(json.dumps({
+        'sequential': sequential,
+        'pipelined': pipelined,
+        'speedup': round(sequential['seconds'] / pipelined['seconds'], 2),
+        'dism': bench_dism_update(args.images, args.packages, args.latency),
+        'order': bench_orders(args.images, args.scale),
+        'cancel': bench_cancel(),
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
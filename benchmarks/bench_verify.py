@@ -0,0 +1,79 @@
+"""무결성 검사 처리량 벤치마크
+
+무결성 테이블이 있는 합성 WIM 코퍼스를 만들어 IntegrityVerifier의 처리량을 측정한다.
+청크 해시를 스레드 1개로 계산한 경우와 기본 스레드 수로 계산한 경우,
+무결성 테이블이 없는 파일의 전체 해시, 캐시 적중을 비교한다.
+
+    python -m benchmarks.bench_verify [--count N] [--size BYTES] [--chunk BYTES]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import make_corpus
+from modules.cache import ScanCache
+from modules.integrity import IntegrityVerifier
+
+
+def bench_verify(paths, max_workers=None, cache=None, force=False):
+    """파일 목록 검사에 걸린 시간과 처리량 측정"""
+    verifier = IntegrityVerifier(cache=cache, max_workers=max_workers)
+    start = time.perf_counter()
+    results = verifier.verify_files(paths, force=force)
+    elapsed = time.perf_counter() - start
+
+    total_mb = sum(os.path.getsize(path) for path in paths) / 1024**2
+    return {
+        'files': len(paths),
+        'ok': sum(1 for result in results if result.ok),
+        'max_workers': verifier.max_workers,
+        'seconds': round(elapsed, 4),
+        'mb_per_second': round(total_mb / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def run(count=8, file_size=64 * 1024 * 1024, chunk_size=10 * 1024 * 1024, max_workers=None):
+    """코퍼스를 만들고 네 가지 경우를 측정한 결과 dict 반환"""
+    with tempfile.TemporaryDirectory(prefix='kdic-bench-verify-') as work:
+        table_paths = make_corpus(os.path.join(work, 'integrity'), count, file_size,
+                                  integrity_chunk_size=chunk_size)
+        digest_paths = make_corpus(os.path.join(work, 'digest'), count, file_size, seed=1)
+
+        single = bench_verify(table_paths, max_workers=1)
+        parallel = bench_verify(table_paths, max_workers=max_workers)
+        digest = bench_verify(digest_paths, max_workers=max_workers)
+
+        cache = ScanCache(os.path.join(work, 'cache.db'))
+        try:
+            bench_verify(table_paths, max_workers=max_workers, cache=cache, force=True)  # 캐시 채우기
+            cached = bench_verify(table_paths, max_workers=max_workers, cache=cache)
+        finally:
+            cache.close()
+
+    return {
+        'file_size': file_size,
+        'chunk_size': chunk_size,
+        'integrity_single': single,
+        'integrity_parallel': parallel,
+        'digest': digest,
+        'cached': cached,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="무결성 검사 처리량 벤치마크")
+    parser.add_argument('--count', type=int, default=8)
+    parser.add_argument('--size', type=int, default=64 * 1024 * 1024, help="파일 하나의 크기 (바이트)")
+    parser.add_argument('--chunk', type=int, default=10 * 1024 * 1024, help="무결성 테이블 청크 크기")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.count, args.size, args.chunk, args.workers), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
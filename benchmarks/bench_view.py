@@ -0,0 +1,95 @@
+"""WIM 목록 채우기 벤치마크
+
+View에 스캔 결과 N개를 스트리밍 스캔과 같은 배치 크기로 넣는 데 걸린 시간,
+전체 선택/해제와 선택 상태 갱신에 걸린 시간을 측정한다.
+화면 없이 실행하도록 QT_QPA_PLATFORM=offscreen을 사용한다. PyQt6가 없으면 건너뛴다.
+
+    python -m benchmarks.bench_view [--items N]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from modules.records import ImageRecord, WimFileRecord
+from benchmarks.corpus import EDITIONS, BUILDS
+
+
+def make_records(count, seed=0):
+    """파일 없이 합성 WimFileRecord 목록 생성 (도착 순서는 무작위)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        images = [ImageRecord(n, name=rng.choice(EDITIONS), version='10.0', build=rng.choice(BUILDS),
+                              architecture='x64', size=rng.randrange(4, 20) * 1024**3)
+                  for n in range(1, rng.randrange(2, 6))]
+        records.append(WimFileRecord(f"/images/set{i % 37:02d}/image{i:06d}.wim", images,
+                                     file_size=rng.randrange(3, 6) * 1024**3, image_count=len(images)))
+    rng.shuffle(records)
+    return records
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return round(time.perf_counter() - start, 4)
+
+
+def bench_view(items=10000):
+    """View 목록 채우기/선택 조작 시간 측정 (PyQt6가 없으면 skipped)"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import Qt
+    except ImportError as e:
+        return {'items': items, 'skipped': f"PyQt6를 불러올 수 없습니다: {e}"}
+
+    from modules.view import View, LIST_FLUSH_BATCH_SIZE
+
+    app = QApplication.instance() or QApplication([])
+    records = make_records(items)
+    view = View()
+    view.show()
+
+    def populate():
+        for start in range(0, len(records), LIST_FLUSH_BATCH_SIZE):
+            view.insert_wim_items(records[start:start + LIST_FLUSH_BATCH_SIZE])
+            view.update_ui_state()
+        app.processEvents()
+
+    def toggle_all():
+        view.toggle_all_selection(Qt.CheckState.Unchecked.value)
+        view.toggle_all_selection(Qt.CheckState.Checked.value)
+        app.processEvents()
+
+    def update_state():
+        for _ in range(1000):
+            view.update_ui_state()
+
+    result = {
+        'items': items,
+        'batch_size': LIST_FLUSH_BATCH_SIZE,
+        'populate_seconds': timed(populate),
+        'toggle_all_seconds': timed(toggle_all),
+        'update_ui_state_x1000_seconds': timed(update_state),
+        'refresh_seconds': timed(view.refresh_wim_items, records[:LIST_FLUSH_BATCH_SIZE]),
+        'rows': view.wim_model.rowCount(),
+    }
+    result['items_per_second'] = round(items / result['populate_seconds'], 1) if result['populate_seconds'] else 0.0
+    view.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WIM 목록 채우기 벤치마크")
+    parser.add_argument('--items', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(bench_view(args.items), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""벤치마크용 합성 WIM 코퍼스와 가짜 dism 생성
+
+헤더(208바이트)와 XML 메타데이터 리소스(선택적으로 lookup/무결성 테이블)만 올바른 WIM 파일을 만든다.
+modules.wim.read_wim_info로 읽을 수 있고, 나머지 영역은 0으로 채워 원하는 크기를 맞춘다.
+같은 seed면 항상 같은 파일(GUID 포함)이 만들어진다.
+
+    python -m benchmarks.corpus <폴더> [--count N] [--size BYTES] [--images N]
+"""
+import argparse
+import hashlib
+import os
+import random
+import stat
+import struct
+import sys
+import uuid
+from xml.sax.saxutils import escape
+
+from modules.wim import (WIM_TAG, WIM_HEADER_SIZE, WIM_HDR_FLAG_COMPRESSION, WIM_HDR_FLAG_COMPRESS_LZX,
+                         RESHDR_FLAG_COMPRESSED, LOOKUP_ENTRY_FORMAT)
+
+FAKE_DISM_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_dism.py')
+
+EDITIONS = ('Windows 11 Home', 'Windows 11 Education', 'Windows 11 Pro', 'Windows 11 Enterprise',
+            'Windows 10 Pro', 'Windows Server 2022 Standard')
+BUILDS = ('22631', '22621', '19045', '20348', '26100')
+
+
+def build_wim_xml(images):
+    """이미지 정보 목록 [(이름, 빌드, 크기), ...] -> WIM XML 메타데이터 (BOM 포함 UTF-16LE)"""
+    parts = ["<WIM>"]
+    for i, (name, build, size) in enumerate(images, start=1):
+        parts.append(
+            f'<IMAGE INDEX="{i}"><TOTALBYTES>{size}</TOTALBYTES>'
+            f'<WINDOWS><ARCH>9</ARCH><VERSION><MAJOR>10</MAJOR><MINOR>0</MINOR>'
+            f'<BUILD>{build}</BUILD><SPBUILD>{1000 + i}</SPBUILD></VERSION></WINDOWS>'
+            f'<NAME>{escape(name)}</NAME><DESCRIPTION>{escape(name)}</DESCRIPTION></IMAGE>'
+        )
+    parts.append("</WIM>")
+    return b'\xff\xfe' + ''.join(parts).encode('utf-16-le')
+
+
+def build_lookup_table(resources):
+    """리소스 목록 [(SHA-1, 저장 크기, 원본 크기), ...] -> lookup 테이블 (리소스 내용은 없음)"""
+    return b''.join(
+        struct.pack(LOOKUP_ENTRY_FORMAT, size | (RESHDR_FLAG_COMPRESSED << 56), WIM_HEADER_SIZE,
+                    original_size, 1, 1, sha1)
+        for sha1, size, original_size in resources
+    )
+
+
+def write_wim(path, images, file_size=0, guid=None, integrity_chunk_size=None, resources=None):
+    """헤더와 XML 리소스가 올바른 WIM 파일 생성 (file_size까지 0으로 채움)
+
+    resources를 지정하면 XML 바로 앞에 그 항목들로 lookup 테이블을 쓴다.
+    integrity_chunk_size를 지정하면 헤더 뒤부터 lookup 테이블 끝까지의
+    무결성 테이블(청크별 SHA-1)을 파일 끝에 추가한다.
+    """
+    xml = build_wim_xml(images)
+    xml_offset = max(WIM_HEADER_SIZE, file_size - len(xml))
+    lookup = build_lookup_table(resources or [])
+    lookup_offset = max(WIM_HEADER_SIZE, xml_offset - len(lookup))
+    xml_offset = max(xml_offset, lookup_offset + len(lookup))
+
+    header = bytearray(WIM_HEADER_SIZE)
+    header[0:8] = WIM_TAG
+    struct.pack_into('<IIII', header, 8, WIM_HEADER_SIZE, 0x10d00,
+                     WIM_HDR_FLAG_COMPRESSION | WIM_HDR_FLAG_COMPRESS_LZX, 32768)
+    header[24:40] = (guid or uuid.uuid4()).bytes_le
+    struct.pack_into('<HHI', header, 40, 1, 1, len(images))
+    struct.pack_into('<QQQ', header, 72, len(xml), xml_offset, len(xml))
+    if resources is not None:
+        struct.pack_into('<QQQ', header, 48, len(lookup), lookup_offset, len(lookup))
+
+    integrity = b''
+    if integrity_chunk_size:
+        if resources is None:
+            # lookup 테이블이 없으면 헤더 뒤 영역 전체를 lookup 테이블로 표시
+            lookup_offset = xml_offset
+            struct.pack_into('<QQQ', header, 48, xml_offset - WIM_HEADER_SIZE, WIM_HEADER_SIZE,
+                             xml_offset - WIM_HEADER_SIZE)
+        region = xml_offset - WIM_HEADER_SIZE
+        lookup_start = lookup_offset - WIM_HEADER_SIZE
+        zero_chunk = hashlib.sha1(bytes(integrity_chunk_size)).digest()
+        hashes = []
+        for start in range(0, region, integrity_chunk_size):
+            length = min(integrity_chunk_size, region - start)
+            if start + length <= lookup_start and length == integrity_chunk_size:
+                hashes.append(zero_chunk)
+                continue
+            # lookup 테이블과 겹치는 청크는 실제 내용으로 해시
+            chunk = bytearray(length)
+            overlap = max(start, lookup_start)
+            chunk[overlap - start:] = lookup[overlap - lookup_start:overlap - lookup_start + start + length - overlap]
+            hashes.append(hashlib.sha1(chunk).digest())
+        integrity = struct.pack('<III', 12 + 20 * len(hashes), len(hashes), integrity_chunk_size) + b''.join(hashes)
+        struct.pack_into('<QQQ', header, 124, len(integrity), xml_offset + len(xml), len(integrity))
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        if lookup_offset > WIM_HEADER_SIZE:
+            f.truncate(lookup_offset)  # 가능하면 sparse 파일로 만듦
+            f.seek(lookup_offset)
+        f.write(lookup)
+        f.write(xml)
+        f.write(integrity)
+
+
+def make_resources(rng, build, count, shared_fraction, unique_tag):
+    """같은 빌드끼리 shared_fraction만큼 겹치는 리소스 목록 (나머지는 파일마다 고유)"""
+    resources = []
+    shared = int(count * shared_fraction)
+    for n in range(count):
+        tag = f"{build}-{n}" if n < shared else f"{unique_tag}-{n}"
+        sha1 = hashlib.sha1(tag.encode()).digest()
+        original_size = int.from_bytes(sha1[:3], 'little') + 1  # 내용 기준으로 고정된 크기
+        resources.append((sha1, max(1, original_size // rng.choice((2, 3))), original_size))
+    return resources
+
+
+def make_corpus(root, count=200, file_size=1024 * 1024, images_per_file=3, files_per_dir=50, seed=0,
+                integrity_chunk_size=None, resources_per_file=0, shared_fraction=0.8):
+    """root 아래에 합성 WIM 파일 count개를 만들고 경로 목록 반환 (files_per_dir개마다 하위 폴더)
+
+    resources_per_file을 지정하면 대표 빌드가 같은 파일끼리 리소스의 shared_fraction이 겹치는
+    lookup 테이블을 쓴다.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        folder = os.path.join(root, f"set{i // files_per_dir:03d}") if files_per_dir else root
+        os.makedirs(folder, exist_ok=True)
+        images = [(rng.choice(EDITIONS), rng.choice(BUILDS), rng.randrange(4, 20) * 1024**3)
+                  for _ in range(images_per_file)]
+        path = os.path.join(folder, f"image{i:05d}.wim")
+        resources = None
+        if resources_per_file:
+            resources = make_resources(rng, images[0][1], resources_per_file, shared_fraction, f"{seed}-{i}")
+        write_wim(path, images, file_size, guid=uuid.UUID(int=rng.getrandbits(128)),
+                  integrity_chunk_size=integrity_chunk_size, resources=resources)
+        paths.append(path)
+    return paths
+
+
+def write_fake_dism(folder, latency=0.0, lang='en', child=False):
+    """가짜 dism 실행 파일을 만들고 경로 반환 (SubprocessRunner/KDIC_DISM에 지정)
+
+    child: 기다리는 일을 자식 프로세스에서 실행 (취소 시 프로세스 트리 종료 확인용)
+    """
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, 'dism')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("#!/bin/sh\n")
+        f.write(f"KDIC_FAKE_DISM_LATENCY={latency} KDIC_FAKE_DISM_LANG={lang} "
+                f"KDIC_FAKE_DISM_CHILD={int(child)} "
+                f"exec '{sys.executable}' '{FAKE_DISM_SCRIPT}' \"$@\"\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 WIM 코퍼스 생성")
+    parser.add_argument('root')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--size', type=int, default=1024 * 1024, help="파일 하나의 크기 (바이트)")
+    parser.add_argument('--images', type=int, default=3, help="파일당 이미지(인덱스) 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--resources', type=int, default=0, help="파일당 lookup 테이블 리소스 수")
+    args = parser.parse_args(argv)
+
+    paths = make_corpus(args.root, args.count, args.size, args.images, seed=args.seed,
+                        resources_per_file=args.resources)
+    print(f"{len(paths)}개 파일 생성: {args.root}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
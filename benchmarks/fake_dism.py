@@ -0,0 +1,78 @@
+"""벤치마크용 가짜 dism
+
+캡처된 DISM 출력(fixtures/dism: 이미지 정보, 설치된 패키지 목록)을 돌려주고, 서비스 명령(마운트/패키지 적용/정리/커밋/내보내기)은
+성공 메시지만 출력한다. 실행마다 KDIC_FAKE_DISM_LATENCY초만큼 기다린다.
+
+    KDIC_FAKE_DISM_LANG=en|ko       출력 언어 (기본 en)
+    KDIC_FAKE_DISM_LATENCY=0.05     명령 하나의 지연 시간(초)
+    KDIC_FAKE_DISM_FAIL=<문자열>     인자에 이 문자열이 있으면 실패 (종료 코드 2)
+    KDIC_FAKE_DISM_PROGRESS=1       기다리는 동안 DISM 형식의 진행률 표시줄 출력
+    KDIC_FAKE_DISM_CHILD=1          기다리는 일을 자식 프로세스에서 실행 (프로세스 트리 종료 확인용)
+"""
+import os
+import subprocess
+import sys
+import time
+
+PROGRESS_STEPS = 10
+
+
+def wait(latency, progress):
+    """latency초 동안 기다리면서 필요하면 진행률 표시줄 출력"""
+    if not progress:
+        time.sleep(latency)
+        return
+    for step in range(1, PROGRESS_STEPS + 1):
+        time.sleep(latency / PROGRESS_STEPS)
+        percent = step * 100 / PROGRESS_STEPS
+        bar = '=' * (step * 5)
+        sys.stdout.write(f"\r[{bar:<50}{percent:5.1f}%]")
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'dism')
+
+SUCCESS = {
+    'en': "The operation completed successfully.",
+    'ko': "작업을 완료했습니다.",
+}
+
+
+def main(args):
+    lang = os.environ.get('KDIC_FAKE_DISM_LANG', 'en')
+    latency = float(os.environ.get('KDIC_FAKE_DISM_LATENCY') or 0)
+    fail = os.environ.get('KDIC_FAKE_DISM_FAIL')
+    progress = os.environ.get('KDIC_FAKE_DISM_PROGRESS') == '1'
+    if latency > 0 and os.environ.get('KDIC_FAKE_DISM_CHILD') == '1':
+        # 자식은 같은 표준 출력을 물려받으므로 부모만 종료하면 파이프가 닫히지 않음
+        child = subprocess.Popen([sys.executable, '-c', f"import time; time.sleep({latency})"])
+        child.wait()
+    elif latency > 0:
+        wait(latency, progress)
+
+    code, output = respond(args, lang, fail)
+    sys.stdout.write(output)
+    return code
+
+
+def respond(args, lang='en', fail=None):
+    """dism 인자 -> (종료 코드, 출력) (상주 도우미 스텁도 같은 응답을 사용)"""
+    if fail and any(fail in arg for arg in args):
+        with open(os.path.join(FIXTURE_DIR, 'en_error.txt'), encoding='utf-8') as f:
+            return 2, f.read()
+
+    lowered = [arg.lower() for arg in args]
+    if '/get-wiminfo' in lowered:
+        detail = any(arg.startswith('/index:') for arg in lowered)
+        name = f"{lang}_index1.txt" if detail else f"{lang}_list.txt"
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            return 0, f.read()
+    if '/get-packages' in lowered:
+        with open(os.path.join(FIXTURE_DIR, f"{lang}_packages.txt"), encoding='utf-8') as f:
+            return 0, f.read()
+
+    return 0, SUCCESS.get(lang, SUCCESS['en']) + "\n"
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
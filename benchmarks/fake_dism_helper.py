@@ -0,0 +1,50 @@
+"""벤치마크용 상주 DISM 도우미 스텁
+
+modules.dism_helper와 같은 프레임 프로토콜로 요청을 받아, 프로세스를 만들지 않고
+가짜 dism(fake_dism.respond)과 같은 출력을 돌려준다. 요청마다 KDIC_FAKE_DISM_LATENCY초만큼 기다린다.
+환경 변수는 fake_dism과 같다 (KDIC_FAKE_DISM_LANG, KDIC_FAKE_DISM_LATENCY, KDIC_FAKE_DISM_FAIL).
+
+    python benchmarks/fake_dism_helper.py      (HelperPool(command=stub_command())로 시작)
+"""
+import os
+import sys
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_dism import respond
+from modules.dism_helper import serve
+from modules.runner import CommandResult
+
+
+class StubBackend:
+    name = 'stub'
+    resident = True
+
+    def __init__(self, latency=0.0, lang='en', fail=None):
+        self.latency = latency
+        self.lang = lang
+        self.fail = fail
+
+    def run(self, args, on_output, cancel_event, encoding='utf-8'):
+        if self.latency > 0 and cancel_event.wait(self.latency):
+            return CommandResult(-1, '', "취소되었습니다.", cancelled=True)
+        code, output = respond(args[1:], self.lang, self.fail)
+        for line in output.splitlines():
+            on_output(line)
+        return CommandResult(code, output, '')
+
+
+def stub_command():
+    """HelperPool에 넘길 스텁 도우미 실행 명령"""
+    return [sys.executable, os.path.abspath(__file__)]
+
+
+def main():
+    backend = StubBackend(float(os.environ.get('KDIC_FAKE_DISM_LATENCY') or 0),
+                          os.environ.get('KDIC_FAKE_DISM_LANG', 'en'), os.environ.get('KDIC_FAKE_DISM_FAIL'))
+    return serve(backend)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
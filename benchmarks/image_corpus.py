@@ -0,0 +1,464 @@
+"""벤치마크용 내용이 있는 합성 WIM 생성
+
+디렉터리 트리(메타데이터 리소스)와 파일 데이터 리소스, lookup 테이블, XML까지 갖춘 WIM 파일을 만든다.
+modules.wim_image로 읽어 왕복 검증할 수 있도록 압축 없음/XPRESS/LZX 청크 압축을 단순한 인코더로 구현한다.
+(탐욕적 LZ77 + 길이 제한 허프만, LZX는 verbatim 블록만) 압축률보다 형식의 정확성이 목적이다.
+같은 seed면 항상 같은 파일이 만들어진다.
+
+    python -m benchmarks.image_corpus <파일> [--compression none|xpress|lzx] [--dirs N] [--files N]
+"""
+import argparse
+import hashlib
+import heapq
+import random
+import struct
+import sys
+import uuid
+
+from benchmarks.corpus import build_wim_xml
+from modules.wim import (WIM_TAG, WIM_HEADER_SIZE, WIM_HDR_FLAG_COMPRESSION, WIM_HDR_FLAG_COMPRESS_XPRESS,
+                         WIM_HDR_FLAG_COMPRESS_LZX, RESHDR_FLAG_METADATA, RESHDR_FLAG_COMPRESSED, LOOKUP_ENTRY_FORMAT)
+from modules.wim_compression import (XPRESS_MAX_CODE_LENGTH, XPRESS_MIN_MATCH, XPRESS_NUM_SYMBOLS, LZX_NUM_CHARS,
+                                     LZX_NUM_LEN_SYMBOLS, LZX_NUM_PRETREE_SYMBOLS, LZX_NUM_PRIMARY_LENS,
+                                     LZX_MIN_MATCH, LZX_DEFAULT_BLOCK_SIZE, LZX_E8_FILE_SIZE, LZX_BLOCK_VERBATIM,
+                                     LZX_EXTRA_BITS, LZX_SLOT_BASE)
+from modules.wim_image import DENTRY_FORMAT, DENTRY_SIZE, STREAM_ENTRY_FORMAT, STREAM_ENTRY_SIZE, FILE_ATTRIBUTE_DIRECTORY
+
+CHUNK_SIZE = 32768
+COMPRESSION_FLAGS = {
+    'none': 0,
+    'xpress': WIM_HDR_FLAG_COMPRESSION | WIM_HDR_FLAG_COMPRESS_XPRESS,
+    'lzx': WIM_HDR_FLAG_COMPRESSION | WIM_HDR_FLAG_COMPRESS_LZX,
+}
+FILE_ATTRIBUTE_ARCHIVE = 0x20
+LZX_NUM_MAIN_SYMBOLS = LZX_NUM_CHARS + 30 * 8  # 32KB 창: 오프셋 슬롯 30개
+LZX_MAX_MATCH = LZX_MIN_MATCH + LZX_NUM_PRIMARY_LENS + LZX_NUM_LEN_SYMBOLS - 1
+XPRESS_MAX_MATCH = 0xFFFF + XPRESS_MIN_MATCH
+MAX_CHAIN = 16
+FILETIME = 133500000000000000  # 2024-01-21
+
+
+def huffman_lengths(freqs, max_length):
+    """빈도 -> 최대 max_length비트로 제한한 허프만 부호 길이 (넘치면 빈도를 줄여 다시 계산)"""
+    freqs = list(freqs)
+    used = [symbol for symbol, freq in enumerate(freqs) if freq]
+    lengths = [0] * len(freqs)
+    if len(used) == 1:
+        lengths[used[0]] = 1
+        return lengths
+    while True:
+        heap = [(freqs[symbol], symbol, [symbol]) for symbol in used]
+        heapq.heapify(heap)
+        depth = [0] * len(freqs)
+        while len(heap) > 1:
+            freq_a, key_a, syms_a = heapq.heappop(heap)
+            freq_b, key_b, syms_b = heapq.heappop(heap)
+            for symbol in syms_a + syms_b:
+                depth[symbol] += 1
+            heapq.heappush(heap, (freq_a + freq_b, min(key_a, key_b), syms_a + syms_b))
+        if max(depth) <= max_length:
+            return depth
+        freqs = [max(1, freq >> 1) if freq else 0 for freq in freqs]
+
+
+def canonical_codes(lengths):
+    """부호 길이 -> 정규 허프만 부호 (modules.wim_compression.build_decode_table과 같은 순서)"""
+    codes = [0] * len(lengths)
+    code = 0
+    for length in range(1, max(lengths) + 1):
+        for symbol, symbol_length in enumerate(lengths):
+            if symbol_length == length:
+                codes[symbol] = code
+                code += 1
+        code <<= 1
+    return codes
+
+
+def find_matches(data, min_match, max_match, max_offset):
+    """탐욕적 LZ77: [(리터럴 바이트, None) 또는 (길이, 오프셋), ...]"""
+    heads = {}
+    items = []
+    i = 0
+    size = len(data)
+    while i < size:
+        best_length = best_offset = 0
+        if i + min_match <= size:
+            key = bytes(data[i:i + 3])
+            for candidate in reversed(heads.get(key, [])[-MAX_CHAIN:]):
+                offset = i - candidate
+                if offset > max_offset:
+                    break
+                length = 0
+                limit = min(max_match, size - i)
+                while length < limit and data[candidate + length] == data[i + length]:
+                    length += 1
+                if length > best_length:
+                    best_length, best_offset = length, offset
+        step = best_length if best_length >= min_match else 1
+        for position in range(i, min(i + step, size - 2)):
+            heads.setdefault(bytes(data[position:position + 3]), []).append(position)
+        if best_length >= min_match:
+            items.append((best_length, best_offset))
+        else:
+            items.append((data[i], None))
+        i += step
+    return items
+
+
+def compress_xpress(data):
+    """XPRESS Huffman 청크 압축 (디코더가 워드를 읽는 순서를 그대로 따라가며 비트와 바이트를 배치)"""
+    items = find_matches(data, XPRESS_MIN_MATCH, XPRESS_MAX_MATCH, 0xFFFF)
+    symbols = []
+    freqs = [0] * XPRESS_NUM_SYMBOLS
+    for value, offset in items:
+        if offset is None:
+            symbol = value
+        else:
+            log = offset.bit_length() - 1
+            symbol = 256 + (log << 4) + min(value - XPRESS_MIN_MATCH, 15)
+        symbols.append(symbol)
+        freqs[symbol] += 1
+    freqs[0] += 1  # 부호가 두 개 이상이 되도록
+    lengths = huffman_lengths(freqs, XPRESS_MAX_CODE_LENGTH)
+    codes = canonical_codes(lengths)
+
+    output = bytearray(bytes((lengths[2 * i] | lengths[2 * i + 1] << 4) for i in range(XPRESS_NUM_SYMBOLS // 2)))
+    words = [len(output), len(output) + 2]  # 디코더가 처음에 읽는 두 워드
+    output += bytes(4)
+    state = {'written': 0, 'valid': 32}
+
+    def put_bits(value, count):
+        for n in range(count - 1, -1, -1):
+            word = state['written'] // 16
+            if (value >> n) & 1:
+                position = words[word]
+                bit = 15 - state['written'] % 16
+                current = output[position] | output[position + 1] << 8 | (1 << bit)
+                output[position:position + 2] = current.to_bytes(2, 'little')
+            state['written'] += 1
+        state['valid'] -= count
+        if state['valid'] < 16:
+            words.append(len(output))
+            output.extend(bytes(2))
+            state['valid'] += 16
+
+    for (value, offset), symbol in zip(items, symbols):
+        put_bits(codes[symbol], lengths[symbol])
+        if offset is None:
+            continue
+        extra = value - XPRESS_MIN_MATCH
+        if extra >= 15:
+            if extra - 15 < 0xFF:
+                output.append(extra - 15)
+            else:
+                output.append(0xFF)
+                output += extra.to_bytes(2, 'little')
+        log = offset.bit_length() - 1
+        if log:
+            put_bits(offset - (1 << log), log)
+    return bytes(output)
+
+
+class _BitWriter:
+    """LZX 비트스트림 (16비트 리틀 엔디언 워드, 최상위 비트부터)"""
+
+    def __init__(self):
+        self.output = bytearray()
+        self.bits = 0
+        self.count = 0
+
+    def put(self, value, count):
+        self.bits = (self.bits << count) | value
+        self.count += count
+        while self.count >= 16:
+            self.count -= 16
+            self.output += ((self.bits >> self.count) & 0xFFFF).to_bytes(2, 'little')
+        self.bits &= (1 << self.count) - 1
+
+    def flush(self):
+        if self.count:
+            self.put(0, 16 - self.count)
+        return bytes(self.output)
+
+
+def lzx_e8_translate(data):
+    """LZX 압축 전 E8(x86 CALL) 상대 주소를 절대 주소로 변환"""
+    data = bytearray(data)
+    i = 0
+    while i < len(data) - 10:
+        if data[i] != 0xE8:
+            i += 1
+            continue
+        relative = int.from_bytes(data[i + 1:i + 5], 'little', signed=True)
+        if -i <= relative < LZX_E8_FILE_SIZE:
+            absolute = relative + i if relative < LZX_E8_FILE_SIZE - i else relative - LZX_E8_FILE_SIZE
+            data[i + 1:i + 5] = absolute.to_bytes(4, 'little', signed=True)
+        i += 5
+    return data
+
+
+def _lzx_write_lengths(writer, lengths):
+    """이전 값이 0인 부호 길이를 pretree(0~16번 심볼만 사용)로 기록"""
+    presyms = [(17 - length) % 17 for length in lengths]
+    freqs = [0] * LZX_NUM_PRETREE_SYMBOLS
+    for presym in presyms:
+        freqs[presym] += 1
+    pre_lengths = huffman_lengths(freqs, 15)
+    pre_codes = canonical_codes(pre_lengths)
+    for length in pre_lengths:
+        writer.put(length, 4)
+    for presym in presyms:
+        writer.put(pre_codes[presym], pre_lengths[presym])
+
+
+def compress_lzx(data):
+    """LZX(WIM 변형) 청크 압축 (verbatim 블록 하나, 반복 오프셋은 쓰지 않음)"""
+    items = find_matches(lzx_e8_translate(data), 3, LZX_MAX_MATCH, CHUNK_SIZE - 3)
+    main_freqs = [0] * LZX_NUM_MAIN_SYMBOLS
+    len_freqs = [0] * LZX_NUM_LEN_SYMBOLS
+    encoded = []
+    for value, offset in items:
+        if offset is None:
+            main_freqs[value] += 1
+            encoded.append((value, None, None))
+            continue
+        formatted = offset + 2
+        slot = next(s for s in range(3, len(LZX_SLOT_BASE)) if LZX_SLOT_BASE[s + 1] > formatted)
+        header = min(value - LZX_MIN_MATCH, LZX_NUM_PRIMARY_LENS)
+        symbol = LZX_NUM_CHARS + slot * 8 + header
+        main_freqs[symbol] += 1
+        length_symbol = None
+        if header == LZX_NUM_PRIMARY_LENS:
+            length_symbol = value - LZX_MIN_MATCH - LZX_NUM_PRIMARY_LENS
+            len_freqs[length_symbol] += 1
+        encoded.append((symbol, length_symbol, (formatted - LZX_SLOT_BASE[slot], LZX_EXTRA_BITS[slot])))
+    main_freqs[0] += 1
+    main_lengths = huffman_lengths(main_freqs, 16)
+    len_lengths = huffman_lengths(len_freqs, 16) if any(len_freqs) else [0] * LZX_NUM_LEN_SYMBOLS
+    main_codes = canonical_codes(main_lengths)
+    len_codes = canonical_codes(len_lengths) if any(len_lengths) else len_lengths
+
+    writer = _BitWriter()
+    writer.put(LZX_BLOCK_VERBATIM, 3)
+    if len(data) == LZX_DEFAULT_BLOCK_SIZE:
+        writer.put(1, 1)
+    else:
+        writer.put(0, 1)
+        writer.put(len(data), 16)
+    _lzx_write_lengths(writer, main_lengths[:LZX_NUM_CHARS])
+    _lzx_write_lengths(writer, main_lengths[LZX_NUM_CHARS:])
+    _lzx_write_lengths(writer, len_lengths)
+    for symbol, length_symbol, extra in encoded:
+        writer.put(main_codes[symbol], main_lengths[symbol])
+        if length_symbol is not None:
+            writer.put(len_codes[length_symbol], len_lengths[length_symbol])
+        if extra is not None:
+            writer.put(*extra)
+    return writer.flush()
+
+
+COMPRESSORS = {'xpress': compress_xpress, 'lzx': compress_lzx}
+
+
+def compress_resource(data, compression):
+    """리소스 데이터 -> (저장할 바이트, 리소스 플래그) (청크 테이블 + 청크별 압축, 줄지 않은 청크는 그대로)"""
+    if compression == 'none' or not data:
+        return data, 0
+    chunks = []
+    for start in range(0, len(data), CHUNK_SIZE):
+        raw = data[start:start + CHUNK_SIZE]
+        packed = COMPRESSORS[compression](raw)
+        chunks.append(packed if len(packed) < len(raw) else raw)
+    entry_format = '<Q' if len(data) > 0xFFFFFFFF else '<I'
+    table = bytearray()
+    position = 0
+    for chunk in chunks[:-1]:
+        position += len(chunk)
+        table += struct.pack(entry_format, position)
+    return bytes(table) + b''.join(chunks), RESHDR_FLAG_COMPRESSED
+
+
+def _dentry(name, attributes, sha1, subdir_offset, streams=()):
+    """디렉터리 항목 하나 (8바이트 정렬, 뒤에 이름 있는 추가 스트림 항목)"""
+    encoded = name.encode('utf-16-le')
+    length = DENTRY_SIZE + len(encoded) + 2
+    data = bytearray(struct.pack(DENTRY_FORMAT, length, attributes, -1, subdir_offset, 0, 0, FILETIME, FILETIME,
+                                 FILETIME, sha1, 0, 0, len(streams), 0, len(encoded)))
+    data += encoded + b'\0\0'
+    data += bytes(-len(data) % 8)
+    for stream_name, stream_hash in streams:
+        stream_encoded = stream_name.encode('utf-16-le')
+        entry = struct.pack(STREAM_ENTRY_FORMAT, STREAM_ENTRY_SIZE + len(stream_encoded) + 2, 0, stream_hash,
+                            len(stream_encoded)) + stream_encoded + b'\0\0'
+        data += entry + bytes(-len(entry) % 8)
+    return bytes(data)
+
+
+def build_metadata(tree, blobs):
+    """트리 {이름: bytes | (bytes, {스트림 이름: bytes}) | dict} -> 메타데이터 리소스 (내용은 blobs에 모음)"""
+    def content_hash(content):
+        if not content:
+            return bytes(20)
+        sha1 = hashlib.sha1(content).digest()
+        blobs[sha1] = content
+        return sha1
+
+    # 디렉터리별 자식 목록 위치를 먼저 정하고(BFS) 두 번째로 항목을 씀
+    directories = [('', tree)]
+    sizes = []
+    for _, children in directories:
+        size = 8  # 목록 끝 표시
+        for name, value in children.items():
+            streams = value[1] if isinstance(value, tuple) else {}
+            size += len(_dentry(name, 0, bytes(20), 0, [(s, bytes(20)) for s in streams]))
+            if isinstance(value, dict):
+                directories.append((name, value))
+        sizes.append(size)
+
+    security = struct.pack('<II', 8, 0)  # 보안 디스크립터 없음
+    root_offset = len(security)
+    offsets = []
+    position = root_offset + len(_dentry('', FILE_ATTRIBUTE_DIRECTORY, bytes(20), 0)) + 8
+    for size in sizes:
+        offsets.append(position)
+        position += size
+
+    data = bytearray(security)
+    data += _dentry('', FILE_ATTRIBUTE_DIRECTORY, bytes(20), offsets[0]) + bytes(8)
+    next_directory = 1
+    for _, children in directories:
+        for name, value in children.items():
+            if isinstance(value, dict):
+                data += _dentry(name, FILE_ATTRIBUTE_DIRECTORY, bytes(20), offsets[next_directory])
+                next_directory += 1
+            elif isinstance(value, tuple):
+                content, streams = value
+                data += _dentry(name, FILE_ATTRIBUTE_ARCHIVE, content_hash(content), 0,
+                                [(stream_name, content_hash(stream)) for stream_name, stream in streams.items()])
+            else:
+                data += _dentry(name, FILE_ATTRIBUTE_ARCHIVE, content_hash(value), 0)
+        data += bytes(8)
+    return bytes(data)
+
+
+def tree_totals(tree):
+    """트리의 (파일 수, 디렉터리 수, 데이터 크기 합계) (WimImage.tree_size와 같은 기준)"""
+    files = dirs = total = 0
+    for value in tree.values():
+        if isinstance(value, dict):
+            sub_files, sub_dirs, sub_total = tree_totals(value)
+            files += sub_files
+            dirs += sub_dirs + 1
+            total += sub_total
+        else:
+            files += 1
+            total += len(value[0] if isinstance(value, tuple) else value)
+    return files, dirs, total
+
+
+def write_image_wim(path, trees, compression='lzx', names=None, guid=None):
+    """이미지별 트리 목록으로 내용이 있는 WIM 파일 생성"""
+    blobs = {}
+    metadata = [build_metadata(tree, blobs) for tree in trees]
+
+    lookup = bytearray()
+    with open(path, 'wb') as f:
+        f.seek(WIM_HEADER_SIZE)
+
+        def write_resource(sha1, data, flags):
+            stored, compressed = compress_resource(data, compression)
+            offset = f.tell()
+            f.write(stored)
+            lookup.extend(struct.pack(LOOKUP_ENTRY_FORMAT, len(stored) | ((flags | compressed) << 56), offset,
+                                      len(data), 1, 1, sha1))
+
+        for sha1, data in blobs.items():
+            write_resource(sha1, data, 0)
+        for data in metadata:
+            write_resource(hashlib.sha1(data).digest(), data, RESHDR_FLAG_METADATA)
+
+        lookup_offset = f.tell()
+        f.write(lookup)
+        images = [(name, '26100', tree_totals(tree)[2])
+                  for name, tree in zip(names or [f"Image {i}" for i in range(1, len(trees) + 1)], trees)]
+        xml = build_wim_xml(images)
+        xml_offset = f.tell()
+        f.write(xml)
+
+        header = bytearray(WIM_HEADER_SIZE)
+        header[0:8] = WIM_TAG
+        struct.pack_into('<IIII', header, 8, WIM_HEADER_SIZE, 0x10d00, COMPRESSION_FLAGS[compression],
+                         CHUNK_SIZE if compression != 'none' else 0)
+        header[24:40] = (guid or uuid.uuid4()).bytes_le
+        struct.pack_into('<HHI', header, 40, 1, 1, len(trees))
+        struct.pack_into('<QQQ', header, 48, len(lookup), lookup_offset, len(lookup))
+        struct.pack_into('<QQQ', header, 72, len(xml), xml_offset, len(xml))
+        f.seek(0)
+        f.write(header)
+    return path
+
+
+def make_tree(rng, dirs=20, files_per_dir=30, depth=3):
+    """드라이버 저장소 비슷한 합성 트리 (.inf 텍스트, E8 바이트가 섞인 .sys, 빈 파일, 추가 스트림 포함)
+
+    드라이버 폴더 dirs개 각각에 depth단계까지 하위 폴더 2개씩, 폴더마다 파일 files_per_dir개
+    """
+    def inf(name):
+        lines = [f"; {name}", "[Version]", 'Signature="$WINDOWS NT$"', "Class=System",
+                 f"DriverVer=06/21/2006,10.0.{rng.randrange(19041, 26100)}.{rng.randrange(1, 5000)}"]
+        lines += [f"HKR,,Setting{n},0x00010001,{rng.randrange(1 << 16)}" for n in range(rng.randrange(5, 40))]
+        return '\r\n'.join(lines).encode('utf-16-le')
+
+    def binary():
+        parts = []
+        for _ in range(rng.randrange(1, 16)):
+            parts.append(b'\xe8' + rng.randrange(1 << 32).to_bytes(4, 'little'))
+            parts.append(bytes(rng.randrange(256) for _ in range(rng.randrange(0, 48))))
+            parts.append(b'\x48\x89\x5c\x24\x08' * rng.randrange(1, 20))
+        return b''.join(parts)
+
+    def level(prefix, remaining):
+        node = {}
+        for n in range(files_per_dir):
+            kind = n % 4
+            if kind == 0:
+                node[f"{prefix}{n:03d}.inf"] = inf(f"{prefix}{n}")
+            elif kind == 1:
+                node[f"{prefix}{n:03d}.sys"] = binary()
+            elif kind == 2:
+                node[f"{prefix}{n:03d}.cat"] = (binary(), {'Zone.Identifier': b'[ZoneTransfer]\r\nZoneId=3'})
+            else:
+                node[f"Empty{n:03d}.txt"] = b''
+        if remaining > 1:
+            for d in range(2):
+                node[f"{prefix}Dir{d:02d}"] = level(f"{prefix}{d}_", remaining - 1)
+        return node
+
+    tree = {'Windows': {'System32': {'DriverStore': {'FileRepository': {}}}}, 'Users': {}}
+    repository = tree['Windows']['System32']['DriverStore']['FileRepository']
+    for d in range(dirs):
+        repository[f"driver{d:03d}.inf_amd64_{rng.getrandbits(64):016x}"] = level(f"d{d}_", depth)
+    tree['Windows']['System32']['ntoskrnl.exe'] = binary() * 20
+    return tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="내용이 있는 합성 WIM 생성")
+    parser.add_argument('path')
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_FLAGS), default='lzx')
+    parser.add_argument('--dirs', type=int, default=20)
+    parser.add_argument('--files', type=int, default=30)
+    parser.add_argument('--images', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    trees = [make_tree(rng, args.dirs, args.files) for _ in range(args.images)]
+    write_image_wim(args.path, trees, args.compression, guid=uuid.UUID(int=rng.getrandbits(128)))
+    files, dirs, total = tree_totals(trees[0])
+    print(f"{args.path}: 이미지 {args.images}개, 첫 이미지 파일 {files}개, 디렉터리 {dirs}개, {total}바이트")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
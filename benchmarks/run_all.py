@@ -0,0 +1,155 @@
+"""전체 벤치마크 실행 및 결과 비교
+
+모든 벤치마크를 실행하여 환경 정보와 함께 JSON으로 저장하고,
+이전 결과 파일을 지정하면 지표별 변화율을 비교한다. 네트워크 없이 Linux에서 실행된다.
+
+    python -m benchmarks.run_all [--quick] [--output results.json] [--compare baseline.json]
+
+비교 시 이름이 seconds/seconds_per_mb로 끝나는 지표는 작을수록, per_second로 끝나는 지표는
+클수록 좋은 것으로 본다.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks import (bench_browse, bench_dedup, bench_helper, bench_parser, bench_scan, bench_trace, bench_update,
+                        bench_verify, bench_view)
+from modules.update_engine import STAGES
+
+# 실행 프로필별 매개변수 (기본 full, --quick)
+PROFILES = {
+    'full': {'parser_repeat': 2000, 'scan_count': 2000, 'scan_dism_count': 40, 'dism_latency': 0.02,
+             'update_images': 16, 'update_scale': 0.1, 'view_items': 20000,
+             'verify_count': 8, 'verify_size': 64 * 1024 * 1024, 'dedup_count': 50, 'dedup_resources': 20000,
+             'cancel_repeat': 5, 'trace_spans': 200000, 'helper_calls': 200,
+             'browse_dirs': 10, 'browse_files': 30},
+    'quick': {'parser_repeat': 200, 'scan_count': 200, 'scan_dism_count': 8, 'dism_latency': 0.01,
+              'update_images': 4, 'update_scale': 0.02, 'view_items': 2000,
+              'verify_count': 4, 'verify_size': 16 * 1024 * 1024, 'dedup_count': 10, 'dedup_resources': 5000,
+             'cancel_repeat': 2, 'trace_spans': 20000, 'helper_calls': 40,
+             'browse_dirs': 4, 'browse_files': 12},
+}
+DEFAULT_THRESHOLD = 0.10  # 이보다 많이 나빠지면 회귀로 표시 (10%)
+METRIC_SUFFIXES = ('seconds', 'seconds_per_mb', 'per_second')
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_all(profile='full'):
+    params = PROFILES[profile]
+    fixtures = bench_parser.load_fixtures()
+    mismatched = bench_parser.verify_fixtures(fixtures)
+    if mismatched:
+        raise RuntimeError(f"파싱 결과가 expected.json과 다릅니다: {', '.join(mismatched)}")
+
+    sequential = bench_update.bench_pipeline(params['update_images'], 2, params['update_scale'],
+                                             stage_limits={stage: 1 for stage in STAGES}, max_in_flight=1)
+    pipelined = bench_update.bench_pipeline(params['update_images'], 2, params['update_scale'])
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'profile': profile,
+            'params': params,
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': {
+            'parser': bench_parser.bench_parser(fixtures, params['parser_repeat']),
+            'scan': bench_scan.run(params['scan_count'], latency=params['dism_latency'],
+                                   dism_count=params['scan_dism_count']),
+            'update': {
+                'sequential': sequential,
+                'pipelined': pipelined,
+                'dism': bench_update.bench_dism_update(params['update_images'], 2, params['dism_latency']),
+                'order': bench_update.bench_orders(params['update_images'], params['update_scale']),
+                'cancel': bench_update.bench_cancel(params['cancel_repeat']),
+            },
+            'dedup': bench_dedup.run(params['dedup_count'], params['dedup_resources']),
+            'verify': bench_verify.run(params['verify_count'], params['verify_size']),
+            'view': bench_view.bench_view(params['view_items']),
+            'trace': bench_trace.bench_trace(params['trace_spans']),
+            'helper': bench_helper.bench_helper(params['helper_calls']),
+            'browse': bench_browse.run(params['browse_dirs'], params['browse_files']),
+        },
+    }
+
+
+def flatten_metrics(results, prefix=''):
+    """비교할 지표만 '경로 -> 값' 으로 펼침"""
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and key.endswith(METRIC_SUFFIXES):
+            metrics[name] = value
+    return metrics
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """지표별 변화 목록과 회귀 지표 이름 목록 반환 (change: 양수면 좋아짐)"""
+    old = flatten_metrics(baseline['results'])
+    new = flatten_metrics(current['results'])
+    rows = []
+    regressions = []
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        if not before or not after:
+            continue
+        higher_is_better = name.endswith('per_second')
+        change = (after - before) / before if higher_is_better else (before - after) / before
+        rows.append((name, before, after, change))
+        if change < -threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전체 벤치마크 실행")
+    parser.add_argument('--quick', action='store_true', help="작은 코퍼스로 빠르게 실행")
+    parser.add_argument('--output', '-o', help="결과 JSON 파일 (기본: stdout)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 악화 비율")
+    parser.add_argument('--fail-on-regression', action='store_true', help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    current = run_all('quick' if args.quick else 'full')
+    text = json.dumps(current, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['meta'].get('profile') != current['meta']['profile']:
+        print("경고: 실행 프로필이 달라 비교 결과가 정확하지 않을 수 있습니다.", file=sys.stderr)
+    rows, regressions = compare(baseline, current, args.threshold)
+    width = max([len(row[0]) for row in rows] + [4])
+    print(f"{'지표':<{width}}  {'이전':>10}  {'현재':>10}  {'변화':>7}", file=sys.stderr)
+    for name, before, after, change in rows:
+        mark = '  ← 회귀' if name in regressions else ''
+        print(f"{name:<{width}}  {before:>10}  {after:>10}  {change:>+7.1%}{mark}", file=sys.stderr)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from modules.dedup import DedupAnalyzer
+
+
+class DedupWorker(QThread):
+    """스캔된 WIM 파일들의 리소스 중복을 분석하는 스레드"""
+    analysis_complete = pyqtSignal(object)  # 분석 완료 시 DedupReport 전달 (중지되면 None)
+    progress = pyqtSignal(int, str)         # 진행률 (값, 메시지)
+    log_message = pyqtSignal(str)           # 로그 메시지
+
+    def __init__(self, file_list, index, max_workers=None, force=False, channel=None, sink=None):
+        """
+        file_list: 분석할 파일 경로 목록
+        index: DedupIndex (바뀌지 않은 파일은 색인된 내용을 그대로 사용)
+        """
+        super().__init__()
+        self.file_list = file_list
+        self.force = force
+        self.channel = channel  # UiChannel (지정 시 진행률을 묶어서 전달)
+        self.sink = sink        # LogSink (지정 시 모든 로그를 구조화된 이벤트로 기록)
+        self.is_running = True
+        self.analyzer = DedupAnalyzer(index, max_workers=max_workers, log=self.log)
+
+    def run(self):
+        """스레드 실행 함수"""
+        self.log(f"{len(self.file_list)}개 파일의 리소스 중복을 분석합니다...")
+        report = None
+        try:
+            report = self.analyzer.analyze(
+                self.file_list,
+                on_progress=self.on_progress,
+                should_stop=lambda: not self.is_running,
+                force=self.force
+            )
+        except Exception as e:
+            self.log(f"중복 분석 중 오류 발생: {str(e)}", level='error')
+
+        if report is not None:
+            self.log(f"중복 분석 완료: 하나로 합치면 {report.savings_bytes / 1024**3:.1f} GB "
+                     f"({report.savings_fraction:.0%}) 절약")
+        self.analysis_complete.emit(report)
+
+    def on_progress(self, done, total, file_path):
+        """처리한 파일 수 기준 진행률 갱신"""
+        value = int(done / total * 100) if total else 100
+        message = f"중복 분석 중... ({done}/{total})"
+        if self.channel is not None:
+            self.channel.post_progress(value, message, job='dedup')
+        else:
+            self.progress.emit(value, message)
+
+    def log(self, message, **fields):
+        """로그 전달 (로그 싱크가 있으면 싱크로, 없으면 시그널로)"""
+        if self.sink is not None:
+            self.sink.emit(message, job='dedup', **fields)
+        elif fields.get('level') != 'debug':
+            self.log_message.emit(message)
+
+    def stop(self):
+        """스레드 중지"""
+        self.is_running = False
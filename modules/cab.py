@@ -0,0 +1,193 @@
+import struct
+import zlib
+
+# Microsoft Cabinet(.cab, .msu) 파일 목록과 작은 파일 내용 읽기 (MS-CAB 형식)
+# 업데이트 패키지의 메타데이터 파일(pkgProperties.txt, update.mum 등)만 읽으면 되므로
+# 압축 없음과 MSZIP 폴더만 지원한다. LZX/Quantum 폴더의 파일은 CabFormatError를 발생시킨다.
+
+CAB_SIGNATURE = b'MSCF'
+CAB_HEADER_FORMAT = '<4sIIIIIBBHHHHH'
+CAB_HEADER_SIZE = struct.calcsize(CAB_HEADER_FORMAT)  # 36
+CAB_FOLDER_FORMAT = '<IHH'
+CAB_FILE_FORMAT = '<IIHHHH'
+CAB_DATA_FORMAT = '<IHH'
+
+CAB_FLAG_PREV_CABINET = 0x0001
+CAB_FLAG_NEXT_CABINET = 0x0002
+CAB_FLAG_RESERVE_PRESENT = 0x0004
+CAB_ATTRIB_NAME_IS_UTF = 0x80
+
+COMPRESS_MASK = 0x000F
+COMPRESS_NONE = 0
+COMPRESS_MSZIP = 1
+COMPRESS_QUANTUM = 2
+COMPRESS_LZX = 3
+
+COMPRESSION_NAMES = {
+    COMPRESS_NONE: 'none',
+    COMPRESS_MSZIP: 'mszip',
+    COMPRESS_QUANTUM: 'quantum',
+    COMPRESS_LZX: 'lzx',
+}
+
+MSZIP_SIGNATURE = b'CK'
+MSZIP_WINDOW = 32 * 1024
+MAX_ENTRIES = 65535
+DEFAULT_MAX_READ = 4 * 1024 * 1024  # read_file()이 읽는 최대 크기 (메타데이터 파일용)
+MAX_FOLDER_READ = 64 * 1024 * 1024  # 항목 앞에 있는 다른 파일까지 합해 압축 해제할 최대 크기
+
+
+class CabFormatError(Exception):
+    """CAB 파일 형식이 올바르지 않거나 지원하지 않는 압축일 때 발생하는 예외"""
+    pass
+
+
+class CabFolder:
+    __slots__ = ('offset', 'blocks', 'compression')
+
+    def __init__(self, offset, blocks, compression):
+        self.offset = offset            # 첫 CFDATA 블록 위치
+        self.blocks = blocks
+        self.compression = compression  # COMPRESS_*
+
+
+class CabEntry:
+    """CAB 안의 파일 하나"""
+    __slots__ = ('name', 'size', 'folder', 'offset')
+
+    def __init__(self, name, size, folder, offset):
+        self.name = name      # CAB 안의 경로 ('\\' 구분)
+        self.size = size      # 압축 전 크기
+        self.folder = folder  # 폴더 번호
+        self.offset = offset  # 폴더의 압축 해제 데이터 안에서의 위치
+
+    def __repr__(self):
+        return f"CabEntry({self.name!r}, size={self.size})"
+
+
+class CabReader:
+    """CAB 파일 읽기 (with 문 사용)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._read_directory()
+        except (struct.error, UnicodeDecodeError) as e:
+            self._file.close()
+            raise CabFormatError(f"CAB 구조를 읽을 수 없습니다: {e}") from e
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self._file.close()
+
+    def _read(self, size):
+        data = self._file.read(size)
+        if len(data) != size:
+            raise CabFormatError("CAB 파일이 잘렸습니다.")
+        return data
+
+    def _read_string(self, limit=1024):
+        data = bytearray()
+        while len(data) < limit:
+            byte = self._file.read(1)
+            if not byte:
+                raise CabFormatError("CAB 파일이 잘렸습니다.")
+            if byte == b'\0':
+                return bytes(data)
+            data += byte
+        raise CabFormatError("CAB 문자열이 너무 깁니다.")
+
+    def _read_directory(self):
+        (signature, _, self.size, _, files_offset, _, minor, major, folder_count, file_count, flags, _,
+         _) = struct.unpack(CAB_HEADER_FORMAT, self._read(CAB_HEADER_SIZE))
+        if signature != CAB_SIGNATURE:
+            raise CabFormatError("CAB 파일이 아닙니다.")
+        if major != 1:
+            raise CabFormatError(f"지원하지 않는 CAB 버전입니다: {major}.{minor}")
+        if flags & (CAB_FLAG_PREV_CABINET | CAB_FLAG_NEXT_CABINET):
+            raise CabFormatError("여러 파일로 나뉜 CAB은 지원하지 않습니다.")
+
+        folder_reserve = self.data_reserve = 0
+        if flags & CAB_FLAG_RESERVE_PRESENT:
+            header_reserve, folder_reserve, self.data_reserve = struct.unpack('<HBB', self._read(4))
+            self._file.seek(header_reserve, 1)
+
+        self.folders = []
+        for _ in range(folder_count):
+            offset, blocks, compression = struct.unpack(CAB_FOLDER_FORMAT,
+                                                        self._read(struct.calcsize(CAB_FOLDER_FORMAT)))
+            self._file.seek(folder_reserve, 1)
+            self.folders.append(CabFolder(offset, blocks, compression))
+
+        self._file.seek(files_offset)
+        self.entries = []
+        for _ in range(min(file_count, MAX_ENTRIES)):
+            size, offset, folder, _, _, attribs = struct.unpack(CAB_FILE_FORMAT,
+                                                               self._read(struct.calcsize(CAB_FILE_FORMAT)))
+            raw = self._read_string()
+            name = raw.decode('utf-8') if attribs & CAB_ATTRIB_NAME_IS_UTF else raw.decode('latin-1')
+            self.entries.append(CabEntry(name, size, folder, offset))
+
+    def find(self, predicate):
+        """조건에 맞는 첫 번째 항목 (없으면 None)"""
+        return next((entry for entry in self.entries if predicate(entry.name)), None)
+
+    def compression(self, entry):
+        """항목이 들어 있는 폴더의 압축 방식 이름"""
+        folder = self._folder(entry)
+        return COMPRESSION_NAMES.get(folder.compression & COMPRESS_MASK, 'unknown')
+
+    def read_file(self, entry, max_size=DEFAULT_MAX_READ):
+        """항목 내용 읽기 (폴더 처음부터 항목 끝까지만 압축 해제)"""
+        if entry.size > max_size:
+            raise CabFormatError(f"'{entry.name}' 파일이 너무 큽니다: {entry.size}바이트")
+        if entry.offset + entry.size > MAX_FOLDER_READ:
+            raise CabFormatError(f"'{entry.name}' 앞에 있는 파일이 너무 커서 읽지 않습니다.")
+        folder = self._folder(entry)
+        compression = folder.compression & COMPRESS_MASK
+        if compression not in (COMPRESS_NONE, COMPRESS_MSZIP):
+            raise CabFormatError(f"지원하지 않는 압축 방식입니다: "
+                                 f"{COMPRESSION_NAMES.get(compression, compression)}")
+
+        end = entry.offset + entry.size
+        output = bytearray()
+        self._file.seek(folder.offset)
+        for _ in range(folder.blocks):
+            if len(output) >= end:
+                break
+            _, stored, original = struct.unpack(CAB_DATA_FORMAT, self._read(struct.calcsize(CAB_DATA_FORMAT)))
+            self._file.seek(self.data_reserve, 1)
+            data = self._read(stored)
+            if compression == COMPRESS_NONE:
+                output += data
+                continue
+            if data[:2] != MSZIP_SIGNATURE:
+                raise CabFormatError("MSZIP 블록 서명이 올바르지 않습니다.")
+            # 블록마다 새 deflate 스트림이지만 앞 블록의 출력(최대 32KB)을 사전으로 사용
+            history = bytes(output[-MSZIP_WINDOW:])
+            try:
+                decompressor = zlib.decompressobj(-15, zdict=history) if history else zlib.decompressobj(-15)
+                block = decompressor.decompress(data[2:]) + decompressor.flush()
+            except zlib.error as e:
+                raise CabFormatError(f"MSZIP 블록을 풀 수 없습니다: {e}") from e
+            if len(block) != original:
+                raise CabFormatError("MSZIP 블록 크기가 맞지 않습니다.")
+            output += block
+        if len(output) < end:
+            raise CabFormatError(f"'{entry.name}' 파일 데이터가 잘렸습니다.")
+        return bytes(output[entry.offset:end])
+
+    def _folder(self, entry):
+        if entry.folder >= len(self.folders):
+            raise CabFormatError(f"'{entry.name}' 항목의 폴더 번호가 올바르지 않습니다: {entry.folder}")
+        return self.folders[entry.folder]
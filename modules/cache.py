@@ -0,0 +1,171 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from modules.paths import get_app_data_path
+from modules.wim import read_wim_header, WimFormatError
+
+CACHE_FILE_NAME = 'kdic_cache.db'
+CACHE_SCHEMA_VERSION = 2
+
+# 캐시 테이블 (스캔 결과, 무결성 검사 결과) - 구조는 같고 info 내용만 다름
+SCAN_TABLE = 'scan_cache'
+VERIFY_TABLE = 'verify_cache'
+TABLES = (SCAN_TABLE, VERIFY_TABLE)
+
+# 이 기간 동안 한 번도 조회되지 않은 항목은 제거
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def get_file_identity(file_path, stat_result=None):
+    """캐시 키로 사용할 파일 식별 정보 (크기, 수정 시각, WIM GUID)"""
+    st = stat_result or os.stat(file_path)
+    try:
+        guid = str(read_wim_header(file_path).guid)
+    except (OSError, WimFormatError):
+        guid = None  # 헤더를 읽을 수 없는 파일은 크기/수정 시각만 비교
+    return st.st_size, st.st_mtime_ns, guid
+
+
+class ScanCache:
+    """WIM 스캔 결과(wim_info)와 무결성 검사 결과를 파일 식별 정보 기준으로 저장하는 SQLite 캐시"""
+
+    def __init__(self, db_path=None, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.db_path = db_path or get_app_data_path(CACHE_FILE_NAME)
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_SCHEMA_VERSION:
+                # 스키마가 바뀌면 캐시를 새로 만든다
+                for table in TABLES:
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for table in TABLES:
+                self._conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        guid TEXT,
+                        info TEXT NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                """)
+            self._conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def lookup(self, file_path, stat_result=None):
+        """파일이 바뀌지 않았으면 캐시된 wim_info 반환, 아니면 None"""
+        wim_info = self._lookup(SCAN_TABLE, file_path, stat_result)
+        if wim_info is not None:
+            wim_info['file_path'] = file_path
+        return wim_info
+
+    def store(self, file_path, wim_info, stat_result=None):
+        """조회 결과 저장 (같은 경로의 이전 항목은 덮어씀)"""
+        self._store(SCAN_TABLE, file_path, wim_info, stat_result)
+
+    def lookup_verify(self, file_path, stat_result=None):
+        """파일이 바뀌지 않았으면 캐시된 무결성 검사 결과(dict) 반환, 아니면 None"""
+        return self._lookup(VERIFY_TABLE, file_path, stat_result)
+
+    def store_verify(self, file_path, result, stat_result=None):
+        """무결성 검사 결과 저장"""
+        self._store(VERIFY_TABLE, file_path, result, stat_result)
+
+    def _lookup(self, table, file_path, stat_result=None):
+        key = self._key(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT size, mtime_ns, guid, info FROM {table} WHERE path = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            st = stat_result or os.stat(file_path)
+        except OSError:
+            return None
+        size, mtime_ns, guid, info = row
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            return None
+        if guid is not None:
+            try:
+                if str(read_wim_header(file_path).guid) != guid:
+                    return None
+            except (OSError, WimFormatError):
+                return None
+
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE {table} SET last_used = ? WHERE path = ?", (time.time(), key))
+
+        return json.loads(info)
+
+    def _store(self, table, file_path, data, stat_result=None):
+        try:
+            size, mtime_ns, guid = get_file_identity(file_path, stat_result)
+        except OSError:
+            return
+        info = json.dumps(data, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (path, size, mtime_ns, guid, info, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._key(file_path), size, mtime_ns, guid, info, time.time())
+            )
+
+    def invalidate(self, file_path):
+        """특정 파일의 캐시 항목 제거"""
+        with self._lock, self._conn:
+            for table in TABLES:
+                self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (self._key(file_path),))
+
+    def evict_missing(self, folder_path, existing_paths, recursive=False):
+        """폴더 안에서 더 이상 존재하지 않는 파일의 항목 제거 (제거 수 반환)
+
+        recursive가 False이면 폴더 바로 아래 파일만 대상으로 한다.
+        """
+        prefix = self._key(folder_path).rstrip(os.sep) + os.sep
+        existing = {self._key(p) for p in existing_paths}
+        removed = 0
+        with self._lock, self._conn:
+            for table in TABLES:
+                rows = self._conn.execute(
+                    f"SELECT path FROM {table} WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                ).fetchall()
+                missing = [(path,) for path, in rows
+                           if path not in existing and (recursive or os.sep not in path[len(prefix):])]
+                self._conn.executemany(f"DELETE FROM {table} WHERE path = ?", missing)
+                removed += len(missing)
+        return removed
+
+    def evict_stale(self):
+        """오래 사용되지 않았거나 디스크에서 사라진 파일의 항목 제거 (제거 수 반환)"""
+        cutoff = time.time() - self.max_age_days * 86400
+        removed = 0
+        with self._lock, self._conn:
+            for table in TABLES:
+                rows = self._conn.execute(f"SELECT path, last_used FROM {table}").fetchall()
+                stale = [(path,) for path, last_used in rows if last_used < cutoff or not os.path.exists(path)]
+                self._conn.executemany(f"DELETE FROM {table} WHERE path = ?", stale)
+                removed += len(stale)
+        return removed
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock, self._conn:
+            for table in TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
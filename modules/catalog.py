@@ -0,0 +1,492 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, asdict
+
+from modules.cab import CabReader, CabFormatError
+from modules.paths import get_app_data_path
+from modules.tracing import span, count
+
+# 업데이트 패키지(.msu/.cab) 카탈로그 (Qt 비의존)
+# 패키지 폴더를 한 번 훑어 패키지별 대상 제품/빌드 범위/아키텍처/종류를 SQLite 색인에 저장하고
+# (바뀐 파일만 다시 읽음), 스캔한 이미지마다 적용할 패키지를 골라 업데이트 계획을 만든다.
+# 메타데이터는 파일 이름(windows11.0-kb5034441-x64_...msu)과 패키지 안의 파일
+# (.msu: *-pkgProperties.txt, 설치용 XML / .cab: update.mum)에서 읽는다.
+
+CATALOG_FILE_NAME = 'kdic_catalog.db'
+CATALOG_SCHEMA_VERSION = 2
+
+PACKAGE_EXTENSIONS = ('.msu', '.cab')
+
+# 패키지 종류 (같은 종류/빌드 계열에서는 가장 새 패키지만 적용)
+PACKAGE_SSU = 'ssu'          # 서비스 스택 업데이트 (다른 패키지보다 먼저 적용)
+PACKAGE_LCU = 'lcu'          # 누적 업데이트
+PACKAGE_DOTNET = 'dotnet'    # .NET 누적 업데이트
+PACKAGE_UPDATE = 'update'    # 그 밖의 개별 업데이트 (KB마다 따로 적용)
+
+PACKAGE_KIND_LABELS = {
+    PACKAGE_SSU: '서비스 스택',
+    PACKAGE_LCU: '누적 업데이트',
+    PACKAGE_DOTNET: '.NET',
+    PACKAGE_UPDATE: '업데이트',
+}
+APPLY_ORDER = (PACKAGE_SSU, PACKAGE_LCU, PACKAGE_UPDATE, PACKAGE_DOTNET)
+
+# 건너뛴 이유
+SKIP_ARCHITECTURE = 'architecture'  # 아키텍처가 다름
+SKIP_PRODUCT = 'product'            # Windows 버전이 다름
+SKIP_BUILD = 'build'                # 빌드 범위 밖
+SKIP_INCLUDED = 'included'          # 이미지가 이미 이 누적 업데이트 이상
+SKIP_SUPERSEDED = 'superseded'      # 같은 종류의 더 새 패키지가 있음
+
+SKIP_LABELS = {
+    SKIP_ARCHITECTURE: '아키텍처가 다름',
+    SKIP_PRODUCT: 'Windows 버전이 다름',
+    SKIP_BUILD: '빌드 범위 밖',
+    SKIP_INCLUDED: '이미 포함됨',
+    SKIP_SUPERSEDED: '더 새 패키지로 대체됨',
+}
+
+# 기능 업데이트(enablement package)로 같은 누적 업데이트를 쓰는 빌드 계열: 기준 빌드 -> 마지막 빌드
+BUILD_FAMILIES = {
+    19041: 19045,  # Windows 10 2004 ~ 22H2
+    22621: 22631,  # Windows 11 22H2/23H2
+}
+MIN_WINDOWS_BUILD = 7600          # 이보다 작은 버전 첫 자리는 빌드가 아님 (.NET 패키지 등)
+WINDOWS11_FIRST_BUILD = 22000     # 이 빌드부터 패키지 이름이 windows11.0
+
+# 아키텍처 표기 통일 (DISM/WIM XML/패키지 이름/어셈블리 ID)
+ARCHITECTURE_ALIASES = {
+    'amd64': 'x64',
+    'x64': 'x64',
+    'x86': 'x86',
+    'wow64': 'x64',
+    'arm64': 'arm64',
+    'arm': 'arm',
+}
+
+_NAME_PRODUCT_RE = re.compile(r'windows(\d+\.\d+)', re.IGNORECASE)
+_NAME_KB_RE = re.compile(r'kb(\d{6,8})', re.IGNORECASE)
+_NAME_ARCH_RE = re.compile(r'(?:^|[-_.])(x64|x86|amd64|arm64)(?=$|[-_.])', re.IGNORECASE)
+_NAME_SSU_RE = re.compile(r'(?:^|[-_])ssu(?:[-_]|$)', re.IGNORECASE)
+_NAME_SSU_BUILD_RE = re.compile(r'ssu-(\d{4,5})\.(\d+)', re.IGNORECASE)
+_NAME_DOTNET_RE = re.compile(r'(?:^|[-_])ndp\d*', re.IGNORECASE)
+_PROPERTY_RE = re.compile(r'^\s*([^=]+?)\s*=\s*"?(.*?)"?\s*$')
+
+
+@dataclass(slots=True)
+class PackageInfo:
+    """업데이트 패키지 하나의 메타데이터"""
+    path: str
+    kb: str = None               # 예: KB5034441
+    product: str = None          # 대상 Windows 버전 (10.0 / 11.0 / 6.3 ...), 모르면 None
+    architecture: str = None     # x64 / x86 / arm64, 모르면 None
+    kind: str = PACKAGE_UPDATE
+    identity: str = ''           # 패키지 어셈블리 이름 (예: Package_for_RollupFix)
+    version: str = ''            # 패키지 어셈블리 버전 (예: 22621.3007.1.6)
+    min_build: int = None        # 적용 대상 빌드 범위 (모르면 None)
+    max_build: int = None
+    revision: int = None         # 설치 후 빌드 리비전 (UBR, 누적 업데이트만)
+    release_type: str = ''       # 예: Update, Security Update
+    source: str = 'name'         # 메타데이터 출처: name(파일 이름만) / metadata(패키지 안의 파일)
+    size: int = 0
+    mtime_ns: int = 0
+
+    @property
+    def file_name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def kb_number(self):
+        return int(self.kb[2:]) if self.kb else 0
+
+    @property
+    def label(self):
+        return self.kb or self.file_name
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+@dataclass(slots=True)
+class ImagePlan:
+    """이미지 하나에 적용할 패키지 (적용 순서)와 건너뛴 패키지"""
+    packages: list = field(default_factory=list)  # PackageInfo 목록
+    skipped: list = field(default_factory=list)   # (PackageInfo, 건너뛴 이유) 목록
+
+    @property
+    def paths(self):
+        return [package.path for package in self.packages]
+
+    def to_dict(self):
+        return {
+            'packages': [package.path for package in self.packages],
+            'skipped': [{'package': package.path, 'kb': package.kb, 'reason': reason}
+                        for package, reason in self.skipped],
+        }
+
+
+def normalize_architecture(value):
+    if not value:
+        return None
+    return ARCHITECTURE_ALIASES.get(value.strip().lower())
+
+
+def product_for_build(build):
+    """빌드 번호에 해당하는 패키지 이름의 Windows 버전 (Windows 11/Server 2025는 11.0)"""
+    return '11.0' if build >= WINDOWS11_FIRST_BUILD else '10.0'
+
+
+def family_range(build):
+    """같은 누적 업데이트를 쓰는 빌드 범위 (기준 빌드, 마지막 빌드)"""
+    for base, last in BUILD_FAMILIES.items():
+        if base <= build <= last:
+            return base, last
+    return build, build
+
+
+def _parse_build(version):
+    """어셈블리 버전 '22621.2861.1.6' -> (22621, 2861) (빌드로 볼 수 없으면 (None, None))"""
+    parts = (version or '').split('.')
+    try:
+        build = int(parts[0])
+        revision = int(parts[1]) if len(parts) > 1 else None
+    except ValueError:
+        return None, None
+    if build < MIN_WINDOWS_BUILD:
+        return None, None
+    return build, revision
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def info_from_name(path):
+    """파일 이름에서 알 수 있는 메타데이터"""
+    name = os.path.basename(path)
+    info = PackageInfo(path)
+    match = _NAME_KB_RE.search(name)
+    if match:
+        info.kb = f"KB{match.group(1)}"
+    match = _NAME_PRODUCT_RE.search(name)
+    if match:
+        info.product = match.group(1)
+    match = _NAME_ARCH_RE.search(name)
+    if match:
+        info.architecture = normalize_architecture(match.group(1))
+    if _NAME_SSU_RE.search(name):
+        info.kind = PACKAGE_SSU
+        match = _NAME_SSU_BUILD_RE.search(name)
+        if match:
+            _apply_build(info, int(match.group(1)), None)
+    elif _NAME_DOTNET_RE.search(name):
+        info.kind = PACKAGE_DOTNET
+    return info
+
+
+def _apply_build(info, build, revision):
+    info.min_build, info.max_build = family_range(build)
+    info.revision = revision if info.kind == PACKAGE_LCU else None
+    if info.product is None:
+        info.product = product_for_build(build)
+
+
+def _kind_from_identity(name):
+    lowered = name.lower()
+    if 'rollupfix' in lowered:
+        return PACKAGE_LCU
+    if 'servicingstack' in lowered:
+        return PACKAGE_SSU
+    if 'dotnet' in lowered or 'netfx' in lowered:
+        return PACKAGE_DOTNET
+    return None
+
+
+def _decode_text(data):
+    """패키지 안의 텍스트 파일 (BOM이 있으면 UTF-16, 잘린 파일의 깨진 문자는 대체 문자로)"""
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return data.decode('utf-16', errors='replace')
+    return data.decode('utf-8-sig', errors='replace')
+
+
+def parse_properties(text):
+    """*-pkgProperties.txt ('이름="값"' 줄) -> dict"""
+    properties = {}
+    for line in text.splitlines():
+        match = _PROPERTY_RE.match(line)
+        if match:
+            properties[match.group(1).strip().lower()] = match.group(2)
+    return properties
+
+
+def parse_package_xml(text):
+    """update.mum 또는 .msu 설치용 XML에서 첫 번째 패키지 어셈블리 ID와 package 요소의 속성
+
+    반환: (어셈블리 ID 속성 dict, package 속성 dict), 없으면 빈 dict
+    """
+    try:
+        root = ET.fromstring(text)
+    except (ET.ParseError, ValueError):
+        return {}, {}
+    identity = package = {}
+    for element in root.iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag == 'assemblyIdentity' and not identity:
+            identity = dict(element.attrib)
+        elif tag == 'package' and not package:
+            package = dict(element.attrib)
+        if identity and package:
+            break
+    return identity, package
+
+
+def _apply_properties(info, properties):
+    kb = properties.get('kb article number')
+    if kb and kb.isdigit():
+        info.kb = f"KB{kb}"
+    architecture = normalize_architecture(properties.get('processor architecture'))
+    if architecture:
+        info.architecture = architecture
+    product = _NAME_PRODUCT_RE.search((properties.get('product name') or '').replace(' ', ''))
+    if product:
+        info.product = product.group(1)
+    if properties.get('package type'):
+        info.release_type = properties['package type']
+
+
+def _apply_package_xml(info, identity, package):
+    if not identity:
+        return
+    info.identity = identity.get('name', '')
+    info.version = identity.get('version', '')
+    kind = _kind_from_identity(info.identity)
+    if kind is not None:
+        info.kind = kind
+    architecture = normalize_architecture(identity.get('processorArchitecture'))
+    if architecture:
+        info.architecture = architecture
+    build, revision = _parse_build(identity.get('version'))
+    if build is not None:
+        _apply_build(info, build, revision)
+    identifier = package.get('identifier', '')
+    match = _NAME_KB_RE.search(identifier)
+    if match and not info.kb:
+        info.kb = f"KB{match.group(1)}"
+    if package.get('releaseType'):
+        info.release_type = package['releaseType']
+
+
+def read_package_info(path, stat_result=None):
+    """패키지 파일의 메타데이터 (패키지 안의 파일을 읽지 못하면 파일 이름에서 알 수 있는 것만)"""
+    st = stat_result or os.stat(path)
+    info = _name_only_info(path, st)
+    try:
+        with CabReader(path) as cab:
+            properties = cab.find(lambda name: name.lower().endswith('pkgproperties.txt'))
+            if properties is not None:
+                _apply_properties(info, parse_properties(_decode_text(cab.read_file(properties))))
+                info.source = 'metadata'
+            # .cab은 update.mum, .msu는 안쪽 .cab을 설치하는 XML에 패키지 어셈블리 ID가 있음
+            descriptor = (cab.find(lambda name: name.lower() == 'update.mum')
+                          or cab.find(lambda name: name.lower().endswith('.xml')
+                                      and 'wsusscan' not in name.lower()))
+            if descriptor is not None:
+                identity, package = parse_package_xml(_decode_text(cab.read_file(descriptor)))
+                if identity:
+                    _apply_package_xml(info, identity, package)
+                    info.source = 'metadata'
+    except (OSError, CabFormatError, ValueError, ET.ParseError):
+        # LZX로 압축된 메타데이터, 깨진 UTF-16/XML 등은 일부만 읽은 값을 버리고 파일 이름 정보만 사용
+        # (UnicodeDecodeError는 ValueError)
+        info = _name_only_info(path, st)
+    return info
+
+
+def _name_only_info(path, st):
+    info = info_from_name(path)
+    info.size = st.st_size
+    info.mtime_ns = st.st_mtime_ns
+    return info
+
+
+def image_key(image):
+    """ImageRecord -> (Windows 버전, 빌드, 리비전, 아키텍처) (알 수 없는 값은 None)"""
+    build = _to_int(image.build)
+    product = None
+    if build is not None and image.version and image.version != 'N/A':
+        product = product_for_build(build) if image.version == '10.0' else image.version
+    return product, build, _to_int(image.spbuild), normalize_architecture(image.architecture)
+
+
+def applicability(package, product, build, revision, architecture):
+    """패키지를 이미지에 적용할 수 없는 이유 (적용할 수 있거나 판단할 수 없으면 None)"""
+    if package.architecture and architecture and package.architecture != architecture:
+        return SKIP_ARCHITECTURE
+    if package.product and product and package.product != product:
+        return SKIP_PRODUCT
+    if build is not None and package.min_build is not None:
+        if not package.min_build <= build <= package.max_build:
+            return SKIP_BUILD
+        if package.revision is not None and revision is not None and revision >= package.revision:
+            return SKIP_INCLUDED
+    return None
+
+
+def _supersede_key(package):
+    """같은 키를 가진 패키지 중 가장 새 것만 적용 (종류별 개별 업데이트는 KB마다 따로)"""
+    if package.kind == PACKAGE_UPDATE:
+        return package.kind, package.kb or package.path
+    return package.kind, package.min_build
+
+
+def _newness(package):
+    return package.revision or 0, package.kb_number, package.mtime_ns
+
+
+def resolve_packages(packages, image):
+    """이미지(ImageRecord)에 적용할 패키지와 건너뛴 패키지를 ImagePlan으로 반환"""
+    product, build, revision, architecture = image_key(image)
+    plan = ImagePlan()
+    latest = {}
+    for package in packages:
+        reason = applicability(package, product, build, revision, architecture)
+        if reason is not None:
+            plan.skipped.append((package, reason))
+            continue
+        key = _supersede_key(package)
+        current = latest.get(key)
+        if current is None:
+            latest[key] = package
+        elif _newness(package) > _newness(current):
+            plan.skipped.append((current, SKIP_SUPERSEDED))
+            latest[key] = package
+        else:
+            plan.skipped.append((package, SKIP_SUPERSEDED))
+    plan.packages = sorted(latest.values(), key=lambda package: (APPLY_ORDER.index(package.kind),
+                                                                  package.kb_number, package.file_name))
+    return plan
+
+
+class PackageCatalog:
+    """패키지 폴더의 메타데이터 색인 (파일 크기/수정 시각이 바뀐 패키지만 다시 읽음)"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_app_data_path(CATALOG_FILE_NAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_schema()
+        self.packages = []  # 마지막으로 refresh한 폴더의 PackageInfo 목록 (이름순)
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CATALOG_SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS packages")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS packages (
+                    path TEXT PRIMARY KEY,
+                    folder TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    info TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS packages_folder ON packages (folder)")
+            self._conn.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def refresh(self, folder, log=None):
+        """폴더의 패키지 목록을 색인과 맞추고 PackageInfo 목록 반환 (이름순)
+
+        새로 생기거나 바뀐 패키지만 읽고, 폴더에서 사라진 패키지는 색인에서 지운다.
+        """
+        log = log or (lambda message, **fields: None)
+        if not folder or not os.path.isdir(folder):
+            self.packages = []
+            return self.packages
+        folder_key = self._key(folder)
+        with span('catalog.refresh', 'catalog', folder=folder) as refresh_span:
+            with self._lock:
+                rows = self._conn.execute("SELECT path, size, mtime_ns, info FROM packages WHERE folder = ?",
+                                          (folder_key,)).fetchall()
+            indexed = {path: (size, mtime_ns, info) for path, size, mtime_ns, info in rows}
+
+            packages = []
+            changed = []
+            found = set()
+            for name in sorted(os.listdir(folder)):
+                if not name.lower().endswith(PACKAGE_EXTENSIONS):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                key = self._key(path)
+                found.add(key)
+                entry = indexed.get(key)
+                if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                    info = PackageInfo.from_dict(json.loads(entry[2]))
+                    info.path = path
+                else:
+                    info = read_package_info(path, st)
+                    changed.append((key, info))
+                packages.append(info)
+            removed = [key for key in indexed if key not in found]
+
+            now = time.time()
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO packages (path, folder, size, mtime_ns, info, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(key, folder_key, info.size, info.mtime_ns, json.dumps(info.to_dict(), ensure_ascii=False),
+                      now) for key, info in changed]
+                )
+                self._conn.executemany("DELETE FROM packages WHERE path = ?", [(key,) for key in removed])
+            refresh_span.set(packages=len(packages), changed=len(changed))
+        count('catalog_packages_read', len(changed))
+        if changed or removed:
+            log(f"패키지 색인 갱신: {len(packages)}개 중 {len(changed)}개 읽음, {len(removed)}개 삭제",
+                level='debug')
+        self.packages = packages
+        return packages
+
+    def plan(self, records, indexes=None):
+        """스캔 결과(WimFileRecord 목록)의 이미지별 ImagePlan: {(파일 경로, 인덱스): ImagePlan}
+
+        indexes: 지정 시 이 인덱스만 (dict면 파일 경로 -> 인덱스 목록)
+        """
+        plans = {}
+        for record in records:
+            wanted = indexes.get(record.file_path) if isinstance(indexes, dict) else indexes
+            for image in record.images:
+                if wanted and image.index not in wanted:
+                    continue
+                plans[(record.file_path, image.index)] = resolve_packages(self.packages, image)
+        return plans
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def describe_plan(plan):
+    """로그용 한 줄 요약 (예: 'KB5034441, KB5034123 · 건너뜀 3개')"""
+    applied = ', '.join(package.label for package in plan.packages) or '없음'
+    return f"{applied} · 건너뜀 {len(plan.skipped)}개" if plan.skipped else applied
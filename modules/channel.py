@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import datetime
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from modules.tracing import tracer
+
+# View로 전달하는 주기 (20 Hz)
+DEFAULT_FRAME_RATE = 20
+# 한 주기에 전달할 최대 로그 줄 수 (초과분은 생략하고 생략 수만 알림)
+MAX_LOG_LINES_PER_TICK = 500
+
+
+class UiChannel(QObject):
+    """작업 스레드의 진행률/로그를 모아 일정 주기로 View에 전달하는 채널
+
+    post_log()/post_progress()는 어느 스레드에서나 호출할 수 있으며 Qt 이벤트를
+    만들지 않는다. GUI 스레드의 타이머가 주기마다 쌓인 내용을 꺼내
+    진행률은 작업별 최신 값 하나로, 로그는 한 블록으로 묶어서 보낸다.
+    """
+    logs_ready = pyqtSignal(list)          # [(datetime, 메시지), ...]
+    progress_ready = pyqtSignal(int, str)  # 가장 최근 진행률 (값, 메시지)
+    stats_updated = pyqtSignal(dict)       # 초당 이벤트 수, 병합/생략 수
+
+    def __init__(self, frame_rate=DEFAULT_FRAME_RATE, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._logs = []
+        self._progress = {}  # 작업 키 -> (순번, 값, 메시지)
+        self._seq = 0
+        self._pending_since = None  # 마지막 전달 이후 처음 쌓인 시각 (전달 지연 계측용)
+
+        # 통계 (1초 단위)
+        self._log_posts = 0
+        self._progress_posts = 0
+        self._coalesced = 0
+        self._dropped = 0
+        self._emits = 0
+        self._stats_started = time.monotonic()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(1000 / frame_rate)))
+        self.timer.timeout.connect(self.flush)
+        self.timer.start()
+
+    def post_log(self, message, logged_at=None):
+        """로그 한 줄 추가 (스레드 안전)"""
+        with self._lock:
+            self._logs.append((logged_at or datetime.now(), message))
+            self._log_posts += 1
+            if self._pending_since is None:
+                self._pending_since = time.perf_counter()
+
+    def post_progress(self, value, message="", job=None):
+        """진행률 갱신 (스레드 안전, 같은 작업의 이전 값은 덮어씀)"""
+        with self._lock:
+            self._seq += 1
+            if job in self._progress:
+                self._coalesced += 1
+            self._progress[job] = (self._seq, value, message)
+            self._progress_posts += 1
+            if self._pending_since is None:
+                self._pending_since = time.perf_counter()
+
+    def flush(self):
+        """쌓인 로그/진행률을 View로 전달 (GUI 스레드에서 호출)"""
+        with self._lock:
+            logs, self._logs = self._logs, []
+            progress, self._progress = self._progress, {}
+            pending_since, self._pending_since = self._pending_since, None
+            if len(logs) > MAX_LOG_LINES_PER_TICK:
+                dropped = len(logs) - MAX_LOG_LINES_PER_TICK
+                self._dropped += dropped
+                logs = logs[-MAX_LOG_LINES_PER_TICK:]
+                logs.insert(0, (logs[0][0], f"... 로그 {dropped}줄 생략 ..."))
+
+        if logs:
+            self._emits += 1
+            self.logs_ready.emit(logs)
+        if progress:
+            self._emits += 1
+            seq, value, message = max(progress.values())
+            self.progress_ready.emit(value, message)
+        if pending_since is not None:
+            # 작업 스레드가 처음 보낸 시각부터 View 갱신(같은 스레드의 슬롯 실행)이 끝날 때까지
+            tracer.record('ui.delivery', 'ui', pending_since, time.perf_counter() - pending_since,
+                          logs=len(logs), progress=len(progress))
+
+        self._update_stats()
+
+    def _update_stats(self):
+        elapsed = time.monotonic() - self._stats_started
+        if elapsed < 1.0:
+            return
+        with self._lock:
+            stats = {
+                'log_rate': self._log_posts / elapsed,
+                'progress_rate': self._progress_posts / elapsed,
+                'emit_rate': self._emits / elapsed,
+                'coalesced': self._coalesced,
+                'dropped': self._dropped,
+            }
+            self._log_posts = self._progress_posts = self._coalesced = self._dropped = 0
+        self._emits = 0
+        self._stats_started = time.monotonic()
+        self.stats_updated.emit(stats)
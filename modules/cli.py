@@ -0,0 +1,564 @@
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+
+from modules.scheduling import ORDER_POLICIES, ORDER_LARGEST
+
+# Qt 없이 실행하는 명령줄 모드 (예약 작업/빌드 에이전트용)
+#   KdicUpdater scan   <폴더|파일>...   이미지 정보 조회
+#   KdicUpdater plan   <폴더|파일>...   업데이트 계획만 출력
+#   KdicUpdater update <폴더|파일>...   업데이트 실행
+#   KdicUpdater verify <폴더|파일>...   무결성 검사
+#   KdicUpdater dedup  <폴더|파일>...   이미지 간 리소스 중복 분석
+#   KdicUpdater resume [--discard]      중단된 업데이트 이어서 실행 (또는 남은 마운트 정리)
+# 결과는 JSON으로 stdout(또는 --output 파일)에, 로그는 stderr에 출력한다.
+# 이 모듈은 KdicUpdater.py가 시작할 때 읽으므로 무거운 모듈은 명령 실행 시에 가져온다.
+
+COMMANDS = ('scan', 'update', 'plan', 'verify', 'dedup', 'resume')
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_FAILED = 1       # 일부 파일 조회/무결성 검사 또는 이미지 업데이트 실패
+EXIT_USAGE = 2        # 잘못된 인자 (argparse 기본값과 같음)
+EXIT_NO_IMAGES = 3    # 대상 이미지가 없음
+EXIT_INTERRUPTED = 130
+
+
+class StopFlag:
+    """Ctrl+C를 받으면 작업을 멈추도록 표시하고 실행 중인 DISM을 종료 (두 번째 Ctrl+C는 즉시 중단)"""
+
+    def __init__(self):
+        self.stopped = False
+        self.callbacks = []  # 처음 Ctrl+C를 받았을 때 호출 (예: SubprocessRunner.cancel)
+
+    def __call__(self):
+        return self.stopped
+
+    def install(self):
+        signal.signal(signal.SIGINT, self.handle)
+
+    def handle(self, signum, frame):
+        if self.stopped:
+            raise KeyboardInterrupt
+        self.stopped = True
+        for callback in self.callbacks:
+            callback()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='KdicUpdater', description='WIM 이미지 조회/업데이트 (명령줄 모드)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--dism', default=None, help='dism 실행 파일 경로')
+    output.add_argument('--timeout', type=float, default=None, help='DISM 명령 하나의 제한 시간(초)')
+    output.add_argument('--deadline', type=float, default=None,
+                        help='전체 제한 시간(초), 넘기면 실행 중인 DISM을 종료하고 남은 작업은 실패 처리')
+    output.add_argument('--dism-helpers', type=int, default=None,
+                        help='DISM API를 직접 호출하는 상주 도우미 프로세스 수 (0이면 명령마다 dism 실행, DISM API가 없으면 사용 안 함, 기본: KDIC_DISM_HELPERS)')
+    output.add_argument('--trace', help='구간별 소요 시간을 저장할 Chrome trace JSON 파일')
+    output.add_argument('--metrics', help='구간/카운터 메트릭을 저장할 Prometheus 텍스트 파일')
+    output.add_argument('-o', '--output', help='JSON 결과를 저장할 파일 (기본: stdout)')
+    output.add_argument('--pretty', action='store_true', help='JSON을 들여쓰기하여 출력')
+    output.add_argument('-q', '--quiet', action='store_true', help='stderr 로그 출력 안 함')
+    output.add_argument('-v', '--verbose', action='store_true', help='파일/단계별 소요 시간 등 상세 로그 출력')
+
+    common = argparse.ArgumentParser(add_help=False, parents=[output])
+    common.add_argument('targets', nargs='+', help='스캔할 폴더 또는 이미지 파일')
+    common.add_argument('--max-depth', type=int, default=None,
+                        help='하위 폴더 탐색 깊이 (0이면 지정한 폴더만)')
+    common.add_argument('--include', action='append', help='포함할 파일 glob 패턴 (여러 번 지정 가능)')
+    common.add_argument('--exclude', action='append', help='제외할 파일/폴더 glob 패턴 (여러 번 지정 가능)')
+    common.add_argument('--workers', type=int, default=None, help='동시 조회 수')
+    common.add_argument('--dism-only', action='store_true', help='헤더 직접 읽기 없이 DISM으로만 조회')
+    common.add_argument('--no-cache', action='store_true', help='스캔 캐시 사용 안 함')
+    common.add_argument('--force', action='store_true', help='캐시를 무시하고 다시 조회 (결과는 캐시에 저장)')
+
+    subparsers.add_parser('scan', parents=[common], help='이미지 정보 조회')
+    subparsers.add_parser('verify', parents=[common], help='무결성 테이블(없으면 전체 해시) 검사')
+    dedup = subparsers.add_parser('dedup', parents=[common], help='이미지 간 리소스 중복 분석')
+    dedup.add_argument('--report', help='보고서 파일 (.csv면 CSV, 아니면 JSON)')
+    dedup.add_argument('--max-pairs', type=int, default=None, help='보고서에 넣을 파일 쌍 최대 수')
+
+    for name, help_text in (('plan', '업데이트 계획만 출력 (실행하지 않음)'), ('update', '업데이트 실행')):
+        sub = subparsers.add_parser(name, parents=[common], help=help_text)
+        sub.add_argument('--packages', help='적용할 업데이트 패키지(.msu/.cab) 폴더')
+        sub.add_argument('--all-packages', action='store_true',
+                         help='이미지별 적용 대상을 판단하지 않고 폴더의 모든 패키지를 모든 이미지에 적용')
+        sub.add_argument('--index', type=int, action='append', dest='indexes',
+                         help='업데이트할 인덱스 (여러 번 지정 가능, 기본: 모든 인덱스)')
+        sub.add_argument('--export-dir', help='커밋 후 이미지를 내보낼 폴더')
+        sub.add_argument('--order', choices=ORDER_POLICIES, default=ORDER_LARGEST,
+                         help='이미지 처리 순서 (largest: 큰 이미지 먼저, smallest: 작은 이미지 먼저, user: 지정한 순서)')
+        sub.add_argument('--verify', action='store_true', help='무결성 검사를 먼저 하고 통과하지 못한 파일은 제외')
+        sub.add_argument('--reapply', action='store_true',
+                         help='설치된 패키지 기록을 무시하고 계획한 패키지를 모두 적용 (기록은 새로 저장)')
+        sub.add_argument('--journal', help='업데이트 작업 기록 파일 (기본: 앱 데이터 폴더)')
+        sub.add_argument('--no-journal', action='store_true', help='작업 기록을 남기지 않음 (중단되면 이어서 실행 불가)')
+        if name == 'update':
+            sub.add_argument('--discard-previous', action='store_true',
+                             help='끝나지 않은 이전 업데이트가 있으면 남은 마운트를 정리하고 기록을 지운 뒤 시작 '
+                                  '(없으면 이어서 실행하거나 정리할 때까지 시작하지 않음)')
+
+    resume = subparsers.add_parser('resume', parents=[output], help='중단된 업데이트 이어서 실행')
+    resume.add_argument('--discard', action='store_true', help='이어서 실행하지 않고 남은 마운트를 정리한 뒤 기록 삭제')
+    resume.add_argument('--journal', help='업데이트 작업 기록 파일 (기본: 앱 데이터 폴더)')
+
+    return parser
+
+
+def main(argv=None):
+    """명령줄 모드 진입점 (종료 코드 반환)"""
+    args = build_parser().parse_args(argv)
+
+    from modules.logsink import LogSink, LEVEL_DEBUG
+
+    sink = LogSink()
+    if not args.quiet:
+        def print_event(event):
+            if event.level != LEVEL_DEBUG or args.verbose:
+                print(f"[{event.timestamp.strftime('%H:%M:%S')}] {event.message}", file=sys.stderr, flush=True)
+        sink.subscribe(print_event)
+
+    stop = StopFlag()
+    stop.install()
+
+    if args.trace or args.metrics:
+        from modules.tracing import tracer
+        tracer.enable()
+
+    from modules.runner import create_runner
+    from modules.helper_pool import configure_shared_pool, close_shared_pool
+
+    if args.dism_helpers is not None:
+        configure_shared_pool(args.dism_helpers)
+    # 명령 전체가 함께 쓰는 DISM 실행기 (전체 제한 시간을 공유하고, Ctrl+C를 받으면 실행 중인 DISM 종료)
+    args.runner = create_runner(dism_executable=args.dism, timeout=args.timeout, deadline=args.deadline)
+    stop.callbacks.append(args.runner.cancel)
+    started = time.perf_counter()
+    try:
+        if args.command == 'scan':
+            result, exit_code = run_scan_command(args, sink, stop)
+        elif args.command == 'verify':
+            result, exit_code = run_verify_command(args, sink, stop)
+        elif args.command == 'dedup':
+            result, exit_code = run_dedup_command(args, sink, stop)
+        elif args.command == 'resume':
+            result, exit_code = run_resume_command(args, sink, stop)
+        else:
+            result, exit_code = run_update_command(args, sink, stop)
+    except KeyboardInterrupt:
+        sink.emit("사용자에 의해 중단되었습니다.", level='warning', job='cli')
+        write_trace(args, sink)
+        close_shared_pool()
+        sink.close()
+        return EXIT_INTERRUPTED
+
+    result['elapsed'] = round(time.perf_counter() - started, 3)
+    result['exit_code'] = exit_code
+    write_result(result, args)
+    write_trace(args, sink)
+    close_shared_pool()
+    sink.close()
+    return exit_code
+
+
+def write_trace(args, sink):
+    """--trace/--metrics 파일 저장 (-v이면 오래 걸린 구간 요약도 출력)"""
+    if not (args.trace or args.metrics):
+        return
+    from modules.tracing import tracer
+
+    try:
+        if args.trace:
+            tracer.write_chrome_trace(args.trace)
+        if args.metrics:
+            tracer.write_prometheus(args.metrics)
+    except OSError as e:
+        sink.emit(f"계측 결과를 저장하지 못했습니다: {e}", level='error', job='cli')
+        return
+    for row in tracer.stats()[:10]:
+        sink.emit(f"{row['category']}·{row['name']}: {row['count']}회, 합계 {row['total']:.3f}초, "
+                  f"최대 {row['max']:.3f}초", level='debug', job='cli', stage=row['name'], duration=row['total'])
+
+
+def write_result(result, args):
+    indent = 2 if args.pretty else None
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=indent)
+            f.write('\n')
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=indent)
+        sys.stdout.write('\n')
+        sys.stdout.flush()
+
+
+def open_cache(args, log):
+    """스캔 캐시 열기 (실패 시 캐시 없이 진행)"""
+    if args.no_cache:
+        return None
+    from modules.cache import ScanCache
+    try:
+        cache = ScanCache()
+        cache.evict_stale()
+        return cache
+    except (sqlite3.Error, OSError) as e:
+        log(f"스캔 캐시를 사용할 수 없습니다: {e}", level='warning')
+        return None
+
+
+def open_inventory(args, log):
+    """설치된 패키지 캐시 열기 (--no-cache이거나 실패 시 None)"""
+    if getattr(args, 'no_cache', False):  # resume 명령에는 --no-cache가 없음
+        return None
+    from modules.inventory import InventoryCache
+    try:
+        inventory = InventoryCache()
+        inventory.evict_stale()
+        return inventory
+    except (sqlite3.Error, OSError) as e:
+        log(f"설치된 패키지 캐시를 사용할 수 없습니다: {e}", level='warning')
+        return None
+
+
+def scan_targets(args, sink, stop):
+    """지정한 폴더/파일을 조회하여 ScanOutcome 하나로 합쳐서 반환"""
+    from modules.core import ScanOutcome, scan_folder
+    from modules.discovery import DEFAULT_MAX_DEPTH
+    from modules.scan_engine import ScanEngine
+
+    log = lambda message, **fields: sink.emit(message, job='scan', **fields)
+    cache = open_cache(args, log)
+    engine = ScanEngine(
+        runner=args.runner,
+        max_workers=args.workers,
+        use_native=not args.dism_only,
+        log=log,
+        cache=cache
+    )
+    max_depth = DEFAULT_MAX_DEPTH if args.max_depth is None else args.max_depth
+
+    combined = ScanOutcome()
+    try:
+        files = []
+        for target in args.targets:
+            if os.path.isdir(target):
+                log(f"'{target}' 폴더에서 WIM 파일을 스캔합니다...")
+                outcome = scan_folder(engine, target, max_depth=max_depth, include=args.include,
+                                      exclude=args.exclude, should_stop=stop, force=args.force)
+            elif os.path.isfile(target):
+                files.append(os.path.abspath(target))
+                continue
+            else:
+                log(f"'{target}' 경로를 찾을 수 없습니다.", level='error', file=target)
+                combined.found_paths.append(target)
+                continue
+            combined.records.extend(outcome.records)
+            combined.found_paths.extend(outcome.found_paths)
+            combined.stopped = combined.stopped or outcome.stopped
+
+        if files and not stop():
+            outcome = scan_folder(engine, None, file_paths=files, should_stop=stop, force=args.force)
+            combined.records.extend(outcome.records)
+            combined.found_paths.extend(outcome.found_paths)
+            combined.stopped = combined.stopped or outcome.stopped
+    finally:
+        if cache is not None:
+            cache.close()
+    return combined
+
+
+def run_scan_command(args, sink, stop):
+    outcome = scan_targets(args, sink, stop)
+    result = {
+        'command': 'scan',
+        'found': len(outcome.found_paths),
+        'scanned': len(outcome.records),
+        'failed': outcome.failed_paths,
+        'stopped': outcome.stopped,
+        'files': [record.to_dict() for record in outcome.records],
+    }
+    if outcome.stopped:
+        return result, EXIT_INTERRUPTED
+    if not outcome.found_paths:
+        return result, EXIT_NO_IMAGES
+    return result, EXIT_FAILED if result['failed'] else EXIT_OK
+
+
+def verify_paths(args, sink, stop, file_paths):
+    """파일들의 무결성 검사 (VerifyResult 목록 반환)"""
+    from modules.integrity import IntegrityVerifier
+
+    log = lambda message, **fields: sink.emit(message, job='verify', **fields)
+    cache = open_cache(args, log)
+    verifier = IntegrityVerifier(cache=cache, max_workers=args.workers, log=log)
+    log(f"{len(file_paths)}개 파일의 무결성을 검사합니다...")
+    try:
+        return verifier.verify_files(file_paths, should_stop=stop, force=args.force)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def run_verify_command(args, sink, stop):
+    outcome = scan_targets(args, sink, stop)
+    results = [] if outcome.stopped else verify_paths(args, sink, stop, outcome.found_paths)
+    failed = [result.file_path for result in results if not result.ok]
+    result = {
+        'command': 'verify',
+        'found': len(outcome.found_paths),
+        'verified': len(results),
+        'failed': failed,
+        'files': [item.to_dict() for item in results],
+    }
+    if stop():
+        return result, EXIT_INTERRUPTED
+    if not outcome.found_paths:
+        return result, EXIT_NO_IMAGES
+    return result, EXIT_FAILED if failed else EXIT_OK
+
+
+def run_dedup_command(args, sink, stop):
+    from modules.dedup import DedupAnalyzer, DedupIndex, DEFAULT_MAX_PAIRS, write_report
+
+    outcome = scan_targets(args, sink, stop)
+    paths = [record.file_path for record in outcome.records]
+    result = {'command': 'dedup', 'found': len(outcome.found_paths), 'failed_scans': outcome.failed_paths}
+    if outcome.stopped:
+        return result, EXIT_INTERRUPTED
+    if not paths:
+        return result, EXIT_NO_IMAGES
+
+    log = lambda message, **fields: sink.emit(message, job='dedup', **fields)
+    try:
+        # --no-cache면 색인을 디스크에 남기지 않음
+        index = DedupIndex(':memory:' if args.no_cache else None)
+    except (sqlite3.Error, OSError) as e:
+        log(f"중복 분석 색인을 열 수 없습니다: {e}", level='error')
+        return result, EXIT_FAILED
+    try:
+        analyzer = DedupAnalyzer(index, max_workers=args.workers, log=log)
+        report = analyzer.analyze(paths, should_stop=stop, force=args.force,
+                                  max_pairs=args.max_pairs or DEFAULT_MAX_PAIRS)
+    finally:
+        index.close()
+    if report is None:
+        return result, EXIT_INTERRUPTED
+
+    result.update(report.to_dict())
+    if args.report:
+        write_report(report, args.report)
+        log(f"보고서를 저장했습니다: {args.report}")
+    return result, EXIT_FAILED if report.missing or outcome.failed_paths else EXIT_OK
+
+
+def run_update_command(args, sink, stop):
+    from modules.core import (create_update_jobs, image_sizes, plan_packages, plan_update, run_update,
+                              skip_installed, discard_orphans)
+    from modules.journal import UpdateJournal, JournalPendingError, JournalBusyError
+    from modules.update_engine import DismBackend, find_packages
+
+    # 끝나지 않은 이전 업데이트가 있으면 스캔하기 전에 멈춤 (--discard-previous면 시작할 때 정리)
+    if args.command == 'update' and not args.no_journal:
+        journal = UpdateJournal(args.journal)
+        try:
+            previous = journal.load()
+        except OSError as e:
+            sink.emit(f"업데이트 기록을 읽을 수 없습니다: {e}", level='error', job='cli')
+            return {'command': args.command}, EXIT_FAILED
+        if journal.in_use():
+            sink.emit("다른 프로세스가 업데이트를 실행 중입니다. 끝난 뒤 다시 실행하세요.", level='error', job='cli')
+            return {'command': args.command}, EXIT_FAILED
+        if previous is not None and previous.pending and not args.discard_previous:
+            sink.emit(f"끝나지 않은 이전 업데이트가 있습니다 (남은 이미지 {len(previous.pending)}개). "
+                      f"'resume'으로 이어서 실행하거나 --discard-previous로 정리한 뒤 다시 실행하세요.",
+                      level='error', job='cli')
+            return {'command': args.command}, EXIT_FAILED
+
+    outcome = scan_targets(args, sink, stop)
+    records = outcome.records
+    verify_results = None
+    if args.verify and not outcome.stopped:
+        verify_results = verify_paths(args, sink, stop, [record.file_path for record in records])
+        skipped = {item.file_path for item in verify_results if not item.ok}
+        for path in sorted(skipped):
+            sink.emit(f"'{os.path.basename(path)}' 무결성 검사를 통과하지 못해 건너뜁니다.",
+                      level='warning', job='cli', file=path)
+        records = [record for record in records if record.file_path not in skipped]
+
+    packages = find_packages(args.packages)
+    if args.packages:
+        sink.emit(f"적용할 패키지 {len(packages)}개를 찾았습니다.", job='cli')
+    plans = None
+    if packages and not args.all_packages:
+        from modules.catalog import PackageCatalog
+        catalog = PackageCatalog(':memory:') if args.no_cache else None  # 없으면 앱 데이터 폴더의 색인 사용
+        plans = plan_packages(records, args.packages, catalog=catalog, indexes=args.indexes,
+                              log=lambda message, **fields: sink.emit(message, job='catalog', **fields))
+        if catalog is not None:
+            catalog.close()
+    export = bool(args.export_dir)
+    plan = plan_update(records, packages, indexes=args.indexes, export=export, order=args.order, plans=plans)
+
+    result = {
+        'command': args.command,
+        'packages': packages,
+        'failed_scans': outcome.failed_paths,
+        'plan': plan,
+    }
+    if verify_results is not None:
+        result['verify'] = [item.to_dict() for item in verify_results]
+    if outcome.stopped or stop():
+        return result, EXIT_INTERRUPTED
+    if not plan:
+        sink.emit("업데이트할 이미지가 없습니다.", level='warning', job='cli')
+        return result, EXIT_NO_IMAGES
+
+    images = {}
+    for entry in plan:
+        images.setdefault(entry['file_path'], []).append(entry['index'])
+    sizes = {record.file_path: image_sizes(record) for record in records}
+    jobs = create_update_jobs(list(images), images, packages, sizes, plans=plans,
+                              log=lambda message, **fields: sink.emit(message, job='cli', **fields))
+    inventory = open_inventory(args, lambda message, **fields: sink.emit(message, job='cli', **fields))
+    if inventory is not None and not args.reapply:
+        infos = {package.path: package for image_plan in (plans or {}).values() for package in image_plan.packages}
+        planned = {(job.file_path, job.index): job.packages for job in jobs}
+        jobs, up_to_date = skip_installed(jobs, inventory, infos,
+                                          log=lambda message, **fields: sink.emit(message, job='cli', **fields))
+        remaining = {(job.file_path, job.index): job.packages for job in jobs}
+        for entry in plan:
+            key = (entry['file_path'], entry['index'])
+            if key in planned and remaining.get(key) != planned[key]:
+                entry['installed_packages'] = [package for package in planned[key]
+                                               if package not in remaining.get(key, ())]
+                entry['packages'] = remaining.get(key, [])
+        result['up_to_date'] = [{'file_path': job.file_path, 'index': job.index} for job in up_to_date]
+    if args.command == 'plan':
+        return result, EXIT_FAILED if outcome.failed_paths else EXIT_OK
+    if not jobs:
+        sink.emit("적용할 패키지가 있는 이미지가 없습니다.", job='cli')
+        return result, EXIT_FAILED if outcome.failed_paths else EXIT_OK
+    backend = DismBackend(runner=args.runner, export_dir=args.export_dir)
+    log = lambda message, **fields: sink.emit(message, job='update', **fields)
+    journal = None
+    try:
+        if not args.no_journal:
+            journal = UpdateJournal(args.journal)
+            previous = journal.load()
+            if previous is not None and previous.pending:  # --discard-previous
+                sink.emit(f"끝나지 않은 이전 업데이트(남은 이미지 {len(previous.pending)}개)를 정리하고 새로 시작합니다.",
+                          level='warning', job='cli')
+                result['released_mounts'] = discard_orphans(backend, previous, log=log)
+                journal.discard()
+        sink.emit(f"이미지 {len(jobs)}개의 업데이트를 시작합니다...", job='cli')
+        update = run_update(
+            jobs,
+            backend,
+            export=export,
+            log=log,
+            on_progress=progress_logger(sink, export),
+            should_stop=stop,
+            journal=journal,
+            order=args.order,
+            inventory=inventory
+        )
+    except (JournalPendingError, JournalBusyError) as e:
+        sink.emit(str(e), level='error', job='cli')
+        return result, EXIT_FAILED
+    result.update(update_result(update))
+
+    if stop():
+        return result, EXIT_INTERRUPTED
+    return result, EXIT_FAILED if update.failed or outcome.failed_paths else EXIT_OK
+
+
+def progress_logger(sink, export):
+    """이미지 크기로 가중한 진행률과 남은 시간을 로그로 출력하는 on_progress 콜백
+
+    이미지 하나가 끝날 때만 일반 로그로, 나머지 단계는 상세(-v) 로그로 출력한다.
+    """
+    from modules.scheduling import EtaEstimator, format_duration
+    from modules.update_engine import STAGE_COMMIT, STAGE_EXPORT, STAGE_LABELS
+
+    eta = EtaEstimator()
+    last_stage = STAGE_EXPORT if export else STAGE_COMMIT
+
+    def on_progress(done, total, job, stage):
+        if job is None:
+            eta.reset(done, total)
+            return
+        eta.update(done, total, measured=stage is not None)
+        message = f"진행률 {done / total:.0%}" if total else "진행률 100%"
+        if stage is not None:
+            message = f"'{job.file_name}' [{job.index}] {STAGE_LABELS[stage]} 완료 · {message}"
+        remaining = eta.eta()
+        if remaining is not None:
+            message += f" · 남은 시간 약 {format_duration(remaining)}"
+        sink.emit(message, level='info' if stage in (last_stage, None) else 'debug', job='update')
+
+    return on_progress
+
+
+def update_result(update):
+    """UpdateOutcome의 JSON 결과 항목"""
+    return {
+        'jobs': [{
+            'file_path': job.file_path,
+            'index': job.index,
+            'status': job.status,
+            'stage': job.stage,
+            'error': job.error,
+            'stage_times': {stage: round(seconds, 3) for stage, seconds in job.stage_times.items()},
+        } for job in update.jobs],
+        'done': update.done,
+        'failed': update.failed,
+        'cancelled': update.cancelled,
+    }
+
+
+def run_resume_command(args, sink, stop):
+    from modules.core import resume_jobs, discard_orphans, run_update
+    from modules.journal import UpdateJournal
+    from modules.update_engine import DismBackend
+
+    journal = UpdateJournal(args.journal)
+    try:
+        state = journal.load()
+    except OSError as e:
+        sink.emit(f"업데이트 기록을 읽을 수 없습니다: {e}", level='error', job='cli')
+        return {'command': args.command}, EXIT_FAILED
+    if journal.in_use():
+        sink.emit("다른 프로세스가 이 기록으로 업데이트를 실행 중입니다. 끝난 뒤 다시 실행하세요.", level='error', job='cli')
+        return {'command': args.command}, EXIT_FAILED
+
+    backend = DismBackend(runner=args.runner, export_dir=state.export_dir if state is not None else None)
+    log = lambda message, **fields: sink.emit(message, job='update', **fields)
+    result = {'command': args.command, 'run_id': state.run_id if state is not None else None}
+
+    if args.discard or state is None or not state.pending:
+        result['discarded'] = len(state.pending) if state is not None else 0
+        result['released_mounts'] = discard_orphans(backend, state, log=log)
+        journal.discard()
+        if args.discard:
+            return result, EXIT_OK
+        sink.emit("이어서 진행할 업데이트가 없습니다.", level='warning', job='cli')
+        return result, EXIT_NO_IMAGES
+
+    jobs = resume_jobs(state)
+    result['skipped'] = state.done
+    sink.emit(f"중단된 업데이트를 이어서 진행합니다: 완료 {state.done}개, 남은 이미지 {len(jobs)}개", job='cli')
+    inventory = open_inventory(args, log)
+    update = run_update(jobs, backend, export=state.export, log=log, on_progress=progress_logger(sink, state.export),
+                        should_stop=stop, journal=journal, order=state.order, inventory=inventory,
+                        resume_of=state.run_id)
+    result.update(update_result(update))
+
+    if stop():
+        return result, EXIT_INTERRUPTED
+    return result, EXIT_FAILED if update.failed else EXIT_OK
@@ -0,0 +1,616 @@
+import os
+import sqlite3
+
+from modules.view import View
+from modules.discovery import DEFAULT_MAX_DEPTH
+from modules.channel import UiChannel
+from modules.job_queue import (JobQueue, KIND_SCAN, KIND_VERIFY, KIND_UPDATE, KIND_CLEANUP, STATUS_RUNNING,
+                               STATUS_STOPPING, STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED,
+                               PRIORITY_HIGH, PRIORITY_NORMAL)
+from modules.logsink import LogSink, LEVEL_DEBUG
+
+# 스캐너/업데이트/감시/캐시 모듈은 처음 사용할 때 가져온다 (첫 화면 표시를 늦추지 않도록)
+
+# 성능 계측 중 메트릭 파일을 다시 쓰는 주기(ms, 외부 수집기가 실행 중에도 읽을 수 있도록)
+METRICS_INTERVAL_MS = 10000
+
+# 진행률 표시줄/취소 버튼을 쓰는 작업 (스캔은 목록에 결과를 바로 표시)
+BUSY_KINDS = (KIND_VERIFY, KIND_UPDATE, KIND_CLEANUP)
+
+
+class MainController:
+    """View와 스캔/업데이트 스레드를 연결하는 GUI 컨트롤러
+
+    스캔/검사/업데이트는 모두 작업 대기열(JobQueue)을 거쳐 동시 실행 수 제한 안에서 시작되며,
+    GUI 스레드는 작업을 시작하거나 중지할 때 스레드가 끝나기를 기다리지 않는다.
+    """
+
+    def __init__(self):
+        self.view = View()
+        self.queue = JobQueue(on_change=self.on_queue_changed)  # 스캔/검사/업데이트 작업 대기열
+        self.scan_generation = 0  # 폴더를 새로 선택할 때마다 증가 (이전 선택의 스캔 결과는 목록에 넣지 않음)
+        self.analyzer = None # 중복 분석 스레드
+        self.dedup_index = None  # 리소스 중복 색인 (처음 분석할 때 열기)
+        self.journal = None  # 업데이트 작업 기록 (deferred_setup에서 이전 실행 확인)
+        self.channel = UiChannel()      # 작업 스레드 -> View 진행률/로그 전달 (20 Hz)
+        self.sink = LogSink()           # 모든 로그를 JSONL 파일로 기록 (View는 구독자 중 하나)
+        self.sink.subscribe(self.on_log_event)
+        self.cache = None               # 스캔 결과 캐시 (첫 화면 표시 후 deferred_setup에서 열기)
+        self.inventory = None           # 이미지별 설치된 패키지 캐시 (처음 업데이트할 때 열기)
+        self.watcher = None     # 폴더 감시 (감시 모드일 때만)
+        self.refreshers = set() # 감시 이벤트로 시작된 부분 재스캔 스레드
+        self.stopping = set()   # 중지를 요청하고 종료를 기다리지 않은 스레드 (끝날 때까지 참조 유지)
+        self.trace_dir = None   # 성능 계측 결과 폴더 (enable_tracing 호출 시)
+        self.metrics_timer = None
+
+        self.connect_signals()
+
+    def deferred_setup(self):
+        """첫 화면을 그린 뒤에 해도 되는 초기화"""
+        if self.cache is None:
+            self.cache = self.open_cache()
+        if self.journal is None:
+            from modules.journal import UpdateJournal
+            self.journal = UpdateJournal()
+            self.check_journal()
+
+    def check_journal(self):
+        """이전 실행이 끝나지 않았으면 이어서 진행할지 묻고, 남은 마운트가 있으면 정리"""
+        from modules.update_engine import DismBackend
+
+        try:
+            state = self.journal.load()
+        except OSError as e:
+            self.log(f"업데이트 기록을 읽을 수 없습니다: {e}", level='warning')
+            return
+        if self.journal.in_use():
+            self.log("다른 프로세스가 업데이트를 실행 중이므로 이전 업데이트 기록과 남은 마운트를 확인하지 않습니다.",
+                     level='warning')
+            return
+
+        if state is not None and state.pending:
+            self.log(f"끝나지 않은 이전 업데이트가 있습니다: 남은 이미지 {len(state.pending)}개", level='warning')
+            if self.view.ask_resume(state):
+                self.submit_update([entry.file_path for entry in state.pending], resume_state=state)
+                return
+        elif state is None and not DismBackend().find_orphan_mounts():
+            return
+        self.start_cleanup(state)
+
+    def start_cleanup(self, state):
+        """이전 실행이 남긴 마운트를 정리하고 기록 삭제 (업데이트보다 먼저 실행)"""
+        paths = [entry.file_path for entry in state.entries] if state is not None else []
+        self.queue.submit(KIND_CLEANUP, "이전 실행의 마운트", paths, PRIORITY_HIGH, payload={'state': state})
+        self.pump_queue()
+
+    def enable_tracing(self, output_dir=None):
+        """성능 계측 시작 (메트릭 파일은 주기적으로, trace 파일은 종료 시 저장)"""
+        from PyQt6.QtCore import QTimer
+        from modules.paths import get_app_data_path
+        from modules.tracing import tracer, TRACE_DIR_NAME
+
+        self.trace_dir = output_dir or get_app_data_path(TRACE_DIR_NAME)
+        tracer.enable()
+        self.view.set_trace_enabled(True, self.trace_dir)
+        self.metrics_timer = QTimer()
+        self.metrics_timer.setInterval(METRICS_INTERVAL_MS)
+        self.metrics_timer.timeout.connect(self.write_metrics)
+        self.metrics_timer.start()
+        self.log(f"성능 계측을 시작합니다: {self.trace_dir}")
+
+    def write_metrics(self, with_trace=False):
+        """Prometheus 메트릭 파일 저장 (with_trace: Chrome trace 파일도 저장)"""
+        from modules.tracing import tracer, TRACE_FILE_NAME, METRICS_FILE_NAME
+
+        try:
+            tracer.write_prometheus(os.path.join(self.trace_dir, METRICS_FILE_NAME))
+            if with_trace:
+                tracer.write_chrome_trace(os.path.join(self.trace_dir, TRACE_FILE_NAME))
+        except OSError as e:
+            self.log(f"성능 계측 결과를 저장하지 못했습니다: {e}", level='warning')
+
+    def open_cache(self):
+        """스캔 결과 캐시 열기 (실패 시 캐시 없이 동작)"""
+        from modules.cache import ScanCache
+        try:
+            cache = ScanCache()
+            cache.evict_stale()
+            return cache
+        except (sqlite3.Error, OSError) as e:
+            self.log(f"스캔 캐시를 사용할 수 없습니다: {e}", level='warning')
+            return None
+
+    def open_inventory(self):
+        """설치된 패키지 캐시 열기 (실패 시 캐시 없이 동작)"""
+        from modules.inventory import InventoryCache
+        try:
+            inventory = InventoryCache()
+            inventory.evict_stale()
+            return inventory
+        except (sqlite3.Error, OSError) as e:
+            self.log(f"설치된 패키지 캐시를 사용할 수 없습니다: {e}", level='warning')
+            return None
+
+    def log(self, message, **fields):
+        """컨트롤러 로그 기록"""
+        self.sink.emit(message, job='controller', **fields)
+
+    def on_log_event(self, event):
+        """로그 싱크 구독자: 상세(debug) 로그를 제외하고 채널을 통해 View에 표시"""
+        if event.level != LEVEL_DEBUG:
+            self.channel.post_log(event.message, event.timestamp)
+
+    def close(self):
+        """종료 시 대기 중인 작업 취소, 실행 중인 작업 중지 및 남은 로그 기록"""
+        from modules.helper_pool import close_shared_pool
+
+        if self.analyzer is not None and self.analyzer.isRunning():
+            self.analyzer.stop()
+            self.analyzer.wait()
+        threads = [job.handle for job in self.queue.active() if job.handle is not None]
+        for job in self.queue.cancel_where(lambda job: True, "프로그램 종료"):
+            if job.kind != KIND_CLEANUP:
+                job.handle.stop()  # 실행 중인 DISM을 종료하므로 오래 기다리지 않음
+        for thread in [*self.refreshers, *self.stopping]:
+            if thread.isRunning():
+                thread.stop()
+        for thread in [*threads, *self.refreshers, *self.stopping]:
+            if thread.isRunning():
+                thread.wait()
+        if self.dedup_index is not None:
+            self.dedup_index.close()
+        close_shared_pool()  # 상주 DISM 도우미 종료 (작업 스레드가 모두 끝난 뒤)
+        if self.trace_dir is not None:
+            self.metrics_timer.stop()
+            self.write_metrics(with_trace=True)
+        self.sink.close()
+
+    def connect_signals(self):
+        """시그널 연결"""
+        # View -> Controller
+        self.view.folder_selected.connect(self.on_folder_selected)
+        self.view.folder_added.connect(self.on_folder_added)
+        self.view.rescan_requested.connect(lambda folder: self.on_folder_selected(folder, force_rescan=True))
+        self.view.watch_toggled.connect(self.on_watch_toggled)
+        self.view.start_update.connect(self.on_start_update)
+        self.view.verify_requested.connect(self.on_verify_requested)
+        self.view.dedup_requested.connect(self.on_dedup_requested)
+        self.view.cancel_update.connect(self.on_cancel_update)
+        self.view.job_move_requested.connect(self.queue.move)
+        self.view.job_cancel_requested.connect(self.on_job_cancel_requested)
+        self.view.jobs_clear_requested.connect(self.queue.clear_finished)
+
+        # Channel -> View
+        self.channel.logs_ready.connect(self.view.add_logs)
+        self.channel.progress_ready.connect(self.view.update_progress)
+        self.channel.stats_updated.connect(self.view.update_channel_stats)
+
+    # --- 작업 대기열 ---
+
+    def on_queue_changed(self):
+        """대기열 상태가 바뀔 때마다 표시 갱신"""
+        self.view.update_job_queue(self.queue.jobs())
+
+    def pump_queue(self):
+        """동시 실행 제한 안에서 시작할 수 있는 작업을 모두 시작"""
+        starters = {
+            KIND_SCAN: self.start_scan,
+            KIND_VERIFY: self.start_verify,
+            KIND_UPDATE: self.start_update,
+            KIND_CLEANUP: self.start_cleanup_job,
+        }
+        for job in self.queue.next_jobs():
+            try:
+                starters[job.kind](job)
+            except Exception as e:
+                self.log(f"작업을 시작하지 못했습니다 ({job.label}): {e}", level='error')
+                self.queue.finish(job.id, STATUS_FAILED, str(e))
+        self.update_activity()
+
+    def finish_job(self, job, status, message=None):
+        """작업 종료를 대기열에 반영하고 다음 작업 시작"""
+        self.queue.finish(job.id, status, message)
+        self.pump_queue()
+
+    def update_activity(self):
+        """실행 중인 작업에 맞춰 스캔 표시와 폴더 감시 일시 정지 상태 갱신"""
+        scanning = bool(self.queue.active(KIND_SCAN))
+        if scanning != self.view.is_scanning:
+            self.view.set_scan_mode(scanning)
+        # 업데이트로 인한 파일 변경은 작업이 끝난 뒤 한 번에 반영
+        if self.watcher is not None:
+            updating = bool(self.queue.active(KIND_UPDATE, KIND_CLEANUP))
+            if updating and not self.watcher.is_paused:
+                self.watcher.pause()
+            elif not updating and self.watcher.is_paused:
+                self.watcher.resume()
+
+    def on_job_cancel_requested(self, job_id):
+        """대기열 패널에서 작업 하나 취소 (실행 중이면 중지만 요청하고 기다리지 않음)"""
+        job = self.queue.get(job_id)
+        if job is not None and job.kind == KIND_CLEANUP and job.status == STATUS_RUNNING:
+            self.log("남은 마운트 정리는 중간에 취소할 수 없습니다.", level='warning')
+            return
+        job = self.queue.cancel(job_id, "사용자가 취소함")
+        if job is not None and job.status == STATUS_STOPPING:
+            job.handle.stop()
+
+    def on_cancel_update(self):
+        """View에서 취소 신호를 받았을 때 실행 중인 업데이트/무결성 검사 중지 (대기 중인 작업은 유지)"""
+        for job in self.queue.cancel_where(
+                lambda job: job.kind in (KIND_VERIFY, KIND_UPDATE) and job.status == STATUS_RUNNING,
+                "사용자가 취소함"):
+            job.handle.stop()
+
+    def on_busy_job_finished(self, job, status):
+        """검사/업데이트/정리 작업이 끝났을 때, 더 실행 중인 작업이 없으면 UI 복원"""
+        if self.queue.active(*BUSY_KINDS):
+            return
+        if job.kind == KIND_CLEANUP:
+            self.view.set_cleanup_mode(False)
+        elif job.kind == KIND_VERIFY:
+            self.view.finish_verify(cancelled=status == STATUS_CANCELLED)
+        elif status == STATUS_CANCELLED:
+            self.view.reset_ui_immediately()
+        else:
+            self.view.reset_ui_after_completion()
+
+    # --- 스캔 ---
+
+    def on_folder_selected(self, folder_path, force_rescan=False):
+        """View에서 폴더 선택 신호를 받았을 때 (force_rescan: 캐시 무시)
+
+        이전에 선택한 폴더의 스캔은 취소한다. 실행 중인 스캐너는 DISM도 종료되므로 GUI 스레드에서
+        기다리지 않으며, 늦게 보내는 결과는 on_scan_result/on_scan_completed에서 무시한다.
+        """
+        self.deferred_setup()
+        self.stop_watcher()
+        self.scan_generation += 1
+        for job in self.queue.cancel_where(lambda job: job.kind == KIND_SCAN, "다른 폴더를 선택함"):
+            job.handle.stop()
+        self.submit_scan(folder_path, force_rescan=force_rescan, primary=True)
+
+    def on_folder_added(self, folder_path):
+        """목록에 다른 폴더의 이미지 추가 (선택한 폴더의 스캔 뒤에 실행)"""
+        self.deferred_setup()
+        self.submit_scan(folder_path, primary=False)
+
+    def submit_scan(self, folder_path, force_rescan=False, primary=True):
+        """폴더 스캔 작업을 대기열에 추가 (primary: 폴더 감시 대상인 선택한 폴더)"""
+        payload = {
+            'folder': folder_path,
+            'force_rescan': force_rescan,
+            'max_depth': DEFAULT_MAX_DEPTH if self.view.is_recursive_scan() else 0,
+            'primary': primary,
+            'generation': self.scan_generation,
+        }
+        self.queue.submit(KIND_SCAN, folder_path, [folder_path], PRIORITY_HIGH if primary else PRIORITY_NORMAL,
+                          payload=payload)
+        self.pump_queue()
+
+    def start_scan(self, job):
+        from modules.scanner import ScannerWorker
+
+        payload = job.payload
+        scanner = ScannerWorker(payload['folder'], cache=self.cache, force_rescan=payload['force_rescan'],
+                                max_depth=payload['max_depth'], sink=self.sink)
+        job.handle = scanner
+        scanner.scan_result.connect(lambda wim_info: self.on_scan_result(job, wim_info))
+        scanner.scan_complete.connect(lambda wim_info_list: self.on_scan_completed(job, scanner, wim_info_list))
+
+        # 스캐너가 종료되면 스스로 삭제되도록 설정
+        scanner.finished.connect(scanner.deleteLater)
+        scanner.start()
+
+    def is_current_scan(self, job):
+        """지금 목록에 결과를 넣어야 하는 스캔인지 여부 (취소되었거나 이전 선택의 스캔이면 False)"""
+        return job.status == STATUS_RUNNING and job.payload['generation'] == self.scan_generation
+
+    def on_scan_result(self, job, wim_info):
+        """파일 하나의 스캔 결과 수신 시"""
+        if self.is_current_scan(job):
+            self.view.add_wim_info(wim_info)
+
+    def on_scan_completed(self, job, scanner, wim_info_list):
+        """스캔 완료 시 (중지된 스캐너는 대기열에서만 정리)"""
+        current = self.is_current_scan(job)
+        self.finish_job(job, STATUS_DONE if scanner.is_running else STATUS_CANCELLED)
+        if not current:
+            return
+        self.channel.flush()  # 스캔 중 쌓인 로그를 먼저 출력
+        if scanner.streaming:
+            self.view.finish_wim_list(wim_info_list)
+        else:
+            self.view.update_wim_list(wim_info_list)
+
+        if job.payload['primary'] and self.view.is_watch_enabled():
+            self.start_watcher(scanner.folder_path, scanner.max_depth, scanner.found_paths)
+
+    def retire(self, thread):
+        """스레드 중지를 요청하고 끝날 때까지 참조만 유지"""
+        thread.stop()
+        self.stopping.add(thread)
+        thread.finished.connect(lambda: self.stopping.discard(thread))
+
+    # --- 폴더 감시 ---
+
+    def on_watch_toggled(self, enabled):
+        """폴더 감시 모드 변경 시"""
+        if not enabled:
+            self.stop_watcher()
+            self.log("폴더 감시를 중지했습니다.")
+        elif self.view.selected_folder and not self.queue.pending(KIND_SCAN):
+            max_depth = DEFAULT_MAX_DEPTH if self.view.is_recursive_scan() else 0
+            self.start_watcher(self.view.selected_folder, max_depth, self.view.current_wim_paths())
+
+    def start_watcher(self, folder_path, max_depth, known_paths):
+        """작업 폴더 감시 시작"""
+        from modules.watcher import FolderWatcher
+
+        self.stop_watcher()
+        self.watcher = FolderWatcher(folder_path, max_depth=max_depth)
+        self.watcher.files_changed.connect(self.on_watch_files_changed)
+        self.watcher.files_removed.connect(self.on_watch_files_removed)
+        self.watcher.start(known_paths)
+        self.log(f"'{folder_path}' 폴더 감시를 시작합니다.")
+        self.update_activity()
+
+    def stop_watcher(self):
+        """폴더 감시 및 진행 중인 부분 재스캔 중지"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
+        for refresher in self.refreshers:
+            self.retire(refresher)
+        self.refreshers.clear()
+
+    def on_watch_files_changed(self, file_paths):
+        """감시 중인 폴더에서 파일이 추가/변경되었을 때 해당 파일만 다시 조회
+
+        바뀐 파일 몇 개만 조회하는 가벼운 작업이므로 대기열을 거치지 않고 바로 실행한다.
+        """
+        from modules.scanner import ScannerWorker
+
+        refresher = ScannerWorker(
+            self.watcher.folder_path,
+            cache=self.cache,
+            streaming=False,
+            file_paths=file_paths,
+            sink=self.sink
+        )
+        self.refreshers.add(refresher)
+        refresher.scan_complete.connect(lambda wim_info_list: self.on_refresh_completed(refresher, wim_info_list))
+        refresher.finished.connect(refresher.deleteLater)
+        refresher.start()
+
+    def on_refresh_completed(self, refresher, wim_info_list):
+        """부분 재스캔 완료 시 변경된 행만 갱신"""
+        if refresher not in self.refreshers:
+            return
+        self.refreshers.discard(refresher)
+        self.channel.flush()
+        self.view.refresh_wim_items(wim_info_list)
+
+    def on_watch_files_removed(self, file_paths):
+        """감시 중인 폴더에서 파일이 삭제되었을 때"""
+        if self.cache is not None:
+            for file_path in file_paths:
+                self.cache.invalidate(file_path)
+        if self.dedup_index is not None:
+            self.dedup_index.remove(file_paths)
+        self.view.remove_wim_paths(file_paths)
+
+    # --- 중복 분석 ---
+
+    def on_dedup_requested(self, file_list):
+        """리소스 중복 분석 시작 (바뀐 파일만 lookup 테이블을 다시 읽음)"""
+        from modules.analyzer import DedupWorker
+        from modules.dedup import DedupIndex
+
+        if self.dedup_index is None:
+            try:
+                self.dedup_index = DedupIndex()
+            except (sqlite3.Error, OSError) as e:
+                self.log(f"중복 분석 색인을 열 수 없습니다: {e}", level='error')
+                return
+
+        analyzer = DedupWorker(file_list, self.dedup_index, channel=self.channel, sink=self.sink)
+        self.analyzer = analyzer
+        analyzer.analysis_complete.connect(lambda report: self.on_dedup_completed(analyzer, report))
+        analyzer.finished.connect(analyzer.deleteLater)
+        analyzer.start()
+        self.view.set_dedup_mode(True)
+
+    def on_dedup_completed(self, analyzer, report):
+        """중복 분석 완료 시 결과 창 표시"""
+        if analyzer is not self.analyzer:
+            return
+        self.analyzer = None
+        self.channel.flush()
+        self.view.set_dedup_mode(False)
+        if report is not None:
+            self.view.show_dedup_report(report)
+
+    # --- 무결성 검사/업데이트 ---
+
+    def on_start_update(self, file_list):
+        """View에서 업데이트 시작 신호를 받았을 때 (설정에 따라 무결성 검사 먼저)"""
+        self.submit_update(file_list, verify_first=self.view.is_verify_before_update())
+
+    def on_verify_requested(self, file_list):
+        """무결성 검사 작업을 대기열에 추가"""
+        self.deferred_setup()
+        self.queue.submit(KIND_VERIFY, f"파일 {len(file_list)}개", file_list, PRIORITY_NORMAL,
+                          payload={'files': list(file_list)})
+        self.pump_queue()
+
+    def submit_update(self, file_list, resume_state=None, verify_first=False):
+        """업데이트 작업을 대기열에 추가 (패키지/인덱스/크기/순서는 지금 설정을 보관)
+
+        resume_state: 이전 실행 기록에서 이어서 진행 (가장 먼저 실행)
+        verify_first: 시작할 때 무결성 검사를 먼저 하고 통과한 파일만 업데이트
+        """
+        from modules.update_engine import find_packages
+
+        self.deferred_setup()
+        if resume_state is None:
+            packages = find_packages(self.view.package_folder)
+            if self.view.package_folder:
+                self.log(f"적용할 패키지 {len(packages)}개를 찾았습니다.")
+            images = {file_path: self.view.get_image_indexes(file_path) for file_path in file_list}
+            sizes = {file_path: self.view.get_image_sizes(file_path) for file_path in file_list}
+            records = self.view.get_records(file_list)
+            label = f"파일 {len(file_list)}개"
+        else:
+            packages, images, sizes, records = None, None, None, None  # 기록에 남은 패키지/인덱스/크기를 그대로 사용
+            label = f"이어서 실행 (이미지 {len(resume_state.pending)}개)"
+        payload = {
+            'files': list(file_list),
+            'packages': packages,
+            'package_folder': self.view.package_folder,
+            'records': records,
+            'images': images,
+            'sizes': sizes,
+            'order': self.view.get_update_order(),
+            'resume_state': resume_state,
+            'verify_first': verify_first,
+        }
+        self.queue.submit(KIND_UPDATE, label, file_list, PRIORITY_HIGH if resume_state else PRIORITY_NORMAL,
+                          payload=payload)
+        self.pump_queue()
+
+    def start_verify(self, job):
+        """무결성 검사 스레드 시작 (업데이트 작업이면 검사를 통과한 파일만 이어서 업데이트)"""
+        from modules.verifier import VerifyWorker
+
+        verifier = VerifyWorker(job.payload['files'], cache=self.cache, channel=self.channel, sink=self.sink)
+        job.handle = verifier
+        verifier.verify_complete.connect(lambda results: self.on_verify_completed(job, verifier, results))
+        verifier.finished.connect(verifier.deleteLater)
+        verifier.start()
+        self.view.set_verify_mode(True)
+
+    def on_verify_completed(self, job, verifier, results):
+        """무결성 검사 완료 시 결과를 목록에 표시하고, 업데이트 작업이면 정상 파일만 업데이트"""
+        self.channel.flush()
+        self.view.apply_verify_results(results)
+
+        if not verifier.is_running:
+            self.log("사용자에 의해 무결성 검사가 중단되었습니다.", level='warning')
+            self.finish_job(job, STATUS_CANCELLED)
+            self.on_busy_job_finished(job, STATUS_CANCELLED)
+            return
+        if job.kind == KIND_VERIFY:
+            failed = sum(1 for result in results if not result.ok)
+            self.finish_job(job, STATUS_DONE, f"문제 {failed}개" if failed else None)
+            self.on_busy_job_finished(job, STATUS_DONE)
+            return
+
+        passed = [result.file_path for result in results if result.ok]
+        for result in results:
+            if not result.ok:
+                self.log(f"'{os.path.basename(result.file_path)}' 무결성 검사를 통과하지 못해 건너뜁니다: "
+                         f"{result.message}", level='warning', file=result.file_path)
+        if not passed:
+            self.log("업데이트할 정상 파일이 없습니다.", level='warning')
+            self.finish_job(job, STATUS_FAILED, "업데이트할 정상 파일이 없습니다.")
+            self.on_busy_job_finished(job, STATUS_FAILED)
+            return
+        self.start_worker(job, passed)
+
+    def start_update(self, job):
+        """업데이트 작업 시작 (설정에 따라 무결성 검사 먼저)
+
+        끝나지 않은 이전 업데이트 기록이 있으면 덮어쓰지 않고 작업을 실패로 끝낸 뒤,
+        이어서 진행할지 정리할지 묻는다 (선택한 작업이 먼저 실행됨).
+        """
+        if job.payload['resume_state'] is None and self.refuse_update(job):
+            return
+        if job.payload['verify_first']:
+            self.start_verify(job)
+        else:
+            self.start_worker(job, job.payload['files'])
+
+    def refuse_update(self, job):
+        """이전 업데이트 기록이 남아 있거나 다른 프로세스가 사용 중이면 작업을 시작하지 않고 True 반환"""
+        try:
+            state = self.journal.load()
+        except OSError:
+            return False  # 기록을 쓸 때 다시 실패하면 작업 스레드가 알림
+        busy = self.journal.in_use()
+        if not busy and (state is None or not state.pending):
+            return False
+        if busy:
+            self.log(f"다른 프로세스가 업데이트를 실행 중이므로 업데이트 작업({job.label})을 시작하지 않습니다.",
+                     level='warning')
+        else:
+            self.log(f"끝나지 않은 이전 업데이트(남은 이미지 {len(state.pending)}개)가 있어 업데이트 작업({job.label})을 "
+                     f"시작하지 않습니다. 이어서 진행하거나 정리한 뒤 다시 실행하세요.", level='warning')
+            self.check_journal()  # 모달로 묻고 이어서 실행/정리 작업을 높은 우선순위로 추가
+        # 업데이트 모드로 바꾸기 전이므로 UI는 그대로 두고 대기열만 갱신
+        self.finish_job(job, STATUS_FAILED, "다른 프로세스가 업데이트 중" if busy else "이전 업데이트 기록이 남아 있음")
+        return True
+
+    def start_worker(self, job, file_list):
+        """업데이트 스레드 시작"""
+        from modules.worker import Worker
+
+        payload = job.payload
+        if self.inventory is None:
+            self.inventory = self.open_inventory()
+        worker = Worker(file_list, packages=payload['packages'], images=payload['images'], channel=self.channel,
+                        sink=self.sink, journal=self.journal, resume_state=payload['resume_state'],
+                        sizes=payload['sizes'], order=payload['order'],
+                        package_folder=payload['package_folder'], records=payload['records'],
+                        inventory=self.inventory)
+        job.handle = worker
+
+        # Worker -> View 시그널 연결
+        worker.progress.connect(self.view.update_progress)
+        worker.finished.connect(lambda: self.on_update_finished(job, worker))
+
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+        self.view.set_update_mode(True)
+
+    def on_update_finished(self, job, worker):
+        """업데이트 스레드 작업 완료 시"""
+        from modules.update_engine import JOB_FAILED
+
+        self.channel.flush()  # 작업 중 쌓인 로그/진행률을 먼저 출력
+        if worker.is_running and worker.error is not None:  # 작업을 만들거나 실행하다가 예외 발생
+            status, message = STATUS_FAILED, worker.error
+            self.log(f"업데이트 작업({job.label})이 실패했습니다.", level='error')
+        elif worker.is_running:  # 정상 종료 시
+            failed = sum(1 for item in worker.jobs if item.status == JOB_FAILED)
+            status = STATUS_FAILED if failed else STATUS_DONE
+            message = f"이미지 {failed}개 실패" if failed else None
+            self.log(f"업데이트 작업({job.label})이 완료되었습니다." + (f" {message}" if message else ""),
+                     level='warning' if failed else 'info')
+        else:  # 사용자에 의해 중단된 경우
+            status, message = STATUS_CANCELLED, None
+            self.log(f"사용자에 의해 업데이트 작업({job.label})이 중단되었습니다.", level='warning')
+        self.finish_job(job, status, message)
+        self.on_busy_job_finished(job, status)
+
+    def start_cleanup_job(self, job):
+        """이전 실행이 남긴 마운트 정리 스레드 시작"""
+        from modules.worker import MountCleanupWorker
+
+        cleaner = MountCleanupWorker(journal=self.journal, state=job.payload['state'], sink=self.sink)
+        job.handle = cleaner
+        cleaner.finished.connect(lambda: self.on_cleanup_finished(job))
+        cleaner.finished.connect(cleaner.deleteLater)
+        cleaner.start()
+        self.view.set_cleanup_mode(True)
+
+    def on_cleanup_finished(self, job):
+        """남은 마운트 정리 완료 시"""
+        self.channel.flush()
+        self.finish_job(job, STATUS_DONE)
+        self.on_busy_job_finished(job, STATUS_DONE)
+
+    def show(self):
+        """GUI 표시"""
+        self.view.show()
@@ -0,0 +1,330 @@
+import os
+import sqlite3
+from dataclasses import dataclass, field
+
+from modules.discovery import discover_images, DEFAULT_MAX_DEPTH
+from modules.scheduling import ORDER_USER, sort_by_size
+from modules.update_engine import (UpdatePipeline, UpdateJob, STAGES, STAGE_EXPORT,
+                                   JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# GUI(QThread)와 CLI가 함께 쓰는 스캔/업데이트 흐름 (Qt 비의존, 콜백으로만 결과 전달)
+
+
+@dataclass(slots=True)
+class ScanOutcome:
+    """폴더 스캔 결과"""
+    records: list = field(default_factory=list)      # 조회에 성공한 WimFileRecord (탐색 순서)
+    found_paths: list = field(default_factory=list)  # 탐색된 파일 경로 (조회 실패 파일 포함)
+    stopped: bool = False                            # 중간에 중지되었는지 여부
+
+    @property
+    def failed_paths(self):
+        """탐색되었지만 정보 조회에 실패한 파일"""
+        succeeded = {record.file_path for record in self.records}
+        return [path for path in self.found_paths if path not in succeeded]
+
+
+@dataclass(slots=True)
+class UpdateOutcome:
+    """업데이트 실행 결과"""
+    jobs: list = field(default_factory=list)  # 상태가 기록된 UpdateJob 목록
+
+    def count(self, status):
+        return sum(1 for job in self.jobs if job.status == status)
+
+    @property
+    def done(self):
+        return self.count(JOB_DONE)
+
+    @property
+    def failed(self):
+        return self.count(JOB_FAILED)
+
+    @property
+    def cancelled(self):
+        return self.count(JOB_CANCELLED)
+
+
+def _track_found(candidates, found_paths):
+    """탐색된 파일 경로를 기록하면서 그대로 전달"""
+    for candidate in candidates:
+        found_paths.append(getattr(candidate, 'path', candidate))
+        yield candidate
+
+
+def scan_folder(engine, folder_path, file_paths=None, max_depth=DEFAULT_MAX_DEPTH, include=None,
+                exclude=None, on_result=None, should_stop=None, force=False):
+    """폴더(또는 지정한 파일 목록)를 탐색하면서 바로 조회하여 ScanOutcome 반환
+
+    engine: ScanEngine (로그와 캐시는 engine의 것을 사용)
+    file_paths: 지정 시 폴더 탐색 없이 이 파일들만 조회 (부분 재스캔)
+    on_result(index, record): 파일 하나의 조회가 끝날 때마다 호출 (작업 스레드에서 실행)
+    """
+    should_stop = should_stop or (lambda: False)
+    outcome = ScanOutcome()
+
+    # 폴더 탐색과 정보 조회를 동시에 진행 (찾는 즉시 조회 시작)
+    if file_paths is not None:
+        candidates = file_paths
+    else:
+        candidates = discover_images(
+            folder_path,
+            max_depth=max_depth,
+            include=include,
+            exclude=exclude,
+            on_error=lambda path, e: engine.log(f"'{path}' 탐색 실패: {e}", level='warning', file=path)
+        )
+    outcome.records = engine.scan(
+        _track_found(candidates, outcome.found_paths),
+        on_result=on_result,
+        should_stop=should_stop,
+        force=force
+    )
+    outcome.stopped = should_stop()
+
+    if not outcome.found_paths:
+        engine.log("스캔할 WIM 파일이 없습니다.")
+
+    # 폴더에서 사라진 파일의 캐시 항목 정리 (전체 스캔일 때만)
+    if engine.cache is not None and not outcome.stopped and file_paths is None:
+        engine.cache.evict_missing(folder_path, outcome.found_paths, recursive=max_depth != 0)
+
+    if outcome.stopped:
+        engine.log("사용자에 의해 스캔이 중단되었습니다.", level='warning')
+    return outcome
+
+
+def image_sizes(record):
+    """진행률/순서 계산에 쓸 인덱스별 이미지 크기 (크기를 모르면 파일 크기를 인덱스 수로 나눔)"""
+    fallback = record.file_size // max(1, len(record.images))
+    return {image.index: image.size or fallback for image in record.images}
+
+
+def create_update_jobs(file_list, images=None, packages=None, sizes=None, plans=None, log=None):
+    """파일/인덱스별 업데이트 작업 생성
+
+    images: 파일 경로 -> 인덱스 목록 (없으면 인덱스 1)
+    sizes: 파일 경로 -> {인덱스: 바이트} (image_sizes 결과, 없으면 크기 0)
+    plans: (파일 경로, 인덱스) -> ImagePlan (plan_packages 결과, 지정 시 계획에 있는 이미지는 packages 대신
+        이미지별 패키지를 적용하고, 적용할 패키지가 없는 이미지는 작업을 만들지 않음)
+    log(message, **fields): 작업을 만들지 않은 이미지를 알림 (구성 요소 정리/커밋도 하지 않으므로)
+    """
+    log = log or (lambda message, **fields: None)
+    images = images or {}
+    sizes = sizes or {}
+    plans = plans or {}
+    jobs = []
+    for file_path in file_list:
+        file_sizes = sizes.get(file_path) or {}
+        for index in images.get(file_path) or [1]:
+            image_packages = packages
+            plan = plans.get((file_path, index))
+            if plan is not None:
+                if not plan.packages:
+                    log(f"'{os.path.basename(file_path)}' [인덱스 {index}] 적용할 패키지가 없어 건너뜁니다 "
+                        f"(구성 요소 정리/커밋도 하지 않음).", file=file_path)
+                    continue
+                image_packages = plan.paths
+            jobs.append(UpdateJob(file_path, index, image_packages, size=file_sizes.get(index, 0)))
+    return jobs
+
+
+def plan_packages(records, package_folder, catalog=None, indexes=None, log=None):
+    """패키지 폴더를 색인하고 스캔한 이미지마다 적용할 패키지를 골라 {(파일 경로, 인덱스): ImagePlan} 반환
+
+    catalog: PackageCatalog (없으면 앱 데이터 폴더의 색인을 열고 닫음, 열 수 없으면 메모리 색인 사용)
+    indexes: 지정 시 이 인덱스만 (dict면 파일 경로 -> 인덱스 목록)
+    """
+    from modules.catalog import PackageCatalog, SKIP_LABELS, describe_plan
+
+    log = log or (lambda message, **fields: None)
+    owned = catalog is None
+    if owned:
+        try:
+            catalog = PackageCatalog()
+        except (sqlite3.Error, OSError) as e:
+            log(f"패키지 색인을 사용할 수 없어 메모리에서 색인합니다: {e}", level='warning')
+            catalog = PackageCatalog(':memory:')
+    try:
+        packages = catalog.refresh(package_folder, log=log)
+        plans = catalog.plan(records, indexes)
+    finally:
+        if owned:
+            catalog.close()
+
+    unknown = sum(1 for package in packages if package.source == 'name')
+    log(f"패키지 {len(packages)}개를 색인했습니다." +
+        (f" (메타데이터를 읽지 못해 파일 이름으로 판단: {unknown}개)" if unknown else ""))
+    for (file_path, index), plan in plans.items():
+        log(f"'{os.path.basename(file_path)}' [{index}] 적용할 패키지: {describe_plan(plan)}",
+            level='info' if plan.packages else 'warning', file=file_path)
+        for package, reason in plan.skipped:
+            log(f"'{os.path.basename(file_path)}' [{index}] {package.label} 건너뜀: {SKIP_LABELS[reason]}",
+                level='debug', file=file_path)
+    return plans
+
+
+def skip_installed(jobs, inventory, infos=None, log=None):
+    """설치된 패키지 캐시(InventoryCache)에서 이미 설치된 패키지를 작업에서 빼고 (실행할 작업, 건너뛴 작업) 반환
+
+    적용할 패키지가 하나도 남지 않은 이미지는 마운트하지 않도록 작업에서 제외한다.
+    캐시에 없거나 파일이 바뀐 이미지, 패키지 없이 정리만 하는 작업, 이어서 실행하는 작업은 그대로 둔다.
+    infos: 패키지 경로 -> PackageInfo (plan_packages 결과에 있는 것, 없는 패키지는 파일에서 읽음)
+    """
+    from modules.cache import get_file_identity
+    from modules.catalog import read_package_info
+    from modules.inventory import is_installed
+
+    log = log or (lambda message, **fields: None)
+    infos = dict(infos or {})
+    identities = {}
+    remaining = []
+    skipped = []
+    for job in jobs:
+        if not job.packages or job.completed_stages:
+            remaining.append(job)
+            continue
+        key = os.path.normcase(job.file_path)
+        if key not in identities:
+            try:
+                identities[key] = get_file_identity(job.file_path)
+            except OSError:
+                identities[key] = None
+        installed = inventory.lookup(job.file_path, job.index, identities[key]) if identities[key] else None
+        if installed is None:
+            remaining.append(job)
+            continue
+
+        pending = []
+        for package in job.packages:
+            info = infos.get(package)
+            if info is None:
+                try:
+                    info = infos[package] = read_package_info(package)
+                except OSError:
+                    pending.append(package)
+                    continue
+            if not is_installed(info, installed):
+                pending.append(package)
+        if not pending:
+            log(f"'{job.file_name}' [인덱스 {job.index}] 패키지 {len(job.packages)}개가 모두 설치되어 있어 건너뜁니다.",
+                file=job.file_path)
+            skipped.append(job)
+            continue
+        if len(pending) < len(job.packages):
+            log(f"'{job.file_name}' [인덱스 {job.index}] 이미 설치된 패키지 {len(job.packages) - len(pending)}개를 "
+                f"건너뜁니다.", file=job.file_path)
+            job.packages = pending
+        remaining.append(job)
+    return remaining, skipped
+
+
+def resume_jobs(state):
+    """기록(JournalState)에서 완료되지 않은 이미지의 작업을 다시 만듦
+
+    마운트된 채 중단된 이미지는 마운트 폴더와 끝난 단계를 이어받는다.
+    """
+    jobs = []
+    for entry in state.pending:
+        job = UpdateJob(entry.file_path, entry.index, entry.packages, size=entry.size)
+        job.completed_stages = set(entry.resume_stages())
+        if job.completed_stages:
+            job.mount_dir = entry.mount_dir
+        jobs.append(job)
+    return jobs
+
+
+def discard_orphans(backend, state=None, log=None):
+    """이전 실행이 남긴 마운트를 변경 사항 없이 해제하고 해제한 수 반환
+
+    state: JournalState (기록에 남은 마운트 폴더도 함께 정리)
+    """
+    log = log or (lambda message, **fields: None)
+    mount_dirs = [entry.mount_dir for entry in state.orphan_mounts] if state is not None else []
+    for mount_dir in backend.find_orphan_mounts():
+        if mount_dir not in mount_dirs:
+            mount_dirs.append(mount_dir)
+    in_use = [mount_dir for mount_dir in mount_dirs if backend.mount_in_use(mount_dir)]
+    if in_use:
+        log(f"실행 중인 다른 프로세스가 사용 중인 마운트 {len(in_use)}개는 정리하지 않습니다.", level='warning')
+        mount_dirs = [mount_dir for mount_dir in mount_dirs if mount_dir not in in_use]
+    if not mount_dirs:
+        return 0
+    log(f"이전 실행이 남긴 마운트 {len(mount_dirs)}개를 정리합니다...")
+    released = backend.release_orphans(mount_dirs)
+    log(f"남은 마운트 {released}개를 정리했습니다.")
+    return released
+
+
+def run_update(jobs, backend, stage_limits=None, export=False, log=None, on_progress=None,
+               should_stop=None, journal=None, order=ORDER_USER, inventory=None, resume_of=None):
+    """업데이트 파이프라인을 실행하고 UpdateOutcome 반환
+
+    on_progress(done, total, job, stage): 시작 시와 단계 하나가 끝날 때마다 호출 (작업 스레드에서 실행,
+        진행량은 이미지 크기로 가중한 바이트)
+    order: 처리 순서 정책 (ORDER_POLICIES)
+    journal: UpdateJournal (지정 시 진행 상태를 기록하고, 모든 이미지가 완료되면 기록을 지움,
+        끝나지 않은 이전 기록이 있으면 JournalPendingError)
+    resume_of: 이어서 실행하는 이전 실행의 run_id (이 기록만 새 기록으로 바꿀 수 있음)
+    inventory: InventoryCache (지정 시 커밋한 이미지의 설치된 패키지 목록을 저장)
+    """
+    log = log or (lambda message, **fields: None)
+    if journal is not None:
+        journal.start_run(jobs, export=export, export_dir=getattr(backend, 'export_dir', None), order=order,
+                          resume_of=resume_of)
+    pipeline = UpdatePipeline(
+        backend,
+        stage_limits=stage_limits,
+        export=export,
+        log=log,
+        on_progress=on_progress,
+        journal=journal,
+        order=order,
+        inventory=inventory
+    )
+    completed = False
+    try:
+        outcome = UpdateOutcome(pipeline.run(jobs, should_stop=should_stop))
+        completed = outcome.done == len(outcome.jobs)
+    finally:
+        if journal is not None:
+            journal.finish_run(completed)
+
+    if outcome.failed:
+        log(f"이미지 {len(outcome.jobs)}개 중 {outcome.done}개 완료, {outcome.failed}개 실패", level='warning')
+    return outcome
+
+
+def plan_update(records, packages=None, indexes=None, export=False, order=ORDER_USER, plans=None):
+    """실제로 실행하지 않고 이미지별로 수행할 작업 계획 반환 (처리 순서 정책을 적용한 순서)
+
+    records: WimFileRecord 목록
+    indexes: 지정 시 이 인덱스만 대상으로 함
+    plans: (파일 경로, 인덱스) -> ImagePlan (지정 시 이미지별 패키지와 건너뛴 패키지를 함께 반환)
+    """
+    stages = [stage for stage in STAGES if export or stage != STAGE_EXPORT]
+    packages = list(packages or [])
+    plan = []
+    # 파이프라인과 같이 파일 단위로, 파일 안 이미지 크기의 합으로 정렬
+    for record in sort_by_size(records, order, lambda record: sum(image_sizes(record).values())):
+        sizes = image_sizes(record)
+        for image in record.images:
+            if indexes and image.index not in indexes:
+                continue
+            image_plan = plans.get((record.file_path, image.index)) if plans else None
+            entry = {
+                'file_path': record.file_path,
+                'file_name': os.path.basename(record.file_path),
+                'index': image.index,
+                'name': image.name,
+                'version': image.version,
+                'build': image.build,
+                'architecture': image.architecture,
+                'size': sizes[image.index],
+                'packages': image_plan.paths if image_plan is not None else packages,
+                'stages': stages,
+            }
+            if image_plan is not None:
+                entry['skipped_packages'] = image_plan.to_dict()['skipped']
+            plan.append(entry)
+    return plan
@@ -0,0 +1,368 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from itertools import combinations
+
+from modules.paths import get_app_data_path
+from modules.wim import WimHeader, WimFormatError, WIM_HEADER_SIZE, RESHDR_FLAG_METADATA, read_lookup_table
+
+# 여러 WIM 파일에 같은 리소스(SHA-1이 같은 파일 내용)가 얼마나 겹치는지 분석한다.
+# 파일별 lookup 테이블을 SQLite 색인에 저장해 두고, 바뀐 파일만 다시 읽는다.
+# 이미지 메타데이터 리소스는 이미지마다 따로 있으므로 비교에서 제외한다.
+
+DEDUP_FILE_NAME = 'kdic_dedup.db'
+DEDUP_SCHEMA_VERSION = 1
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_PAIRS = 200   # 보고서에 넣을 파일 쌍 최대 수 (공유 바이트가 큰 순서)
+
+EMPTY_HASH = bytes(20)
+
+
+@dataclass(slots=True)
+class DedupReport:
+    """중복 분석 결과
+
+    바이트 수는 original_*가 원본(압축 전) 크기, stored_*가 WIM 안에 저장된(압축된) 크기다.
+    merged_*는 모든 파일을 하나의 다중 인덱스 이미지로 합쳤을 때의 크기다.
+    """
+    files: list = field(default_factory=list)    # 파일별 {file_path, resources, original_bytes, stored_bytes,
+                                                 #          unique_bytes, shared_bytes, shared_fraction}
+    pairs: list = field(default_factory=list)    # 파일 쌍별 {file_a, file_b, resources, shared_bytes,
+                                                 #            fraction_a, fraction_b} (공유 바이트 순)
+    pair_count: int = 0          # 리소스를 공유하는 전체 파일 쌍 수 (pairs는 상위 일부만)
+    missing: list = field(default_factory=list)  # 색인에 없는 파일 (lookup 테이블을 읽지 못함)
+    resources: int = 0
+    unique_resources: int = 0
+    original_bytes: int = 0
+    merged_original_bytes: int = 0
+    stored_bytes: int = 0
+    merged_stored_bytes: int = 0
+
+    @property
+    def savings_bytes(self):
+        """합쳤을 때 줄어드는 저장 크기"""
+        return self.stored_bytes - self.merged_stored_bytes
+
+    @property
+    def savings_fraction(self):
+        return self.savings_bytes / self.stored_bytes if self.stored_bytes else 0.0
+
+    def to_dict(self):
+        data = asdict(self)
+        data['savings_bytes'] = self.savings_bytes
+        data['savings_fraction'] = round(self.savings_fraction, 4)
+        return data
+
+
+def write_report(report, path):
+    """보고서를 파일로 저장 (확장자가 .csv면 CSV, 아니면 JSON)"""
+    if os.path.splitext(path)[1].lower() != '.csv':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        return
+
+    # Excel에서 한글이 깨지지 않도록 BOM 포함
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        # 합계 행의 shared_bytes는 합쳤을 때 줄어드는 크기 (원본 기준, 저장 크기 기준)
+        writer.writerow(['kind', 'file', 'other_file', 'resources', 'bytes', 'shared_bytes',
+                         'fraction', 'other_fraction'])
+        original_savings = report.original_bytes - report.merged_original_bytes
+        writer.writerow(['total_original', '', '', report.resources, report.original_bytes, original_savings,
+                         round(original_savings / report.original_bytes, 4) if report.original_bytes else 0.0, ''])
+        writer.writerow(['total_stored', '', '', report.resources, report.stored_bytes, report.savings_bytes,
+                         round(report.savings_fraction, 4), ''])
+        for item in report.files:
+            writer.writerow(['file', item['file_path'], '', item['resources'], item['original_bytes'],
+                             item['shared_bytes'], item['shared_fraction'], ''])
+        for pair in report.pairs:
+            writer.writerow(['pair', pair['file_a'], pair['file_b'], pair['resources'], '',
+                             pair['shared_bytes'], pair['fraction_a'], pair['fraction_b']])
+
+
+def read_resources(file_path):
+    """파일 식별 정보와 비교 대상 리소스 목록 [(SHA-1, 저장 크기, 원본 크기), ...] 반환"""
+    with open(file_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        header = WimHeader.unpack(f.read(WIM_HEADER_SIZE))
+        entries = read_lookup_table(f, header, st.st_size)
+
+    resources = [
+        (sha1, size, original_size)
+        for sha1, flags, size, original_size, part_number, _ref_count in entries
+        # 분할 이미지는 이 파트에 들어 있는 리소스만 센다
+        if not flags & RESHDR_FLAG_METADATA and sha1 != EMPTY_HASH
+        and (header.total_parts <= 1 or part_number == header.part_number)
+    ]
+    return (st.st_size, st.st_mtime_ns, str(header.guid)), resources
+
+
+class DedupIndex:
+    """WIM 파일별 리소스 SHA-1을 저장하는 SQLite 색인 (여러 스레드에서 사용 가능)"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_app_data_path(DEDUP_FILE_NAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")  # 색인은 다시 만들 수 있으므로 fsync를 줄임
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != DEDUP_SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS resources")
+                self._conn.execute("DROP TABLE IF EXISTS files")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    guid TEXT,
+                    resources INTEGER NOT NULL,
+                    original_bytes INTEGER NOT NULL,
+                    stored_bytes INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+            """)
+            # 파일 단위로 모아서 저장 (새 파일의 리소스는 B-tree 끝에 붙고, 교체/삭제는 범위 하나)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS resources (
+                    file_id INTEGER NOT NULL,
+                    hash BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    original_size INTEGER NOT NULL,
+                    PRIMARY KEY (file_id, hash)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute(f"PRAGMA user_version = {DEDUP_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def identity(self, file_path):
+        """색인된 파일의 (크기, 수정 시각, GUID) (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, guid FROM files WHERE path = ?", (self._key(file_path),)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def store(self, file_path, identity, resources):
+        """파일 하나의 리소스 목록 저장 (같은 경로의 이전 항목은 교체)"""
+        key = self._key(file_path)
+        size, mtime_ns, guid = identity
+        stats = (len(resources), sum(r[2] for r in resources), sum(r[1] for r in resources))
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM files WHERE path = ?", (key,)).fetchone()
+            if row is None:
+                file_id = self._conn.execute(
+                    "INSERT INTO files (path, size, mtime_ns, guid, resources, original_bytes, stored_bytes, "
+                    "indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, size, mtime_ns, guid, *stats, time.time())
+                ).lastrowid
+            else:
+                file_id = row[0]
+                self._conn.execute("DELETE FROM resources WHERE file_id = ?", (file_id,))
+                self._conn.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ?, guid = ?, resources = ?, original_bytes = ?, "
+                    "stored_bytes = ?, indexed_at = ? WHERE id = ?",
+                    (size, mtime_ns, guid, *stats, time.time(), file_id)
+                )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO resources (file_id, hash, size, original_size) VALUES (?, ?, ?, ?)",
+                ((file_id, sha1, size, original_size) for sha1, size, original_size in sorted(resources))
+            )
+
+    def remove(self, file_paths):
+        """파일들의 항목 제거 (제거 수 반환)"""
+        removed = 0
+        with self._lock, self._conn:
+            for file_path in file_paths:
+                row = self._conn.execute("SELECT id FROM files WHERE path = ?", (self._key(file_path),)).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute("DELETE FROM resources WHERE file_id = ?", row)
+                self._conn.execute("DELETE FROM files WHERE id = ?", row)
+                removed += 1
+        return removed
+
+    def evict_missing(self, folder_path, existing_paths, recursive=False):
+        """폴더 안에서 더 이상 존재하지 않는 파일의 항목 제거 (제거 수 반환)"""
+        prefix = self._key(folder_path).rstrip(os.sep) + os.sep
+        existing = {self._key(p) for p in existing_paths}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+        missing = [path for path, in rows
+                   if path not in existing and (recursive or os.sep not in path[len(prefix):])]
+        return self.remove(missing)
+
+    def report(self, file_paths, max_pairs=DEFAULT_MAX_PAIRS):
+        """지정한 파일들 사이의 리소스 공유 현황 DedupReport 반환"""
+        keys = {self._key(path): path for path in file_paths}
+        report = DedupReport()
+        with self._lock:
+            files = {}
+            for file_id, key, resources, original_bytes, stored_bytes in self._conn.execute(
+                    "SELECT id, path, resources, original_bytes, stored_bytes FROM files"):
+                if key in keys:
+                    files[file_id] = (keys[key], resources, original_bytes, stored_bytes)
+            report.missing = sorted(set(keys.values()) - {item[0] for item in files.values()})
+
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected (id INTEGER PRIMARY KEY)")
+            self._conn.execute("DELETE FROM selected")
+            self._conn.executemany("INSERT INTO selected (id) VALUES (?)", ((file_id,) for file_id in files))
+            rows = self._conn.execute("""
+                SELECT group_concat(r.file_id), max(r.original_size), max(r.size), sum(r.size)
+                FROM resources r JOIN selected s ON s.id = r.file_id
+                GROUP BY r.hash
+            """).fetchall()
+            self._conn.execute("DELETE FROM selected")
+            self._conn.commit()
+
+        # 같은 파일 조합에 속하는 리소스끼리 묶어서 합산 (조합 수는 리소스 수보다 훨씬 적음)
+        groups = {}  # 파일 id 조합 -> [리소스 수, 원본 바이트]
+        for members, original_size, stored_max, stored_sum in rows:
+            key = tuple(sorted(int(file_id) for file_id in members.split(',')))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = [0, 0]
+            group[0] += 1
+            group[1] += original_size
+            report.resources += len(key)
+            report.original_bytes += original_size * len(key)
+            report.merged_original_bytes += original_size
+            report.stored_bytes += stored_sum
+            report.merged_stored_bytes += stored_max  # 합칠 때 어느 쪽이 남을지 모르므로 큰 쪽 기준
+        report.unique_resources = len(rows)
+
+        pairs = {}
+        for key, (count, original) in groups.items():
+            for pair in combinations(key, 2):
+                shared = pairs.get(pair)
+                if shared is None:
+                    shared = pairs[pair] = [0, 0]
+                shared[0] += count
+                shared[1] += original
+
+        for file_id, (file_path, resources, original_bytes, stored_bytes) in sorted(
+                files.items(), key=lambda item: item[1][0].lower()):
+            unique = groups.get((file_id,), (0, 0))[1]
+            report.files.append({
+                'file_path': file_path,
+                'resources': resources,
+                'original_bytes': original_bytes,
+                'stored_bytes': stored_bytes,
+                'unique_bytes': unique,
+                'shared_bytes': original_bytes - unique,
+                'shared_fraction': round((original_bytes - unique) / original_bytes, 4) if original_bytes else 0.0,
+            })
+
+        report.pair_count = len(pairs)
+        top = sorted(pairs.items(), key=lambda item: item[1][1], reverse=True)[:max_pairs]
+        for (a, b), (count, original) in top:
+            original_a, original_b = files[a][2], files[b][2]
+            report.pairs.append({
+                'file_a': files[a][0],
+                'file_b': files[b][0],
+                'resources': count,
+                'shared_bytes': original,
+                'fraction_a': round(original / original_a, 4) if original_a else 0.0,
+                'fraction_b': round(original / original_b, 4) if original_b else 0.0,
+            })
+        return report
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class DedupAnalyzer:
+    """여러 WIM 파일의 리소스 중복 분석 (Qt 비의존)
+
+    파일별 lookup 테이블을 스레드 풀에서 읽어 색인에 반영하고 보고서를 만든다.
+    색인된 뒤 바뀌지 않은(크기/수정 시각/GUID가 같은) 파일은 다시 읽지 않는다.
+    """
+
+    def __init__(self, index, max_workers=None, log=None):
+        self.index = index
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        self.log = log or (lambda message, **fields: None)  # log(message, level=, file=, stage=, duration=)
+
+    def analyze(self, file_paths, on_progress=None, should_stop=None, force=False, max_pairs=DEFAULT_MAX_PAIRS):
+        """색인 갱신 후 보고서 반환 (중지되면 None)"""
+        self.update(file_paths, on_progress=on_progress, should_stop=should_stop, force=force)
+        if should_stop is not None and should_stop():
+            return None
+        started = time.perf_counter()
+        report = self.index.report(file_paths, max_pairs=max_pairs)
+        self.log(f"중복 분석 완료: 파일 {len(report.files)}개, 공유하는 파일 쌍 {report.pair_count}개",
+                 level='debug', stage='dedup-report', duration=time.perf_counter() - started)
+        return report
+
+    def update(self, file_paths, on_progress=None, should_stop=None, force=False):
+        """바뀐 파일만 lookup 테이블을 다시 읽어 색인에 반영 (다시 읽은 파일 수 반환)
+
+        on_progress(done, total, file_path): 파일 하나를 처리할 때마다 호출
+        """
+        should_stop = should_stop or (lambda: False)
+        total = len(file_paths)
+        done = indexed = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='wim-dedup') as pool:
+            futures = {pool.submit(self._read_if_changed, path, should_stop, force): path for path in file_paths}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                done += 1
+                try:
+                    result = future.result()
+                except (OSError, WimFormatError) as e:
+                    # 읽을 수 없게 된 파일의 이전 내용이 보고서에 남지 않도록 색인에서 제거
+                    self.log(f"'{os.path.basename(file_path)}' lookup 테이블을 읽지 못했습니다: {e}",
+                             level='warning', file=file_path)
+                    self.index.remove([file_path])
+                    result = None
+                if result is not None:
+                    identity, resources = result
+                    self.index.store(file_path, identity, resources)
+                    indexed += 1
+                if on_progress is not None:
+                    on_progress(done, total, file_path)
+                if should_stop():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        if indexed:
+            self.log(f"{indexed}개 파일의 lookup 테이블을 색인했습니다 ({total - indexed}개는 변경 없음 또는 실패).")
+        return indexed
+
+    def _read_if_changed(self, file_path, should_stop, force):
+        """색인 이후 바뀐 파일이면 (식별 정보, 리소스 목록), 아니면 None"""
+        if should_stop():
+            return None
+        if not force:
+            st = os.stat(file_path)
+            stored = self.index.identity(file_path)
+            if stored is not None and stored[:2] == (st.st_size, st.st_mtime_ns):
+                with open(file_path, 'rb') as f:
+                    guid = str(WimHeader.unpack(f.read(WIM_HEADER_SIZE)).guid)
+                if stored[2] == guid:
+                    return None
+        started = time.perf_counter()
+        identity, resources = read_resources(file_path)
+        self.log(f"'{os.path.basename(file_path)}' 리소스 {len(resources)}개 색인", level='debug', file=file_path,
+                 stage='dedup-index', duration=time.perf_counter() - started)
+        return identity, resources
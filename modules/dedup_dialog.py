@@ -0,0 +1,124 @@
+import os
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QFileDialog, QMessageBox)
+from PyQt6.QtCore import Qt
+
+from modules.dedup import write_report
+from modules.wim_list_model import format_size
+
+
+class NumberItem(QTableWidgetItem):
+    """표시 문자열과 별개로 숫자 값으로 정렬하는 항목"""
+
+    def __init__(self, text, value):
+        super().__init__(text)
+        self.value = value
+        self.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+    def __lt__(self, other):
+        if isinstance(other, NumberItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+class DedupReportDialog(QDialog):
+    """중복 분석 결과 (요약, 파일별 공유 비율, 파일 쌍별 공유 크기)와 보고서 저장"""
+
+    def __init__(self, report, parent=None):
+        super().__init__(parent)
+        self.report = report
+        self.setWindowTitle("리소스 중복 분석")
+        self.resize(800, 500)
+
+        layout = QVBoxLayout()
+        summary = QLabel(self.summary_text())
+        summary.setObjectName("statusLabel")
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        tabs = QTabWidget()
+        tabs.addTab(self.create_files_table(), f"파일 ({len(report.files)})")
+        pairs_title = f"공유 파일 쌍 ({len(report.pairs)}"
+        pairs_title += f"/{report.pair_count})" if report.pair_count > len(report.pairs) else ")"
+        tabs.addTab(self.create_pairs_table(), pairs_title)
+        layout.addWidget(tabs, 1)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        save_btn = QPushButton("💾 보고서 저장")
+        save_btn.clicked.connect(self.save_report)
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(save_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def summary_text(self):
+        report = self.report
+        lines = [
+            f"파일 {len(report.files)}개 · 리소스 {report.resources:,}개 (고유 {report.unique_resources:,}개)",
+            f"하나의 다중 인덱스 이미지로 합치면 {format_size(report.stored_bytes)} → "
+            f"{format_size(report.merged_stored_bytes)} ({format_size(report.savings_bytes)}, "
+            f"{report.savings_fraction:.1%} 절약)",
+        ]
+        if report.missing:
+            lines.append(f"lookup 테이블을 읽지 못한 파일 {len(report.missing)}개는 제외되었습니다.")
+        return "\n".join(lines)
+
+    def create_table(self, titles, rows):
+        """rows: [[QTableWidgetItem, ...], ...]"""
+        table = QTableWidget(len(rows), len(titles))
+        table.setHorizontalHeaderLabels(titles)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().hide()
+        for row, items in enumerate(rows):
+            for column, item in enumerate(items):
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    def create_files_table(self):
+        rows = []
+        for item in self.report.files:
+            name = QTableWidgetItem(os.path.basename(item['file_path']))
+            name.setToolTip(item['file_path'])
+            rows.append([
+                name,
+                NumberItem(f"{item['resources']:,}", item['resources']),
+                NumberItem(format_size(item['original_bytes']), item['original_bytes']),
+                NumberItem(format_size(item['unique_bytes']), item['unique_bytes']),
+                NumberItem(f"{item['shared_fraction']:.1%}", item['shared_fraction']),
+            ])
+        return self.create_table(('파일', '리소스', '원본 크기', '고유 크기', '공유 비율'), rows)
+
+    def create_pairs_table(self):
+        rows = []
+        for pair in self.report.pairs:
+            names = QTableWidgetItem(f"{os.path.basename(pair['file_a'])} ↔ {os.path.basename(pair['file_b'])}")
+            names.setToolTip(f"{pair['file_a']}\n{pair['file_b']}")
+            rows.append([
+                names,
+                NumberItem(f"{pair['resources']:,}", pair['resources']),
+                NumberItem(format_size(pair['shared_bytes']), pair['shared_bytes']),
+                NumberItem(f"{pair['fraction_a']:.1%}", pair['fraction_a']),
+                NumberItem(f"{pair['fraction_b']:.1%}", pair['fraction_b']),
+            ])
+        return self.create_table(('파일 쌍', '공유 리소스', '공유 크기', '왼쪽 대비', '오른쪽 대비'), rows)
+
+    def save_report(self):
+        """보고서를 JSON 또는 CSV로 저장"""
+        path, _ = QFileDialog.getSaveFileName(self, "중복 분석 보고서 저장", "dedup_report.json",
+                                              "JSON (*.json);;CSV (*.csv)")
+        if not path:
+            return
+        try:
+            write_report(self.report, path)
+        except OSError as e:
+            QMessageBox.warning(self, "저장 실패", f"보고서를 저장하지 못했습니다: {e}")
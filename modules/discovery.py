@@ -0,0 +1,135 @@
+import fnmatch
+import os
+import re
+
+# 스캔 대상 이미지 확장자
+DEFAULT_EXTENSIONS = ('.wim', '.esd', '.swm')
+
+# 하위 폴더 탐색 깊이 기본 상한 (0이면 선택한 폴더만)
+DEFAULT_MAX_DEPTH = 16
+
+# 분할 이미지 이름 규칙: install.swm, install2.swm, install3.swm ...
+_SWM_PART_RE = re.compile(r'^(?P<base>.*?)(?P<number>\d*)\.swm$', re.IGNORECASE)
+
+
+class ImageCandidate:
+    """탐색된 이미지 파일 (분할 이미지는 첫 번째 파트 기준으로 묶음)"""
+    __slots__ = ('path', 'stat', 'parts', 'size')
+
+    def __init__(self, path, stat, parts=None, size=None):
+        self.path = path
+        self.stat = stat              # scandir이 반환한 stat 결과 (재사용)
+        self.parts = parts or [path]  # 분할 이미지 파트 경로 (순서대로)
+        self.size = stat.st_size if size is None else size
+
+    @property
+    def is_split(self):
+        return len(self.parts) > 1
+
+    def __repr__(self):
+        return f"ImageCandidate({self.path!r}, parts={len(self.parts)}, size={self.size})"
+
+
+def _matches(patterns, rel_path, name):
+    """glob 패턴이 상대 경로 또는 파일 이름과 일치하는지 확인"""
+    return any(fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def _group_split_parts(entries):
+    """같은 폴더의 .swm 파일을 분할 이미지 단위로 묶어 ImageCandidate 생성"""
+    groups = {}
+    for entry, st in entries:
+        match = _SWM_PART_RE.match(entry.name)
+        base = match.group('base').lower()
+        number = int(match.group('number') or 1)
+        groups.setdefault(base, []).append((number, entry, st))
+
+    for base in sorted(groups):
+        parts = sorted(groups[base], key=lambda part: part[0])
+        first_number, first_entry, first_stat = parts[0]
+        if first_number != 1:
+            # 첫 번째 파트가 없으면 각각 독립 이미지로 취급 (헤더로 판별 불가)
+            for number, entry, st in parts:
+                yield ImageCandidate(entry.path, st)
+            continue
+        yield ImageCandidate(
+            first_entry.path,
+            first_stat,
+            parts=[entry.path for number, entry, st in parts],
+            size=sum(st.st_size for number, entry, st in parts)
+        )
+
+
+def discover_images(root, max_depth=DEFAULT_MAX_DEPTH, include=None, exclude=None,
+                    extensions=DEFAULT_EXTENSIONS, group_split=True, follow_symlinks=True,
+                    on_error=None):
+    """폴더를 재귀 탐색하며 이미지 후보(ImageCandidate)를 하나씩 반환하는 제너레이터
+
+    - max_depth: 하위 폴더 깊이 제한 (None이면 무제한, 0이면 root만)
+    - include/exclude: root 기준 상대 경로 또는 파일 이름에 대한 glob 패턴 목록
+      (exclude는 폴더에도 적용되어 해당 하위 트리 전체를 건너뜀)
+    - group_split: .swm 분할 이미지를 첫 번째 파트 하나로 묶을지 여부
+    - follow_symlinks: 심볼릭 링크/정션 폴더를 따라갈지 여부 (순환은 항상 차단)
+    """
+    include = list(include or [])
+    exclude = list(exclude or [])
+    extensions = tuple(ext.lower() for ext in extensions)
+    on_error = on_error or (lambda path, error: None)
+
+    # 이미 방문한 폴더 (st_dev, st_ino) - 심볼릭 링크 순환 방지
+    visited = set()
+    try:
+        root_stat = os.stat(root)
+        visited.add((root_stat.st_dev, root_stat.st_ino))
+    except OSError as e:
+        on_error(root, e)
+        return
+
+    stack = [(root, 0)]
+    while stack:
+        dir_path, depth = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name.lower())
+        except OSError as e:
+            on_error(dir_path, e)
+            continue
+
+        sub_dirs = []
+        split_entries = []
+        for entry in entries:
+            rel_path = os.path.relpath(entry.path, root).replace(os.sep, '/')
+            if exclude and _matches(exclude, rel_path, entry.name):
+                continue
+
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if max_depth is None or depth < max_depth:
+                        st = entry.stat(follow_symlinks=True)
+                        key = (st.st_dev, st.st_ino)
+                        if key not in visited:
+                            visited.add(key)
+                            sub_dirs.append(entry.path)
+                    continue
+
+                if not entry.name.lower().endswith(extensions):
+                    continue
+                if include and not _matches(include, rel_path, entry.name):
+                    continue
+                if not entry.is_file(follow_symlinks=follow_symlinks):
+                    continue
+                st = entry.stat(follow_symlinks=True)
+            except OSError as e:
+                on_error(entry.path, e)
+                continue
+
+            if group_split and entry.name.lower().endswith('.swm'):
+                split_entries.append((entry, st))
+            else:
+                yield ImageCandidate(entry.path, st)
+
+        yield from _group_split_parts(split_entries)
+
+        # 이름순으로 탐색되도록 역순으로 스택에 추가
+        for sub_dir in reversed(sub_dirs):
+            stack.append((sub_dir, depth + 1))
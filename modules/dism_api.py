@@ -0,0 +1,390 @@
+import ctypes
+import os
+import threading
+from contextlib import contextmanager
+from ctypes import POINTER, Structure, byref, c_int32, c_uint16, c_uint32, c_uint64, c_void_p, c_wchar_p
+from datetime import datetime
+
+# DISM API(dismapi.dll) ctypes 바인딩 (Windows 전용, Qt 비의존)
+# 상주 DISM 도우미(modules.dism_helper.ApiBackend)가 dism.exe를 실행하지 않고 이미지 정보 조회,
+# 마운트/마운트 해제, 패키지 추가/조회를 같은 프로세스에서 직접 호출할 때 사용한다.
+# 결과는 영어 DISM 출력과 같은 형식의 텍스트로 만들어 기존 파서(modules.dism_parser)를 그대로 쓴다.
+# 구조체는 dismapi.h와 같이 1바이트 정렬(#pragma pack(1))이다.
+
+DISM_LOG_ERRORS = 0
+DISM_IMAGE_INDEX = 0          # DismImageIdentifier: 인덱스로 이미지 지정
+DISM_MOUNT_READWRITE = 0
+DISM_MOUNT_READONLY = 1
+DISM_COMMIT_IMAGE = 0
+DISM_DISCARD_IMAGE = 1
+
+E_ABORT = 0x80004004
+E_CANCELLED = 0x800704C7       # HRESULT_FROM_WIN32(ERROR_CANCELLED)
+CANCELLED_HRESULTS = (E_ABORT, E_CANCELLED)
+
+ARCHITECTURES = {0: 'x86', 5: 'arm', 6: 'ia64', 9: 'x64', 12: 'arm64'}
+
+PACKAGE_STATES = ('Not Present', 'Uninstall Pending', 'Staged', 'Removed', 'Installed',
+                  'Install Pending', 'Superseded', 'Partially Installed')
+
+RELEASE_TYPES = ('Critical Update', 'Driver', 'Feature Pack', 'Hotfix', 'Security Update',
+                 'Software Update', 'Update', 'Update Rollup', 'Language Pack', 'Foundation',
+                 'Service Pack', 'Product', 'Local Pack', 'Other', 'On Demand Pack')
+
+
+class SYSTEMTIME(Structure):
+    _fields_ = [
+        ('wYear', c_uint16), ('wMonth', c_uint16), ('wDayOfWeek', c_uint16), ('wDay', c_uint16),
+        ('wHour', c_uint16), ('wMinute', c_uint16), ('wSecond', c_uint16), ('wMilliseconds', c_uint16),
+    ]
+
+
+class DismString(Structure):
+    _pack_ = 1
+    _fields_ = [('Value', c_wchar_p)]
+
+
+class DismPackage(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('PackageName', c_wchar_p),
+        ('PackageState', c_int32),
+        ('ReleaseType', c_int32),
+        ('InstallTime', SYSTEMTIME),
+    ]
+
+
+class DismWimCustomizedInfo(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('Size', c_uint32),
+        ('DirectoryCount', c_uint32),
+        ('FileCount', c_uint32),
+        ('CreatedTime', SYSTEMTIME),
+        ('ModifiedTime', SYSTEMTIME),
+    ]
+
+
+class DismImageInfo(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('ImageType', c_int32),
+        ('ImageIndex', c_uint32),
+        ('ImageName', c_wchar_p),
+        ('ImageDescription', c_wchar_p),
+        ('ImageSize', c_uint64),
+        ('Architecture', c_uint32),
+        ('ProductName', c_wchar_p),
+        ('EditionId', c_wchar_p),
+        ('InstallationType', c_wchar_p),
+        ('Hal', c_wchar_p),
+        ('ProductType', c_wchar_p),
+        ('ProductSuite', c_wchar_p),
+        ('MajorVersion', c_uint32),
+        ('MinorVersion', c_uint32),
+        ('Build', c_uint32),
+        ('SpBuild', c_uint32),
+        ('SpLevel', c_uint32),
+        ('Bootable', c_int32),
+        ('SystemRoot', c_wchar_p),
+        ('Language', POINTER(DismString)),
+        ('LanguageCount', c_uint32),
+        ('DefaultLanguageIndex', c_uint32),
+        ('CustomizedInfo', c_void_p),
+    ]
+
+
+class DismApiError(RuntimeError):
+    """DISM API 호출 실패 (hresult는 부호 없는 32비트 값, 라이브러리를 불러오지 못했으면 None)"""
+
+    def __init__(self, hresult, message):
+        super().__init__(message)
+        self.hresult = hresult
+        self.message = message
+
+    @property
+    def cancelled(self):
+        return self.hresult in CANCELLED_HRESULTS
+
+    @property
+    def returncode(self):
+        """dism.exe 종료 코드처럼 쓸 값 (HRESULT를 부호 있는 32비트로)"""
+        if self.hresult is None:
+            return -1
+        return self.hresult - 0x100000000 if self.hresult & 0x80000000 else self.hresult
+
+
+def _systemtime(value):
+    """SYSTEMTIME -> datetime (비어 있거나 잘못된 값이면 None)"""
+    try:
+        return datetime(value.wYear, value.wMonth, value.wDay, value.wHour, value.wMinute, value.wSecond)
+    except ValueError:
+        return None
+
+
+def image_to_dict(info):
+    """DismImageInfo -> dict (DismDelete로 해제하기 전에 값을 복사)"""
+    languages = [info.Language[i].Value or '' for i in range(info.LanguageCount)] if info.Language else []
+    image = {
+        'index': info.ImageIndex,
+        'name': info.ImageName or '',
+        'description': info.ImageDescription or '',
+        'size': info.ImageSize,
+        'architecture': ARCHITECTURES.get(info.Architecture, str(info.Architecture)),
+        'edition': info.EditionId or '',
+        'installation': info.InstallationType or '',
+        'product_type': info.ProductType or '',
+        'product_suite': info.ProductSuite or '',
+        'hal': info.Hal or '',
+        'system_root': info.SystemRoot or '',
+        'version': f"{info.MajorVersion}.{info.MinorVersion}.{info.Build}",
+        'spbuild': info.SpBuild,
+        'splevel': info.SpLevel,
+        'bootable': info.Bootable == 0,
+        'languages': languages,
+        'default_language': info.DefaultLanguageIndex,
+        'directories': None,
+        'files': None,
+        'created': None,
+        'modified': None,
+    }
+    if info.CustomizedInfo:
+        custom = ctypes.cast(info.CustomizedInfo, POINTER(DismWimCustomizedInfo)).contents
+        image.update(directories=custom.DirectoryCount, files=custom.FileCount,
+                     created=_systemtime(custom.CreatedTime), modified=_systemtime(custom.ModifiedTime))
+    return image
+
+
+def package_to_dict(package):
+    """DismPackage -> dict"""
+    state, release = package.PackageState, package.ReleaseType
+    return {
+        'identity': package.PackageName or '',
+        'state': PACKAGE_STATES[state] if 0 <= state < len(PACKAGE_STATES) else str(state),
+        'release_type': RELEASE_TYPES[release] if 0 <= release < len(RELEASE_TYPES) else str(release),
+        'install_time': _systemtime(package.InstallTime),
+    }
+
+
+def _clock(value):
+    """12시간제 시각 (DISM 출력과 같이 시는 앞에 0을 붙이지 않음)"""
+    return f"{value.hour % 12 or 12}:{value:%M:%S} {'AM' if value.hour < 12 else 'PM'}"
+
+
+def format_image_info(image_path, images, detail=False):
+    """/Get-WimInfo 출력 형식의 텍스트 줄 목록 (detail이면 /Index를 지정한 상세 형식)"""
+    lines = ["Details for image : " + image_path, ""]
+    for image in images:
+        lines += [
+            f"Index : {image['index']}",
+            f"Name : {image['name']}",
+            f"Description : {image['description']}",
+            f"Size : {image['size']:,} bytes",
+        ]
+        if detail:
+            lines += [
+                f"WIM Bootable : {'Yes' if image['bootable'] else 'No'}",
+                f"Architecture : {image['architecture']}",
+                f"Hal : {image['hal'] or '<undefined>'}",
+                f"Version : {image['version']}",
+                f"ServicePack Build : {image['spbuild']}",
+                f"ServicePack Level : {image['splevel']}",
+                f"Edition : {image['edition']}",
+                f"Installation : {image['installation']}",
+                f"ProductType : {image['product_type']}",
+                f"ProductSuite : {image['product_suite']}",
+                f"System Root : {image['system_root']}",
+            ]
+            if image['directories'] is not None:
+                lines += [f"Directories : {image['directories']}", f"Files : {image['files']}"]
+            if image['created'] is not None:
+                lines.append(f"Created : {image['created']:%Y-%m-%d} - {_clock(image['created'])}")
+            if image['modified'] is not None:
+                lines.append(f"Modified : {image['modified']:%Y-%m-%d} - {_clock(image['modified'])}")
+            if image['languages']:
+                lines.append("Languages :")
+                for i, language in enumerate(image['languages']):
+                    lines.append(f"        {language}" + (" (Default)" if i == image['default_language'] else ""))
+        lines.append("")
+    return lines
+
+
+def format_packages(packages):
+    """/Get-Packages 출력 형식의 텍스트 줄 목록"""
+    lines = ["Packages listing:", ""]
+    for package in packages:
+        installed = package['install_time']
+        lines += [
+            f"Package Identity : {package['identity']}",
+            f"State : {package['state']}",
+            f"Release Type : {package['release_type']}",
+            "Install Time : " + (f"{installed.month}/{installed.day}/{installed.year} "
+                                 f"{installed.hour % 12 or 12}:{installed:%M} {'AM' if installed.hour < 12 else 'PM'}"
+                                 if installed else ""),
+            "",
+        ]
+    return lines
+
+
+class DismApi:
+    """dismapi.dll 래퍼 (프로세스마다 하나, initialize() 후 사용하고 끝나면 shutdown())
+
+    세션은 호출마다 열고 닫는다. 열린 세션이 남아 있으면 같은 마운트 폴더를 해제할 수 없기 때문이다.
+    진행률 콜백과 취소 이벤트를 받는 호출은 on_progress(current, total)와 threading.Event를 받는다.
+    """
+
+    CANCEL_POLL = 0.05  # threading.Event를 Win32 이벤트로 옮기는 주기(초)
+
+    def __init__(self, dll_path='dismapi.dll'):
+        if os.name != 'nt':
+            raise DismApiError(None, "DISM API는 Windows에서만 사용할 수 있습니다.")
+        try:
+            self.dll = ctypes.WinDLL(dll_path)
+        except OSError as e:
+            raise DismApiError(None, f"dismapi.dll을 불러오지 못했습니다: {e}") from e
+        self.dll_path = dll_path
+        self.initialized = False
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._progress_type = ctypes.WINFUNCTYPE(None, c_uint32, c_uint32, c_void_p)
+        self._declare()
+
+    def _declare(self):
+        dll, kernel32, progress = self.dll, self._kernel32, self._progress_type
+        signatures = {
+            'DismInitialize': [c_int32, c_wchar_p, c_wchar_p],
+            'DismShutdown': [],
+            'DismDelete': [c_void_p],
+            'DismGetLastErrorMessage': [POINTER(POINTER(DismString))],
+            'DismGetImageInfo': [c_wchar_p, POINTER(POINTER(DismImageInfo)), POINTER(c_uint32)],
+            'DismMountImage': [c_wchar_p, c_wchar_p, c_uint32, c_wchar_p, c_int32, c_uint32,
+                               c_void_p, progress, c_void_p],
+            'DismUnmountImage': [c_wchar_p, c_uint32, c_void_p, progress, c_void_p],
+            'DismRemountImage': [c_wchar_p],
+            'DismCleanupMountpoints': [],
+            'DismOpenSession': [c_wchar_p, c_wchar_p, c_wchar_p, POINTER(c_uint32)],
+            'DismCloseSession': [c_uint32],
+            'DismAddPackage': [c_uint32, c_wchar_p, c_int32, c_int32, c_void_p, progress, c_void_p],
+            'DismGetPackages': [c_uint32, POINTER(POINTER(DismPackage)), POINTER(c_uint32)],
+        }
+        for name, argtypes in signatures.items():
+            function = getattr(dll, name)
+            function.argtypes = argtypes
+            function.restype = c_int32
+        kernel32.CreateEventW.argtypes = [c_void_p, c_int32, c_int32, c_wchar_p]
+        kernel32.CreateEventW.restype = c_void_p
+        kernel32.SetEvent.argtypes = [c_void_p]
+        kernel32.CloseHandle.argtypes = [c_void_p]
+
+    def initialize(self):
+        if not self.initialized:
+            self._check(self.dll.DismInitialize(DISM_LOG_ERRORS, None, None), "DismInitialize")
+            self.initialized = True
+
+    def shutdown(self):
+        if self.initialized:
+            self.initialized = False
+            self.dll.DismShutdown()
+
+    def last_error_message(self):
+        text = POINTER(DismString)()
+        if self.dll.DismGetLastErrorMessage(byref(text)) < 0 or not text:
+            return ''
+        try:
+            return (text.contents.Value or '').strip()
+        finally:
+            self.dll.DismDelete(text)
+
+    def _check(self, hresult, operation):
+        if hresult >= 0:
+            return hresult
+        code = hresult & 0xFFFFFFFF
+        if code in CANCELLED_HRESULTS:
+            raise DismApiError(code, "취소되었습니다.")
+        raise DismApiError(code, self.last_error_message() or f"{operation} 실패 (0x{code:08x})")
+
+    @contextmanager
+    def _operation(self, cancel_event, on_progress):
+        """(Win32 취소 이벤트, 진행률 콜백) 준비 (cancel_event가 set되면 Win32 이벤트도 set)"""
+        handle = self._kernel32.CreateEventW(None, True, False, None)
+        if not handle:
+            raise DismApiError(None, f"취소 이벤트를 만들지 못했습니다: {ctypes.get_last_error()}")
+        done = threading.Event()
+
+        def watch():
+            while not done.wait(self.CANCEL_POLL):
+                if cancel_event.is_set():
+                    self._kernel32.SetEvent(handle)
+                    return
+
+        def report(current, total, _user_data):
+            try:
+                on_progress(current, total)
+            except Exception:
+                pass  # 콜백 예외가 DISM 호출 스택으로 넘어가지 않도록
+
+        watcher = None
+        if cancel_event is not None:
+            watcher = threading.Thread(target=watch, name='dism-api-cancel', daemon=True)
+            watcher.start()
+        callback = self._progress_type(report) if on_progress is not None else self._progress_type()
+        try:
+            yield handle, callback
+        finally:
+            done.set()
+            if watcher is not None:
+                watcher.join()
+            self._kernel32.CloseHandle(handle)
+
+    @contextmanager
+    def session(self, image_dir):
+        """마운트된 이미지 세션 (블록이 끝나면 바로 닫음)"""
+        handle = c_uint32()
+        self._check(self.dll.DismOpenSession(image_dir, None, None, byref(handle)), "DismOpenSession")
+        try:
+            yield handle.value
+        finally:
+            self.dll.DismCloseSession(handle.value)
+
+    def image_info(self, image_path):
+        """WIM 파일의 이미지 목록 (dict 목록)"""
+        infos, count = POINTER(DismImageInfo)(), c_uint32()
+        self._check(self.dll.DismGetImageInfo(image_path, byref(infos), byref(count)), "DismGetImageInfo")
+        try:
+            return [image_to_dict(infos[i]) for i in range(count.value)]
+        finally:
+            self.dll.DismDelete(infos)
+
+    def mount(self, image_path, mount_dir, index, read_only=False, cancel_event=None, on_progress=None):
+        flags = DISM_MOUNT_READONLY if read_only else DISM_MOUNT_READWRITE
+        with self._operation(cancel_event, on_progress) as (handle, callback):
+            self._check(self.dll.DismMountImage(image_path, mount_dir, index, None, DISM_IMAGE_INDEX, flags,
+                                                handle, callback, None), "DismMountImage")
+
+    def unmount(self, mount_dir, commit, cancel_event=None, on_progress=None):
+        flags = DISM_COMMIT_IMAGE if commit else DISM_DISCARD_IMAGE
+        with self._operation(cancel_event, on_progress) as (handle, callback):
+            self._check(self.dll.DismUnmountImage(mount_dir, flags, handle, callback, None), "DismUnmountImage")
+
+    def remount(self, mount_dir):
+        self._check(self.dll.DismRemountImage(mount_dir), "DismRemountImage")
+
+    def cleanup_mountpoints(self):
+        self._check(self.dll.DismCleanupMountpoints(), "DismCleanupMountpoints")
+
+    def add_package(self, image_dir, package_path, ignore_check=False, prevent_pending=False,
+                    cancel_event=None, on_progress=None):
+        with self.session(image_dir) as session:
+            with self._operation(cancel_event, on_progress) as (handle, callback):
+                self._check(self.dll.DismAddPackage(session, package_path, bool(ignore_check),
+                                                    bool(prevent_pending), handle, callback, None),
+                            "DismAddPackage")
+
+    def packages(self, image_dir):
+        """마운트된 이미지의 패키지 목록 (dict 목록)"""
+        with self.session(image_dir) as session:
+            items, count = POINTER(DismPackage)(), c_uint32()
+            self._check(self.dll.DismGetPackages(session, byref(items), byref(count)), "DismGetPackages")
+            try:
+                return [package_to_dict(items[i]) for i in range(count.value)]
+            finally:
+                self.dll.DismDelete(items)
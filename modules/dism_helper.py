@@ -0,0 +1,345 @@
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+
+from modules.runner import SubprocessRunner, CommandResult
+
+# 상주 DISM 도우미 프로세스 (helper_pool.HelperPool이 시작하고 표준 입출력 파이프로 요청을 보냄)
+#
+# 프레임: 4바이트 little-endian 길이 + UTF-8 JSON 객체
+#   요청  {"op": "run", "id": N, "args": [...], "encoding": "utf-8"}
+#         {"op": "cancel", "id": N}      실행 중이거나 대기 중인 요청 취소
+#         {"op": "shutdown"}             남은 요청을 처리하고 종료 (입력 파이프가 닫혀도 같음)
+#   응답  {"type": "hello", "pid": P, "backend": "dismapi", "resident": true}   시작 직후 한 번
+#         {"type": "started", "id": N}                    요청 실행 시작 (앞의 요청이 끝난 뒤)
+#         {"type": "output", "id": N, "line": "..."}      표준 출력 한 줄 (실행 중에)
+#         {"type": "result", "id": N, "returncode": 0, "stdout": "...", "stderr": "...",
+#          "timed_out": false, "cancelled": false}
+# 요청은 받은 순서대로 하나씩 실행하며, 클라이언트는 앞의 응답을 기다리지 않고 다음 요청을 보낼 수 있다.
+# 기본 백엔드(ApiBackend)는 DISM API(dismapi.dll)를 도우미 프로세스 안에서 한 번만 초기화해 두고 호출한다.
+# DISM API를 쓸 수 없으면 명령을 그대로 실행하는 ExecBackend로 시작하며, hello의 resident가 false이므로
+# 풀은 이 도우미를 쓰지 않고 프로세스 직접 실행으로 돌아간다 (도우미를 거치는 비용만 늘어나므로).
+
+SERVE_FLAG = '--dism-helper'  # KdicUpdater.py를 도우미로 실행하는 인자 (PyInstaller 빌드용, KdicUpdater.DISM_HELPER_FLAG)
+
+FRAME_HEADER = struct.Struct('<I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024  # 출력이 아주 큰 명령도 한 프레임에 들어가도록
+
+
+class ProtocolError(ValueError):
+    """잘못된 프레임"""
+    pass
+
+
+def write_frame(stream, message):
+    """메시지(dict) 하나를 프레임으로 쓰기 (여러 스레드에서 쓰면 호출자가 잠금)"""
+    body = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"프레임이 너무 큽니다: {len(body)}바이트")
+    stream.write(FRAME_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+
+def read_frame(stream):
+    """프레임 하나를 읽어 dict로 반환 (스트림이 닫혔으면 None)"""
+    header = _read_exact(stream, FRAME_HEADER.size)
+    if header is None:
+        return None
+    size, = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"프레임이 너무 큽니다: {size}바이트")
+    body = _read_exact(stream, size)
+    if body is None:
+        raise ProtocolError("프레임 중간에 스트림이 닫혔습니다.")
+    message = json.loads(body.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ProtocolError("프레임이 JSON 객체가 아닙니다.")
+    return message
+
+
+def _read_exact(stream, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ProtocolError("프레임 중간에 스트림이 닫혔습니다.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+class ExecBackend:
+    """요청의 명령을 그대로 실행하는 백엔드 (취소 시 프로세스 트리 종료, 상주 이점 없음)"""
+    name = 'exec'
+    resident = False
+
+    def run(self, args, on_output, cancel_event, encoding='utf-8'):
+        runner = SubprocessRunner(encoding=encoding, cancel_event=cancel_event)
+        return runner.run(args, on_output=on_output)
+
+
+def parse_dism_args(args):
+    """DISM 인자 -> (명령 이름 소문자, {옵션 이름 소문자: 값}, {플래그 소문자})
+
+    /WimFile:C:\\x.wim 처럼 첫 ':'에서 이름과 값을 나누고, 값이 없는 인자는 플래그로 본다.
+    """
+    command, options, flags = None, {}, set()
+    for arg in args:
+        if not arg.startswith('/'):
+            continue
+        name, sep, value = arg[1:].partition(':')
+        name = name.lower()
+        if sep:
+            options[name] = value
+        elif name in DISM_COMMANDS and command is None:
+            command = name
+        else:
+            flags.add(name)
+    return command, options, flags
+
+
+DISM_COMMANDS = {
+    'get-wiminfo': 'get_wim_info', 'get-imageinfo': 'get_wim_info',
+    'mount-wim': 'mount', 'mount-image': 'mount',
+    'unmount-wim': 'unmount', 'unmount-image': 'unmount',
+    'remount-wim': 'remount', 'remount-image': 'remount',
+    'cleanup-wim': 'cleanup_mountpoints', 'cleanup-mountpoints': 'cleanup_mountpoints',
+    'add-package': 'add_package',
+    'get-packages': 'get_packages',
+}
+
+
+class ApiBackend:
+    """DISM API를 도우미 프로세스에서 직접 호출하는 상주 백엔드
+
+    이미지 정보 조회, 마운트/해제/다시 마운트, 패키지 추가/조회는 dism.exe를 실행하지 않고 API로 처리하고
+    결과는 영어 DISM 출력과 같은 형식으로 돌려준다. 다른 명령(/Cleanup-Image, /Export-Image 등)이나
+    시스템 dism이 아닌 실행 파일(KDIC_DISM)은 ExecBackend로 그대로 실행한다.
+    """
+    name = 'dismapi'
+    resident = True
+
+    def __init__(self, api, fallback=None):
+        self.api = api
+        self.fallback = fallback or ExecBackend()
+
+    def close(self):
+        self.api.shutdown()
+
+    def run(self, args, on_output, cancel_event, encoding='utf-8'):
+        command, options, flags = parse_dism_args(args[1:])
+        handler = DISM_COMMANDS.get(command) if _is_system_dism(args[0]) else None
+        if handler is None:
+            return self.fallback.run(args, on_output, cancel_event, encoding)
+
+        from modules.dism_api import DismApiError
+
+        lines = []
+
+        def emit(line=''):
+            lines.append(line + '\n')
+            on_output(line)
+
+        progress = _ProgressReporter(emit)
+        emit("Deployment Image Servicing and Management tool")
+        emit()
+        try:
+            getattr(self, '_' + handler)(options, flags, emit, progress, cancel_event)
+        except DismApiError as e:
+            if e.cancelled or cancel_event.is_set():
+                return CommandResult(-1, ''.join(lines), "취소되었습니다.", cancelled=True)
+            emit(f"Error: 0x{e.hresult or 0:08x}")
+            emit()
+            emit(e.message)
+            return CommandResult(e.returncode, ''.join(lines), e.message)
+        except KeyError as e:
+            return CommandResult(87, ''.join(lines), f"필요한 옵션이 없습니다: /{e.args[0]}")
+        except ValueError as e:
+            return CommandResult(87, ''.join(lines), f"잘못된 옵션 값입니다: {e}")
+        emit("The operation completed successfully.")
+        return CommandResult(0, ''.join(lines), '')
+
+    def _get_wim_info(self, options, flags, emit, progress, cancel_event):
+        from modules.dism_api import DismApiError, format_image_info
+
+        path = options.get('wimfile') or options['imagefile']
+        images = self.api.image_info(path)
+        if 'index' in options:
+            images = [image for image in images if str(image['index']) == options['index'].strip()]
+            if not images:
+                raise DismApiError(0x80070057, f"이미지 인덱스를 찾을 수 없습니다: {options['index']}")
+        for line in format_image_info(path, images, detail='index' in options):
+            emit(line)
+
+    def _mount(self, options, flags, emit, progress, cancel_event):
+        path = options.get('wimfile') or options['imagefile']
+        emit("Mounting image")
+        self.api.mount(path, options['mountdir'], int(options['index']), 'readonly' in flags,
+                       cancel_event, progress)
+        progress.finish()
+
+    def _unmount(self, options, flags, emit, progress, cancel_event):
+        from modules.dism_api import DismApiError
+
+        commit = 'commit' in flags
+        if not commit and 'discard' not in flags:
+            raise DismApiError(0x80070057, "/Commit 또는 /Discard를 지정해야 합니다.")
+        emit("Saving image" if commit else "Unmounting image")
+        self.api.unmount(options['mountdir'], commit, cancel_event, progress)
+        progress.finish()
+
+    def _remount(self, options, flags, emit, progress, cancel_event):
+        self.api.remount(options['mountdir'])
+
+    def _cleanup_mountpoints(self, options, flags, emit, progress, cancel_event):
+        self.api.cleanup_mountpoints()
+
+    def _add_package(self, options, flags, emit, progress, cancel_event):
+        emit("Processing 1 of 1 - Adding package " + os.path.basename(options['packagepath']))
+        self.api.add_package(options['image'], options['packagepath'], 'ignorecheck' in flags,
+                             'preventpending' in flags, cancel_event, progress)
+        progress.finish()
+
+    def _get_packages(self, options, flags, emit, progress, cancel_event):
+        from modules.dism_api import format_packages
+
+        for line in format_packages(self.api.packages(options['image'])):
+            emit(line)
+
+
+class _ProgressReporter:
+    """DISM API 진행률 콜백 -> dism.exe와 같은 "[===  12.3%  ]" 줄 (0.1% 단위로 바뀔 때만)"""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.last = None
+
+    def __call__(self, current, total):
+        percent = min(100.0, current * 100.0 / total) if total else 0.0
+        text = f"{percent:.1f}"
+        if text != self.last:
+            self.last = text
+            bar = '=' * int(percent / 2)
+            self.emit(f"[{bar:<50}{text}%]")
+
+    def finish(self):
+        if self.last is not None and self.last != '100.0':
+            self(1, 1)
+
+
+def _is_system_dism(executable):
+    """인자의 실행 파일이 시스템 dism인지 (가짜 dism이나 ADK dism은 그 실행 파일로 실행)"""
+    name = os.path.basename(executable).lower()
+    if name not in ('dism', 'dism.exe'):
+        return False
+    folder = os.path.dirname(executable)
+    if not folder:
+        return True
+    system_root = os.environ.get('SystemRoot', r'C:\Windows')
+    return os.path.normcase(os.path.abspath(folder)) == os.path.normcase(os.path.join(system_root, 'System32'))
+
+
+def create_backend():
+    """DISM API를 쓸 수 있으면 ApiBackend, 아니면 ExecBackend (상주 이점이 없으므로 풀이 쓰지 않음)"""
+    from modules.dism_api import DismApi, DismApiError
+
+    try:
+        api = DismApi()
+        api.initialize()
+    except DismApiError:
+        return ExecBackend()
+    return ApiBackend(api)
+
+
+def serve(backend, stdin=None, stdout=None):
+    """입력 파이프가 닫히거나 shutdown 요청을 받을 때까지 요청 처리
+
+    읽기는 이 스레드에서, 실행은 별도 스레드에서 하므로 실행 중에도 취소 요청을 받을 수 있다.
+    """
+    stdin = stdin or os.fdopen(sys.stdin.fileno(), 'rb', buffering=0, closefd=False)
+    stdout = stdout or os.fdopen(sys.stdout.fileno(), 'wb', closefd=False)
+    write_lock = threading.Lock()
+    state_lock = threading.Lock()
+    requests = queue.Queue()
+    cancelled = set()   # 실행 전에 취소된 요청 id
+    current = {}        # 실행 중인 요청 id -> 취소 이벤트
+
+    def send(message):
+        with write_lock:
+            write_frame(stdout, message)
+
+    def execute():
+        while True:
+            request = requests.get()
+            if request is None:
+                return
+            request_id = request['id']
+            event = threading.Event()
+            with state_lock:
+                if request_id in cancelled:
+                    cancelled.discard(request_id)
+                    event.set()
+                current[request_id] = event
+            try:
+                if event.is_set():
+                    result = CommandResult(-1, '', "취소되었습니다.", cancelled=True)
+                else:
+                    send({'type': 'started', 'id': request_id})
+                    result = backend.run(
+                        request['args'],
+                        lambda line: send({'type': 'output', 'id': request_id, 'line': line}),
+                        event,
+                        request.get('encoding') or 'utf-8',
+                    )
+            except Exception as e:
+                result = CommandResult(-1, '', f"도우미에서 명령을 실행하지 못했습니다: {e}")
+            finally:
+                with state_lock:
+                    current.pop(request_id, None)
+            send({
+                'type': 'result', 'id': request_id, 'returncode': result.returncode,
+                'stdout': result.stdout, 'stderr': result.stderr,
+                'timed_out': result.timed_out, 'cancelled': result.cancelled,
+            })
+
+    send({'type': 'hello', 'pid': os.getpid(), 'backend': backend.name,
+          'resident': getattr(backend, 'resident', False)})
+    executor = threading.Thread(target=execute, name='helper-executor', daemon=True)
+    executor.start()
+    try:
+        while True:
+            message = read_frame(stdin)
+            if message is None or message.get('op') == 'shutdown':
+                break
+            if message.get('op') == 'run':
+                requests.put(message)
+            elif message.get('op') == 'cancel':
+                with state_lock:
+                    event = current.get(message.get('id'))
+                    if event is None:
+                        cancelled.add(message.get('id'))
+                if event is not None:
+                    event.set()
+    except (OSError, ProtocolError, ValueError):
+        pass  # 클라이언트가 사라짐
+    requests.put(None)
+    executor.join()
+    close = getattr(backend, 'close', None)
+    if close is not None:
+        close()
+    return 0
+
+
+def main(argv=None):
+    """python -m modules.dism_helper 또는 KdicUpdater.py --dism-helper로 실행"""
+    return serve(create_backend())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import re
+
+from modules.records import ImageRecord, InstalledPackage
+from modules.tracing import traced
+
+# DISM 출력 레이블 (영어/한국어) -> ImageRecord 필드
+# 레이블은 공백을 하나로 줄이고 소문자로 바꾼 형태로 비교한다.
+FIELD_LABELS = {
+    'index': 'index',
+    '인덱스': 'index',
+    'name': 'name',
+    '이름': 'name',
+    'description': 'description',
+    '설명': 'description',
+    'size': 'size',
+    '크기': 'size',
+    'architecture': 'architecture',
+    '아키텍처': 'architecture',
+    'version': 'version',
+    '버전': 'version',
+    'servicepack build': 'spbuild',
+    'service pack build': 'spbuild',
+    '서비스 팩 빌드': 'spbuild',
+}
+
+# DISM /Get-Packages 출력 레이블 (영어/한국어) -> InstalledPackage 필드
+PACKAGE_LABELS = {
+    'package identity': 'identity',
+    '패키지 id': 'identity',
+    'state': 'state',
+    '상태': 'state',
+    'release type': 'release_type',
+    '릴리스 유형': 'release_type',
+}
+
+# 패키지 상태
+PACKAGE_STATE_INSTALLED = 'installed'
+PACKAGE_STATE_SUPERSEDED = 'superseded'
+PACKAGE_STATE_INSTALL_PENDING = 'install_pending'
+PACKAGE_STATE_STAGED = 'staged'
+PACKAGE_STATE_UNINSTALL_PENDING = 'uninstall_pending'
+
+PACKAGE_STATES = {
+    'installed': PACKAGE_STATE_INSTALLED,
+    '설치됨': PACKAGE_STATE_INSTALLED,
+    'superseded': PACKAGE_STATE_SUPERSEDED,
+    '대체됨': PACKAGE_STATE_SUPERSEDED,
+    'install pending': PACKAGE_STATE_INSTALL_PENDING,
+    '설치 보류 중': PACKAGE_STATE_INSTALL_PENDING,
+    'staged': PACKAGE_STATE_STAGED,
+    '준비됨': PACKAGE_STATE_STAGED,
+    'uninstall pending': PACKAGE_STATE_UNINSTALL_PENDING,
+    '제거 보류 중': PACKAGE_STATE_UNINSTALL_PENDING,
+}
+
+_VERSION_RE = re.compile(r'^(\d+)\.(\d+)\.(\d+)(?:\.(\d+))?$')
+_NON_DIGIT_RE = re.compile(r'\D')
+_SPACE_RE = re.compile(r'\s+')
+
+
+@traced('dism.parse', 'scan')
+def parse_dism_output(output):
+    """DISM /Get-WimInfo 출력을 한 번만 훑어 인덱스별 ImageRecord 목록 반환
+
+    영어/한국어 출력 모두 지원하며, /Index 없이 조회한 목록 형식과
+    /Index:N 으로 조회한 상세 형식을 모두 처리한다.
+    첫 번째 '인덱스'(Index) 줄 이전의 내용(도구 버전 등)은 무시한다.
+    """
+    images = []
+    current = None
+
+    for line in output.splitlines():
+        label, sep, value = line.partition(':')
+        if not sep:
+            continue
+        field_name = FIELD_LABELS.get(_SPACE_RE.sub(' ', label.strip()).lower())
+        if field_name is None:
+            continue
+        value = value.strip()
+
+        if field_name == 'index':
+            try:
+                current = ImageRecord(int(value))
+            except ValueError:
+                current = None
+                continue
+            images.append(current)
+        elif current is None:
+            continue
+        elif field_name == 'version':
+            # 예: 10.0.22631 또는 10.0.22631.2861 (에디션 등 다른 값은 무시)
+            match = _VERSION_RE.match(value)
+            if match:
+                current.version = f"{match.group(1)}.{match.group(2)}"
+                current.build = match.group(3)
+                if match.group(4) and not current.spbuild:
+                    current.spbuild = match.group(4)
+        elif field_name == 'size':
+            # 예: 16,829,395,066 bytes / 16,829,395,066바이트
+            digits = _NON_DIGIT_RE.sub('', value)
+            current.size = int(digits) if digits else 0
+        else:
+            setattr(current, field_name, value)
+
+    return images
+
+
+def parse_package_list(output):
+    """DISM /Get-Packages 출력 -> InstalledPackage 목록 (영어/한국어 출력 모두 지원)"""
+    packages = []
+    current = None
+
+    for line in output.splitlines():
+        label, sep, value = line.partition(':')
+        if not sep:
+            continue
+        field_name = PACKAGE_LABELS.get(_SPACE_RE.sub(' ', label.strip()).lower())
+        if field_name is None:
+            continue
+        value = value.strip()
+
+        if field_name == 'identity':
+            current = InstalledPackage(value)
+            packages.append(current)
+        elif current is None:
+            continue
+        elif field_name == 'state':
+            current.state = PACKAGE_STATES.get(_SPACE_RE.sub(' ', value).lower(), value)
+        else:
+            current.release_type = value
+
+    return packages
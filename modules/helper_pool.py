@@ -0,0 +1,396 @@
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from modules.dism_helper import SERVE_FLAG, ProtocolError, read_frame, write_frame
+from modules.paths import get_app_dir
+from modules.runner import SubprocessRunner, CommandResult, POLL_INTERVAL, KILL_GRACE, kill_process_tree
+from modules.tracing import span, count
+
+# 상주 DISM 도우미 프로세스 풀 (Qt 비의존)
+# 명령마다 프로세스를 새로 만드는 대신 오래 실행되는 도우미(modules.dism_helper)에 파이프로 요청을 보낸다.
+# 도우미 하나는 요청을 순서대로 실행하고, 풀은 처리 중인 요청이 가장 적은 도우미에 새 요청을 넣는다.
+# 도우미가 비정상 종료되면 다음 요청 때 다시 시작하며, 연달아 실패하면 풀을 끄고 프로세스 직접 실행으로 돌아간다.
+# 도우미가 상주 백엔드(DISM API)를 쓸 수 없다고 알리면(hello의 resident가 false) 바로 풀을 끈다.
+# 그 도우미는 명령마다 dism.exe를 실행하므로 도우미를 거치는 비용만 더해지기 때문이다.
+
+HELPERS_ENV = 'KDIC_DISM_HELPERS'  # 도우미 수 (0 또는 없으면 사용 안 함)
+DEFAULT_POOL_SIZE = 2
+MAX_POOL_SIZE = 8
+
+START_TIMEOUT = 10.0   # 도우미가 hello를 보낼 때까지 기다리는 시간(초)
+CLOSE_TIMEOUT = 5.0    # 종료 요청 후 도우미가 끝나기를 기다리는 시간(초)
+MAX_FAILURES = 3       # 연속으로 이만큼 시작 실패/비정상 종료하면 풀 사용 중지
+
+
+class HelperError(RuntimeError):
+    """도우미를 시작할 수 없거나 풀을 사용할 수 없음 (호출자는 프로세스 직접 실행으로 대체)"""
+    pass
+
+
+def helper_command():
+    """도우미 실행 명령과 환경 변수 (PyInstaller 빌드면 실행 파일을 도우미 모드로 실행)"""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, SERVE_FLAG], None
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [get_app_dir(), env.get('PYTHONPATH')]))
+    return [sys.executable, '-m', 'modules.dism_helper'], env
+
+
+class HelperCall:
+    """도우미에 보낸 요청 하나"""
+    __slots__ = ('id', 'args', 'on_output', 'helper', 'started', 'result', 'crashed', 'done')
+
+    def __init__(self, call_id, args, on_output):
+        self.id = call_id
+        self.args = list(args)
+        self.on_output = on_output
+        self.helper = None
+        self.started = False   # 도우미가 실행을 시작함 (이후 비정상 종료되면 다시 실행하지 않음)
+        self.result = None     # CommandResult
+        self.crashed = False   # 결과를 받기 전에 도우미가 종료됨
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class HelperProcess:
+    """도우미 프로세스 하나 (요청 쓰기는 잠금으로 직렬화, 응답은 읽기 스레드가 요청별로 전달)"""
+
+    def __init__(self, command, env=None):
+        self.command = command
+        self.env = env
+        self.process = None
+        self.pid = None
+        self.backend = None
+        self.resident = False   # 명령을 프로세스 생성 없이 처리하는 백엔드인지 (hello로 받음)
+        self.alive = False
+        self._ready = threading.Event()
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._calls = {}  # id -> HelperCall (결과를 기다리는 요청)
+
+    @property
+    def load(self):
+        return len(self._calls)
+
+    def start(self):
+        """도우미를 시작하고 hello를 받을 때까지 대기"""
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True
+        try:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL, env=self.env, **kwargs)
+        except OSError as e:
+            raise HelperError(f"DISM 도우미를 시작하지 못했습니다: {e}") from e
+        self.alive = True
+        threading.Thread(target=self._read_responses, name='dism-helper-reader', daemon=True).start()
+        if not self._ready.wait(START_TIMEOUT) or not self.alive:
+            self.kill()
+            raise HelperError("DISM 도우미가 응답하지 않습니다.")
+
+    def submit(self, call):
+        """요청 보내기 (앞의 요청이 끝나기를 기다리지 않음)"""
+        with self._lock:
+            if not self.alive:
+                raise HelperError("DISM 도우미가 종료되었습니다.")
+            self._calls[call.id] = call
+        call.helper = self
+        try:
+            self._send({'op': 'run', 'id': call.id, 'args': call.args, 'encoding': 'utf-8'})
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self._calls.pop(call.id, None)
+            self.kill()
+            raise HelperError(f"DISM 도우미에 요청을 보내지 못했습니다: {e}") from e
+
+    def cancel(self, call):
+        """요청 취소 (도우미가 실행 중인 명령을 종료하고 cancelled 결과를 보냄)"""
+        try:
+            self._send({'op': 'cancel', 'id': call.id})
+        except (OSError, ValueError):
+            pass
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """남은 요청을 처리한 뒤 종료하도록 요청하고, 끝나지 않으면 강제 종료"""
+        if self.process is None:
+            return
+        try:
+            self._send({'op': 'shutdown'})
+            self.process.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        """도우미와 실행 중인 명령을 강제 종료 (기다리던 요청은 crashed로 끝남)"""
+        if self.process is not None:
+            kill_process_tree(self.process)
+
+    def _send(self, message):
+        with self._write_lock:
+            write_frame(self.process.stdin, message)
+
+    def _read_responses(self):
+        stream = self.process.stdout
+        try:
+            while True:
+                message = read_frame(stream)
+                if message is None:
+                    break
+                kind = message.get('type')
+                if kind == 'hello':
+                    self.pid = message.get('pid')
+                    self.backend = message.get('backend')
+                    self.resident = bool(message.get('resident', False))
+                    self._ready.set()
+                    continue
+                call = self._calls.get(message.get('id'))
+                if call is None:
+                    continue
+                if kind == 'started':
+                    call.started = True
+                elif kind == 'output':
+                    if call.on_output is not None:
+                        try:
+                            call.on_output(message.get('line', ''))
+                        except Exception:
+                            pass
+                elif kind == 'result':
+                    call.result = CommandResult(message.get('returncode', -1), message.get('stdout', ''),
+                                                message.get('stderr', ''), timed_out=message.get('timed_out', False),
+                                                cancelled=message.get('cancelled', False))
+                    with self._lock:
+                        self._calls.pop(call.id, None)
+                    call.done.set()
+        except (OSError, ValueError, ProtocolError):
+            pass
+        finally:
+            with self._lock:
+                self.alive = False
+                calls = list(self._calls.values())
+                self._calls.clear()
+            self._ready.set()
+            for call in calls:
+                call.crashed = True
+                call.done.set()
+            try:
+                self.process.wait(KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                self.kill()
+
+
+class HelperPool:
+    """크기가 제한된 DISM 도우미 풀 (여러 스레드에서 함께 사용)"""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, command=None, env=None):
+        self.size = max(1, min(int(size), MAX_POOL_SIZE))
+        if command is None:
+            command, env = helper_command()
+        self.command = command
+        self.env = env
+        self.broken = False   # 연속 실패로 사용 중지됨
+        self.restarts = 0     # 비정상 종료 후 다시 시작한 횟수
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._helpers = []
+
+    def submit(self, args, on_output=None):
+        """요청을 도우미 하나에 보내고 HelperCall 반환 (결과는 call.wait() 후 call.result)
+
+        보내기까지 풀 잠금을 유지하므로 동시에 요청해도 처리 중인 요청 수가 고르게 나뉜다.
+        """
+        call = HelperCall(next(self._ids), args, on_output)
+        with self._lock:
+            while True:
+                helper = self._acquire()
+                try:
+                    helper.submit(call)
+                    return call
+                except HelperError:
+                    self._add_failure()
+
+    def cancel(self, call):
+        if call.helper is not None:
+            call.helper.cancel(call)
+
+    def discard(self, helper):
+        """응답하지 않는 도우미 강제 종료 (다음 요청 때 새로 시작)"""
+        helper.kill()
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_crash(self):
+        """요청을 처리하던 도우미가 비정상 종료됨"""
+        with self._lock:
+            self._add_failure()
+
+    def close(self):
+        with self._lock:
+            helpers, self._helpers = self._helpers, []
+        for helper in helpers:
+            helper.close()
+
+    def _acquire(self):
+        """처리 중인 요청이 가장 적은 도우미 (풀 잠금 안에서 호출, 종료된 도우미는 빼고 모자라면 새로 시작)"""
+        if self.broken:
+            raise HelperError("DISM 도우미를 사용할 수 없습니다.")
+        dead = [helper for helper in self._helpers if not helper.alive]
+        for helper in dead:
+            self._helpers.remove(helper)
+        if dead:
+            self.restarts += len(dead)
+            count('dism_helper_restarts', len(dead))
+        idle = [helper for helper in self._helpers if helper.load == 0]
+        if idle:
+            return idle[0]
+        if len(self._helpers) >= self.size:
+            return min(self._helpers, key=lambda helper: helper.load)
+        helper = HelperProcess(self.command, self.env)
+        try:
+            with span('dism.helper.start', 'dism'):
+                helper.start()
+        except HelperError:
+            self._add_failure()
+            raise
+        if not helper.resident:
+            helper.close()
+            self.broken = True
+            count('dism_helper_unavailable', backend=helper.backend)
+            raise HelperError(f"DISM 도우미가 상주 백엔드를 쓸 수 없습니다 ({helper.backend}).")
+        self._helpers.append(helper)
+        count('dism_helper_starts')
+        return helper
+
+    def _add_failure(self):
+        """연속 실패 수 증가 (풀 잠금 안에서 호출)"""
+        self._failures += 1
+        if self._failures >= MAX_FAILURES:
+            self.broken = True
+
+
+class HelperRunner(SubprocessRunner):
+    """DISM 도우미 풀로 명령을 실행하는 실행기 (제한 시간/취소/전체 제한 시간은 SubprocessRunner와 같음)
+
+    풀을 사용할 수 없거나 도우미가 명령을 시작하기 전에 종료되면 프로세스를 직접 실행한다.
+    도우미가 명령 실행 중에 종료되면 같은 명령을 다시 실행하지 않고 실패로 반환한다
+    (마운트/패키지 적용이 반쯤 진행되었을 수 있으므로).
+    """
+
+    def __init__(self, pool, dism_executable=None, encoding='utf-8', timeout=None, deadline=None):
+        super().__init__(dism_executable, encoding, timeout, deadline)
+        self.pool = pool
+        self._calls = set()  # 실행 중인 (HelperCall, cancellable)
+
+    def cancel(self):
+        super().cancel()
+        with self._lock:
+            targets = [call for call, cancellable in self._calls if cancellable]
+        for call in targets:
+            self.pool.cancel(call)
+
+    def _run_process(self, args, limit, on_output, cancellable):
+        try:
+            call = self.pool.submit(args, on_output)
+        except HelperError:
+            return super()._run_process(args, limit, on_output, cancellable)
+
+        entry = (call, cancellable)
+        with self._lock:
+            self._calls.add(entry)
+        timed_out = cancelled = False
+        try:
+            with span('dism.helper', 'dism'):
+                while not call.wait(POLL_INTERVAL):
+                    if cancellable and self.cancelled:
+                        cancelled = True
+                    elif limit is not None and time.monotonic() >= limit:
+                        timed_out = True
+                    else:
+                        continue
+                    self.pool.cancel(call)
+                    if not call.wait(KILL_GRACE):
+                        self.pool.discard(call.helper)  # 취소 요청에도 응답하지 않는 도우미
+                        call.wait(KILL_GRACE)
+                    break
+        finally:
+            with self._lock:
+                self._calls.discard(entry)
+
+        if call.result is None:
+            if call.crashed and not call.started and not (timed_out or cancelled):
+                self.pool.record_crash()
+                return super()._run_process(args, limit, on_output, cancellable)
+            if call.crashed:
+                self.pool.record_crash()
+            message = "DISM 도우미가 명령 실행 중에 종료되었습니다." if not (timed_out or cancelled) else ''
+            result = CommandResult(-1, '', message)
+        else:
+            self.pool.record_success()
+            result = call.result
+        count('dism_helper_calls')
+
+        if cancellable and self.cancelled and not timed_out:
+            cancelled = True
+        message = result.stderr
+        if timed_out:
+            message += f"\n제한 시간을 넘겨 종료했습니다: {' '.join(args[:2])}"
+        cancelled = (cancelled or result.cancelled) and not timed_out
+        return CommandResult(result.returncode, result.stdout, message, timed_out=timed_out,
+                             cancelled=cancelled and result.returncode != 0)
+
+
+_shared_pool = None
+_shared_configured = False
+_shared_lock = threading.Lock()
+
+
+def configure_shared_pool(size, command=None, env=None):
+    """프로그램 전체가 함께 쓰는 도우미 풀 설정 (size가 0이면 사용 안 함)"""
+    global _shared_pool, _shared_configured
+    with _shared_lock:
+        previous = _shared_pool
+        _shared_pool = HelperPool(size, command, env) if size and size > 0 else None
+        _shared_configured = True
+    if previous is not None:
+        previous.close()
+    return _shared_pool
+
+
+def shared_pool():
+    """함께 쓰는 도우미 풀 (설정하지 않았으면 KDIC_DISM_HELPERS 환경 변수로 결정, 사용 안 하면 None)"""
+    global _shared_pool, _shared_configured
+    with _shared_lock:
+        if not _shared_configured:
+            try:
+                size = int(os.environ.get(HELPERS_ENV) or 0)
+            except ValueError:
+                size = 0
+            _shared_pool = HelperPool(size) if size > 0 else None
+            _shared_configured = True
+        pool = _shared_pool
+    if pool is None or pool.broken:
+        return None
+    return pool
+
+
+def close_shared_pool():
+    """함께 쓰는 도우미 풀 종료 (프로그램 종료 시)"""
+    global _shared_pool
+    with _shared_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.close()
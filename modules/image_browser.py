@@ -0,0 +1,277 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QLineEdit, QTreeWidget, QTreeWidgetItem, QHeaderView)
+
+from modules.wim import WimFormatError
+from modules.wim_image import WimImageReader
+from modules.wim_list_model import format_size
+
+COL_NAME, COL_SIZE, COL_MODIFIED, COL_ATTRIBUTES = range(4)
+COLUMN_TITLES = ('이름', '크기', '수정한 날짜', '특성')
+
+ENTRY_ROLE = Qt.ItemDataRole.UserRole + 1   # DirEntry
+LOADED_ROLE = Qt.ItemDataRole.UserRole + 2  # 자식 항목을 만들었는지 여부
+
+
+@contextmanager
+def busy_cursor():
+    QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+    try:
+        yield
+    finally:
+        QApplication.restoreOverrideCursor()
+
+
+def size_text(size):
+    if size is None:
+        return "?"
+    return format_size(size) if size else "0 B"
+
+
+class TreeSizeThread(QThread):
+    """폴더 하위 전체의 파일 수/크기 합계 계산 (하위 폴더를 모두 읽으므로 백그라운드에서 실행)"""
+    size_ready = pyqtSignal(object, object)  # DirEntry, (파일 수, 폴더 수, 크기) 또는 예외
+
+    def __init__(self, image, entry, parent=None):
+        super().__init__(parent)
+        self.image = image
+        self.entry = entry
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            result = self.image.tree_size(self.entry, self.cancel_event)
+        except (OSError, WimFormatError) as e:
+            result = e
+        if not self.cancel_event.is_set():
+            self.size_ready.emit(self.entry, result)
+
+
+class ImageBrowserDialog(QDialog):
+    """마운트하지 않고 WIM 이미지의 폴더와 파일 살펴보기 (폴더는 펼칠 때 메타데이터에서 읽음)"""
+
+    def __init__(self, record, parent=None):
+        super().__init__(parent)
+        self.record = record
+        self.reader = None
+        self.image = None
+        self.size_thread = None
+        self.setWindowTitle(f"이미지 내용 - {os.path.basename(record.file_path)}")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout()
+        image_layout = QHBoxLayout()
+        self.image_combo = QComboBox()
+        for image in record.images:
+            self.image_combo.addItem(f"[{image.index}] {image.name}", image.index)
+        self.image_combo.currentIndexChanged.connect(self.load_image)
+        image_layout.addWidget(QLabel("이미지:"))
+        image_layout.addWidget(self.image_combo, 1)
+        layout.addLayout(image_layout)
+
+        find_layout = QHBoxLayout()
+        self.path_edit = QLineEdit()
+        self.path_edit.setPlaceholderText("경로로 찾기 (예: \\Windows\\System32\\drivers\\ntfs.sys)")
+        self.path_edit.setClearButtonEnabled(True)
+        self.path_edit.returnPressed.connect(self.find_path)
+        find_btn = QPushButton("🔍 찾기")
+        find_btn.clicked.connect(self.find_path)
+        find_layout.addWidget(self.path_edit, 1)
+        find_layout.addWidget(find_btn)
+        layout.addLayout(find_layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(len(COLUMN_TITLES))
+        self.tree.setHeaderLabels(COLUMN_TITLES)
+        self.tree.setUniformRowHeights(True)
+        self.tree.itemExpanded.connect(self.on_item_expanded)
+        self.tree.currentItemChanged.connect(self.on_current_changed)
+        header = self.tree.header()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(COL_NAME, QHeaderView.ResizeMode.Stretch)
+        header.setStretchLastSection(False)
+        for column, width in ((COL_SIZE, 90), (COL_MODIFIED, 130), (COL_ATTRIBUTES, 60)):
+            header.resizeSection(column, width)
+        layout.addWidget(self.tree, 1)
+
+        self.detail_label = QLabel()
+        self.detail_label.setWordWrap(True)
+        self.detail_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(self.detail_label)
+
+        button_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        self.status_label.setObjectName("statusLabel")
+        self.size_btn = QPushButton("📏 폴더 크기")
+        self.size_btn.setToolTip("선택한 폴더(없으면 루트) 아래 전체 파일 수와 크기를 계산합니다.")
+        self.size_btn.clicked.connect(self.calculate_size)
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.status_label, 1)
+        button_layout.addWidget(self.size_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        self.load_image()
+
+    def load_image(self):
+        """선택한 인덱스의 루트 폴더 표시"""
+        self.cancel_size()
+        self.tree.clear()
+        self.image = None
+        index = self.image_combo.currentData() or 1
+        try:
+            with busy_cursor():
+                if self.reader is None:
+                    self.reader = WimImageReader(self.record.file_path)
+                self.image = self.reader.image(index)
+                self.add_children(self.tree.invisibleRootItem(), self.image.root)
+        except (OSError, WimFormatError) as e:
+            self.status_label.setText(f"이미지를 읽을 수 없습니다: {e}")
+            self.size_btn.setEnabled(False)
+            return
+        self.size_btn.setEnabled(True)
+        self.update_status()
+
+    def add_children(self, parent_item, entry):
+        """폴더의 자식 항목 추가 (폴더 먼저, 이름 순)"""
+        children = sorted(self.image.list_dir(entry), key=lambda child: (not child.is_directory,
+                                                                       child.name.casefold()))
+        items = []
+        for child in children:
+            modified = child.modified
+            item = QTreeWidgetItem([
+                child.name,
+                '' if child.is_directory else size_text(child.size),
+                modified.astimezone().strftime('%Y-%m-%d %H:%M') if modified else '',
+                child.attribute_text,
+            ])
+            item.setData(COL_NAME, ENTRY_ROLE, child)
+            item.setTextAlignment(COL_SIZE, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            if child.is_directory and child.subdir_offset:
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            items.append(item)
+        parent_item.addChildren(items)
+        parent_item.setData(COL_NAME, LOADED_ROLE, True)
+
+    def ensure_loaded(self, item):
+        if item.data(COL_NAME, LOADED_ROLE):
+            return True
+        try:
+            with busy_cursor():
+                self.add_children(item, item.data(COL_NAME, ENTRY_ROLE))
+        except (OSError, WimFormatError) as e:
+            self.status_label.setText(f"폴더를 읽을 수 없습니다: {e}")
+            return False
+        if not item.childCount():
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator)
+        self.update_status()
+        return True
+
+    def on_item_expanded(self, item):
+        self.ensure_loaded(item)
+
+    def find_path(self):
+        """입력한 경로를 찾아 트리에서 펼치고 선택"""
+        path = self.path_edit.text().strip()
+        if self.image is None or not path:
+            return
+        try:
+            with busy_cursor():
+                entry = self.image.lookup(path)
+        except (OSError, WimFormatError) as e:
+            self.status_label.setText(f"경로를 찾는 중 오류가 발생했습니다: {e}")
+            return
+        if entry is None:
+            self.status_label.setText(f"'{path}'을(를) 찾을 수 없습니다.")
+            return
+
+        chain = []
+        while entry.parent is not None:
+            chain.append(entry)
+            entry = entry.parent
+        item = self.tree.invisibleRootItem()
+        for target in reversed(chain):
+            if item is not self.tree.invisibleRootItem():
+                if not self.ensure_loaded(item):
+                    return
+                item.setExpanded(True)
+            item = next((item.child(i) for i in range(item.childCount())
+                         if item.child(i).data(COL_NAME, ENTRY_ROLE) is target), None)
+            if item is None:
+                return
+        self.tree.setCurrentItem(item)
+        self.tree.scrollToItem(item)
+        self.update_status()
+
+    def on_current_changed(self, current, previous):
+        entry = current.data(COL_NAME, ENTRY_ROLE) if current is not None else None
+        if entry is None:
+            self.detail_label.clear()
+            return
+        details = [entry.path]
+        if not entry.is_directory:
+            details.append(f"크기: {size_text(entry.size)}"
+                           + (f" ({entry.size:,}바이트)" if entry.size else ""))
+            if entry.hash != bytes(20):
+                details.append(f"SHA-1: {entry.hash.hex()}")
+        if entry.short_name:
+            details.append(f"짧은 이름: {entry.short_name}")
+        if entry.stream_count:
+            details.append(f"추가 스트림: {entry.stream_count}개")
+        self.detail_label.setText(" · ".join(details))
+
+    def current_directory(self):
+        item = self.tree.currentItem()
+        entry = item.data(COL_NAME, ENTRY_ROLE) if item is not None else None
+        if entry is None:
+            return self.image.root
+        return entry if entry.is_directory else entry.parent
+
+    def calculate_size(self):
+        if self.image is None:
+            return
+        self.cancel_size()
+        entry = self.current_directory()
+        self.size_btn.setEnabled(False)
+        self.status_label.setText(f"'{entry.path}' 크기 계산 중...")
+        self.size_thread = TreeSizeThread(self.image, entry, self)
+        self.size_thread.size_ready.connect(self.on_size_ready)
+        self.size_thread.start()
+
+    def on_size_ready(self, entry, result):
+        if self.sender() is not self.size_thread:
+            return  # 취소된 계산의 결과
+        self.size_thread = None
+        self.size_btn.setEnabled(True)
+        if isinstance(result, Exception):
+            self.status_label.setText(f"크기를 계산할 수 없습니다: {result}")
+            return
+        files, dirs, total = result
+        self.status_label.setText(f"'{entry.path}': 파일 {files:,}개, 폴더 {dirs:,}개, {size_text(total)}")
+
+    def cancel_size(self):
+        if self.size_thread is not None:
+            self.size_thread.cancel_event.set()
+            self.size_thread.wait()
+            self.size_thread = None
+            self.size_btn.setEnabled(self.image is not None)
+
+    def update_status(self):
+        stats = self.reader.cache.stats()
+        requests = stats['hits'] + stats['misses']
+        self.status_label.setText(
+            f"압축 {self.reader.compression} · 캐시된 청크 {stats['chunks']:,}개 ({size_text(stats['bytes'])})"
+            + (f" · 캐시 적중 {stats['hits']:,}/{requests:,}" if requests else "")
+        )
+
+    def done(self, result):
+        self.cancel_size()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        super().done(result)
@@ -0,0 +1,266 @@
+import hashlib
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+
+from modules.wim import WimHeader, WimFormatError, WIM_HEADER_SIZE
+
+# 무결성 테이블: u32 크기, u32 청크 수, u32 청크 크기, SHA-1(20바이트) x 청크 수
+# 헤더 다음(208바이트)부터 lookup 테이블 끝까지를 청크 단위로 해시한다.
+INTEGRITY_TABLE_HEADER_SIZE = 12
+SHA1_SIZE = 20
+
+# 검사 상태
+VERIFY_OK = 'ok'
+VERIFY_CORRUPT = 'corrupt'       # 잘림, 해시 불일치 등 손상 확인
+VERIFY_ERROR = 'error'           # 파일을 읽을 수 없음 (권한, 네트워크 등)
+VERIFY_CANCELLED = 'cancelled'
+
+# 검사 방법
+METHOD_INTEGRITY = 'integrity'   # WIM 무결성 테이블의 청크별 SHA-1 비교
+METHOD_DIGEST = 'digest'         # 무결성 테이블이 없으면 파일 전체 SHA-256 (이전 결과와 비교)
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DIGEST_BLOCK_SIZE = 8 * 1024 * 1024  # 전체 파일 해시 시 한 번에 읽는 크기
+MAX_INTEGRITY_ENTRIES = 1 << 20      # 손상된 테이블로 인한 과도한 메모리 사용 방지
+
+
+@dataclass(slots=True)
+class VerifyResult:
+    """파일 하나의 무결성 검사 결과"""
+    file_path: str
+    status: str = VERIFY_OK
+    method: str = METHOD_DIGEST
+    message: str = ''
+    digest: str = None         # 전체 파일 SHA-256 (digest 방식일 때)
+    chunk_size: int = 0
+    chunks: int = 0
+    bad_chunks: list = field(default_factory=list)  # 해시가 다른 청크 번호 (최대 100개)
+    checked_bytes: int = 0
+    seconds: float = 0.0
+    cached: bool = False       # 캐시된 결과를 사용했는지 여부
+
+    @property
+    def ok(self):
+        return self.status == VERIFY_OK
+
+    def to_dict(self):
+        data = asdict(self)
+        del data['cached']
+        return data
+
+    @classmethod
+    def from_dict(cls, data, file_path=None):
+        data = dict(data)
+        if file_path is not None:
+            data['file_path'] = file_path
+        data.pop('cached', None)
+        return cls(cached=True, **data)
+
+
+def read_integrity_table(f, header, file_size):
+    """무결성 테이블 (청크 크기, SHA-1 목록) 반환 (없으면 None)"""
+    res = header.integrity
+    if res.size == 0:
+        return None
+    if res.is_compressed:
+        raise WimFormatError("압축된 무결성 테이블은 지원하지 않습니다.")
+    if res.offset + res.size > file_size:
+        raise WimFormatError("무결성 테이블이 파일 끝을 넘습니다 (잘린 파일).")
+
+    f.seek(res.offset)
+    data = f.read(res.size)
+    if len(data) < INTEGRITY_TABLE_HEADER_SIZE:
+        raise WimFormatError("무결성 테이블을 끝까지 읽지 못했습니다.")
+    table_size, entries, chunk_size = struct.unpack_from('<III', data, 0)
+    if (entries > MAX_INTEGRITY_ENTRIES or chunk_size == 0
+            or len(data) < INTEGRITY_TABLE_HEADER_SIZE + entries * SHA1_SIZE):
+        raise WimFormatError("무결성 테이블 형식이 올바르지 않습니다.")
+
+    hashes = []
+    for i in range(entries):
+        offset = INTEGRITY_TABLE_HEADER_SIZE + i * SHA1_SIZE
+        hashes.append(data[offset:offset + SHA1_SIZE])
+    return chunk_size, hashes
+
+
+def check_resource_ranges(header, file_size):
+    """헤더가 가리키는 리소스가 모두 파일 안에 있는지 확인 (잘린 파일 검출)"""
+    for name, res in (('lookup 테이블', header.offset_table), ('XML 메타데이터', header.xml_data),
+                      ('부팅 메타데이터', header.boot_metadata), ('무결성 테이블', header.integrity)):
+        if res.size and res.offset + res.size > file_size:
+            raise WimFormatError(f"{name}이(가) 파일 끝을 넘습니다 (잘린 파일).")
+
+
+class IntegrityVerifier:
+    """WIM 파일 무결성 검사 (Qt 비의존)
+
+    무결성 테이블이 있으면 청크들을 스레드 풀에서 mmap 버퍼로 해시하여 비교하고,
+    없으면 파일 전체 SHA-256을 계산해 같은 파일(크기/수정 시각/GUID)의 이전 결과와 비교한다.
+    결과는 파일 식별 정보 기준으로 캐시한다.
+    """
+
+    def __init__(self, cache=None, max_workers=None, log=None):
+        self.cache = cache
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        self.log = log or (lambda message, **fields: None)  # log(message, level=, file=, stage=, duration=)
+
+    def verify_files(self, file_paths, on_result=None, on_progress=None, should_stop=None, force=False):
+        """파일들을 차례로 검사하여 VerifyResult 목록 반환
+
+        on_result(result): 파일 하나의 검사가 끝날 때마다 호출
+        on_progress(done_bytes, total_bytes, file_path): 검사한 바이트 수
+        force: 캐시된 결과가 있어도 다시 검사
+        """
+        should_stop = should_stop or (lambda: False)
+        sizes = {}
+        for file_path in file_paths:
+            try:
+                sizes[file_path] = os.path.getsize(file_path)
+            except OSError:
+                sizes[file_path] = 0
+        total = sum(sizes.values())
+        done = 0
+
+        results = []
+        for file_path in file_paths:
+            if should_stop():
+                break
+            base = done
+            progress = None
+            if on_progress is not None:
+                progress = lambda checked, path=file_path, base=base: on_progress(base + checked, total, path)
+            result = self.verify(file_path, on_progress=progress, should_stop=should_stop, force=force)
+            done = base + sizes[file_path]
+            if on_progress is not None:
+                on_progress(done, total, file_path)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    def verify(self, file_path, on_progress=None, should_stop=None, force=False):
+        """파일 하나 검사 (예외는 VerifyResult 상태로 변환)"""
+        should_stop = should_stop or (lambda: False)
+        file_name = os.path.basename(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            return VerifyResult(file_path, VERIFY_ERROR, message=str(e))
+
+        previous = None
+        if self.cache is not None:
+            try:
+                previous = self.cache.lookup_verify(file_path, st)
+            except Exception as e:
+                self.log(f"검사 결과 캐시 조회 실패: {e}", level='warning', file=file_path)
+            if previous is not None and not force:
+                return VerifyResult.from_dict(previous, file_path)
+
+        self.log(f"'{file_name}' 무결성 검사 중...", file=file_path)
+        started = time.perf_counter()
+        try:
+            result = self._verify_file(file_path, st.st_size, on_progress, should_stop)
+        except WimFormatError as e:
+            result = VerifyResult(file_path, VERIFY_CORRUPT, message=str(e))
+        except OSError as e:
+            result = VerifyResult(file_path, VERIFY_ERROR, message=str(e))
+        result.seconds = round(time.perf_counter() - started, 3)
+
+        if (result.ok and result.method == METHOD_DIGEST and previous is not None
+                and previous.get('digest') and previous['digest'] != result.digest):
+            # 크기/수정 시각/GUID는 그대로인데 내용이 바뀜 (디스크/네트워크 저장소 손상)
+            # 다시 검사해도 계속 손상으로 판정되도록 기준 해시는 이전 값을 유지
+            result.status = VERIFY_CORRUPT
+            result.message = "파일 정보는 같은데 이전 검사와 내용이 다릅니다."
+            result.digest = previous['digest']
+
+        if result.status == VERIFY_CANCELLED:
+            return result
+        if self.cache is not None and result.status in (VERIFY_OK, VERIFY_CORRUPT):
+            try:
+                self.cache.store_verify(file_path, result.to_dict(), st)
+            except Exception as e:
+                self.log(f"검사 결과 캐시 저장 실패: {e}", level='warning', file=file_path)
+
+        self.log(f"'{file_name}' 무결성 검사 {'정상' if result.ok else '실패'}"
+                 f"{': ' + result.message if result.message else ''}",
+                 level='debug' if result.ok else 'error', file=file_path, stage='verify', duration=result.seconds)
+        return result
+
+    def _verify_file(self, file_path, file_size, on_progress, should_stop):
+        with open(file_path, 'rb') as f:
+            header = WimHeader.unpack(f.read(WIM_HEADER_SIZE))
+            check_resource_ranges(header, file_size)
+            table = read_integrity_table(f, header, file_size)
+            if table is None:
+                return self._verify_digest(f, file_path, file_size, on_progress, should_stop)
+            return self._verify_chunks(f, file_path, header, table, on_progress, should_stop)
+
+    def _verify_chunks(self, f, file_path, header, table, on_progress, should_stop):
+        """무결성 테이블의 청크별 SHA-1을 스레드 풀에서 계산하여 비교"""
+        chunk_size, hashes = table
+        start = WIM_HEADER_SIZE
+        end = header.offset_table.offset + header.offset_table.size
+        expected_chunks = (end - start + chunk_size - 1) // chunk_size if end > start else 0
+        if expected_chunks != len(hashes):
+            raise WimFormatError(f"무결성 테이블 청크 수가 맞지 않습니다 ({len(hashes)}/{expected_chunks}).")
+
+        result = VerifyResult(file_path, method=METHOD_INTEGRITY, chunk_size=chunk_size, chunks=len(hashes))
+        if not hashes:
+            return result
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                def hash_chunk(i):
+                    if should_stop():
+                        return None
+                    offset = start + i * chunk_size
+                    # hashlib은 큰 버퍼를 해시하는 동안 GIL을 놓으므로 스레드 풀로 병렬 처리된다
+                    return hashlib.sha1(view[offset:min(offset + chunk_size, end)]).digest()
+
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='wim-verify') as pool:
+                    for i, digest in enumerate(pool.map(hash_chunk, range(len(hashes)))):
+                        if digest is None:
+                            result.status = VERIFY_CANCELLED
+                            continue
+                        if digest != hashes[i] and len(result.bad_chunks) < 100:
+                            result.bad_chunks.append(i)
+                        result.checked_bytes = min(start + (i + 1) * chunk_size, end) - start
+                        if on_progress is not None:
+                            on_progress(result.checked_bytes)
+            finally:
+                view.release()
+
+        if result.status != VERIFY_CANCELLED and result.bad_chunks:
+            result.status = VERIFY_CORRUPT
+            result.message = f"청크 {len(result.bad_chunks)}개의 해시가 다릅니다."
+        return result
+
+    def _verify_digest(self, f, file_path, file_size, on_progress, should_stop):
+        """무결성 테이블이 없는 파일의 전체 SHA-256 계산"""
+        result = VerifyResult(file_path, method=METHOD_DIGEST)
+        digest = hashlib.sha256()
+        buffer = bytearray(DIGEST_BLOCK_SIZE)
+        view = memoryview(buffer)
+        f.seek(0)
+        while True:
+            if should_stop():
+                result.status = VERIFY_CANCELLED
+                return result
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+            result.checked_bytes += read
+            if on_progress is not None:
+                on_progress(result.checked_bytes)
+
+        if result.checked_bytes != file_size:
+            raise WimFormatError("파일을 끝까지 읽지 못했습니다.")
+        result.digest = digest.hexdigest()
+        return result
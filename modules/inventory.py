@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from modules.cache import get_file_identity, DEFAULT_MAX_AGE_DAYS
+from modules.dism_parser import PACKAGE_STATE_INSTALLED, PACKAGE_STATE_SUPERSEDED, PACKAGE_STATE_INSTALL_PENDING
+from modules.paths import get_app_data_path
+from modules.records import InstalledPackage
+
+# 이미지별 설치된 패키지 목록 캐시 (Qt 비의존)
+# 업데이트한 이미지의 커밋 직전 패키지 목록(DISM /Get-Packages)을 WIM 파일 식별 정보(크기, 수정 시각, GUID)와
+# 인덱스 기준으로 저장해 두고, 다음 실행에서 이미 설치된 패키지와 적용할 것이 없는 이미지를 건너뛴다.
+# 파일이 바뀌면 식별 정보가 달라지므로 저장된 목록은 자동으로 무효가 된다.
+
+INVENTORY_FILE_NAME = 'kdic_inventory.db'
+INVENTORY_SCHEMA_VERSION = 1
+
+# 이미 적용된 것으로 보는 패키지 상태 (대체됨: 더 새 패키지가 설치되어 있음)
+APPLIED_STATES = frozenset((PACKAGE_STATE_INSTALLED, PACKAGE_STATE_SUPERSEDED, PACKAGE_STATE_INSTALL_PENDING))
+
+
+def _version_key(version):
+    """'22621.3007.1.6' -> (22621, 3007, 1, 6) (숫자가 아니면 빈 튜플)"""
+    try:
+        return tuple(int(part) for part in version.split('.')) if version else ()
+    except ValueError:
+        return ()
+
+
+def is_installed(package, installed):
+    """패키지(PackageInfo)가 설치된 패키지(InstalledPackage) 목록에 이미 들어 있는지 여부
+
+    패키지 어셈블리 이름과 기준 빌드(버전 첫 자리)가 같고 버전이 같거나 더 높은 패키지, 또는 이름에
+    같은 KB 번호가 들어간 패키지가 적용된 상태면 설치된 것으로 본다.
+    """
+    name = package.identity.lower()
+    wanted = _version_key(package.version)
+    kb = package.kb.lower() if package.kb else None
+    for item in installed:
+        if item.state not in APPLIED_STATES:
+            continue
+        item_name = item.name.lower()
+        if name and wanted and item_name == name:
+            version = _version_key(item.version)
+            if version[:1] == wanted[:1] and version >= wanted:
+                return True
+        elif kb and kb in item_name:  # 예: Package_for_KB5034441
+            return True
+    return False
+
+
+class InventoryCache:
+    """이미지(WIM 파일 + 인덱스)별 설치된 패키지 목록을 파일 식별 정보 기준으로 저장하는 SQLite 캐시"""
+
+    def __init__(self, db_path=None, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.db_path = db_path or get_app_data_path(INVENTORY_FILE_NAME)
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != INVENTORY_SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS inventory")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS inventory (
+                    path TEXT NOT NULL,
+                    image_index INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    guid TEXT,
+                    packages TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (path, image_index)
+                )
+            """)
+            self._conn.execute(f"PRAGMA user_version = {INVENTORY_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def lookup(self, file_path, index, identity=None):
+        """파일이 바뀌지 않았으면 저장된 InstalledPackage 목록 반환, 아니면 None
+
+        identity: get_file_identity 결과 (같은 파일의 여러 인덱스를 조회할 때 한 번만 계산)
+        파일이 바뀌었으면 그 파일의 저장된 목록을 모두 지운다.
+        """
+        key = self._key(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, guid, packages FROM inventory WHERE path = ? AND image_index = ?",
+                (key, index)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            identity = identity or get_file_identity(file_path)
+        except OSError:
+            return None
+        if tuple(row[:3]) != tuple(identity):
+            self.invalidate(file_path)
+            return None
+
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE inventory SET last_used = ? WHERE path = ? AND image_index = ?",
+                               (time.time(), key, index))
+        return [InstalledPackage(**item) for item in json.loads(row[3])]
+
+    def store(self, file_path, index, packages, previous=None):
+        """커밋한 이미지의 설치된 패키지 목록 저장
+
+        previous: 커밋 전 파일 식별 정보 (지정 시 그때까지 유효했던 같은 파일의 다른 인덱스 목록도
+            새 식별 정보로 옮김. 커밋은 그 인덱스만 바꾸므로 다른 인덱스의 패키지 목록은 그대로 유효하다)
+        """
+        try:
+            size, mtime_ns, guid = get_file_identity(file_path)
+        except OSError:
+            return
+        key = self._key(file_path)
+        data = json.dumps([package.to_dict() for package in packages], ensure_ascii=False)
+        with self._lock, self._conn:
+            if previous is not None:
+                self._conn.execute(
+                    "UPDATE inventory SET size = ?, mtime_ns = ?, guid = ? "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND guid IS ?",
+                    (size, mtime_ns, guid, key, *previous)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO inventory (path, image_index, size, mtime_ns, guid, packages, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, index, size, mtime_ns, guid, data, time.time())
+            )
+
+    def invalidate(self, file_path):
+        """특정 파일의 모든 인덱스 항목 제거"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM inventory WHERE path = ?", (self._key(file_path),))
+
+    def evict_stale(self):
+        """오래 사용되지 않았거나 디스크에서 사라진 파일의 항목 제거 (제거 수 반환)"""
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT path, image_index, last_used FROM inventory").fetchall()
+            stale = [(path, index) for path, index, last_used in rows
+                     if last_used < cutoff or not os.path.exists(path)]
+            self._conn.executemany("DELETE FROM inventory WHERE path = ? AND image_index = ?", stale)
+        return len(stale)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
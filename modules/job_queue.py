@@ -0,0 +1,289 @@
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+# 스캔/검사/업데이트 작업 대기열 (Qt 비의존)
+# 컨트롤러는 작업을 넣기만 하고, next_jobs()가 돌려준 작업을 스레드로 시작한 뒤 끝나면 finish()를 호출한다.
+# 실행 순서는 우선순위(높은 것 먼저) -> 넣은 순서이며, 슬롯별/전체 동시 실행 수를 넘지 않는다.
+
+# 작업 종류
+KIND_SCAN = 'scan'
+KIND_VERIFY = 'verify'
+KIND_UPDATE = 'update'
+KIND_CLEANUP = 'cleanup'  # 이전 실행이 남긴 마운트 정리
+
+KIND_LABELS = {
+    KIND_SCAN: '스캔',
+    KIND_VERIFY: '무결성 검사',
+    KIND_UPDATE: '업데이트',
+    KIND_CLEANUP: '마운트 정리',
+}
+
+# 작업 상태
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_STOPPING = 'stopping'  # 중지를 요청했고 스레드가 끝나기를 기다리는 중
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+
+STATUS_LABELS = {
+    STATUS_QUEUED: '대기',
+    STATUS_RUNNING: '실행 중',
+    STATUS_STOPPING: '중지 중',
+    STATUS_DONE: '완료',
+    STATUS_FAILED: '실패',
+    STATUS_CANCELLED: '취소됨',
+}
+ACTIVE_STATUSES = (STATUS_RUNNING, STATUS_STOPPING)
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+PRIORITY_LOW = -1
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 1  # 사용자가 결과를 기다리는 작업 (새로 선택한 폴더 스캔, 이어서 실행 등)
+
+# 동시 실행 슬롯: 업데이트와 마운트 정리는 DISM 마운트와 작업 기록 파일을 함께 쓰므로 한 번에 하나만 실행
+SLOT_SCAN = 'scan'
+SLOT_VERIFY = 'verify'
+SLOT_MOUNT = 'mount'
+KIND_SLOTS = {
+    KIND_SCAN: SLOT_SCAN,
+    KIND_VERIFY: SLOT_VERIFY,
+    KIND_UPDATE: SLOT_MOUNT,
+    KIND_CLEANUP: SLOT_MOUNT,
+}
+DEFAULT_LIMITS = {SLOT_SCAN: 2, SLOT_VERIFY: 1, SLOT_MOUNT: 1}
+DEFAULT_MAX_RUNNING = 3
+
+# 이미 끝난 작업을 목록에 남겨 두는 수 (오래된 것부터 삭제)
+MAX_FINISHED = 20
+
+
+def _normalize(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def paths_overlap(a, b):
+    """두 경로 목록에 같은 경로나 상위/하위 관계인 경로가 있는지 여부"""
+    for first in a:
+        for second in b:
+            try:
+                common = os.path.commonpath([first, second])
+            except ValueError:  # 다른 드라이브
+                continue
+            if common in (first, second):
+                return True
+    return False
+
+
+@dataclass(slots=True, eq=False)
+class QueuedJob:
+    """대기열의 작업 하나"""
+    id: int
+    kind: str
+    label: str                                   # 표시용 대상 (폴더 또는 파일 수)
+    paths: tuple = ()                            # 작업이 읽거나 바꾸는 폴더/파일 (정규화된 경로)
+    priority: int = PRIORITY_NORMAL
+    seq: int = 0                                 # 같은 우선순위 안에서의 순서
+    status: str = STATUS_QUEUED
+    payload: dict = field(default_factory=dict)  # 작업을 시작할 때 필요한 값 (넣을 때의 설정을 그대로 보관)
+    handle: object = None                        # 실행 중인 스레드 (컨트롤러가 관리)
+    submitted: float = 0.0
+    started: float = None
+    finished: float = None
+    message: str = None                          # 끝난 이유 등
+
+    @property
+    def writes(self):
+        """WIM 파일을 바꾸는 작업 (같은 경로의 다른 작업과 동시에 실행하지 않음)"""
+        return self.kind in (KIND_UPDATE, KIND_CLEANUP)
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def order_key(self):
+        return (-self.priority, self.seq)
+
+    def conflicts(self, other):
+        """둘 중 하나가 파일을 바꾸고 대상 경로가 겹치면 동시에 실행할 수 없음"""
+        return (self.writes or other.writes) and paths_overlap(self.paths, other.paths)
+
+
+class JobQueue:
+    """우선순위 작업 대기열 (스레드 안전, on_change는 상태가 바뀔 때마다 잠금 밖에서 호출)"""
+
+    def __init__(self, limits=None, max_running=DEFAULT_MAX_RUNNING, on_change=None, clock=time.monotonic):
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_running = max_running
+        self.on_change = on_change or (lambda: None)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._jobs = {}  # id -> QueuedJob (끝난 작업은 MAX_FINISHED개까지)
+
+    # --- 조회 ---
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        """표시 순서: 실행 중 -> 대기(실행될 순서) -> 끝난 작업(최근 것 먼저)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        active = sorted((job for job in jobs if job.active), key=lambda job: job.started)
+        queued = sorted((job for job in jobs if job.status == STATUS_QUEUED), key=lambda job: job.order_key)
+        finished = sorted((job for job in jobs if job.status in FINISHED_STATUSES),
+                          key=lambda job: job.finished, reverse=True)
+        return active + queued + finished
+
+    def active(self, *kinds):
+        """실행 중(중지 중 포함)인 작업 (kinds를 지정하면 그 종류만)"""
+        with self._lock:
+            return [job for job in self._jobs.values() if job.active and (not kinds or job.kind in kinds)]
+
+    def pending(self, *kinds):
+        """대기 중이거나 실행 중인 작업"""
+        with self._lock:
+            return [job for job in self._jobs.values()
+                    if job.status not in FINISHED_STATUSES and (not kinds or job.kind in kinds)]
+
+    # --- 변경 ---
+
+    def submit(self, kind, label, paths=(), priority=PRIORITY_NORMAL, payload=None):
+        """작업 추가 (시작은 next_jobs()가 결정)"""
+        job = QueuedJob(next(self._ids), kind, label, tuple(_normalize(path) for path in paths), priority,
+                        next(self._seq), payload=payload or {}, submitted=self.clock())
+        with self._lock:
+            self._jobs[job.id] = job
+        self.on_change()
+        return job
+
+    def next_jobs(self):
+        """지금 시작할 수 있는 작업을 실행 중으로 바꾸고 반환 (우선순위 순서)
+
+        앞선 작업이 경로 충돌로 기다리면 그 작업과 충돌하는 뒤의 작업도 기다려서
+        같은 폴더에 대한 작업은 넣은 순서대로 실행된다.
+        """
+        started = []
+        with self._lock:
+            running = [job for job in self._jobs.values() if job.active]
+            queued = sorted((job for job in self._jobs.values() if job.status == STATUS_QUEUED),
+                            key=lambda job: job.order_key)
+            slots = {}
+            for job in running:
+                slot = KIND_SLOTS[job.kind]
+                slots[slot] = slots.get(slot, 0) + 1
+            waiting = []
+            for job in queued:
+                if len(running) >= self.max_running:
+                    break
+                slot = KIND_SLOTS[job.kind]
+                if (slots.get(slot, 0) >= self.limits.get(slot, 1)
+                        or any(job.conflicts(other) for other in running)
+                        or any(job.conflicts(other) for other in waiting)):
+                    waiting.append(job)
+                    continue
+                job.status = STATUS_RUNNING
+                job.started = self.clock()
+                running.append(job)
+                slots[slot] = slots.get(slot, 0) + 1
+                started.append(job)
+        if started:
+            self.on_change()
+        return started
+
+    def move(self, job_id, delta):
+        """대기 중인 작업을 실행 순서에서 delta칸 이동 (음수면 앞으로), 이동했으면 True"""
+        with self._lock:
+            queued = sorted((job for job in self._jobs.values() if job.status == STATUS_QUEUED),
+                            key=lambda job: job.order_key)
+            positions = [job.id for job in queued]
+            if job_id not in positions:
+                return False
+            start = positions.index(job_id)
+            target = max(0, min(len(queued) - 1, start + delta))
+            if target == start:
+                return False
+            # 사이에 있는 작업과 (우선순위, 순번)을 차례로 맞바꿔서 상대 순서는 유지
+            step = 1 if target > start else -1
+            for i in range(start, target, step):
+                a, b = queued[i], queued[i + step]
+                a.priority, b.priority = b.priority, a.priority
+                a.seq, b.seq = b.seq, a.seq
+                queued[i], queued[i + step] = b, a
+        self.on_change()
+        return True
+
+    def set_priority(self, job_id, priority):
+        """대기 중인 작업의 우선순위 변경 (같은 우선순위에서는 맨 뒤로)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != STATUS_QUEUED:
+                return False
+            job.priority = priority
+            job.seq = next(self._seq)
+        self.on_change()
+        return True
+
+    def cancel(self, job_id, message=None):
+        """작업 취소: 대기 중이면 바로 취소됨, 실행 중이면 중지 중으로 바꿈 (스레드 중지는 호출자가)
+
+        바뀐 작업을 반환한다 (이미 끝났거나 없으면 None).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES or job.status == STATUS_STOPPING:
+                return None
+            if job.status == STATUS_QUEUED:
+                self._finish(job, STATUS_CANCELLED, message)
+            else:
+                job.status = STATUS_STOPPING
+                job.message = message
+        self.on_change()
+        return job
+
+    def cancel_where(self, predicate, message=None):
+        """조건에 맞는 대기/실행 중 작업 취소 (중지 중으로 바뀐 실행 중 작업 목록 반환)"""
+        with self._lock:
+            targets = [job for job in self._jobs.values()
+                       if job.status in (STATUS_QUEUED, STATUS_RUNNING) and predicate(job)]
+        stopping = []
+        for job in targets:
+            if self.cancel(job.id, message) is not None and job.status == STATUS_STOPPING:
+                stopping.append(job)
+        return stopping
+
+    def finish(self, job_id, status=STATUS_DONE, message=None):
+        """실행이 끝난 작업 표시 (중지를 요청한 작업은 항상 취소됨)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return None
+            if job.status == STATUS_STOPPING:
+                status = STATUS_CANCELLED
+                message = message or job.message
+            self._finish(job, status, message)
+        self.on_change()
+        return job
+
+    def clear_finished(self):
+        """끝난 작업을 목록에서 삭제"""
+        with self._lock:
+            for job_id in [job.id for job in self._jobs.values() if job.status in FINISHED_STATUSES]:
+                del self._jobs[job_id]
+        self.on_change()
+
+    def _finish(self, job, status, message):
+        job.status = status
+        job.message = message
+        job.finished = self.clock()
+        job.handle = None
+        finished = sorted((item for item in self._jobs.values() if item.status in FINISHED_STATUSES),
+                          key=lambda item: item.finished)
+        for old in finished[:-MAX_FINISHED]:
+            del self._jobs[old.id]
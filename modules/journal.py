@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from modules.paths import get_app_data_path
+from modules.scheduling import ORDER_USER
+from modules.update_engine import (STAGES, STAGE_MOUNT, STAGE_COMMIT, JOB_PENDING, JOB_RUNNING, JOB_DONE,
+                                   OwnerLock)
+
+# 업데이트 작업 기록 (미리 쓰기 로그, JSON Lines)
+# 첫 줄은 실행 정보와 작업 목록, 이후 줄은 이미지/단계별 진행 기록이다.
+# 모든 기록은 쓸 때마다 fsync하고, 새 실행을 시작할 때는 임시 파일에 쓴 뒤 이름을 바꿔서
+# 프로세스가 어느 시점에 종료되어도 마지막으로 끝난 단계까지는 남아 있도록 한다.
+# 실행하는 동안에는 '<기록 파일>.lock'의 OS 잠금을 잡아서 다른 프로세스가 기록을 이어서 실행하거나 지우지 않게 한다.
+
+JOURNAL_FILE_NAME = 'kdic_journal.jsonl'
+JOURNAL_VERSION = 1
+
+# 기록 종류
+RECORD_RUN = 'run'          # 실행 시작 (작업 목록 포함)
+RECORD_BEGIN = 'begin'      # 단계 시작
+RECORD_DONE = 'done'        # 단계 완료
+RECORD_JOB = 'job'          # 이미지 작업 종료 (완료/실패/취소)
+RECORD_RELEASE = 'release'  # 마운트 해제 (변경 사항 버림)
+
+
+def _fsync_dir(path):
+    """이름 바꾸기/삭제가 디스크에 반영되도록 폴더 fsync (Windows는 지원하지 않음)"""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@dataclass(slots=True)
+class JournalEntry:
+    """이미지(WIM 파일의 인덱스 하나) 하나의 기록"""
+    file_path: str
+    index: int = 1
+    packages: list = field(default_factory=list)
+    size: int = 0
+    status: str = JOB_PENDING
+    stage: str = None                                # 마지막으로 시작한 단계
+    completed: list = field(default_factory=list)    # 끝난 단계 (순서대로)
+    mount_dir: str = None
+    mounted: bool = False                            # 마운트된 채로 남아 있는지 여부
+    error: str = None
+
+    @property
+    def key(self):
+        return (os.path.normcase(self.file_path), self.index)
+
+    def resume_stages(self):
+        """이어서 실행할 때 건너뛸 수 있는 단계
+
+        커밋된 변경은 WIM 파일에 남으므로 커밋까지 끝났으면 그 뒤부터,
+        마운트된 채 중단되었으면 다시 연결할 수 있을 때 마지막으로 끝난 단계 뒤부터 진행한다.
+        그 밖의 경우는 처음(마운트)부터 다시 실행한다.
+        """
+        if STAGE_COMMIT in self.completed or self.mounted:
+            return list(self.completed)
+        return []
+
+
+@dataclass(slots=True)
+class JournalState:
+    """기록 파일을 다시 읽어 만든 마지막 실행 상태"""
+    run_id: str
+    started: float
+    export: bool = False
+    export_dir: str = None
+    order: str = ORDER_USER
+    entries: list = field(default_factory=list)  # JournalEntry (작업 순서)
+
+    @property
+    def pending(self):
+        """완료되지 않은 이미지"""
+        return [entry for entry in self.entries if entry.status != JOB_DONE]
+
+    @property
+    def done(self):
+        return len(self.entries) - len(self.pending)
+
+    @property
+    def orphan_mounts(self):
+        """마운트된 채로 남아 있는 이미지"""
+        return [entry for entry in self.entries if entry.mounted and entry.mount_dir]
+
+
+class JournalPendingError(RuntimeError):
+    """끝나지 않은 이전 실행 기록이 있어 새 실행을 시작할 수 없음 (이어서 실행하거나 정리한 뒤 시작)"""
+
+    def __init__(self, state):
+        super().__init__(f"끝나지 않은 이전 업데이트 기록이 있습니다: 남은 이미지 {len(state.pending)}개")
+        self.state = state
+
+
+class JournalBusyError(RuntimeError):
+    """다른 프로세스가 이 기록으로 업데이트를 실행 중"""
+
+    def __init__(self, path):
+        super().__init__(f"다른 프로세스가 업데이트를 실행 중입니다 (작업 기록 사용 중: {path})")
+        self.path = path
+
+
+class UpdateJournal:
+    """업데이트 작업 기록 파일 (여러 파이프라인 스레드에서 호출 가능)"""
+
+    def __init__(self, path=None):
+        self.path = path or get_app_data_path(JOURNAL_FILE_NAME)
+        self._lock = threading.Lock()
+        self._file = None
+        self._owner = OwnerLock(self.path + '.lock')  # start_run부터 finish_run까지 잡음
+
+    def in_use(self):
+        """다른 프로세스가 이 기록으로 실행 중인지"""
+        return self._owner.in_use()
+
+    # --- 읽기 ---
+
+    def load(self):
+        """기록을 처음부터 다시 적용하여 JournalState 반환 (기록이 없거나 읽을 수 없으면 None)
+
+        마지막 줄이 쓰다가 끊긴 경우 그 줄은 무시한다.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+
+        state = None
+        entries = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            kind = record.get('type')
+            if state is None:
+                if kind != RECORD_RUN or record.get('version') != JOURNAL_VERSION:
+                    return None
+                state = JournalState(record['run_id'], record['started'], record.get('export', False),
+                                     record.get('export_dir'), record.get('order', ORDER_USER))
+                for data in record['jobs']:
+                    entry = JournalEntry(**data)
+                    entries[entry.key] = entry
+                    state.entries.append(entry)
+                continue
+
+            entry = entries.get((os.path.normcase(record.get('file', '')), record.get('index')))
+            if entry is None:
+                continue
+            if kind == RECORD_BEGIN:
+                entry.status = JOB_RUNNING
+                entry.stage = record['stage']
+            elif kind == RECORD_DONE:
+                entry.completed.append(record['stage'])
+                if record.get('mount_dir'):
+                    entry.mount_dir = record['mount_dir']
+                if record['stage'] == STAGE_MOUNT:
+                    entry.mounted = True
+                elif record['stage'] == STAGE_COMMIT:
+                    entry.mounted = False
+            elif kind == RECORD_JOB:
+                entry.status = record['status']
+                entry.error = record.get('error')
+            elif kind == RECORD_RELEASE:
+                entry.mounted = False
+        return state
+
+    # --- 쓰기 ---
+
+    def start_run(self, jobs, export=False, export_dir=None, order=ORDER_USER, resume_of=None):
+        """새 실행 시작 (이전 기록을 원자적으로 교체)
+
+        이어서 실행하는 작업은 끝난 단계와 마운트 폴더를 첫 기록에 함께 남긴다.
+        이전 기록에 완료되지 않은 이미지가 있으면 그 실행을 이어서 하는 경우(resume_of가 그 run_id)에만
+        교체하고, 아니면 JournalPendingError를 발생시킨다 (먼저 discard()로 정리해야 함).
+        다른 프로세스가 실행 중이면 JournalBusyError.
+        """
+        if not self._owner.acquire():
+            raise JournalBusyError(self.path)
+        try:
+            previous = self.load()
+        except OSError:
+            self._owner.release(remove=False)
+            raise
+        if previous is not None and previous.pending and previous.run_id != resume_of:
+            self._owner.release(remove=False)
+            raise JournalPendingError(previous)
+        record = {
+            'type': RECORD_RUN,
+            'version': JOURNAL_VERSION,
+            'run_id': uuid.uuid4().hex,
+            'started': time.time(),
+            'export': export,
+            'export_dir': export_dir,
+            'order': order,
+            'jobs': [{
+                'file_path': job.file_path,
+                'index': job.index,
+                'packages': job.packages,
+                'size': job.size,
+                'completed': [stage for stage in STAGES if stage in job.completed_stages],
+                'mount_dir': job.mount_dir,
+                'mounted': bool(job.mount_dir) and STAGE_MOUNT in job.completed_stages
+                           and STAGE_COMMIT not in job.completed_stages,
+            } for job in jobs],
+        }
+        folder = os.path.dirname(os.path.abspath(self.path))
+        temp_path = f"{self.path}.tmp"
+        try:
+            with self._lock:
+                self._close_file()
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                _fsync_dir(folder)
+                self._file = open(self.path, 'a', encoding='utf-8')
+        except OSError:
+            self._owner.release(remove=False)
+            raise
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def stage_started(self, job, stage):
+        self._append({'type': RECORD_BEGIN, 'file': job.file_path, 'index': job.index, 'stage': stage})
+
+    def stage_completed(self, job, stage):
+        self._append({'type': RECORD_DONE, 'file': job.file_path, 'index': job.index, 'stage': stage,
+                      'mount_dir': job.mount_dir})
+
+    def job_finished(self, job):
+        self._append({'type': RECORD_JOB, 'file': job.file_path, 'index': job.index, 'status': job.status,
+                      'error': job.error})
+
+    def mount_released(self, job):
+        self._append({'type': RECORD_RELEASE, 'file': job.file_path, 'index': job.index})
+
+    def finish_run(self, completed):
+        """실행 종료 (모든 이미지가 완료되었으면 기록 삭제, 아니면 다음 실행을 위해 남김)"""
+        with self._lock:
+            self._close_file()
+        if completed:
+            self.discard()
+        self._owner.release(remove=False)
+
+    def discard(self):
+        """기록 삭제 (이어서 실행하지 않기로 한 경우, 다른 프로세스가 실행 중이면 JournalBusyError)"""
+        if self.in_use():
+            raise JournalBusyError(self.path)
+        with self._lock:
+            self._close_file()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                return
+            _fsync_dir(os.path.dirname(os.path.abspath(self.path)))
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,163 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from modules.paths import get_app_data_path
+
+LOG_DIR_NAME = 'logs'
+LOG_FILE_NAME = 'kdic.jsonl'
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # 파일 하나의 최대 크기
+DEFAULT_BACKUP_COUNT = 10             # 보관할 이전 파일 수 (kdic.1.jsonl ~ kdic.N.jsonl)
+DEFAULT_QUEUE_SIZE = 10000            # 기록 대기열 크기 (가득 차면 이벤트를 버리고 개수만 셈)
+
+LEVEL_DEBUG = 'debug'  # 파일/단계별 소요 시간 등 상세 기록 (화면에는 표시하지 않음)
+LEVEL_INFO = 'info'
+LEVEL_WARNING = 'warning'
+LEVEL_ERROR = 'error'
+
+
+class LogEvent:
+    """구조화된 로그 이벤트 하나"""
+    __slots__ = ('timestamp', 'level', 'message', 'job', 'file', 'stage', 'duration')
+
+    def __init__(self, message, level=LEVEL_INFO, job=None, file=None, stage=None, duration=None):
+        self.timestamp = datetime.now()
+        self.level = level
+        self.message = message
+        self.job = job            # 예: scan, update, controller
+        self.file = file          # 관련 WIM 파일 경로
+        self.stage = stage        # 업데이트 단계 등
+        self.duration = duration  # 소요 시간(초)
+
+    def to_dict(self):
+        data = {'ts': self.timestamp.isoformat(timespec='milliseconds'), 'level': self.level}
+        for name in ('job', 'file', 'stage'):
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        if self.duration is not None:
+            data['duration'] = round(self.duration, 3)
+        data['message'] = self.message
+        return data
+
+
+class LogSink:
+    """구조화된 로그를 회전하는 JSONL 파일에 기록하는 비동기 로그 싱크 (Qt 비의존)
+
+    emit()은 이벤트를 구독자에게 바로 전달한 뒤 크기가 제한된 대기열에 넣기만 하므로
+    디스크 I/O가 스캐너나 GUI 스레드를 막지 않는다. 실제 기록은 백그라운드 스레드가 한다.
+    """
+
+    def __init__(self, log_dir=None, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 queue_size=DEFAULT_QUEUE_SIZE):
+        self.log_dir = log_dir or get_app_data_path(LOG_DIR_NAME)
+        self.log_path = os.path.join(self.log_dir, LOG_FILE_NAME)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0  # 대기열이 가득 차서 기록하지 못한 이벤트 수
+        self.write_error = None
+
+        self._subscribers = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name='log-sink', daemon=True)
+        self._writer.start()
+
+    def subscribe(self, callback):
+        """이벤트 구독 (callback(LogEvent)은 emit을 호출한 스레드에서 실행되므로 가벼워야 함)"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def emit(self, message, level=LEVEL_INFO, job=None, file=None, stage=None, duration=None):
+        """로그 이벤트 기록 (어느 스레드에서나 호출 가능, 블로킹 없음)"""
+        event = LogEvent(message, level, job, file, stage, duration)
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception:
+                pass
+        if self._closed:
+            return event
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+        return event
+
+    def close(self, timeout=2.0):
+        """남은 이벤트를 기록하고 백그라운드 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._writer.join(timeout)
+
+    def _write_loop(self):
+        f = None
+        try:
+            while True:
+                event = self._queue.get()
+                batch = [event]
+                # 쌓여 있는 이벤트를 한 번에 기록
+                while len(batch) < 1000:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = None in batch
+                lines = ''.join(
+                    json.dumps(e.to_dict(), ensure_ascii=False) + '\n' for e in batch if e is not None
+                )
+                if lines:
+                    try:
+                        f = self._write(f, lines)
+                    except OSError as e:
+                        # 기록 실패 시 이번 묶음은 버리고 다음 묶음에서 파일을 다시 연다
+                        self.write_error = str(e)
+                        if f is not None:
+                            f.close()
+                            f = None
+                        time.sleep(1.0)
+                if stop:
+                    break
+        finally:
+            if f is not None:
+                f.close()
+
+    def _write(self, f, lines):
+        if f is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            f = open(self.log_path, 'a', encoding='utf-8')
+        f.write(lines)
+        f.flush()
+        if f.tell() >= self.max_bytes:
+            f.close()
+            self._rotate()
+            f = open(self.log_path, 'a', encoding='utf-8')
+        return f
+
+    def _rotate(self):
+        """kdic.jsonl -> kdic.1.jsonl -> ... -> kdic.N.jsonl (가장 오래된 파일 삭제)"""
+        base, ext = os.path.splitext(self.log_path)
+        oldest = f"{base}.{self.backup_count}{ext}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{base}.{i}{ext}"
+            if os.path.exists(source):
+                os.replace(source, f"{base}.{i + 1}{ext}")
+        if self.backup_count > 0:
+            os.replace(self.log_path, f"{base}.1{ext}")
+        else:
+            os.remove(self.log_path)
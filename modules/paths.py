@@ -0,0 +1,33 @@
+import os
+import sys
+
+
+def get_app_dir():
+    """애플리케이션 실행 위치 (PyInstaller 빌드 시 exe 폴더)"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(os.path.abspath(sys.executable))
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_app_data_path(file_name):
+    """애플리케이션 옆에 저장되는 데이터 파일 경로"""
+    return os.path.join(get_app_dir(), file_name)
+
+
+_resource_cache = {}
+
+
+def find_resource(*parts):
+    """번들 리소스(아이콘 등) 경로를 한 번만 찾아서 기억 (없으면 None)
+
+    PyInstaller 임시 폴더, 애플리케이션 폴더, 현재 작업 폴더 순서로 찾는다.
+    """
+    relative = os.path.join(*parts)
+    if relative not in _resource_cache:
+        bases = [getattr(sys, '_MEIPASS', None), get_app_dir(), os.getcwd()]
+        _resource_cache[relative] = next(
+            (os.path.join(base, relative) for base in bases
+             if base and os.path.exists(os.path.join(base, relative))),
+            None
+        )
+    return _resource_cache[relative]
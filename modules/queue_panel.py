@@ -0,0 +1,108 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QColor
+
+from modules.job_queue import (KIND_LABELS, STATUS_LABELS, STATUS_QUEUED, STATUS_RUNNING, STATUS_STOPPING,
+                               STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED, FINISHED_STATUSES)
+
+# 상태별 글자색
+STATUS_COLORS = {
+    STATUS_RUNNING: '#0d6efd',
+    STATUS_STOPPING: '#fd7e14',
+    STATUS_DONE: '#198754',
+    STATUS_FAILED: '#dc3545',
+    STATUS_CANCELLED: '#6c757d',
+}
+
+
+class JobQueuePanel(QWidget):
+    """작업 대기열 표시와 순서 변경/취소 (실제 변경은 컨트롤러가 JobQueue에 반영)"""
+    move_requested = pyqtSignal(int, int)  # (작업 id, 이동 칸 수, 음수면 앞으로)
+    cancel_requested = pyqtSignal(int)     # 작업 id
+    clear_requested = pyqtSignal()         # 끝난 작업 목록 비우기
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = []
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(('작업', '대상', '상태'))
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().hide()
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.up_btn = QPushButton("▲")
+        self.up_btn.setToolTip("먼저 실행")
+        self.up_btn.clicked.connect(lambda: self.request_move(-1))
+        self.down_btn = QPushButton("▼")
+        self.down_btn.setToolTip("나중에 실행")
+        self.down_btn.clicked.connect(lambda: self.request_move(1))
+        self.cancel_btn = QPushButton("취소")
+        self.cancel_btn.setToolTip("대기 중인 작업은 목록에서 취소하고, 실행 중인 작업은 중지합니다.")
+        self.cancel_btn.clicked.connect(self.request_cancel)
+        self.clear_btn = QPushButton("정리")
+        self.clear_btn.setToolTip("끝난 작업을 목록에서 지웁니다.")
+        self.clear_btn.clicked.connect(self.clear_requested.emit)
+        for button in (self.up_btn, self.down_btn, self.cancel_btn, self.clear_btn):
+            button.setMinimumWidth(0)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        self.update_buttons()
+
+    def set_jobs(self, jobs):
+        """작업 목록 다시 그리기 (선택한 작업은 유지)"""
+        selected = self.selected_job()
+        self.jobs = list(jobs)
+        self.table.clearSelection()
+        self.table.setRowCount(len(self.jobs))
+        for row, job in enumerate(self.jobs):
+            kind = QTableWidgetItem(KIND_LABELS.get(job.kind, job.kind))
+            target = QTableWidgetItem(job.label)
+            target.setToolTip("\n".join(job.paths[:20]) if job.paths else job.label)
+            status = QTableWidgetItem(STATUS_LABELS.get(job.status, job.status))
+            if job.message:
+                status.setToolTip(job.message)
+            if job.status in STATUS_COLORS:
+                status.setForeground(QColor(STATUS_COLORS[job.status]))
+            for column, item in enumerate((kind, target, status)):
+                self.table.setItem(row, column, item)
+            if selected is not None and job.id == selected.id:
+                self.table.selectRow(row)
+        self.update_buttons()
+
+    def selected_job(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows or rows[0].row() >= len(self.jobs):
+            return None
+        return self.jobs[rows[0].row()]
+
+    def update_buttons(self):
+        job = self.selected_job()
+        queued = job is not None and job.status == STATUS_QUEUED
+        self.up_btn.setEnabled(queued)
+        self.down_btn.setEnabled(queued)
+        self.cancel_btn.setEnabled(job is not None and job.status in (STATUS_QUEUED, STATUS_RUNNING))
+        self.clear_btn.setEnabled(any(item.status in FINISHED_STATUSES for item in self.jobs))
+
+    def request_move(self, delta):
+        job = self.selected_job()
+        if job is not None:
+            self.move_requested.emit(job.id, delta)
+
+    def request_cancel(self):
+        job = self.selected_job()
+        if job is not None:
+            self.cancel_requested.emit(job.id)
+
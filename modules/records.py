@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass(slots=True)
+class ImageRecord:
+    """WIM 파일 안의 이미지(인덱스) 하나의 정보"""
+    index: int
+    name: str = 'N/A'
+    description: str = ''
+    version: str = 'N/A'       # 예: 10.0
+    build: str = 'N/A'         # 예: 22631
+    spbuild: str = ''          # 예: 2861
+    architecture: str = ''     # 예: x64
+    size: int = 0              # 이미지 전체 크기 (바이트)
+
+    def merge(self, other):
+        """다른 조회 결과에서 비어 있는 항목만 채움"""
+        defaults = ImageRecord(self.index)
+        for name in self.__slots__:
+            if getattr(self, name) == getattr(defaults, name):
+                setattr(self, name, getattr(other, name))
+
+
+@dataclass(slots=True)
+class WimFileRecord:
+    """WIM 파일 하나의 스캔 결과"""
+    file_path: str
+    images: list = field(default_factory=list)  # ImageRecord 목록 (인덱스 순)
+    file_size: int = 0         # 디스크상 파일 크기 (분할 이미지는 전체 파트 합계)
+    guid: str = None           # WIM 헤더 GUID
+    image_count: int = 0
+    compression: str = ''
+    parts: list = None         # 분할 이미지(.swm) 파트 경로 목록
+    source: str = 'native'     # 정보 출처: native(헤더 직접 읽기) / dism
+
+    @property
+    def primary(self):
+        """목록에 표시할 대표 이미지 (보통 첫 번째 인덱스)"""
+        return self.images[0] if self.images else ImageRecord(1)
+
+    @property
+    def name(self):
+        return self.primary.name
+
+    @property
+    def version(self):
+        return self.primary.version
+
+    @property
+    def build(self):
+        return self.primary.build
+
+    def to_dict(self):
+        """JSON 저장용 dict 변환"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 결과(또는 이전 형식의 wim_info dict)에서 복원"""
+        images = [ImageRecord(**image) for image in data.get('images') or []]
+        if not images:
+            # 이전 형식: 첫 번째 이미지 정보만 최상위에 저장되어 있음
+            images = [ImageRecord(
+                1,
+                name=data.get('name', 'N/A'),
+                version=data.get('version', 'N/A'),
+                build=data.get('build', 'N/A')
+            )]
+        return cls(
+            file_path=data.get('file_path', 'N/A'),
+            images=images,
+            file_size=data.get('file_size', 0),
+            guid=data.get('guid'),
+            image_count=data.get('image_count') or len(images),
+            compression=data.get('compression', ''),
+            parts=data.get('parts'),
+            source=data.get('source', 'native'),
+        )
+
+
+@dataclass(slots=True)
+class InstalledPackage:
+    """이미지에 설치된 패키지 하나 (DISM /Get-Packages 결과)"""
+    identity: str              # 예: Package_for_RollupFix~31bf3856ad364e35~amd64~~22621.3007.1.6
+    state: str = ''            # PACKAGE_STATE_* (모르는 상태는 DISM 출력 그대로)
+    release_type: str = ''     # 예: Security Update
+
+    @property
+    def name(self):
+        """패키지 이름 (예: Package_for_RollupFix)"""
+        return self.identity.split('~', 1)[0]
+
+    @property
+    def version(self):
+        """패키지 버전 (예: 22621.3007.1.6, 없으면 빈 문자열)"""
+        parts = self.identity.split('~')
+        return parts[4] if len(parts) > 4 else ''
+
+    def to_dict(self):
+        return asdict(self)
@@ -0,0 +1,245 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+
+from modules.tracing import span, count
+
+# 기본 DISM 실행 파일 (KDIC_DISM 환경 변수로 가짜 dism 경로 지정 가능)
+DISM_EXECUTABLE = os.environ.get('KDIC_DISM', 'dism')
+
+# 실행 중인 명령의 취소/시간 초과를 확인하는 주기(초)
+POLL_INTERVAL = 0.05
+
+# 프로세스를 강제 종료한 뒤 출력 스레드를 기다리는 최대 시간(초)
+KILL_GRACE = 1.0
+
+
+class CommandResult:
+    """외부 명령 실행 결과"""
+    __slots__ = ('returncode', 'stdout', 'stderr', 'timed_out', 'cancelled')
+
+    def __init__(self, returncode, stdout='', stderr='', timed_out=False, cancelled=False):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out    # 제한 시간을 넘겨 강제 종료됨
+        self.cancelled = cancelled    # 취소되어 강제 종료(또는 실행 안 함)
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+
+class CommandRunner:
+    """외부 명령 실행 인터페이스
+
+    스캐너/업데이트 엔진은 이 인터페이스로만 DISM을 호출하므로
+    테스트나 벤치마크에서는 가짜 구현으로 교체할 수 있다.
+    """
+
+    def run(self, args, timeout=None, on_output=None, cancellable=True):
+        """명령 인자 리스트를 실행하고 CommandResult 반환
+
+        timeout: 이 명령의 제한 시간(초)
+        on_output(line): 표준 출력을 줄 단위로 받는 콜백 (실행 중에 호출)
+        cancellable: False이면 cancel()로 중단하지 않음 (커밋처럼 중간에 끊으면 안 되는 명령)
+        """
+        raise NotImplementedError
+
+    def dism(self, *args, **options):
+        """DISM 명령 실행 (options는 run()에 전달)"""
+        return self.run([self.dism_executable, *args], **options)
+
+    def cancel(self):
+        """실행 중인 명령을 중단하고 이후 명령은 실행하지 않음"""
+        pass
+
+    dism_executable = DISM_EXECUTABLE
+
+
+class SubprocessRunner(CommandRunner):
+    """subprocess로 명령을 실행하는 기본 구현 (스캔/업데이트 스레드가 함께 사용 가능)
+
+    출력은 별도 스레드가 줄 단위로 읽고, 실행 중에는 POLL_INTERVAL마다 취소와 제한 시간을 확인한다.
+    취소하거나 제한 시간을 넘기면 자식 프로세스 트리 전체를 강제 종료한다.
+    """
+
+    def __init__(self, dism_executable=None, encoding='utf-8', timeout=None, deadline=None, cancel_event=None):
+        """
+        timeout: 명령 하나의 기본 제한 시간(초, None이면 제한 없음)
+        deadline: 전체 제한 시간(초, 지금부터), 넘기면 실행 중인 명령을 종료하고 이후 명령은 실패 처리
+        cancel_event: 다른 곳에서 set()하면 cancel()과 같이 동작하는 threading.Event (DISM 도우미의 요청별 취소)
+        """
+        if dism_executable:
+            self.dism_executable = dism_executable
+        self.encoding = encoding
+        self.timeout = timeout
+        self.deadline = time.monotonic() + deadline if deadline else None
+        self._cancelled = cancel_event or threading.Event()
+        self._lock = threading.Lock()
+        self._active = set()  # 실행 중인 (Popen, cancellable)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            targets = [process for process, cancellable in self._active if cancellable]
+        for process in targets:
+            kill_process_tree(process)
+
+    def reset(self):
+        """취소 상태 해제 (같은 실행기를 다시 사용할 때)"""
+        self._cancelled.clear()
+
+    def _popen_options(self):
+        kwargs = {}
+        if os.name == 'nt':
+            # 콘솔 창이 나타나지 않도록 startupinfo 설정, 트리 종료를 위해 새 프로세스 그룹으로 실행
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            kwargs['startupinfo'] = startupinfo
+            kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # 자식이 만든 프로세스까지 한 번에 종료할 수 있도록 새 세션(프로세스 그룹)으로 실행
+            kwargs['start_new_session'] = True
+        return kwargs
+
+    def run(self, args, timeout=None, on_output=None, cancellable=True):
+        if cancellable and self.cancelled:
+            return CommandResult(-1, '', "취소되었습니다.", cancelled=True)
+        timeout = self.timeout if timeout is None else timeout
+        now = time.monotonic()
+        limits = [now + timeout] if timeout else []
+        if self.deadline is not None:
+            if now >= self.deadline:
+                return CommandResult(-1, '', "전체 제한 시간을 넘겼습니다.", timed_out=True)
+            limits.append(self.deadline)
+        limit = min(limits) if limits else None
+
+        command = args[1] if len(args) > 1 else os.path.basename(args[0])
+        with span('dism', 'dism', command=command) as command_span:
+            result = self._run_process(args, limit, on_output, cancellable)
+            command_span.set(returncode=result.returncode)
+        count('dism_commands', command=command)
+        if result.timed_out:
+            count('dism_timeouts', command=command)
+        elif result.cancelled:
+            count('dism_cancelled', command=command)
+        return result
+
+    def _run_process(self, args, limit, on_output, cancellable):
+        with span('dism.spawn', 'dism'):
+            process = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding=self.encoding,
+                errors='replace',
+                **self._popen_options()
+            )
+        entry = (process, cancellable)
+        with self._lock:
+            self._active.add(entry)
+
+        stdout, stderr = [], []
+        readers = [
+            threading.Thread(target=_read_lines, args=(process.stdout, stdout, on_output), daemon=True),
+            threading.Thread(target=_read_lines, args=(process.stderr, stderr, None), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = cancelled = False
+        try:
+            while True:
+                try:
+                    process.wait(timeout=POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                if cancellable and self.cancelled:
+                    cancelled = True
+                elif limit is not None and time.monotonic() >= limit:
+                    timed_out = True
+                else:
+                    continue
+                kill_process_tree(process)
+                try:
+                    process.wait(timeout=KILL_GRACE)
+                except subprocess.TimeoutExpired:
+                    pass
+                break
+        finally:
+            with self._lock:
+                self._active.discard(entry)
+
+        # 강제 종료한 경우 손자 프로세스가 파이프를 잡고 있을 수 있으므로 오래 기다리지 않음
+        for reader in readers:
+            reader.join(KILL_GRACE if (timed_out or cancelled) else None)
+        if cancellable and self.cancelled and not timed_out:
+            cancelled = True
+        returncode = process.returncode if process.returncode is not None else -1
+        message = ''.join(stderr)
+        if timed_out:
+            message += f"\n제한 시간을 넘겨 종료했습니다: {' '.join(args[:2])}"
+        return CommandResult(returncode, ''.join(stdout), message, timed_out=timed_out,
+                             cancelled=cancelled and returncode != 0)
+
+
+def _read_lines(stream, lines, on_output):
+    """파이프를 줄 단위로 읽어 모으고 콜백에 전달 (진행률 표시줄의 \\r도 줄 구분으로 처리)"""
+    try:
+        for line in stream:
+            lines.append(line)
+            if on_output is not None:
+                try:
+                    on_output(line.rstrip('\n'))
+                except Exception:
+                    pass
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+def kill_process_tree(process):
+    """프로세스와 그 자식 프로세스를 모두 강제 종료"""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/PID', str(process.pid), '/T', '/F'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+def create_runner(**options):
+    """설정에 따라 상주 DISM 도우미 풀을 쓰는 실행기 또는 명령마다 새 프로세스를 만드는 실행기 생성
+
+    options는 SubprocessRunner에 전달한다. 도우미 풀은 KDIC_DISM_HELPERS 환경 변수나
+    helper_pool.configure_shared_pool()로 켠다.
+    """
+    from modules.helper_pool import shared_pool, HelperRunner
+
+    pool = shared_pool()
+    if pool is None:
+        return SubprocessRunner(**options)
+    return HelperRunner(pool, **options)
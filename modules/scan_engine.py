@@ -0,0 +1,212 @@
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.discovery import ImageCandidate
+from modules.dism_parser import parse_dism_output
+from modules.records import WimFileRecord
+from modules.runner import create_runner
+from modules.tracing import span, count
+from modules.wim import read_wim_info, WimFormatError
+
+# 동시 조회 수 기본 상한 (DISM은 이미지 열기 시 디스크 I/O가 많아 과도한 병렬화는 역효과)
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+MAX_WORKERS_LIMIT = 32
+
+# DISM 정보 조회 명령 하나의 기본 제한 시간(초, 응답 없는 DISM이 스캔 전체를 멈추지 않도록)
+DISM_INFO_TIMEOUT = 120
+
+
+def _as_candidate(item):
+    """경로 문자열이면 stat을 조회해 ImageCandidate로 변환"""
+    if isinstance(item, ImageCandidate):
+        return item
+    try:
+        return ImageCandidate(item, os.stat(item))
+    except OSError:
+        return ImageCandidate(item, None, size=0)
+
+
+class ScanEngine:
+    """WIM 파일 메타데이터 조회 엔진 (Qt 비의존)
+
+    파일별 조회를 크기가 제한된 스레드 풀에서 실행하고,
+    결과는 입력 순서대로 반환한다. 한 파일의 실패는 다른 파일에 영향을 주지 않는다.
+    """
+
+    def __init__(self, runner=None, max_workers=None, use_native=True, log=None, cache=None):
+        self.runner = runner or create_runner(timeout=DISM_INFO_TIMEOUT)
+        self.cache = cache  # ScanCache (None이면 항상 새로 조회)
+        if max_workers is None:
+            max_workers = DEFAULT_MAX_WORKERS
+        self.max_workers = max(1, min(int(max_workers), MAX_WORKERS_LIMIT))
+        self.use_native = use_native  # WIM 헤더/XML 직접 읽기 사용 여부
+        self.log = log or (lambda message, **fields: None)  # log(message, level=, file=, stage=, duration=)
+
+    def cancel(self):
+        """실행 중인 DISM 조회를 종료 (스캔 중지 시 호출, 이후 DISM 조회는 바로 실패)"""
+        self.runner.cancel()
+
+    def scan(self, file_paths, on_result=None, should_stop=None, force=False):
+        """파일 목록을 병렬로 조회하여 입력 순서대로 결과 리스트 반환
+
+        file_paths는 경로 또는 ImageCandidate의 iterable이며, 제너레이터를 넘기면
+        탐색이 진행되는 동안 이미 찾은 파일의 조회가 먼저 시작된다.
+        결과는 WimFileRecord 목록이다.
+        on_result(index, record)는 각 파일 조회가 끝나는 즉시 호출된다.
+        should_stop()이 True를 반환하면 대기 중인 조회를 취소한다.
+        force가 True이면 캐시를 무시하고 모든 파일을 다시 조회한다.
+        """
+        total = len(file_paths) if hasattr(file_paths, '__len__') else None
+        results = {}
+        candidates = {}
+        should_stop = should_stop or (lambda: False)
+        cache_hits = 0
+        done = queue.Queue()
+
+        def collect(future):
+            """완료된 조회 결과 처리 (호출 스레드에서만 실행)"""
+            i = futures.pop(future)
+            if future.cancelled():
+                return
+            record = future.result()
+            if record is None:
+                return
+            self._apply_candidate(record, candidates[i])
+            results[i] = record
+            self._store_cache(candidates[i].path, record)
+            if on_result:
+                on_result(i, record)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='wim-scan') as pool:
+            futures = {}
+            for i, item in enumerate(file_paths):
+                if should_stop():
+                    break
+                candidate = _as_candidate(item)
+                candidates[i] = candidate
+
+                # 변경되지 않은 파일은 캐시 결과를 그대로 사용
+                cached = self._lookup_cache(candidate) if not force else None
+                if cached is not None:
+                    cache_hits += 1
+                    self._apply_candidate(cached, candidate)
+                    results[i] = cached
+                    if on_result:
+                        on_result(i, cached)
+                else:
+                    future = pool.submit(self._query_isolated, i, total, candidate.path, should_stop)
+                    futures[future] = i
+                    future.add_done_callback(done.put)
+
+                # 탐색 중에도 끝난 조회 결과는 바로 전달
+                while not done.empty():
+                    collect(done.get_nowait())
+
+            while futures:
+                if should_stop():
+                    for pending in list(futures):
+                        pending.cancel()
+                collect(done.get())
+
+        if cache_hits:
+            count('scan_cache_hits', cache_hits)
+            self.log(f"{cache_hits}개 파일은 변경되지 않아 캐시된 정보를 사용했습니다.")
+        return [results[i] for i in sorted(results)]
+
+    @staticmethod
+    def _apply_candidate(record, candidate):
+        """탐색 단계에서 얻은 파일 크기/분할 파트 정보 반영"""
+        record.file_path = candidate.path
+        record.file_size = candidate.size
+        record.parts = list(candidate.parts) if candidate.is_split else None
+
+    def _lookup_cache(self, candidate):
+        if self.cache is None:
+            return None
+        try:
+            data = self.cache.lookup(candidate.path, candidate.stat)
+            return WimFileRecord.from_dict(data) if data is not None else None
+        except Exception as e:
+            self.log(f"캐시 조회 실패: {e}", level='warning', file=candidate.path)
+            return None
+
+    def _store_cache(self, file_path, record):
+        if self.cache is None:
+            return
+        try:
+            self.cache.store(file_path, record.to_dict())
+        except Exception as e:
+            self.log(f"캐시 저장 실패: {e}", level='warning', file=file_path)
+
+    def _query_isolated(self, i, total, file_path, should_stop):
+        """파일 하나를 조회 (예외는 로그로 남기고 None 반환)"""
+        if should_stop():
+            return None
+
+        file_name = os.path.basename(file_path)
+        position = f"{i+1}/{total}" if total is not None else f"{i+1}"
+        self.log(f"({position}) '{file_name}' 정보 조회 중...", file=file_path)
+        started = time.perf_counter()
+        with span('scan.file', 'scan', file=file_path) as file_span:
+            try:
+                record = self.query_wim_info(file_path)
+            except Exception as e:
+                self.log(f"'{file_name}' 처리 중 오류 발생: {str(e)}", level='error', file=file_path)
+                return None
+            file_span.set(source=record.source if record is not None else None)
+        count('scan_files', source=record.source if record is not None else 'failed')
+        if record is not None:
+            self.log(f"'{file_name}' 정보 조회 완료 ({record.source})", level='debug', file=file_path,
+                     stage=record.source, duration=time.perf_counter() - started)
+        return record
+
+    def query_wim_info(self, file_path):
+        """WIM 파일 정보 조회 (기본: 헤더 직접 읽기, 실패 시 DISM)"""
+        if self.use_native:
+            try:
+                with span('wim.header', 'scan'):
+                    return read_wim_info(file_path)
+            except (OSError, WimFormatError) as e:
+                self.log(f"'{os.path.basename(file_path)}' 헤더 직접 읽기 실패, DISM으로 조회합니다: {e}",
+                         level='warning', file=file_path)
+
+        return self.query_dism_info(file_path)
+
+    def query_dism_info(self, file_path):
+        """dism /Get-WimInfo 실행 결과에서 정보 추출 (실패 시 None)
+
+        인덱스 없이 조회하면 이름/설명/크기만 나오므로, 버전 정보가 빠진
+        인덱스는 /Index:N 상세 조회 결과로 채운다.
+        """
+        result = self.runner.dism('/Get-WimInfo', f'/WimFile:{file_path}')
+        if result.cancelled:
+            return None
+        if not result.ok:
+            self.log(f"'{os.path.basename(file_path)}' 정보 조회 실패: {result.stderr or result.stdout}",
+                     level='error', file=file_path)
+            return None
+
+        # DISM 출력 결과 파싱
+        images = parse_dism_output(result.stdout)
+        for image in images:
+            if image.build != 'N/A':
+                continue
+            detail = self.runner.dism('/Get-WimInfo', f'/WimFile:{file_path}', f'/Index:{image.index}')
+            if detail.ok:
+                for detail_image in parse_dism_output(detail.stdout):
+                    if detail_image.index == image.index:
+                        image.merge(detail_image)
+
+        if not images:
+            self.log(f"'{os.path.basename(file_path)}' DISM 출력에서 이미지 정보를 찾지 못했습니다.",
+                     level='error', file=file_path)
+            return None
+
+        return WimFileRecord(
+            file_path=file_path,
+            images=images,
+            image_count=len(images),
+            source='dism',
+        )
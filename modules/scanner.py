@@ -1,100 +1,89 @@
-import os
-import subprocess
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from modules.core import scan_folder
+from modules.discovery import DEFAULT_MAX_DEPTH
+from modules.dism_parser import parse_dism_output
+from modules.scan_engine import ScanEngine
+from modules.tracing import span
+
 class ScannerWorker(QThread):
     """지정된 폴더에서 WIM 파일을 스캔하고 정보를 추출하는 스레드"""
-    scan_complete = pyqtSignal(list)  # 스캔 완료 시 파일 정보 리스트 전달
+    scan_complete = pyqtSignal(list)  # 스캔 완료 시 WimFileRecord 리스트 전달
+    scan_result = pyqtSignal(object)  # 파일 하나의 조회가 끝날 때마다 WimFileRecord 전달 (스트리밍 모드)
     log_message = pyqtSignal(str)     # 로그 메시지 전달
     scan_started = pyqtSignal()       # 스캔 시작 신호
-    
-    def __init__(self, folder_path):
+
+    def __init__(self, folder_path, use_native=True, max_workers=None, runner=None,
+                 cache=None, force_rescan=False, streaming=True,
+                 max_depth=DEFAULT_MAX_DEPTH, include=None, exclude=None, file_paths=None,
+                 sink=None):
         super().__init__()
         self.folder_path = folder_path
+        self.file_paths = file_paths  # 지정 시 폴더 탐색 없이 이 파일들만 조회 (부분 재스캔)
+        self.found_paths = []         # 탐색된 파일 경로 (조회 실패 파일 포함)
+        self.max_depth = max_depth  # 하위 폴더 탐색 깊이 (0이면 선택한 폴더만)
+        self.include = include      # 포함할 파일 glob 패턴 목록
+        self.exclude = exclude      # 제외할 파일/폴더 glob 패턴 목록
+        self.streaming = streaming  # True이면 결과를 파일 단위로 즉시 전달
+        self.force_rescan = force_rescan  # True이면 캐시를 무시하고 전체 재조회
+        self.cache = cache
+        self.sink = sink  # LogSink (지정 시 모든 로그를 구조화된 이벤트로 기록)
         self.is_running = True
+        self.engine = ScanEngine(
+            runner=runner,
+            max_workers=max_workers,
+            use_native=use_native,  # WIM 헤더/XML 직접 읽기 사용 여부
+            log=self.log,
+            cache=cache
+        )
 
     def run(self):
         """스레드 실행 함수"""
-        self.log_message.emit(f"'{self.folder_path}' 폴더에서 WIM 파일을 스캔합니다...")
+        if self.file_paths is None:
+            self.log(f"'{self.folder_path}' 폴더에서 WIM 파일을 스캔합니다...")
+        else:
+            self.log(f"변경된 파일 {len(self.file_paths)}개의 정보를 다시 조회합니다...")
         self.scan_started.emit()
-        
-        wim_files_info = []
-        try:
-            files = [f for f in os.listdir(self.folder_path) if f.lower().endswith('.wim')]
-            if not files:
-                self.log_message.emit("스캔할 WIM 파일이 없습니다.")
-                self.scan_complete.emit([])
-                return
 
-            total_files = len(files)
-            for i, file_name in enumerate(files):
-                if not self.is_running:
-                    self.log_message.emit("사용자에 의해 스캔이 중단되었습니다.")
-                    break
-                
-                file_path = os.path.join(self.folder_path, file_name)
-                self.log_message.emit(f"({i+1}/{total_files}) '{file_name}' 정보 조회 중...")
-                
-                try:
-                    # DISM 명령 실행
-                    cmd = f'dism /Get-WimInfo /WimFile:"{file_path}"'
-                    
-                    # 콘솔 창이 나타나지 않도록 startupinfo 설정
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                    
-                    result = subprocess.run(
-                        cmd, 
-                        shell=True, 
-                        capture_output=True, 
-                        text=True, 
-                        encoding='utf-8',
-                        startupinfo=startupinfo
-                    )
-                    
-                    if result.returncode == 0:
-                        # DISM 출력 결과 파싱
-                        wim_info = self.parse_dism_output(result.stdout)
-                        wim_info['file_path'] = file_path
-                        wim_files_info.append(wim_info)
-                    else:
-                        self.log_message.emit(f"'{file_name}' 정보 조회 실패: {result.stderr}")
-                        
-                except Exception as e:
-                    self.log_message.emit(f"'{file_name}' 처리 중 오류 발생: {str(e)}")
+        wim_files_info = []
+        with span('scan.run', 'scan', folder=self.folder_path) as scan_span:
+            try:
+                outcome = scan_folder(
+                    self.engine,
+                    self.folder_path,
+                    file_paths=self.file_paths,
+                    max_depth=self.max_depth,
+                    include=self.include,
+                    exclude=self.exclude,
+                    on_result=self.emit_result if self.streaming else None,
+                    should_stop=lambda: not self.is_running,
+                    force=self.force_rescan
+                )
+                wim_files_info = outcome.records
+                self.found_paths = outcome.found_paths
+            except Exception as e:
+                self.log(f"폴더 스캔 중 오류 발생: {str(e)}", level='error')
+            scan_span.set(files=len(wim_files_info))
 
-        except Exception as e:
-            self.log_message.emit(f"폴더 스캔 중 오류 발생: {str(e)}")
-            
         self.scan_complete.emit(wim_files_info)
 
+    def emit_result(self, index, record):
+        """조회가 끝난 파일 정보를 즉시 전달"""
+        if self.is_running:
+            self.scan_result.emit(record)
+
+    def log(self, message, **fields):
+        """로그 전달 (로그 싱크가 있으면 싱크로, 없으면 시그널로)"""
+        if self.sink is not None:
+            self.sink.emit(message, job='scan', **fields)
+        elif fields.get('level') != 'debug':
+            self.log_message.emit(message)
+
     def parse_dism_output(self, output):
-        """DISM /Get-WimInfo 결과 텍스트를 파싱하여 정보 추출"""
-        info = {'name': 'N/A', 'version': 'N/A', 'build': 'N/A'}
-        lines = output.splitlines()
-        
-        try:
-            for i, line in enumerate(lines):
-                # 보통 첫 번째 이미지의 정보를 사용
-                if "인덱스 : 1" in line:
-                    for sub_line in lines[i:]:
-                        if '이름 :' in sub_line and info['name'] == 'N/A':
-                            info['name'] = sub_line.split(':', 1)[1].strip()
-                        elif '버전 :' in sub_line and info['version'] == 'N/A':
-                            # 예: 버전 : 10.0.22631
-                            version_str = sub_line.split(':', 1)[1].strip()
-                            parts = version_str.split('.')
-                            if len(parts) >= 3:
-                                info['version'] = f"{parts[0]}.{parts[1]}"
-                                info['build'] = parts[2]
-                            break # 버전 정보 찾으면 종료
-                    break # 인덱스 1 찾으면 종료
-        except Exception:
-            # 파싱 실패 시 기본값 반환
-            pass
-            
-        return info
+        """DISM /Get-WimInfo 결과 텍스트를 파싱하여 인덱스별 ImageRecord 목록 반환"""
+        return parse_dism_output(output)
 
     def stop(self):
-        """스레드 중지"""
-        self.is_running = False
\ No newline at end of file
+        """스레드 중지 (실행 중인 DISM 조회도 바로 종료)"""
+        self.is_running = False
+        self.engine.cancel()
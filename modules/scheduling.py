@@ -0,0 +1,85 @@
+import time
+
+# 업데이트 처리 순서 정책과 남은 시간 추정 (Qt 비의존, View가 시작할 때 읽으므로 가볍게 유지)
+
+# 이미지 처리 순서
+ORDER_LARGEST = 'largest'    # 큰 이미지 먼저 (병렬 실행 시 마지막에 큰 이미지 하나만 남는 것을 방지)
+ORDER_SMALLEST = 'smallest'  # 작은 이미지 먼저 (첫 결과를 빨리 확인)
+ORDER_USER = 'user'          # 지정한 순서 그대로
+ORDER_POLICIES = (ORDER_LARGEST, ORDER_SMALLEST, ORDER_USER)
+ORDER_LABELS = {
+    ORDER_LARGEST: '큰 이미지 먼저',
+    ORDER_SMALLEST: '작은 이미지 먼저',
+    ORDER_USER: '목록 순서',
+}
+
+
+def sort_by_size(items, order, size):
+    """처리 순서 정책에 따라 정렬 (크기가 같으면 원래 순서 유지)"""
+    if order == ORDER_LARGEST:
+        return sorted(items, key=size, reverse=True)
+    if order == ORDER_SMALLEST:
+        return sorted(items, key=size)
+    return list(items)
+
+
+def format_duration(seconds):
+    """남은 시간 표시 문자열 (예: 1시간 5분, 3분 20초, 45초)"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}시간 {minutes}분"
+    if minutes:
+        return f"{minutes}분 {seconds}초"
+    return f"{seconds}초"
+
+
+class EtaEstimator:
+    """진행량(이미지 크기 가중치)의 처리 속도를 평활하여 남은 시간 추정
+
+    속도는 시간 기준 지수 이동 평균(반감기 half_life초)이라 최근 처리량을 더 반영한다.
+    실패/취소로 건너뛴 양(measured=False)은 남은 양에서만 빼고 속도 계산에는 넣지 않는다.
+    """
+
+    def __init__(self, half_life=60.0, warmup=3.0, clock=time.monotonic):
+        self.half_life = half_life
+        self.warmup = warmup  # 시작 후 이 시간(초)이 지나기 전에는 추정하지 않음
+        self.clock = clock
+        self.reset()
+
+    def reset(self, done=0, total=0):
+        self.done = done
+        self.total = total
+        self.rate = None      # 평활한 처리 속도 (초당 진행량)
+        self.started = self._last = self.clock()
+
+    def update(self, done, total=None, measured=True):
+        """누적 진행량 갱신"""
+        now = self.clock()
+        if total is not None:
+            self.total = total
+        delta = done - self.done
+        elapsed = now - self._last
+        if not measured:
+            self.done = done
+            return
+        if elapsed <= 0:
+            return  # 다음 갱신에 합쳐서 계산
+        self.done = done
+        self._last = now
+        sample = delta / elapsed
+        if self.rate is None:
+            self.rate = sample
+        else:
+            alpha = 1 - 0.5 ** (elapsed / self.half_life)
+            self.rate += alpha * (sample - self.rate)
+
+    def eta(self):
+        """남은 시간(초), 아직 추정할 수 없으면 None"""
+        now = self.clock()
+        if not self.rate or now - self.started < self.warmup:
+            return None
+        remaining = max(0, self.total - self.done) / self.rate
+        # 마지막 갱신 이후 흐른 시간만큼 줄여서 표시 (진행 중인 단계 반영)
+        return max(0.0, remaining - (now - self._last))
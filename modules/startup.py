@@ -0,0 +1,36 @@
+import time
+
+
+class StartupProfiler:
+    """GUI 시작 단계별 소요 시간 기록 (--profile-startup)"""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.last = self.started
+        self.phases = []  # (단계 이름, 소요 시간(초))
+
+    def mark(self, name):
+        """직전 mark 이후 지금까지를 한 단계로 기록"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @property
+    def total(self):
+        return self.last - self.started
+
+    def to_dict(self):
+        return {
+            'phases': [{'name': name, 'seconds': round(seconds, 4)} for name, seconds in self.phases],
+            'total': round(self.total, 4),
+        }
+
+    def report(self):
+        """단계별 소요 시간 표"""
+        width = max([len(name) for name, _ in self.phases] + [4])
+        lines = ["시작 시간 분석:"]
+        for name, seconds in self.phases:
+            share = seconds / self.total * 100 if self.total else 0
+            lines.append(f"  {name:<{width}}  {seconds * 1000:8.1f} ms  {share:5.1f}%")
+        lines.append(f"  {'합계':<{width}}  {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
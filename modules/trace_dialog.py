@@ -0,0 +1,115 @@
+import os
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox)
+
+from modules.dedup_dialog import NumberItem
+from modules.tracing import TRACE_FILE_NAME, METRICS_FILE_NAME
+
+# 표에 표시할 최대 행 수
+MAX_ROWS = 200
+
+
+def format_seconds(seconds):
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+class TraceDialog(QDialog):
+    """성능 계측 결과 (구간별 합계/최대, 가장 오래 걸린 파일)와 trace/metrics 파일 저장"""
+
+    def __init__(self, tracer, output_dir=None, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.output_dir = output_dir
+        self.setWindowTitle("성능 계측")
+        self.resize(800, 500)
+
+        layout = QVBoxLayout()
+        self.summary = QLabel()
+        self.summary.setObjectName("statusLabel")
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs, 1)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        refresh_btn = QPushButton("🔄 새로 고침")
+        refresh_btn.clicked.connect(self.refresh)
+        save_btn = QPushButton("💾 파일로 저장")
+        save_btn.setToolTip(f"{TRACE_FILE_NAME} (Chrome trace), {METRICS_FILE_NAME} (Prometheus)")
+        save_btn.clicked.connect(self.save_files)
+        save_btn.setEnabled(bool(output_dir))
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(save_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        """지금까지 모은 구간으로 표 다시 만들기"""
+        stats = self.tracer.stats()
+        files = self.tracer.slowest_files(MAX_ROWS)
+        self.summary.setText(
+            f"구간 {sum(row['count'] for row in stats):,}개 · 종류 {len(stats)}개"
+            + (f" · 버린 구간 {self.tracer.dropped:,}개" if self.tracer.dropped else "")
+        )
+        self.tabs.clear()
+        self.tabs.addTab(self.create_stages_table(stats[:MAX_ROWS]), f"단계 ({len(stats)})")
+        self.tabs.addTab(self.create_files_table(files), f"느린 파일 ({len(files)})")
+
+    def create_table(self, titles, rows):
+        """rows: [[QTableWidgetItem, ...], ...]"""
+        table = QTableWidget(len(rows), len(titles))
+        table.setHorizontalHeaderLabels(titles)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().hide()
+        for row, items in enumerate(rows):
+            for column, item in enumerate(items):
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    def create_stages_table(self, stats):
+        rows = [[
+            QTableWidgetItem(f"{row['category']} · {row['name']}"),
+            NumberItem(f"{row['count']:,}", row['count']),
+            NumberItem(format_seconds(row['total']), row['total']),
+            NumberItem(format_seconds(row['mean']), row['mean']),
+            NumberItem(format_seconds(row['max']), row['max']),
+        ] for row in stats]
+        return self.create_table(('구간', '횟수', '합계', '평균', '최대'), rows)
+
+    def create_files_table(self, files):
+        rows = []
+        for row in files:
+            name = QTableWidgetItem(os.path.basename(row['file']))
+            name.setToolTip(row['file'])
+            rows.append([
+                name,
+                NumberItem(format_seconds(row['total']), row['total']),
+                NumberItem(f"{row['spans']:,}", row['spans']),
+                QTableWidgetItem(row['slowest']),
+                NumberItem(format_seconds(row['slowest_seconds']), row['slowest_seconds']),
+            ])
+        return self.create_table(('파일', '합계', '구간 수', '가장 긴 구간', '소요 시간'), rows)
+
+    def save_files(self):
+        """Chrome trace JSON과 Prometheus 텍스트 파일 저장"""
+        try:
+            self.tracer.write_chrome_trace(os.path.join(self.output_dir, TRACE_FILE_NAME))
+            self.tracer.write_prometheus(os.path.join(self.output_dir, METRICS_FILE_NAME))
+        except OSError as e:
+            QMessageBox.warning(self, "저장 실패", f"계측 결과를 저장하지 못했습니다: {e}")
+            return
+        QMessageBox.information(self, "저장 완료", f"'{self.output_dir}' 폴더에 저장했습니다.")
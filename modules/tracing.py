@@ -0,0 +1,302 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+# 구간(span)/카운터 계측 (Qt 비의존, 표준 라이브러리만 사용)
+# 기본은 꺼져 있으며, 꺼져 있을 때 span()은 아무것도 하지 않는 공용 객체를 돌려주므로
+# 계측 지점에 남겨 두어도 비용은 속성 확인 한 번뿐이다.
+# 켜면 구간을 Chrome trace 이벤트(chrome://tracing, Perfetto)로 모으고,
+# 구간별 횟수/합계/최대와 카운터를 Prometheus 텍스트 형식으로 내보낸다.
+
+TRACE_DIR_NAME = 'trace'  # GUI에서 --trace로 실행할 때 결과를 저장하는 폴더 (앱 데이터 폴더 아래)
+TRACE_FILE_NAME = 'kdic_trace.json'
+METRICS_FILE_NAME = 'kdic_metrics.prom'
+METRIC_PREFIX = 'kdic_'
+
+DEFAULT_MAX_EVENTS = 200000  # 보관할 최대 구간 수 (넘으면 통계만 갱신하고 이벤트는 버림)
+
+_METRIC_NAME_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 쓰는 아무것도 하지 않는 구간"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """with 블록 하나의 소요 시간을 기록하는 구간"""
+    __slots__ = ('tracer', 'name', 'category', 'args', 'started')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        finished = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record(self.name, self.category, self.started, finished - self.started, **self.args)
+        return False
+
+    def set(self, **args):
+        """구간이 끝나기 전에 알게 된 값 추가 (예: 조회 방식, 항목 수)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """구간/카운터 수집기 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0  # max_events를 넘어 버린 구간 수
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._events = []    # (이름, 분류, 시작, 소요 시간, 스레드 id, args)
+        self._threads = {}   # 스레드 id -> 이름
+        self._spans = {}     # (분류, 이름) -> [횟수, 합계, 최대]
+        self._counters = {}  # (이름, ((레이블, 값), ...)) -> 값
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """모은 구간/카운터 삭제 (시간 기준점도 지금으로)"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._events.clear()
+            self._threads.clear()
+            self._spans.clear()
+            self._counters.clear()
+            self.dropped = 0
+
+    def span(self, name, category='app', **args):
+        """with 문으로 감싼 구간의 소요 시간 기록 (꺼져 있으면 NULL_SPAN)"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args)
+
+    def record(self, name, category, started, duration, **args):
+        """이미 잰 구간 기록 (started는 time.perf_counter() 값)"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        key = (category, name)
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                self._spans[key] = [1, duration, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._threads[thread.ident] = thread.name
+            self._events.append((name, category, started, duration, thread.ident, args))
+
+    def count(self, name, value=1, **labels):
+        """카운터 증가 (labels는 Prometheus 레이블)"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    # --- 요약 ---
+
+    def stats(self):
+        """구간별 횟수/합계/평균/최대 (합계가 큰 순서)"""
+        with self._lock:
+            items = [(key, list(values)) for key, values in self._spans.items()]
+        rows = [{
+            'category': category,
+            'name': name,
+            'count': count,
+            'total': total,
+            'mean': total / count,
+            'max': longest,
+        } for (category, name), (count, total, longest) in items]
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows
+
+    def counters(self):
+        """[(이름, {레이블: 값}, 값), ...] (이름 순서)"""
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [(name, dict(labels), value) for (name, labels), value in items]
+
+    def slowest_files(self, limit=20):
+        """파일별 구간 합계가 큰 순서로 [{file, total, spans, slowest, slowest_seconds}, ...]
+
+        file 인자가 있는 구간만 집계하며, 바깥 구간과 안쪽 구간이 겹치면 모두 더하지 않도록
+        파일별로 가장 바깥(가장 긴) 분류의 구간만 합계에 넣는다.
+        """
+        with self._lock:
+            events = list(self._events)
+        files = {}
+        for name, category, started, duration, tid, args in events:
+            file_path = args.get('file')
+            if not file_path:
+                continue
+            entry = files.setdefault(file_path, {})
+            entry.setdefault(category, []).append((duration, name))
+        rows = []
+        for file_path, categories in files.items():
+            spans = max(categories.values(), key=lambda items: sum(duration for duration, _ in items))
+            slowest_seconds, slowest = max(spans)
+            rows.append({
+                'file': file_path,
+                'total': sum(duration for duration, _ in spans),
+                'spans': len(spans),
+                'slowest': slowest,
+                'slowest_seconds': slowest_seconds,
+            })
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows[:limit]
+
+    # --- 내보내기 ---
+
+    def chrome_trace(self):
+        """Chrome trace-event 형식 (chrome://tracing, ui.perfetto.dev에서 열기)"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            origin = self._origin
+            dropped = self.dropped
+        trace_events = [{
+            'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name},
+        } for tid, name in threads.items()]
+        for name, category, started, duration, tid, args in events:
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((started - origin) * 1e6, 1),
+                'dur': round(duration * 1e6, 1),
+                'pid': pid,
+                'tid': tid,
+            }
+            if args:
+                event['args'] = {key: _json_value(value) for key, value in args.items()}
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'otherData': {'dropped_events': dropped}}
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 형식 (node_exporter textfile collector 등으로 수집)"""
+        lines = [
+            f"# HELP {METRIC_PREFIX}span_seconds 구간별 소요 시간(초)",
+            f"# TYPE {METRIC_PREFIX}span_seconds summary",
+        ]
+        rows = sorted(self.stats(), key=lambda row: (row['category'], row['name']))
+        for row in rows:
+            labels = _format_labels({'category': row['category'], 'name': row['name']})
+            lines.append(f"{METRIC_PREFIX}span_seconds_sum{labels} {row['total']:.6f}")
+            lines.append(f"{METRIC_PREFIX}span_seconds_count{labels} {row['count']}")
+        lines.append(f"# HELP {METRIC_PREFIX}span_max_seconds 구간별 최대 소요 시간(초)")
+        lines.append(f"# TYPE {METRIC_PREFIX}span_max_seconds gauge")
+        for row in rows:
+            labels = _format_labels({'category': row['category'], 'name': row['name']})
+            lines.append(f"{METRIC_PREFIX}span_max_seconds{labels} {row['max']:.6f}")
+
+        declared = set()
+        for name, labels, value in self.counters():
+            metric = f"{METRIC_PREFIX}{_METRIC_NAME_RE.sub('_', name)}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}trace_dropped_events_total counter")
+        lines.append(f"{METRIC_PREFIX}trace_dropped_events_total {self.dropped}")
+        return "\n".join(lines) + "\n"
+
+    def write_chrome_trace(self, path):
+        _write_atomic(path, json.dumps(self.chrome_trace(), ensure_ascii=False))
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.prometheus_text())
+
+
+def _json_value(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        text = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{_METRIC_NAME_RE.sub("_", key)}="{text}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _write_atomic(path, text):
+    """임시 파일에 쓴 뒤 이름을 바꿔서, 수집기가 쓰다 만 파일을 읽지 않도록 함"""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+# 프로그램 전체가 함께 쓰는 수집기
+tracer = Tracer()
+
+
+def span(name, category='app', **args):
+    """tracer.span()의 줄임 (계측이 꺼져 있으면 NULL_SPAN)"""
+    if not tracer.enabled:
+        return NULL_SPAN
+    return Span(tracer, name, category, args)
+
+
+def count(name, value=1, **labels):
+    """tracer.count()의 줄임"""
+    if tracer.enabled:
+        tracer.count(name, value, **labels)
+
+
+def traced(name, category='app'):
+    """함수 전체를 구간으로 기록하는 데코레이터 (계측이 꺼져 있으면 바로 호출)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(tracer, name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,705 @@
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.dism_parser import parse_package_list, PACKAGE_STATE_INSTALLED
+from modules.records import InstalledPackage
+from modules.runner import create_runner
+from modules.scheduling import ORDER_USER, sort_by_size
+from modules.tracing import span, tracer
+
+# 업데이트 단계 (순서대로 실행)
+STAGE_MOUNT = 'mount'
+STAGE_APPLY = 'apply'
+STAGE_CLEANUP = 'cleanup'
+STAGE_COMMIT = 'commit'
+STAGE_EXPORT = 'export'
+STAGES = (STAGE_MOUNT, STAGE_APPLY, STAGE_CLEANUP, STAGE_COMMIT, STAGE_EXPORT)
+
+STAGE_LABELS = {
+    STAGE_MOUNT: '마운트',
+    STAGE_APPLY: '패키지 적용',
+    STAGE_CLEANUP: '구성 요소 정리',
+    STAGE_COMMIT: '커밋/마운트 해제',
+    STAGE_EXPORT: '내보내기',
+}
+
+# 단계별 동시 실행 수 기본값
+# 마운트/커밋은 디스크 I/O 위주, 패키지 적용은 CPU 위주이므로 따로 제한한다.
+DEFAULT_STAGE_LIMITS = {
+    STAGE_MOUNT: 2,
+    STAGE_APPLY: max(1, min(4, (os.cpu_count() or 2) // 2)),
+    STAGE_CLEANUP: 1,
+    STAGE_COMMIT: 1,
+    STAGE_EXPORT: 1,
+}
+
+# 동시에 처리 중인(마운트된) 이미지 파일 수 상한 (마운트 폴더 디스크 사용량 제한)
+DEFAULT_MAX_IN_FLIGHT = 3
+
+# 진행률 계산용 단계별 상대 비중 (이미지 크기에 곱해서 사용, 실행하는 단계끼리 합이 1이 되도록 정규화)
+STAGE_WEIGHTS = {
+    STAGE_MOUNT: 0.2,
+    STAGE_APPLY: 0.4,
+    STAGE_CLEANUP: 0.2,
+    STAGE_COMMIT: 0.15,
+    STAGE_EXPORT: 0.05,
+}
+
+# DISM 진행률 표시줄에서 백분율 추출 (예: [=====    25.0%        ])
+DISM_PERCENT_PATTERN = re.compile(r'(\d{1,3}(?:[.,]\d+)?)\s*%')
+
+# 마운트 폴더의 소유 표시 파일 ('<마운트 폴더>.lock', DISM은 빈 폴더에만 마운트하므로 폴더 옆에 둠)
+MOUNT_LOCK_SUFFIX = '.lock'
+
+# 진행 중인 단계의 추정 진행률 상한 (측정한 속도보다 오래 걸려도 완료 전까지는 이 이상 올리지 않음)
+MAX_ACTIVE_FRACTION = 0.9
+
+# 작업 상태
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+
+class UpdateError(Exception):
+    """업데이트 단계 실행 실패"""
+    pass
+
+
+class UpdateJob:
+    """이미지(WIM 파일의 인덱스 하나)에 대한 업데이트 작업"""
+
+    def __init__(self, file_path, index=1, packages=None, size=0):
+        self.file_path = file_path
+        self.index = index
+        self.packages = list(packages or [])  # 적용할 .msu/.cab 경로
+        self.size = size            # 이미지 크기(바이트, 진행률/순서 계산용, 모르면 0)
+        self.mount_dir = None
+        self.status = JOB_PENDING
+        self.stage = None           # 현재(또는 마지막) 실행 단계
+        self.error = None
+        self.stage_times = {}       # 단계 -> 소요 시간(초)
+        self.completed_stages = set()  # 이전 실행에서 이미 끝난 단계 (이어서 실행할 때 건너뜀)
+        self.stage_progress = None  # 실행 중인 단계의 진행률 (0~1, 백엔드가 알려 줄 때만)
+
+    @property
+    def file_name(self):
+        return os.path.basename(self.file_path)
+
+    def __repr__(self):
+        return f"UpdateJob({self.file_name!r}, index={self.index}, status={self.status})"
+
+
+class OwnerLock:
+    """소유 프로세스가 살아 있는 동안 유지되는 잠금 파일 (파일에 pid를 쓰고 OS 잠금을 잡음)
+
+    프로세스가 종료되면 OS가 잠금을 풀므로, 잠금을 잡을 수 있으면 주인이 없는(종료된 프로세스가 남긴) 것이다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        """잠금 획득 (다른 프로세스나 같은 파일의 다른 OwnerLock이 잡고 있으면 False)"""
+        if self._file is not None:
+            return True
+        try:
+            file = open(self.path, 'a+b')
+        except OSError:
+            return False
+        try:
+            _lock_file(file)
+        except OSError:
+            file.close()
+            return False
+        try:
+            file.seek(0)
+            file.truncate()
+            file.write(str(os.getpid()).encode('ascii'))
+            file.flush()
+        except OSError:
+            pass  # pid는 참고용이며 소유 여부는 잠금으로만 판단
+        self._file = file
+        return True
+
+    def release(self, remove=True):
+        """잠금 해제 (remove: 잠금 파일도 삭제)"""
+        if self._file is None:
+            return
+        file, self._file = self._file, None
+        try:
+            _unlock_file(file)
+        except OSError:
+            pass
+        file.close()
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def in_use(self):
+        """다른 곳에서 잠금을 잡고 있는지 (잠금 파일이 없으면 False, 잠시 잡아 보고 바로 놓음)"""
+        if self._file is not None or not os.path.exists(self.path):
+            return False
+        if not self.acquire():
+            return True
+        self.release(remove=False)
+        return False
+
+
+def _lock_file(file):
+    """파일 첫 바이트에 배타 잠금 (잡을 수 없으면 OSError)"""
+    file.seek(0)
+    if os.name == 'nt':
+        import msvcrt
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock_file(file):
+    file.seek(0)
+    if os.name == 'nt':
+        import msvcrt
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class UpdateBackend:
+    """업데이트 단계 실행 인터페이스
+
+    각 메서드는 실패 시 UpdateError를 발생시킨다.
+    스케줄러는 이 인터페이스로만 이미지를 다루므로 가짜 구현으로 교체할 수 있다.
+    """
+
+    def mount(self, job):
+        raise NotImplementedError
+
+    def apply_packages(self, job):
+        raise NotImplementedError
+
+    def cleanup(self, job):
+        raise NotImplementedError
+
+    def commit(self, job):
+        raise NotImplementedError
+
+    def export(self, job):
+        raise NotImplementedError
+
+    def discard(self, job):
+        """실패/취소 시 변경 사항을 버리고 마운트 해제"""
+        raise NotImplementedError
+
+    def installed_packages(self, job):
+        """마운트된 이미지에 설치된 패키지(InstalledPackage) 목록 (알 수 없으면 None)"""
+        return None
+
+    def remount(self, job):
+        """이전 실행에서 마운트된 채 남은 이미지(job.mount_dir)를 다시 연결"""
+        raise UpdateError(f"'{job.file_name}' [{job.index}] 다시 마운트할 수 없습니다")
+
+    def find_orphan_mounts(self):
+        """다른(종료된) 프로세스가 남긴 마운트 폴더 목록"""
+        return []
+
+    def mount_in_use(self, mount_dir):
+        """다른 실행 중인 프로세스가 사용 중인 마운트 폴더인지 (정리하면 안 됨)"""
+        return False
+
+    def release_orphans(self, mount_dirs):
+        """남은 마운트를 변경 사항 없이 해제하고 해제한 수 반환"""
+        return 0
+
+    def cancel(self):
+        """실행 중인 단계를 중단 (커밋/내보내기처럼 끊으면 안 되는 단계는 끝날 때까지 기다림)"""
+        pass
+
+
+class DismBackend(UpdateBackend):
+    """DISM 명령으로 실제 이미지를 서비스하는 백엔드"""
+
+    def __init__(self, runner=None, mount_root=None, export_dir=None):
+        self.runner = runner or create_runner()  # 취소 시 실행 중인 DISM 프로세스 트리(또는 도우미 요청)를 종료
+        self.mount_root = mount_root or os.path.join(tempfile.gettempdir(), 'KdicUpdater', 'mount')
+        self.export_dir = export_dir  # 지정 시 커밋 후 이 폴더로 이미지 내보내기
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._mount_locks = {}  # 마운트 폴더 -> 이 백엔드가 잡고 있는 OwnerLock (마운트하는 동안 유지)
+
+    def _dism(self, job, *args, part=0, parts=1, cancellable=True):
+        """DISM 명령 실행 (출력의 진행률을 job.stage_progress에 반영, part/parts: 단계 안에서 몇 번째 명령인지)"""
+        def on_output(line):
+            match = DISM_PERCENT_PATTERN.search(line)
+            if match:
+                percent = min(100.0, float(match.group(1).replace(',', '.')))
+                job.stage_progress = (part + percent / 100) / parts
+
+        result = self.runner.dism(*args, on_output=on_output, cancellable=cancellable)
+        if result.cancelled:
+            raise UpdateError(f"'{job.file_name}' [{job.index}] {args[0]} 취소됨")
+        if not result.ok:
+            output = (result.stderr or result.stdout or '').strip().splitlines()
+            detail = output[-1] if output else f"종료 코드 {result.returncode}"
+            raise UpdateError(f"'{job.file_name}' [{job.index}] {args[0]} 실패: {detail}")
+        return result
+
+    def cancel(self):
+        self.runner.cancel()
+
+    def _new_mount_dir(self):
+        with self._lock:
+            self._counter += 1
+            name = f"{os.getpid()}_{self._counter}"
+        return os.path.join(self.mount_root, name)
+
+    def _claim(self, mount_dir):
+        """마운트 폴더의 잠금을 잡음 (이미 잡고 있으면 True, 다른 프로세스가 사용 중이면 False)"""
+        with self._lock:
+            lock = self._mount_locks.get(mount_dir)
+            if lock is None:
+                lock = OwnerLock(mount_dir + MOUNT_LOCK_SUFFIX)
+                if not lock.acquire():
+                    return False
+                self._mount_locks[mount_dir] = lock
+            return True
+
+    def _release(self, mount_dir):
+        """마운트 폴더를 지우고 잠금 해제 (폴더가 남아 있으면 잠금 파일도 남김)"""
+        try:
+            os.rmdir(mount_dir)
+        except OSError:
+            pass
+        with self._lock:
+            lock = self._mount_locks.pop(mount_dir, None)
+        if lock is not None:
+            lock.release(remove=not os.path.isdir(mount_dir))
+
+    def mount(self, job):
+        job.mount_dir = self._new_mount_dir()
+        # 폴더를 만들기 전에 잠금을 잡아 다른 프로세스가 빈 폴더를 남은 마운트로 보지 않도록 함
+        os.makedirs(self.mount_root, exist_ok=True)
+        if not self._claim(job.mount_dir):
+            raise UpdateError(f"다른 프로세스가 사용 중인 마운트 폴더입니다: {job.mount_dir}")
+        os.makedirs(job.mount_dir, exist_ok=True)
+        if os.listdir(job.mount_dir):
+            raise UpdateError(f"마운트 폴더가 비어 있지 않습니다: {job.mount_dir}")
+        self._dism(job, '/Mount-Wim', f'/WimFile:{job.file_path}', f'/Index:{job.index}',
+                   f'/MountDir:{job.mount_dir}')
+
+    def apply_packages(self, job):
+        for part, package in enumerate(job.packages):
+            self._dism(job, f'/Image:{job.mount_dir}', '/Add-Package', f'/PackagePath:{package}',
+                       part=part, parts=len(job.packages))
+
+    def cleanup(self, job):
+        self._dism(job, f'/Image:{job.mount_dir}', '/Cleanup-Image', '/StartComponentCleanup')
+
+    def installed_packages(self, job):
+        result = self._dism(job, f'/Image:{job.mount_dir}', '/Get-Packages', '/English')
+        return parse_package_list(result.stdout)
+
+    def commit(self, job):
+        # 커밋 중에 프로세스를 끊으면 WIM 파일이 손상될 수 있으므로 취소하지 않음
+        self._dism(job, '/Unmount-Wim', f'/MountDir:{job.mount_dir}', '/Commit', cancellable=False)
+        self._release(job.mount_dir)
+
+    def export(self, job):
+        if not self.export_dir:
+            return
+        os.makedirs(self.export_dir, exist_ok=True)
+        destination = os.path.join(self.export_dir, job.file_name)
+        self._dism(job, '/Export-Image', f'/SourceImageFile:{job.file_path}', f'/SourceIndex:{job.index}',
+                   f'/DestinationImageFile:{destination}', '/Compress:max', cancellable=False)
+
+    def discard(self, job):
+        if not job.mount_dir or not os.path.isdir(job.mount_dir):
+            return
+        if not self._claim(job.mount_dir):
+            raise UpdateError(f"'{job.file_name}' [{job.index}] 다른 프로세스가 사용 중인 마운트는 해제하지 않습니다: "
+                              f"{job.mount_dir}")
+        self.runner.dism('/Unmount-Wim', f'/MountDir:{job.mount_dir}', '/Discard', cancellable=False)
+        self._release(job.mount_dir)
+
+    def remount(self, job):
+        if not job.mount_dir or not os.path.isdir(job.mount_dir):
+            raise UpdateError(f"'{job.file_name}' [{job.index}] 마운트 폴더가 없습니다: {job.mount_dir}")
+        if not self._claim(job.mount_dir):
+            raise UpdateError(f"'{job.file_name}' [{job.index}] 다른 프로세스가 사용 중인 마운트입니다: {job.mount_dir}")
+        self._dism(job, '/Remount-Wim', f'/MountDir:{job.mount_dir}')
+
+    def mount_in_use(self, mount_dir):
+        with self._lock:
+            if mount_dir in self._mount_locks:
+                return True
+        return OwnerLock(mount_dir + MOUNT_LOCK_SUFFIX).in_use()
+
+    def find_orphan_mounts(self):
+        try:
+            names = os.listdir(self.mount_root)
+        except OSError:
+            return []
+        # 잠금 파일이 없거나(이전 버전이 만든 폴더 포함) 잠금을 잡을 수 있는(주인이 종료된) 폴더만
+        mount_dirs = [os.path.join(self.mount_root, name) for name in sorted(names)]
+        return [mount_dir for mount_dir in mount_dirs
+                if os.path.isdir(mount_dir) and not self.mount_in_use(mount_dir)]
+
+    def release_orphans(self, mount_dirs):
+        released = 0
+        for mount_dir in mount_dirs:
+            if not self._claim(mount_dir):
+                continue  # 실행 중인 다른 프로세스의 마운트
+            if os.path.isdir(mount_dir):
+                self.runner.dism('/Unmount-Wim', f'/MountDir:{mount_dir}', '/Discard', cancellable=False)
+                released += 1
+            self._release(mount_dir)
+        # 폴더가 이미 지워졌어도 DISM에 남은 마운트 정보는 정리
+        self.runner.dism('/Cleanup-Wim', cancellable=False)
+        return released
+
+
+class FakeBackend(UpdateBackend):
+    """단계별 소요 시간만 흉내 내는 가짜 백엔드 (Linux 테스트/처리량 측정용)
+
+    durations: 단계 -> 초 (패키지 적용은 패키지 하나당 시간)
+    fail: 실패시킬 (파일 이름, 단계) 집합
+    size_unit: 지정 시 단계 소요 시간을 이미지 크기 size_unit 바이트당 시간으로 계산
+    """
+
+    def __init__(self, durations=None, fail=None, time_scale=1.0, size_unit=None):
+        self.durations = {
+            STAGE_MOUNT: 0.2,
+            STAGE_APPLY: 0.3,
+            STAGE_CLEANUP: 0.2,
+            STAGE_COMMIT: 0.2,
+            STAGE_EXPORT: 0.0,
+        }
+        self.durations.update(durations or {})
+        self.fail = set(fail or ())
+        self.time_scale = time_scale
+        self.size_unit = size_unit
+        self.mounted = set()
+        self.installed = {}  # (파일 경로, 인덱스) -> 적용한 패키지의 InstalledPackage 목록
+        self._lock = threading.Lock()
+
+    def _simulate(self, job, stage, units=1):
+        if (job.file_name, stage) in self.fail:
+            raise UpdateError(f"'{job.file_name}' [{job.index}] {STAGE_LABELS[stage]} 실패 (시뮬레이션)")
+        if self.size_unit and job.size:
+            units *= job.size / self.size_unit
+        time.sleep(self.durations.get(stage, 0.0) * units * self.time_scale)
+
+    def mount(self, job):
+        self._simulate(job, STAGE_MOUNT)
+        job.mount_dir = f"fake://{job.file_name}/{job.index}"
+        with self._lock:
+            self.mounted.add(job.mount_dir)
+
+    def apply_packages(self, job):
+        self._simulate(job, STAGE_APPLY, max(1, len(job.packages)))
+        with self._lock:
+            installed = self.installed.setdefault((job.file_path, job.index), [])
+            installed.extend(InstalledPackage(self.package_identity(package), PACKAGE_STATE_INSTALLED)
+                             for package in job.packages)
+
+    def installed_packages(self, job):
+        with self._lock:
+            return list(self.installed.get((job.file_path, job.index), []))
+
+    @staticmethod
+    def package_identity(package):
+        """패키지 파일 이름의 KB 번호로 만든 패키지 ID (예: Package_for_KB5034441~...~amd64~~10.0.1.0)"""
+        match = re.search(r'kb\d+', os.path.basename(package), re.IGNORECASE)
+        name = match.group(0).upper() if match else os.path.splitext(os.path.basename(package))[0]
+        return f"Package_for_{name}~31bf3856ad364e35~amd64~~10.0.1.0"
+
+    def cleanup(self, job):
+        self._simulate(job, STAGE_CLEANUP)
+
+    def commit(self, job):
+        self._simulate(job, STAGE_COMMIT)
+        with self._lock:
+            self.mounted.discard(job.mount_dir)
+
+    def export(self, job):
+        self._simulate(job, STAGE_EXPORT)
+
+    def discard(self, job):
+        with self._lock:
+            self.mounted.discard(job.mount_dir)
+
+    def remount(self, job):
+        self._simulate(job, STAGE_MOUNT)
+        with self._lock:
+            self.mounted.add(job.mount_dir)
+
+    def release_orphans(self, mount_dirs):
+        with self._lock:
+            self.mounted.difference_update(mount_dirs)
+        return len(mount_dirs)
+
+
+class UpdatePipeline:
+    """이미지별 업데이트 단계를 겹쳐서 실행하는 스케줄러 (Qt 비의존)
+
+    각 이미지는 마운트 -> 패키지 적용 -> 정리 -> 커밋 -> (내보내기) 순서로 진행되며,
+    단계마다 별도의 동시 실행 제한(세마포어)이 있어 이미지 A를 커밋하는 동안
+    이미지 B를 마운트할 수 있다. 같은 WIM 파일의 인덱스들은 순서대로 처리한다.
+    """
+
+    def __init__(self, backend, stage_limits=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 export=False, log=None, on_progress=None, journal=None, order=ORDER_USER, inventory=None):
+        self.backend = backend
+        self.order = order      # 처리 순서 (ORDER_POLICIES, 같은 파일의 인덱스는 항상 순서대로)
+        self.journal = journal  # UpdateJournal (지정 시 단계마다 진행 상태를 기록)
+        self.inventory = inventory  # InventoryCache (지정 시 커밋한 이미지의 설치된 패키지 목록을 저장)
+        limits = dict(DEFAULT_STAGE_LIMITS)
+        limits.update(stage_limits or {})
+        self.semaphores = {stage: threading.BoundedSemaphore(max(1, limits[stage])) for stage in STAGES}
+        self.stages = [s for s in STAGES if export or s != STAGE_EXPORT]
+        weight_sum = sum(STAGE_WEIGHTS[stage] for stage in self.stages)
+        self.stage_shares = {stage: STAGE_WEIGHTS[stage] / weight_sum for stage in self.stages}
+        self.max_in_flight = max(1, max_in_flight)
+        self.log = log or (lambda message, **fields: None)  # log(message, level=, file=, stage=, duration=)
+        # on_progress(done, total, job, stage): 진행량은 이미지 크기로 가중한 바이트
+        # (시작 시 job=None으로 한 번, 이후 단계가 끝날 때마다, 작업이 중단되면 stage=None)
+        self.on_progress = on_progress or (lambda done, total, job, stage: None)
+
+        self._lock = threading.Lock()
+        self._done = 0.0
+        self._total = 0.0
+        self._reported = 0.0
+        self._default_size = 1
+        self._stage_cost = {}  # 단계 -> 측정한 바이트당 소요 시간(초), 지수 이동 평균
+        self._active = {}      # id(job) -> (job, 단계, 시작 시각): 실행 중인 단계
+
+    def weight(self, job):
+        """진행률 가중치 (크기를 모르는 이미지는 다른 이미지의 평균 크기로 계산)"""
+        return job.size or self._default_size
+
+    def run(self, jobs, should_stop=None):
+        """작업 목록을 실행하고 완료/실패/취소 상태가 기록된 작업 목록 반환"""
+        jobs = list(jobs)
+        should_stop = should_stop or (lambda: False)
+        sizes = [job.size for job in jobs if job.size]
+        self._default_size = sum(sizes) // len(sizes) if sizes else 1
+        self._total = float(sum(self.weight(job) for job in jobs))
+        self._done = float(sum(self.weight(job) * self.stage_shares[stage]
+                               for job in jobs for stage in self.stages if stage in job.completed_stages))
+        self._reported = self._done
+
+        # 같은 파일의 인덱스는 한 작업자에서 순서대로 처리, 파일 단위로 처리 순서 정책 적용
+        groups = {}
+        for job in jobs:
+            groups.setdefault(os.path.normcase(job.file_path), []).append(job)
+        ordered = sort_by_size(groups.values(), self.order, lambda group: sum(self.weight(job) for job in group))
+
+        self.on_progress(int(self._done), int(self._total), None, None)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='wim-update') as pool:
+            futures = [pool.submit(self._run_group, group, should_stop) for group in ordered]
+            for future in futures:
+                future.result()
+
+        return jobs
+
+    def _run_group(self, group, should_stop):
+        for job in group:
+            if should_stop():
+                job.status = JOB_CANCELLED
+                continue
+            self._run_job(job, should_stop)
+
+    def _run_job(self, job, should_stop):
+        """이미지 하나의 단계를 순서대로 실행 (실패/취소 시 마운트 해제)"""
+        job.status = JOB_RUNNING
+        self.log(f"'{job.file_name}' [인덱스 {job.index}] 업데이트 시작...", file=job.file_path)
+        mounted = self._resume_mount(job) if job.completed_stages else False
+        pending = [stage for stage in self.stages if stage not in job.completed_stages]
+        try:
+            for stage in pending:
+                if should_stop():
+                    job.status = JOB_CANCELLED
+                    break
+                job.stage = stage
+                job.stage_progress = None
+                if self.journal is not None:
+                    self.journal.stage_started(job, stage)
+                if stage == STAGE_MOUNT:
+                    mounted = True  # 마운트 도중 실패/취소되어도 반쯤 마운트된 이미지를 해제
+                waiting = time.perf_counter()
+                with self.semaphores[stage]:
+                    started = time.perf_counter()
+                    # 같은 단계의 동시 실행 수 제한 때문에 기다린 시간
+                    tracer.record(f"{stage}.wait", 'update.wait', waiting, started - waiting,
+                                  file=job.file_path, index=job.index)
+                    with self._lock:
+                        self._active[id(job)] = (job, stage, started)
+                    try:
+                        with span(stage, 'update', file=job.file_path, index=job.index):
+                            self._run_stage(job, stage, should_stop)
+                    finally:
+                        with self._lock:
+                            del self._active[id(job)]
+                    job.stage_times[stage] = time.perf_counter() - started
+                if self.journal is not None:
+                    self.journal.stage_completed(job, stage)
+                self.log(f"'{job.file_name}' [인덱스 {job.index}] {STAGE_LABELS[stage]} 완료", level='debug',
+                         file=job.file_path,
+                         stage=stage, duration=job.stage_times[stage])
+                if stage == STAGE_COMMIT:
+                    mounted = False
+                self._advance(job, stage)
+            else:
+                job.status = JOB_DONE
+                self.log(f"'{job.file_name}' [인덱스 {job.index}] 업데이트 완료.", file=job.file_path,
+                         duration=sum(job.stage_times.values()))
+        except Exception as e:
+            if should_stop():
+                # 취소로 실행 중인 명령이 중단된 경우
+                job.status = JOB_CANCELLED
+                self.log(f"'{job.file_name}' [인덱스 {job.index}] {STAGE_LABELS.get(job.stage, job.stage)} 단계가 "
+                         f"취소되었습니다.", level='warning', file=job.file_path, stage=job.stage)
+            else:
+                job.status = JOB_FAILED
+                job.error = str(e)
+                self.log(f"'{job.file_name}' [인덱스 {job.index}] {STAGE_LABELS.get(job.stage, job.stage)} 단계 실패: {e}",
+                         level='error', file=job.file_path, stage=job.stage)
+
+        if mounted:
+            try:
+                self.backend.discard(job)
+                if self.journal is not None:
+                    self.journal.mount_released(job)
+            except Exception as e:
+                self.log(f"'{job.file_name}' 마운트 해제 실패: {e}", level='error', file=job.file_path)
+
+        if self.journal is not None:
+            self.journal.job_finished(job)
+
+        if job.status != JOB_DONE:
+            # 남은 단계는 진행률에서 완료로 처리
+            remaining = sum(self.stage_shares[stage] for stage in pending if stage not in job.stage_times)
+            with self._lock:
+                self._done += self.weight(job) * remaining
+                self.on_progress(self._estimate(), int(self._total), job, None)
+
+    def _resume_mount(self, job):
+        """이전 실행에서 마운트된 채 중단된 이미지를 다시 연결 (실패하면 버리고 처음부터)
+
+        커밋 전에 중단된 이미지는 마운트 폴더가 남아 있어야 이어서 진행할 수 있다.
+        커밋까지 끝난 이미지는 마운트가 필요 없으므로 그대로 둔다.
+        """
+        if STAGE_COMMIT in job.completed_stages or STAGE_MOUNT not in job.completed_stages:
+            return False
+        try:
+            self.backend.remount(job)
+            self.log(f"'{job.file_name}' [인덱스 {job.index}] 이전 마운트에서 이어서 진행합니다.",
+                     file=job.file_path)
+            return True
+        except Exception as e:
+            self.log(f"'{job.file_name}' [인덱스 {job.index}] 다시 마운트하지 못해 처음부터 진행합니다: {e}",
+                     level='warning', file=job.file_path)
+        try:
+            self.backend.discard(job)
+        except Exception:
+            pass
+        if self.journal is not None:
+            self.journal.mount_released(job)
+        # 완료로 계산해 둔 단계를 다시 실행하므로 진행량에서 뺌
+        redo = sum(self.stage_shares[stage] for stage in self.stages if stage in job.completed_stages)
+        with self._lock:
+            self._done -= self.weight(job) * redo
+        job.completed_stages.clear()
+        job.mount_dir = None
+        return False
+
+    def _run_stage(self, job, stage, should_stop):
+        if stage == STAGE_MOUNT:
+            self.backend.mount(job)
+        elif stage == STAGE_APPLY:
+            self.backend.apply_packages(job)
+        elif stage == STAGE_CLEANUP:
+            self.backend.cleanup(job)
+        elif stage == STAGE_COMMIT:
+            installed, previous = self._read_inventory(job, should_stop)
+            self.backend.commit(job)
+            if installed is not None:
+                self.inventory.store(job.file_path, job.index, installed, previous)
+        elif stage == STAGE_EXPORT:
+            self.backend.export(job)
+
+    def _read_inventory(self, job, should_stop):
+        """커밋 직전 이미지의 설치된 패키지 목록과 파일 식별 정보 (저장하지 않거나 읽지 못하면 (None, None))
+
+        목록을 읽지 못해도 업데이트는 실패시키지 않는다 (다음 실행에서 건너뛰지 못할 뿐이다).
+        단, 취소로 조회가 중단되었으면 커밋하지 않고 이미지를 버리도록 예외를 그대로 전달한다.
+        """
+        if self.inventory is None:
+            return None, None
+        from modules.cache import get_file_identity
+
+        try:
+            installed = self.backend.installed_packages(job)
+            previous = get_file_identity(job.file_path) if installed is not None else None
+        except Exception as e:
+            if should_stop():
+                raise
+            self.log(f"'{job.file_name}' [인덱스 {job.index}] 설치된 패키지 목록을 읽지 못했습니다: {e}",
+                     level='warning', file=job.file_path)
+            return None, None
+        return installed, previous
+
+    def _advance(self, job, stage):
+        with self._lock:
+            self._done += self.weight(job) * self.stage_shares[stage]
+            cost = job.stage_times[stage] / self.weight(job)
+            previous = self._stage_cost.get(stage)
+            self._stage_cost[stage] = cost if previous is None else previous + 0.3 * (cost - previous)
+            # 여러 스레드가 보고해도 순서가 바뀌지 않도록 잠금 안에서 전달
+            self.on_progress(self._estimate(), int(self._total), job, stage)
+
+    def _estimate(self):
+        """끝난 단계에 실행 중인 단계의 추정 진행량을 더한 진행량 (_lock 안에서 호출)
+
+        실행 중인 단계는 DISM이 출력한 진행률, 없으면 같은 단계에서 측정한 바이트당 소요 시간으로
+        얼마나 진행되었는지 추정하여, 큰 이미지의 긴 단계가 끝날 때 진행률이 한꺼번에 뛰지 않도록 한다.
+        보고하는 값은 줄어들지 않는다.
+        """
+        now = time.perf_counter()
+        estimate = self._done
+        for job, stage, started in self._active.values():
+            cost = self._stage_cost.get(stage)
+            if job.stage_progress is not None:
+                fraction = min(MAX_ACTIVE_FRACTION, job.stage_progress)  # DISM이 알려 준 진행률
+            elif cost:
+                fraction = min(MAX_ACTIVE_FRACTION, (now - started) / (cost * self.weight(job)))
+            else:
+                continue
+            estimate += self.weight(job) * self.stage_shares[stage] * fraction
+        self._reported = max(self._reported, min(estimate, self._total))
+        return int(self._reported)
+
+
+def find_packages(package_folder, extensions=('.msu', '.cab')):
+    """패키지 폴더의 업데이트 파일 목록 (이름순)"""
+    if not package_folder or not os.path.isdir(package_folder):
+        return []
+    return sorted(
+        os.path.join(package_folder, name) for name in os.listdir(package_folder)
+        if name.lower().endswith(extensions)
+    )
+
@@ -0,0 +1,66 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from modules.integrity import IntegrityVerifier, VERIFY_OK
+
+
+class VerifyWorker(QThread):
+    """선택된 WIM 파일의 무결성을 검사하는 스레드"""
+    verify_result = pyqtSignal(object)    # 파일 하나의 검사가 끝날 때마다 VerifyResult 전달
+    verify_complete = pyqtSignal(list)    # 검사 완료 시 VerifyResult 리스트 전달
+    progress = pyqtSignal(int, str)       # 진행률 (값, 메시지)
+    log_message = pyqtSignal(str)         # 로그 메시지
+
+    def __init__(self, file_list, cache=None, max_workers=None, force=False, channel=None, sink=None):
+        """
+        file_list: 검사할 파일 경로 목록 (분할 이미지는 모든 파트 경로 포함)
+        force: 캐시된 결과가 있어도 다시 검사
+        """
+        super().__init__()
+        self.file_list = file_list
+        self.force = force
+        self.channel = channel  # UiChannel (지정 시 진행률을 묶어서 전달)
+        self.sink = sink        # LogSink (지정 시 모든 로그를 구조화된 이벤트로 기록)
+        self.is_running = True
+        self.verifier = IntegrityVerifier(cache=cache, max_workers=max_workers, log=self.log)
+
+    def run(self):
+        """스레드 실행 함수"""
+        self.log(f"{len(self.file_list)}개 파일의 무결성을 검사합니다...")
+        results = []
+        try:
+            results = self.verifier.verify_files(
+                self.file_list,
+                on_result=self.verify_result.emit,
+                on_progress=self.on_progress,
+                should_stop=lambda: not self.is_running,
+                force=self.force
+            )
+        except Exception as e:
+            self.log(f"무결성 검사 중 오류 발생: {str(e)}", level='error')
+
+        failed = sum(1 for result in results if result.status != VERIFY_OK)
+        if self.is_running:
+            self.log(f"무결성 검사 완료: {len(results)}개 중 {failed}개 문제 발견"
+                     if failed else f"무결성 검사 완료: {len(results)}개 모두 정상",
+                     level='warning' if failed else 'info')
+        self.verify_complete.emit(results)
+
+    def on_progress(self, done_bytes, total_bytes, file_path):
+        """검사한 바이트 수 기준 진행률 갱신"""
+        value = int(done_bytes / total_bytes * 100) if total_bytes else 100
+        message = f"무결성 검사 중... ({done_bytes / 1024**3:.1f}/{total_bytes / 1024**3:.1f} GB)"
+        if self.channel is not None:
+            self.channel.post_progress(value, message, job='verify')
+        else:
+            self.progress.emit(value, message)
+
+    def log(self, message, **fields):
+        """로그 전달 (로그 싱크가 있으면 싱크로, 없으면 시그널로)"""
+        if self.sink is not None:
+            self.sink.emit(message, job='verify', **fields)
+        elif fields.get('level') != 'debug':
+            self.log_message.emit(message)
+
+    def stop(self):
+        """스레드 중지"""
+        self.is_running = False
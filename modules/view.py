@@ -1,127 +1,141 @@
-from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                            QPushButton, QListWidget, QFileDialog, QProgressBar,
-                            QLabel, QListWidgetItem, QSplitter, QPlainTextEdit,
-                            QGroupBox, QCheckBox)
-from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QSize # pyqtSlot 추가
-from PyQt6.QtGui import QFont, QIcon, QPixmap, QPainter, QPen
 import os
-from datetime import datetime
-
-class WimListItem(QListWidgetItem):
-    """WIM 파일 상세 정보를 담는 커스텀 리스트 아이템"""
-
-    # 클래스 변수로 아이콘 저장
-    checked_icon = None
-    unchecked_icon = None
-
-    @classmethod
-    def create_icons(cls):
-        """10x10 크기의 체크/언체크 아이콘 생성"""
-        if cls.checked_icon is None:
-            # 체크된 아이콘 (녹색 배경 + 흰색 체크마크)
-            checked_pixmap = QPixmap(10, 10)
-            checked_pixmap.fill(Qt.GlobalColor.green)
-            painter = QPainter(checked_pixmap)
-            painter.setPen(QPen(Qt.GlobalColor.white, 1))
-            painter.drawLine(2, 5, 4, 7)
-            painter.drawLine(4, 7, 8, 3)
-            painter.end()
-            cls.checked_icon = QIcon(checked_pixmap)
-
-            # 체크 안된 아이콘 (흰색 배경 + 검은 테두리)
-            unchecked_pixmap = QPixmap(10, 10)
-            unchecked_pixmap.fill(Qt.GlobalColor.white)
-            painter = QPainter(unchecked_pixmap)
-            painter.setPen(QPen(Qt.GlobalColor.black, 1))
-            painter.drawRect(0, 0, 9, 9)
-            painter.end()
-            cls.unchecked_icon = QIcon(unchecked_pixmap)
-
-    def __init__(self, wim_info):
-        super().__init__()
-        WimListItem.create_icons()
-
-        self.file_path = wim_info.get('file_path', 'N/A')
-        self.file_name = os.path.basename(self.file_path)
-        self.win_name = wim_info.get('name', 'N/A')
-        self.win_version = wim_info.get('version', 'N/A')
-        self.win_build = wim_info.get('build', 'N/A')
-        self.file_size = self.get_file_size(self.file_path)
-
-        self.is_selected = True  # 기본값: 선택됨
-
-        # 표시 텍스트 설정 (여러 줄로)
-        display_text = (
-            f"{self.file_name} ({self.file_size})\n"
-            f"    - 버전: {self.win_version} (빌드: {self.win_build}) / 이름: {self.win_name}"
-        )
-        self.setText(display_text)
-        self.setFont(QFont("Segoe UI", 9))
-
-        self.update_icon()
-        self.setToolTip(f"경로: {self.file_path}")
-
-    def get_file_size(self, file_path):
-        """파일 크기를 읽기 쉬운 형태로 변환"""
-        try:
-            size_bytes = os.path.getsize(file_path)
-            if size_bytes < 1024:
-                return f"{size_bytes} B"
-            elif size_bytes < 1024**2:
-                return f"{size_bytes/1024:.1f} KB"
-            elif size_bytes < 1024**3:
-                return f"{size_bytes/(1024**2):.1f} MB"
-            else:
-                return f"{size_bytes/(1024**3):.1f} GB"
-        except FileNotFoundError:
-            return "N/A"
-        except Exception:
-            return "Unknown"
-
-    def toggle_selection(self):
-        """선택 상태 토글"""
-        self.is_selected = not self.is_selected
-        self.update_icon()
-
-    def set_selection(self, selected):
-        """선택 상태 직접 설정"""
-        self.is_selected = selected
-        self.update_icon()
 
-    def update_icon(self):
-        """아이콘 업데이트"""
-        icon = self.checked_icon if self.is_selected else self.unchecked_icon
-        self.setIcon(icon)
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
+                            QPushButton, QTableView, QFileDialog, QProgressBar,
+                            QLabel, QSplitter, QPlainTextEdit, QAbstractItemView,
+                            QGroupBox, QCheckBox, QHeaderView, QLineEdit, QMessageBox, QComboBox)
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QSize, QTimer, QModelIndex # pyqtSlot 추가
+from datetime import datetime
 
+from modules.scheduling import ORDER_POLICIES, ORDER_LABELS, ORDER_LARGEST
+from modules.tracing import traced
+from modules.wim_list_model import (WimListModel, WimSortFilterProxyModel, WimItemDelegate,
+                                    COL_FILE, COL_NAME, COL_VERSION, COL_BUILD, COL_SIZE, COL_VERIFY)
+
+# 스트리밍 스캔 결과를 리스트에 반영하는 주기(ms)와 한 번에 추가할 최대 항목 수
+LIST_FLUSH_INTERVAL_MS = 100
+LIST_FLUSH_BATCH_SIZE = 200
+
+# 전체 UI 스타일시트 (최상위 위젯에 한 번만 적용)
+STYLESHEET = """
+    QWidget {
+        font-family: 'Segoe UI', 'Malgun Gothic', Arial, sans-serif;
+        font-size: 9pt; background-color: #f8f9fa; color: #212529;
+    }
+    QGroupBox {
+        font-weight: bold; border: 2px solid #dee2e6; border-radius: 8px;
+        margin-top: 12px; padding-top: 10px; background-color: white;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin; left: 15px; padding: 0 8px;
+        color: #495057; font-weight: bold;
+    }
+    QPushButton {
+        background-color: #ffffff; border: 1px solid #dee2e6;
+        border-radius: 5px; padding: 8px; min-width: 80px;
+        font-weight: 500; color: #495057;
+    }
+    QPushButton:hover {
+        background-color: #e9ecef; border-color: #adb5bd; color: #212529;
+    }
+    QPushButton:disabled {
+        background-color: #f8f9fa; color: #6c757d; border-color: #dee2e6;
+    }
+    QTableView {
+        border: 1px solid #dee2e6; border-radius: 5px; background-color: white;
+    }
+    QTableView::item {
+        padding: 4px 8px; border-bottom: 1px solid #f1f3f4;
+    }
+    QTableView::item:hover { background-color: #f0f8ff; }
+    QTableView::item:selected { background-color: #e7f3ff; color: #212529; }
+    QHeaderView::section {
+        background-color: #f8f9fa; border: none; border-bottom: 1px solid #dee2e6;
+        padding: 4px 8px; font-weight: bold; color: #495057;
+    }
+    QLineEdit {
+        border: 1px solid #dee2e6; border-radius: 5px; padding: 4px 8px; background-color: white;
+    }
+    QPlainTextEdit {
+        border: 1px solid #dee2e6; border-radius: 5px;
+        background-color: #ffffff; color: #212529;
+        font-family: 'Consolas', 'Monaco', monospace; font-size: 8pt;
+    }
+    QCheckBox { spacing: 10px; font-weight: 500; }
+    QCheckBox::indicator {
+        width: 10px; height: 10px; border: 1px solid #000;
+        border-radius: 1px; background-color: #fff;
+    }
+    QCheckBox::indicator:checked { background-color: #000; }
+    QCheckBox::indicator:indeterminate { background-color: #666; }
+    QLabel#headerLabel {
+        font-size: 16pt; font-weight: bold; color: #212529; padding: 10px;
+    }
+    QLabel#versionLabel { font-size: 10pt; color: #6c757d; padding: 10px; }
+    QLabel#pathLabel { color: #212529; font-weight: 500; }
+    QLabel#pathLabel[empty="true"] { color: #6c757d; font-style: italic; font-weight: normal; }
+    QLabel#selectionStatusLabel { color: #495057; font-size: 8pt; }
+    QLabel#helpLabel { color: #6c757d; font-size: 8pt; font-style: italic; padding: 5px; }
+    QLabel#channelStatsLabel { color: #6c757d; font-size: 8pt; }
+    QLabel#statusLabel { color: #495057; font-weight: bold; font-size: 10pt; }
+    QPushButton#startButton {
+        background-color: #0d6efd; color: white; font-weight: bold;
+        border: none; border-radius: 5px; font-size: 11pt;
+    }
+    QPushButton#startButton:hover { background-color: #0b5ed7; }
+    QPushButton#startButton:disabled { background-color: #6c757d; color: #dee2e6; }
+    QPushButton#cancelButton {
+        background-color: #dc3545; color: white; font-weight: bold;
+        border: none; border-radius: 5px;
+    }
+    QPushButton#cancelButton:hover { background-color: #bb2d3b; }
+    QPushButton#cancelButton:disabled { background-color: #6c757d; color: #dee2e6; }
+    QProgressBar {
+        border: 2px solid #dee2e6; border-radius: 8px; text-align: center;
+        font-weight: bold; background-color: #f8f9fa; color: #495057;
+    }
+    QProgressBar::chunk { background-color: #0d6efd; border-radius: 6px; }
+"""
 
 class View(QWidget):
     # 시그널 정의 (클래스 속성으로 정의)
     folder_selected = pyqtSignal(str)
+    folder_added = pyqtSignal(str)      # 목록에 다른 폴더의 이미지도 추가 (스캔 작업을 대기열에 추가)
+    rescan_requested = pyqtSignal(str)  # 캐시를 무시한 전체 재스캔 요청
+    watch_toggled = pyqtSignal(bool)    # 폴더 감시 모드 켜기/끄기
     start_update = pyqtSignal(list)
+    verify_requested = pyqtSignal(list)  # 선택된 파일 무결성 검사 요청
+    dedup_requested = pyqtSignal(list)   # 목록 전체 파일의 리소스 중복 분석 요청
     cancel_update = pyqtSignal()
+    job_move_requested = pyqtSignal(int, int)  # 대기 중인 작업 순서 변경 (작업 id, 이동 칸 수)
+    job_cancel_requested = pyqtSignal(int)     # 대기열의 작업 하나 취소
+    jobs_clear_requested = pyqtSignal()        # 끝난 작업을 대기열 목록에서 삭제
 
     def __init__(self):
         super().__init__()
         self.selected_folder = ""
+        self.added_folders = []   # '폴더 추가'로 함께 스캔한 폴더
+        self.package_folder = ""  # 적용할 업데이트 패키지(.msu/.cab) 폴더
         self.is_updating = False
         self.is_scanning = False
+        self.is_analyzing = False
+        self.trace_output_dir = None  # 성능 계측 결과를 저장할 폴더 (--trace)
+
+        # 스트리밍 스캔 결과 대기열 (일정 주기로 묶어서 리스트에 삽입)
+        self.pending_wim_infos = []
+        self.wim_model = WimListModel(self)  # 스캔 결과 모델 (선택 개수를 직접 관리)
+        self.list_flush_timer = QTimer(self)
+        self.list_flush_timer.setInterval(LIST_FLUSH_INTERVAL_MS)
+        self.list_flush_timer.timeout.connect(self.flush_pending_wim_infos)
+
         self.initUI()
 
     def initUI(self):
-        # 윈도우 타이틀과 아이콘 설정
+        # 윈도우 타이틀 설정 (아이콘은 QApplication에 한 번만 설정)
         self.setWindowTitle("KdicUpdater - WIM 파일 업데이트 매니저 v1.0")
         self.setGeometry(100, 100, 800, 600)
 
-        # 아이콘 설정
-        icon_path = "icon/kdic.ico"
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-        else:
-            # 절대 경로로 다시 시도
-            icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "icon", "kdic.ico")
-            if os.path.exists(icon_path):
-                self.setWindowIcon(QIcon(icon_path))
-
+        # 스타일시트는 최상위 위젯에 한 번만 적용 (개별 위젯은 objectName으로 구분)
         self.setStyleSheet(self.get_stylesheet())
 
         # 메인 레이아웃
@@ -131,23 +145,10 @@ class View(QWidget):
         # 상단: 프로그램 헤더
         header_layout = QHBoxLayout()
         header_label = QLabel("KdicUpdater")
-        header_label.setStyleSheet("""
-            QLabel {
-                font-size: 16pt;
-                font-weight: bold;
-                color: #212529;
-                padding: 10px;
-            }
-        """)
+        header_label.setObjectName("headerLabel")
 
         version_label = QLabel("v1.0.0")
-        version_label.setStyleSheet("""
-            QLabel {
-                font-size: 10pt;
-                color: #6c757d;
-                padding: 10px;
-            }
-        """)
+        version_label.setObjectName("versionLabel")
 
         header_layout.addWidget(header_label)
         header_layout.addStretch()
@@ -161,7 +162,11 @@ class View(QWidget):
         # 중간: 메인 작업 영역 (분할)
         splitter = QSplitter(Qt.Orientation.Horizontal)
         left_widget = self.create_wim_list_group()
-        right_widget = self.create_log_group()
+        right_widget = QSplitter(Qt.Orientation.Vertical)
+        right_widget.addWidget(self.create_queue_group())
+        right_widget.addWidget(self.create_log_group())
+        right_widget.setStretchFactor(0, 1)
+        right_widget.setStretchFactor(1, 2)
         splitter.addWidget(left_widget)
         splitter.addWidget(right_widget)
         splitter.setStretchFactor(0, 7)
@@ -185,10 +190,35 @@ class View(QWidget):
         self.folder_btn.setFixedHeight(35)
 
         self.folder_label = QLabel("선택된 폴더가 없습니다.")
-        self.folder_label.setStyleSheet("color: #6c757d; font-style: italic;")
+        self.folder_label.setObjectName("pathLabel")
+        self.folder_label.setProperty("empty", True)
+
+        self.add_folder_btn = QPushButton("➕ 폴더 추가")
+        self.add_folder_btn.setToolTip("다른 폴더의 이미지도 목록에 추가합니다. 스캔은 작업 대기열에서 차례로 실행됩니다.")
+        self.add_folder_btn.clicked.connect(self.open_add_folder_dialog)
+        self.add_folder_btn.setFixedHeight(35)
+        self.add_folder_btn.setEnabled(False)
+
+        self.rescan_btn = QPushButton("🔄 다시 스캔")
+        self.rescan_btn.setToolTip("캐시를 무시하고 모든 WIM 파일 정보를 다시 조회합니다.")
+        self.rescan_btn.clicked.connect(self.request_rescan)
+        self.rescan_btn.setFixedHeight(35)
+        self.rescan_btn.setEnabled(False)
+
+        self.recursive_checkbox = QCheckBox("하위 폴더 포함")
+        self.recursive_checkbox.setChecked(True)
+        self.recursive_checkbox.setToolTip("하위 폴더의 .wim/.esd/.swm 이미지까지 스캔합니다.")
+
+        self.watch_checkbox = QCheckBox("폴더 감시")
+        self.watch_checkbox.setToolTip("폴더의 이미지가 추가/변경/삭제되면 해당 파일만 자동으로 다시 조회합니다.")
+        self.watch_checkbox.toggled.connect(self.watch_toggled.emit)
 
         layout.addWidget(self.folder_btn)
         layout.addWidget(self.folder_label, 1)
+        layout.addWidget(self.add_folder_btn)
+        layout.addWidget(self.recursive_checkbox)
+        layout.addWidget(self.watch_checkbox)
+        layout.addWidget(self.rescan_btn)
 
         group.setLayout(layout)
         return group
@@ -203,25 +233,79 @@ class View(QWidget):
         self.select_all_checkbox.stateChanged.connect(self.toggle_all_selection)
 
         self.selection_status_label = QLabel("선택: 0/0개")
-        self.selection_status_label.setStyleSheet("color: #495057; font-size: 8pt;")
+        self.selection_status_label.setObjectName("selectionStatusLabel")
+
+        self.dedup_btn = QPushButton("📊 중복 분석")
+        self.dedup_btn.setToolTip("목록의 이미지들이 공유하는 리소스와 하나로 합쳤을 때 줄어드는 크기를 분석합니다.")
+        self.dedup_btn.clicked.connect(self.request_dedup)
+        self.dedup_btn.setEnabled(False)
+
+        self.browse_btn = QPushButton("🗂 내용 보기")
+        self.browse_btn.setToolTip("마운트하지 않고 마지막으로 클릭한 파일의 이미지 안 폴더와 파일을 살펴봅니다.")
+        self.browse_btn.clicked.connect(self.show_image_browser)
+        self.browse_btn.setEnabled(False)
 
         checkbox_layout.addWidget(self.select_all_checkbox)
         checkbox_layout.addStretch()
         checkbox_layout.addWidget(self.selection_status_label)
+        checkbox_layout.addWidget(self.browse_btn)
+        checkbox_layout.addWidget(self.dedup_btn)
         layout.addLayout(checkbox_layout)
 
-        self.wim_list = QListWidget()
-        self.wim_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-        self.wim_list.itemClicked.connect(self.on_item_clicked)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("🔍 파일 이름, 이미지 이름, 버전, 빌드로 필터")
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+
+        # 정렬/필터는 프록시 모델에서 처리 (원본 모델의 행 순서는 도착 순서)
+        self.wim_proxy = WimSortFilterProxyModel(self)
+        self.wim_proxy.setSourceModel(self.wim_model)
+        self.filter_edit.textChanged.connect(self.wim_proxy.setFilterFixedString)
+
+        self.wim_list = QTableView()
+        self.wim_list.setModel(self.wim_proxy)
+        self.wim_list.setItemDelegate(WimItemDelegate(self.wim_list))
+        self.wim_list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.wim_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.wim_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.wim_list.setShowGrid(False)
+        self.wim_list.setWordWrap(False)
+        self.wim_list.verticalHeader().hide()
+        # 행 높이 고정 (내용 기준 크기 계산은 행 수에 비례하므로 사용하지 않음)
+        self.wim_list.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.wim_list.verticalHeader().setDefaultSectionSize(26)
+        header = self.wim_list.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(COL_FILE, QHeaderView.ResizeMode.Stretch)
+        for column, width in ((COL_NAME, 200), (COL_VERSION, 60), (COL_BUILD, 70), (COL_SIZE, 80),
+                              (COL_VERIFY, 50)):
+            header.resizeSection(column, width)
+        self.wim_list.setSortingEnabled(True)
+        self.wim_list.sortByColumn(COL_FILE, Qt.SortOrder.AscendingOrder)
+        self.wim_list.clicked.connect(self.on_item_clicked)
         layout.addWidget(self.wim_list)
 
         help_label = QLabel("각 파일을 클릭하여 업데이트 대상을 선택/해제할 수 있습니다.")
-        help_label.setStyleSheet("color: #6c757d; font-size: 8pt; font-style: italic; padding: 5px;")
+        help_label.setObjectName("helpLabel")
         layout.addWidget(help_label)
 
         group.setLayout(layout)
         return group
 
+    def create_queue_group(self):
+        """작업 대기열 영역 생성"""
+        from modules.queue_panel import JobQueuePanel
+
+        group = QGroupBox("작업 대기열")
+        layout = QVBoxLayout()
+        self.queue_panel = JobQueuePanel()
+        self.queue_panel.move_requested.connect(self.job_move_requested.emit)
+        self.queue_panel.cancel_requested.connect(self.job_cancel_requested.emit)
+        self.queue_panel.clear_requested.connect(self.jobs_clear_requested.emit)
+        layout.addWidget(self.queue_panel)
+        group.setLayout(layout)
+        return group
+
     def create_log_group(self):
         """로그 영역 생성"""
         group = QGroupBox("작업 로그")
@@ -232,6 +316,18 @@ class View(QWidget):
         self.log_text.appendPlainText("KdicUpdater가 시작되었습니다.")
         self.log_text.appendPlainText("폴더를 선택하여 WIM 파일을 스캔하세요.")
         layout.addWidget(self.log_text)
+
+        stats_layout = QHBoxLayout()
+        self.channel_stats_label = QLabel("")
+        self.channel_stats_label.setObjectName("channelStatsLabel")
+        # 성능 계측(--trace)을 켠 경우에만 표시
+        self.trace_btn = QPushButton("⏱ 성능")
+        self.trace_btn.setToolTip("가장 오래 걸린 파일과 단계를 봅니다.")
+        self.trace_btn.clicked.connect(self.show_trace_panel)
+        self.trace_btn.hide()
+        stats_layout.addWidget(self.channel_stats_label, 1)
+        stats_layout.addWidget(self.trace_btn)
+        layout.addLayout(stats_layout)
         group.setLayout(layout)
         return group
 
@@ -240,47 +336,56 @@ class View(QWidget):
         group = QGroupBox("작업 제어")
         layout = QVBoxLayout()
 
+        package_layout = QHBoxLayout()
+        self.package_btn = QPushButton("📦 패키지 폴더")
+        self.package_btn.clicked.connect(self.open_package_folder_dialog)
+        self.package_label = QLabel("선택된 패키지 폴더가 없습니다. (패키지 없이 정리/커밋만 수행)")
+        self.package_label.setObjectName("pathLabel")
+        self.package_label.setProperty("empty", True)
+        self.verify_checkbox = QCheckBox("업데이트 전 무결성 검사")
+        self.verify_checkbox.setChecked(True)
+        self.verify_checkbox.setToolTip("업데이트 전에 선택된 파일의 무결성을 검사하고 손상된 파일은 건너뜁니다.\n"
+                                        "바뀌지 않은 파일은 이전 검사 결과를 사용합니다.")
+        self.order_combo = QComboBox()
+        for order in ORDER_POLICIES:
+            self.order_combo.addItem(ORDER_LABELS[order], order)
+        self.order_combo.setCurrentIndex(ORDER_POLICIES.index(ORDER_LARGEST))
+        self.order_combo.setToolTip("이미지 처리 순서\n"
+                                    "큰 이미지 먼저: 여러 이미지를 동시에 처리할 때 전체 시간이 가장 짧습니다.\n"
+                                    "작은 이미지 먼저: 첫 결과를 빨리 확인할 수 있습니다.")
+        package_layout.addWidget(self.package_btn)
+        package_layout.addWidget(self.package_label, 1)
+        package_layout.addWidget(self.order_combo)
+        package_layout.addWidget(self.verify_checkbox)
+        layout.addLayout(package_layout)
+
         button_layout = QHBoxLayout()
         self.start_btn = QPushButton("업데이트 시작")
         self.start_btn.clicked.connect(self.start_update_process)
         self.start_btn.setFixedHeight(40)
-        self.start_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0d6efd; color: white; font-weight: bold;
-                border: none; border-radius: 5px; font-size: 11pt;
-            }
-            QPushButton:hover { background-color: #0b5ed7; }
-            QPushButton:disabled { background-color: #6c757d; color: #dee2e6; }
-        """)
+        self.start_btn.setObjectName("startButton")
+
+        self.verify_btn = QPushButton("🛡 무결성 검사")
+        self.verify_btn.setToolTip("선택된 파일의 무결성 테이블(없으면 전체 해시)을 검사합니다.")
+        self.verify_btn.clicked.connect(self.start_verify_process)
+        self.verify_btn.setFixedHeight(40)
+        self.verify_btn.setEnabled(False)
 
         self.cancel_btn = QPushButton("취소")
         self.cancel_btn.clicked.connect(self.cancel_update.emit)
         self.cancel_btn.setFixedHeight(40)
         self.cancel_btn.setEnabled(False)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545; color: white; font-weight: bold;
-                border: none; border-radius: 5px;
-            }
-            QPushButton:hover { background-color: #bb2d3b; }
-            QPushButton:disabled { background-color: #6c757d; color: #dee2e6; }
-        """)
+        self.cancel_btn.setObjectName("cancelButton")
         button_layout.addWidget(self.start_btn)
+        button_layout.addWidget(self.verify_btn)
         button_layout.addWidget(self.cancel_btn)
         layout.addLayout(button_layout)
 
         progress_layout = QVBoxLayout()
         self.status_label = QLabel("대기 중...")
-        self.status_label.setStyleSheet("color: #495057; font-weight: bold; font-size: 10pt;")
+        self.status_label.setObjectName("statusLabel")
         self.progress_bar = QProgressBar()
         self.progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #dee2e6; border-radius: 8px; text-align: center;
-                font-weight: bold; background-color: #f8f9fa; color: #495057;
-            }
-            QProgressBar::chunk { background-color: #0d6efd; border-radius: 6px; }
-        """)
         progress_layout.addWidget(self.status_label)
         progress_layout.addWidget(self.progress_bar)
         layout.addLayout(progress_layout)
@@ -290,117 +395,204 @@ class View(QWidget):
 
     def get_stylesheet(self):
         """전체 UI에 적용될 스타일시트"""
-        return """
-            QWidget {
-                font-family: 'Segoe UI', 'Malgun Gothic', Arial, sans-serif;
-                font-size: 9pt; background-color: #f8f9fa; color: #212529;
-            }
-            QGroupBox {
-                font-weight: bold; border: 2px solid #dee2e6; border-radius: 8px;
-                margin-top: 12px; padding-top: 10px; background-color: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin; left: 15px; padding: 0 8px;
-                color: #495057; font-weight: bold;
-            }
-            QPushButton {
-                background-color: #ffffff; border: 1px solid #dee2e6;
-                border-radius: 5px; padding: 8px; min-width: 80px;
-                font-weight: 500; color: #495057;
-            }
-            QPushButton:hover {
-                background-color: #e9ecef; border-color: #adb5bd; color: #212529;
-            }
-            QPushButton:disabled {
-                background-color: #f8f9fa; color: #6c757d; border-color: #dee2e6;
-            }
-            QListWidget {
-                border: 1px solid #dee2e6; border-radius: 5px; background-color: white;
-            }
-            QListWidget::item {
-                padding: 8px 12px; border-bottom: 1px solid #f1f3f4;
-            }
-            QListWidget::item:hover { background-color: #f0f8ff; }
-            QListWidget::item:selected { background-color: #e7f3ff; color: #212529; }
-            QPlainTextEdit {
-                border: 1px solid #dee2e6; border-radius: 5px;
-                background-color: #ffffff; color: #212529;
-                font-family: 'Consolas', 'Monaco', monospace; font-size: 8pt;
-            }
-            QCheckBox { spacing: 10px; font-weight: 500; }
-            QCheckBox::indicator {
-                width: 10px; height: 10px; border: 1px solid #000;
-                border-radius: 1px; background-color: #fff;
-            }
-            QCheckBox::indicator:checked { background-color: #000; }
-            QCheckBox::indicator:indeterminate { background-color: #666; }
-        """
+        return STYLESHEET
+
+    def set_path_label(self, label, text):
+        """선택된 경로 표시 (empty 속성이 바뀌면 스타일을 다시 적용)"""
+        label.setText(text)
+        label.setProperty("empty", False)
+        label.style().unpolish(label)
+        label.style().polish(label)
 
     @pyqtSlot()
     def open_folder_dialog(self):
-        """폴더 선택 다이얼로그 열기"""
-        if self.is_scanning or self.is_updating: return
-
+        """폴더 선택 다이얼로그 열기 (실행 중인 업데이트는 계속 진행, 이전 폴더의 스캔은 취소)"""
         folder = QFileDialog.getExistingDirectory(self, "WIM 파일이 있는 폴더 선택", self.selected_folder or ".")
         if folder:
             self.selected_folder = folder
-            self.folder_label.setText(folder)
-            self.folder_label.setStyleSheet("color: #212529; font-weight: 500;")
-            self.wim_list.clear()
+            self.added_folders = []
+            self.set_path_label(self.folder_label, folder)
+            self.clear_wim_list()
             self.folder_selected.emit(folder)
 
+    @pyqtSlot()
+    def open_add_folder_dialog(self):
+        """목록에 추가할 폴더 선택"""
+        folder = QFileDialog.getExistingDirectory(self, "추가할 WIM 파일 폴더 선택", self.selected_folder or ".")
+        if not folder or folder == self.selected_folder or folder in self.added_folders:
+            return
+        self.added_folders.append(folder)
+        self.set_path_label(self.folder_label, f"{self.selected_folder} 외 {len(self.added_folders)}개 폴더")
+        self.folder_label.setToolTip("\n".join([self.selected_folder, *self.added_folders]))
+        self.folder_added.emit(folder)
+
+    @pyqtSlot()
+    def open_package_folder_dialog(self):
+        """업데이트 패키지 폴더 선택 다이얼로그 열기 (대기열에 넣은 업데이트는 넣을 때의 폴더를 사용)"""
+        folder = QFileDialog.getExistingDirectory(self, "업데이트 패키지(.msu/.cab) 폴더 선택", self.package_folder or ".")
+        if folder:
+            self.package_folder = folder
+            self.set_path_label(self.package_label, folder)
+            self.add_log(f"패키지 폴더: {folder}")
+
+    @pyqtSlot()
+    def request_rescan(self):
+        """현재 폴더를 캐시 없이 다시 스캔"""
+        if not self.selected_folder: return
+
+        self.add_log("캐시를 무시하고 전체 파일을 다시 스캔합니다.")
+        self.clear_wim_list()
+        self.rescan_requested.emit(self.selected_folder)
+        for folder in self.added_folders:
+            self.folder_added.emit(folder)
+
     @pyqtSlot(bool)
     def set_scan_mode(self, scanning):
-        """스캔 모드 UI 설정"""
+        """스캔 모드 UI 설정 (스캔 중에도 이미 목록에 있는 파일은 업데이트/검사 가능)"""
         self.is_scanning = scanning
-        self.folder_btn.setEnabled(not scanning)
-        self.start_btn.setEnabled(False) # 스캔 중 및 스캔 완료 직후에는 비활성화
+        self.rescan_btn.setEnabled(bool(self.selected_folder))
+        self.add_folder_btn.setEnabled(bool(self.selected_folder))
+
+        # 업데이트 진행률을 표시하는 중이면 진행률 표시줄은 그대로 둠
+        if not self.is_updating:
+            if scanning:
+                self.status_label.setText("WIM 파일 정보 스캔 중...")
+                self.progress_bar.setRange(0, 0)
+            else:
+                self.progress_bar.setRange(0, 100)
+                self.progress_bar.setValue(0)
+                self.status_label.setText("대기 중...")
+        self.update_ui_state()
 
-        if scanning:
-            self.status_label.setText("WIM 파일 정보 스캔 중...")
-            self.progress_bar.setRange(0, 0)
-        else:
-            self.progress_bar.setRange(0, 100)
-            self.progress_bar.setValue(0)
-            self.status_label.setText("대기 중...")
+    def is_watch_enabled(self):
+        """폴더 감시 모드 사용 여부"""
+        return self.watch_checkbox.isChecked()
+
+    def current_wim_paths(self):
+        """리스트에 표시된(또는 삽입 대기 중인) 파일 경로 목록"""
+        return self.wim_model.paths() + [record.file_path for record in self.pending_wim_infos]
+
+    def is_recursive_scan(self):
+        """하위 폴더까지 스캔할지 여부"""
+        return self.recursive_checkbox.isChecked()
+
+    def clear_wim_list(self):
+        """WIM 리스트와 스트리밍 대기열 초기화"""
+        self.list_flush_timer.stop()
+        self.pending_wim_infos.clear()
+        self.wim_model.clear()
+        self.update_ui_state()
 
     @pyqtSlot(list)
+    @traced('view.update_wim_list', 'ui')
     def update_wim_list(self, wim_files_info):
         """스캔 완료 후 WIM 리스트 위젯 업데이트"""
-        self.wim_list.clear()
+        self.clear_wim_list()
         if not wim_files_info:
             self.add_log("표시할 WIM 파일 정보가 없습니다.")
         else:
-            for wim_info in wim_files_info:
-                item = WimListItem(wim_info)
-                self.wim_list.addItem(item)
+            self.insert_wim_items(wim_files_info)
+            self.add_log(f"총 {len(wim_files_info)}개의 WIM 파일 정보를 불러왔습니다.")
+        self.update_ui_state()
+
+    @pyqtSlot(object)
+    def add_wim_info(self, wim_info):
+        """스캔 중 파일 하나의 결과 수신 (다음 주기에 묶어서 삽입)"""
+        self.pending_wim_infos.append(wim_info)
+        if not self.list_flush_timer.isActive():
+            self.list_flush_timer.start()
+
+    @pyqtSlot()
+    @traced('view.flush_pending', 'ui')
+    def flush_pending_wim_infos(self):
+        """대기 중인 스캔 결과를 최대 LIST_FLUSH_BATCH_SIZE개씩 리스트에 삽입"""
+        batch = self.pending_wim_infos[:LIST_FLUSH_BATCH_SIZE]
+        del self.pending_wim_infos[:LIST_FLUSH_BATCH_SIZE]
+        if batch:
+            self.insert_wim_items(batch)
+            self.update_ui_state()
+        if not self.pending_wim_infos:
+            self.list_flush_timer.stop()
+
+    @pyqtSlot(list)
+    @traced('view.finish_wim_list', 'ui')
+    def finish_wim_list(self, wim_files_info):
+        """스트리밍 스캔 완료 시 남은 결과를 반영하고 요약 로그 출력"""
+        self.list_flush_timer.stop()
+        if self.pending_wim_infos:
+            self.insert_wim_items(self.pending_wim_infos)
+            self.pending_wim_infos.clear()
+
+        if self.wim_model.rowCount() == 0:
+            self.add_log("표시할 WIM 파일 정보가 없습니다.")
+        else:
             self.add_log(f"총 {len(wim_files_info)}개의 WIM 파일 정보를 불러왔습니다.")
         self.update_ui_state()
 
+    @pyqtSlot(list)
+    @traced('view.refresh_wim_items', 'ui')
+    def refresh_wim_items(self, wim_files_info):
+        """변경된 파일의 행만 추가/교체 (전체 리스트는 다시 만들지 않음)"""
+        if not wim_files_info:
+            return
+        self.insert_wim_items(wim_files_info)
+        self.update_ui_state()
+        self.add_log(f"{len(wim_files_info)}개 파일 정보가 갱신되었습니다.")
+
+    @pyqtSlot(list)
+    def remove_wim_paths(self, file_paths):
+        """삭제된 파일의 행만 제거"""
+        removed = self.wim_model.remove_paths(file_paths)
+        if removed:
+            self.update_ui_state()
+            self.add_log(f"삭제된 파일 {removed}개를 목록에서 제거했습니다.")
+
+    def insert_wim_items(self, wim_infos):
+        """스캔 결과를 모델에 반영 (같은 경로는 선택 상태를 유지한 채 교체)"""
+        self.wim_model.upsert(wim_infos)
+
     @pyqtSlot(int)
     def toggle_all_selection(self, state):
         """전체 선택/해제 체크박스 상태 변경 시"""
-        if self.is_updating: return
-
         is_checked = (Qt.CheckState(state) == Qt.CheckState.Checked)
-        for i in range(self.wim_list.count()):
-            item = self.wim_list.item(i)
-            if item:
-                item.set_selection(is_checked)
+        self.wim_model.set_all_selected(is_checked)
 
         self.update_ui_state()
         self.add_log(f"모든 파일 {'선택' if is_checked else '선택 해제'}됨")
 
-    @pyqtSlot(QListWidgetItem)
-    def on_item_clicked(self, item):
-        """리스트 아이템 클릭 시 선택 상태 토글"""
-        if self.is_updating or not item: return
-        item.toggle_selection()
+    @pyqtSlot(QModelIndex)
+    def on_item_clicked(self, index):
+        """행 클릭 시 선택 상태 토글"""
+        if not index.isValid(): return
+        self.wim_model.toggle(self.wim_proxy.mapToSource(index).row())
         self.update_ui_state()
 
+    def get_image_indexes(self, file_path):
+        """스캔 결과에 있는 파일의 인덱스 목록"""
+        record = self.wim_model.record(file_path)
+        if record is None:
+            return [1]
+        return [image.index for image in record.images] or [1]
+
+    def get_image_sizes(self, file_path):
+        """스캔 결과에 있는 파일의 인덱스별 이미지 크기 (진행률/처리 순서 계산용)"""
+        from modules.core import image_sizes
+
+        record = self.wim_model.record(file_path)
+        return image_sizes(record) if record is not None else {}
+
+    def get_records(self, file_paths):
+        """스캔 결과에 있는 파일의 WimFileRecord 목록 (패키지 적용 대상 판단용)"""
+        records = (self.wim_model.record(file_path) for file_path in file_paths)
+        return [record for record in records if record is not None]
+
+    def get_update_order(self):
+        """선택된 처리 순서 정책"""
+        return self.order_combo.currentData()
+
     def get_selected_files(self):
         """선택된 항목의 파일 경로 리스트 반환"""
-        return [self.wim_list.item(i).file_path for i in range(self.wim_list.count()) if self.wim_list.item(i).is_selected]
+        return self.wim_model.selected_paths()
 
     def start_update_process(self):
         """업데이트 프로세스 시작"""
@@ -409,22 +601,133 @@ class View(QWidget):
             self.add_log("업데이트할 WIM 파일을 선택해주세요.")
             return
 
-        self.add_log(f"{len(selected_files)}개 파일의 업데이트를 시작합니다...")
+        self.add_log(f"{len(selected_files)}개 파일의 업데이트를 작업 대기열에 추가합니다...")
         self.start_update.emit(selected_files)
 
+    def start_verify_process(self):
+        """선택된 파일 무결성 검사 시작"""
+        selected_files = self.get_selected_files()
+        if not selected_files:
+            self.add_log("검사할 WIM 파일을 선택해주세요.")
+            return
+
+        self.add_log(f"{len(selected_files)}개 파일의 무결성 검사를 작업 대기열에 추가합니다...")
+        self.verify_requested.emit(selected_files)
+
+    @pyqtSlot()
+    def request_dedup(self):
+        """목록 전체 파일의 리소스 중복 분석 요청"""
+        if self.is_scanning or self.is_updating or self.is_analyzing: return
+
+        paths = self.wim_model.paths()
+        if len(paths) < 2:
+            self.add_log("중복 분석에는 2개 이상의 WIM 파일이 필요합니다.")
+            return
+        self.dedup_requested.emit(paths)
+
+    def set_dedup_mode(self, analyzing):
+        """중복 분석 중에는 분석 버튼만 잠금 (목록은 읽기만 하므로 다른 작업은 가능)"""
+        self.is_analyzing = analyzing
+        self.dedup_btn.setText("📊 분석 중..." if analyzing else "📊 중복 분석")
+        if not analyzing and not self.is_updating and not self.is_scanning:
+            self.progress_bar.setValue(0)
+            self.status_label.setText("대기 중...")
+        self.update_ui_state()
+
+    def show_dedup_report(self, report):
+        """중복 분석 결과 창 표시"""
+        from modules.dedup_dialog import DedupReportDialog
+
+        DedupReportDialog(report, self).exec()
+
+    def show_image_browser(self):
+        """현재 행 파일의 이미지 내용 보기 (메타데이터 리소스만 읽음)"""
+        from modules.image_browser import ImageBrowserDialog
+
+        index = self.wim_list.currentIndex()
+        if not index.isValid(): return
+        record = self.wim_model.record_at(self.wim_proxy.mapToSource(index).row())
+        if record is None: return
+        ImageBrowserDialog(record, self).exec()
+
+    def set_trace_enabled(self, enabled, output_dir=None):
+        """성능 계측 패널 버튼 표시 (output_dir: 저장할 trace/metrics 파일 폴더)"""
+        self.trace_output_dir = output_dir
+        self.trace_btn.setVisible(enabled)
+
+    def show_trace_panel(self):
+        """가장 오래 걸린 파일/단계 표시"""
+        from modules.trace_dialog import TraceDialog
+        from modules.tracing import tracer
+
+        TraceDialog(tracer, self.trace_output_dir, self).exec()
+
+    def ask_resume(self, state):
+        """이전 업데이트가 끝나지 않았을 때 이어서 진행할지 묻기 (예: 이어서, 아니요: 정리 후 기록 삭제)"""
+        pending = state.pending
+        started = datetime.fromtimestamp(state.started).strftime('%Y-%m-%d %H:%M')
+        lines = [
+            f"{started}에 시작한 업데이트가 끝나지 않았습니다.",
+            f"이미지 {len(state.entries)}개 중 {state.done}개 완료, {len(pending)}개 남음",
+        ]
+        if state.orphan_mounts:
+            lines.append(f"마운트된 채로 남은 이미지: {len(state.orphan_mounts)}개")
+        lines.append("")
+        lines.extend(f"  • {os.path.basename(entry.file_path)} [{entry.index}]" for entry in pending[:10])
+        if len(pending) > 10:
+            lines.append(f"  … 외 {len(pending) - 10}개")
+        lines.append("")
+        lines.append("이어서 진행할까요? '아니요'를 선택하면 남은 마운트를 변경 없이 정리합니다.")
+        answer = QMessageBox.question(self, "이전 업데이트 이어서 진행", "\n".join(lines),
+                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                      QMessageBox.StandardButton.Yes)
+        return answer == QMessageBox.StandardButton.Yes
+
+    def set_cleanup_mode(self, cleaning):
+        """남은 마운트를 정리하는 동안 업데이트와 같이 목록/버튼 잠금"""
+        self.set_update_mode(cleaning)
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText("남은 마운트 정리 중..." if cleaning else "대기 중...")
+        if not cleaning:
+            self.update_ui_state()
+
+    def is_verify_before_update(self):
+        """업데이트 전에 무결성 검사를 할지 여부"""
+        return self.verify_checkbox.isChecked()
+
+    def set_verify_mode(self, verifying):
+        """무결성 검사 중 UI 설정 (업데이트와 같이 목록/버튼 잠금)"""
+        self.set_update_mode(verifying)
+        if verifying:
+            self.progress_bar.setValue(0)
+            self.status_label.setText("무결성 검사 중...")
+
+    def apply_verify_results(self, results):
+        """무결성 검사 결과를 목록에 표시 (손상된 파일은 선택 해제)"""
+        self.wim_model.set_verify_results(results)
+        self.update_ui_state()
+
+    def finish_verify(self, cancelled=False):
+        """무결성 검사만 실행한 경우 UI 복원"""
+        self.set_verify_mode(False)
+        self.progress_bar.setValue(0 if cancelled else 100)
+        self.status_label.setText("무결성 검사가 취소되었습니다." if cancelled else "무결성 검사 완료")
+        self.update_ui_state()
+
     def set_update_mode(self, updating):
-        """업데이트 모드 UI 설정"""
+        """업데이트(또는 검사/정리) 실행 중 UI 설정
+
+        작업은 대기열에 넣을 때의 파일/패키지/설정을 그대로 쓰므로 실행 중에도 목록과 설정은 바꿀 수 있다.
+        """
         self.is_updating = updating
-        self.start_btn.setEnabled(not updating)
         self.cancel_btn.setEnabled(updating)
-        self.folder_btn.setEnabled(not updating)
-        self.select_all_checkbox.setEnabled(not updating)
-        self.wim_list.setEnabled(not updating)
 
         if updating:
+            self.progress_bar.setRange(0, 100)
             self.status_label.setText("업데이트 진행 중...")
         else:
             self.status_label.setText("대기 중...")
+        self.update_ui_state()
 
     def reset_ui_immediately(self):
         """즉시 UI 초기화 (취소 시 사용)"""
@@ -436,26 +739,29 @@ class View(QWidget):
 
     def update_ui_state(self):
         """UI 상태 업데이트"""
-        total_count = self.wim_list.count()
-        selected_count = len(self.get_selected_files())
+        total_count = self.wim_model.rowCount()
+        selected_count = self.wim_model.selected_count
 
-        # 업데이트 중이 아닐 때만 시작 버튼 활성화
-        if not self.is_updating and not self.is_scanning:
-            self.start_btn.setEnabled(selected_count > 0)
+        # 실행 중인 작업이 있어도 대기열에 추가할 수 있음
+        self.start_btn.setEnabled(selected_count > 0)
+        self.verify_btn.setEnabled(selected_count > 0)
 
         self.selection_status_label.setText(f"선택: {selected_count}/{total_count}개")
+        self.dedup_btn.setEnabled(total_count > 1 and not self.is_analyzing
+                                  and not self.is_scanning and not self.is_updating)
+        self.browse_btn.setEnabled(self.wim_list.currentIndex().isValid())
 
         # 체크박스 시그널을 잠시 비활성화하여 무한 루프 방지
         self.select_all_checkbox.blockSignals(True)
         if total_count == 0:
             self.select_all_checkbox.setCheckState(Qt.CheckState.Unchecked)
             self.select_all_checkbox.setEnabled(False)
-        elif selected_count == total_count:
-            self.select_all_checkbox.setCheckState(Qt.CheckState.Checked)
-            self.select_all_checkbox.setEnabled(True)
         elif selected_count == 0:
             self.select_all_checkbox.setCheckState(Qt.CheckState.Unchecked)
             self.select_all_checkbox.setEnabled(True)
+        elif selected_count == self.wim_model.selectable_count():
+            self.select_all_checkbox.setCheckState(Qt.CheckState.Checked)
+            self.select_all_checkbox.setEnabled(True)
         else:
             self.select_all_checkbox.setCheckState(Qt.CheckState.PartiallyChecked)
             self.select_all_checkbox.setEnabled(True)
@@ -467,6 +773,31 @@ class View(QWidget):
         self.log_text.appendPlainText(f"[{timestamp}] {message}")
         self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
 
+    @pyqtSlot(list)
+    def add_logs(self, entries):
+        """여러 로그를 한 블록으로 추가 (entries: [(datetime, 메시지), ...])"""
+        if not entries:
+            return
+        self.log_text.appendPlainText("\n".join(
+            f"[{logged_at.strftime('%H:%M:%S')}] {message}" for logged_at, message in entries
+        ))
+        self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
+
+    @pyqtSlot(dict)
+    def update_channel_stats(self, stats):
+        """진행률/로그 채널의 초당 이벤트 수와 병합/생략 수 표시"""
+        if not stats['log_rate'] and not stats['progress_rate']:
+            self.channel_stats_label.setText("")
+            return
+        self.channel_stats_label.setText(
+            f"로그 {stats['log_rate']:.0f}/s · 진행률 {stats['progress_rate']:.0f}/s · "
+            f"화면 갱신 {stats['emit_rate']:.0f}/s · 병합 {stats['coalesced']} · 생략 {stats['dropped']}"
+        )
+
+    def update_job_queue(self, jobs):
+        """작업 대기열 표시 갱신"""
+        self.queue_panel.set_jobs(jobs)
+
     def update_progress(self, value, message=""):
         """진행률 업데이트"""
         self.progress_bar.setValue(value)
@@ -0,0 +1,199 @@
+import os
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from modules.discovery import discover_images, DEFAULT_MAX_DEPTH
+
+# 이벤트가 연달아 발생할 때 마지막 이벤트 후 이 시간(ms)이 지나면 처리
+DEBOUNCE_MS = 800
+# 파일 크기/수정 시각이 이 간격(ms) 동안 변하지 않아야 복사가 끝난 것으로 판단
+SETTLE_MS = 2000
+
+
+def _signature(parts):
+    """파일(분할 파트 포함)의 크기/수정 시각 목록 (없으면 None)"""
+    try:
+        return tuple((st.st_size, st.st_mtime_ns) for st in (os.stat(p) for p in parts))
+    except OSError:
+        return None
+
+
+class FolderWatcher(QObject):
+    """작업 폴더를 감시하여 추가/변경/삭제된 이미지 파일을 알려주는 객체
+
+    QFileSystemWatcher(Linux에서는 inotify 기반) 이벤트를 DEBOUNCE_MS 동안 모은 뒤
+    변경된 폴더만 다시 확인하고, 크기가 SETTLE_MS 동안 변하지 않은 파일만 전달한다.
+    """
+    files_changed = pyqtSignal(list)  # 추가되었거나 내용이 바뀐 파일 경로 목록
+    files_removed = pyqtSignal(list)  # 삭제된 파일 경로 목록
+
+    def __init__(self, folder_path, max_depth=DEFAULT_MAX_DEPTH, include=None, exclude=None, parent=None):
+        super().__init__(parent)
+        self.folder_path = os.path.abspath(folder_path)
+        self.max_depth = max_depth
+        self.include = include
+        self.exclude = exclude
+        self.is_paused = False
+
+        self.snapshot = {}      # 파일 경로 -> (분할 파트 목록, 시그니처)
+        self.dirty_dirs = set() # 다시 확인해야 할 폴더
+        self.settling = {}      # 복사 완료 대기 중인 파일 경로 -> (분할 파트 목록, 시그니처)
+
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.fs_watcher.fileChanged.connect(self.on_file_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.process_dirty_dirs)
+
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setInterval(SETTLE_MS)
+        self.settle_timer.timeout.connect(self.check_settling)
+
+    def start(self, known_paths=()):
+        """감시 시작 (known_paths: 이미 목록에 반영된 파일 경로)"""
+        self.stop()
+        known_paths = set(known_paths)
+        for candidate in self.discover(self.folder_path, self.max_depth):
+            if candidate.path in known_paths:
+                self.snapshot[candidate.path] = (candidate.parts, _signature(candidate.parts))
+        for path in known_paths:
+            if path not in self.snapshot:
+                self.snapshot[path] = ([path], _signature([path]))
+
+        self.watch_tree(self.folder_path, 0)
+        self.fs_watcher.addPaths(list(self.snapshot))
+
+        # 마지막 스캔 이후 바뀐 파일이 있으면 반영
+        self.dirty_dirs.update(self.fs_watcher.directories())
+        self.debounce_timer.start()
+
+    def stop(self):
+        """감시 중지"""
+        self.debounce_timer.stop()
+        self.settle_timer.stop()
+        watched = self.fs_watcher.directories() + self.fs_watcher.files()
+        if watched:
+            self.fs_watcher.removePaths(watched)
+        self.snapshot.clear()
+        self.dirty_dirs.clear()
+        self.settling.clear()
+
+    def pause(self):
+        """이벤트 처리 일시 중지 (업데이트 작업 중 자체 변경 무시)"""
+        self.is_paused = True
+        self.debounce_timer.stop()
+        self.settle_timer.stop()
+
+    def resume(self):
+        """일시 중지 해제 후 중지 기간에 쌓인 변경 반영"""
+        self.is_paused = False
+        self.dirty_dirs.update(self.fs_watcher.directories())
+        self.debounce_timer.start()
+
+    def discover(self, dir_path, max_depth):
+        return discover_images(dir_path, max_depth=max_depth, include=self.include, exclude=self.exclude)
+
+    def depth_of(self, dir_path):
+        rel_path = os.path.relpath(dir_path, self.folder_path)
+        return 0 if rel_path == '.' else rel_path.count(os.sep) + 1
+
+    def watch_tree(self, dir_path, depth):
+        """폴더와 깊이 제한 안의 하위 폴더를 감시 대상에 추가 (새로 추가된 폴더 반환)"""
+        dirs = [dir_path]
+        stack = [(dir_path, depth)]
+        while stack:
+            current, current_depth = stack.pop()
+            if self.max_depth is not None and current_depth >= self.max_depth:
+                continue
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.path)
+                            stack.append((entry.path, current_depth + 1))
+            except OSError:
+                continue
+        watched = set(self.fs_watcher.directories())
+        new_dirs = [d for d in dirs if d not in watched]
+        if new_dirs:
+            self.fs_watcher.addPaths(new_dirs)
+        return new_dirs
+
+    def on_directory_changed(self, dir_path):
+        self.dirty_dirs.add(dir_path)
+        if not self.is_paused:
+            self.debounce_timer.start()  # 연속 이벤트는 마지막 이벤트 기준으로 한 번만 처리
+
+    def on_file_changed(self, file_path):
+        self.dirty_dirs.add(os.path.dirname(file_path))
+        if not self.is_paused:
+            self.debounce_timer.start()
+
+    def process_dirty_dirs(self):
+        """변경된 폴더만 다시 확인하여 추가/변경/삭제 파일 분류"""
+        if self.is_paused:
+            return
+
+        removed = []
+        dirty_dirs, self.dirty_dirs = self.dirty_dirs, set()
+        for dir_path in dirty_dirs:
+            prefix = dir_path.rstrip(os.sep) + os.sep
+            if not os.path.isdir(dir_path):
+                # 폴더가 통째로 삭제된 경우
+                gone = [p for p in self.snapshot if p.startswith(prefix)]
+                removed.extend(gone)
+                for path in gone:
+                    del self.snapshot[path]
+                    self.settling.pop(path, None)
+                self.fs_watcher.removePath(dir_path)
+                continue
+
+            new_dirs = self.watch_tree(dir_path, self.depth_of(dir_path))
+
+            # 이 폴더 바로 아래 파일과 새로 생긴 하위 폴더의 파일
+            current = {}
+            for scan_dir in [dir_path] + new_dirs:
+                for candidate in self.discover(scan_dir, 0):
+                    current[candidate.path] = candidate.parts
+
+            for path in [p for p in self.snapshot if os.path.dirname(p) == dir_path and p not in current]:
+                del self.snapshot[path]
+                self.settling.pop(path, None)
+                removed.append(path)
+
+            for path, parts in current.items():
+                signature = _signature(parts)
+                known = self.snapshot.get(path)
+                if signature is not None and (known is None or known[1] != signature):
+                    self.settling[path] = (parts, signature)
+
+        if removed:
+            self.fs_watcher.removePaths([p for p in removed if p in self.fs_watcher.files()])
+            self.files_removed.emit(sorted(removed))
+        if self.settling and not self.settle_timer.isActive():
+            self.settle_timer.start()
+
+    def check_settling(self):
+        """크기/수정 시각이 더 이상 바뀌지 않는 파일만 변경 목록으로 전달"""
+        if self.is_paused:
+            return
+
+        stable = []
+        for path, (parts, signature) in list(self.settling.items()):
+            current = _signature(parts)
+            if current is None:
+                del self.settling[path]  # 복사 도중 삭제됨
+            elif current == signature:
+                del self.settling[path]
+                self.snapshot[path] = (parts, current)
+                stable.append(path)
+            else:
+                self.settling[path] = (parts, current)  # 아직 복사 중
+
+        if not self.settling:
+            self.settle_timer.stop()
+        if stable:
+            self.fs_watcher.addPaths([p for p in stable if p not in self.fs_watcher.files()])
+            self.files_changed.emit(sorted(stable))
@@ -0,0 +1,252 @@
+import os
+import struct
+import uuid
+import xml.etree.ElementTree as ET
+
+from modules.records import ImageRecord, WimFileRecord
+
+# WIM 파일 고정 헤더 (WIMHEADER_V1_PACKED, 208 바이트)
+WIM_TAG = b"MSWIM\0\0\0"
+WIM_HEADER_SIZE = 208
+
+# 리소스 헤더 (RESHDR_DISK_SHORT): 7바이트 크기 + 1바이트 플래그, 8바이트 오프셋, 8바이트 원본 크기
+RESHDR_SIZE = 24
+RESHDR_FLAG_FREE = 0x01
+RESHDR_FLAG_METADATA = 0x02
+RESHDR_FLAG_COMPRESSED = 0x04
+RESHDR_FLAG_SPANNED = 0x08
+
+# 헤더 플래그
+WIM_HDR_FLAG_COMPRESSION = 0x00000002
+WIM_HDR_FLAG_READONLY = 0x00000004
+WIM_HDR_FLAG_SPANNED = 0x00000008
+WIM_HDR_FLAG_RP_FIX = 0x00000080
+WIM_HDR_FLAG_COMPRESS_XPRESS = 0x00020000
+WIM_HDR_FLAG_COMPRESS_LZX = 0x00040000
+WIM_HDR_FLAG_COMPRESS_LZMS = 0x00080000
+
+# XML 메타데이터 크기 상한 (손상된 헤더로 인한 과도한 메모리 사용 방지)
+MAX_XML_SIZE = 64 * 1024 * 1024
+
+# lookup 테이블 항목: 리소스 헤더(24) + 파트 번호(u16) + 참조 수(u32) + SHA-1(20)
+LOOKUP_ENTRY_FORMAT = '<QQQHI20s'
+LOOKUP_ENTRY_SIZE = 50
+MAX_LOOKUP_TABLE_SIZE = 256 * 1024 * 1024
+
+# <ARCH> 값 -> DISM 표기
+ARCH_NAMES = {
+    '0': 'x86',
+    '5': 'arm',
+    '6': 'ia64',
+    '9': 'x64',
+    '12': 'arm64',
+}
+
+
+class WimFormatError(Exception):
+    """WIM 파일 형식이 올바르지 않을 때 발생하는 예외"""
+    pass
+
+
+class ResourceHeader:
+    """WIM 리소스 헤더 (RESHDR_DISK_SHORT)"""
+    __slots__ = ('size', 'flags', 'offset', 'original_size')
+
+    def __init__(self, size, flags, offset, original_size):
+        self.size = size
+        self.flags = flags
+        self.offset = offset
+        self.original_size = original_size
+
+    @classmethod
+    def unpack(cls, data, offset=0):
+        """24바이트 리소스 헤더 해석"""
+        raw_size, = struct.unpack_from('<Q', data, offset)
+        res_offset, original_size = struct.unpack_from('<QQ', data, offset + 8)
+        return cls(raw_size & 0x00FFFFFFFFFFFFFF, raw_size >> 56, res_offset, original_size)
+
+    @property
+    def is_compressed(self):
+        return bool(self.flags & RESHDR_FLAG_COMPRESSED)
+
+    def __repr__(self):
+        return (f"ResourceHeader(size={self.size}, flags={self.flags:#x}, "
+                f"offset={self.offset}, original_size={self.original_size})")
+
+
+class WimHeader:
+    """WIM 파일 고정 헤더"""
+    __slots__ = ('version', 'flags', 'chunk_size', 'guid', 'part_number', 'total_parts',
+                 'image_count', 'offset_table', 'xml_data', 'boot_metadata', 'boot_index',
+                 'integrity')
+
+    @classmethod
+    def unpack(cls, data):
+        """208바이트 헤더 버퍼 해석"""
+        if len(data) < WIM_HEADER_SIZE or data[:8] != WIM_TAG:
+            raise WimFormatError("WIM 헤더 태그가 올바르지 않습니다.")
+
+        header_size, = struct.unpack_from('<I', data, 8)
+        if header_size != WIM_HEADER_SIZE:
+            raise WimFormatError(f"지원하지 않는 WIM 헤더 크기입니다: {header_size}")
+
+        header = cls()
+        header.version, header.flags, header.chunk_size = struct.unpack_from('<III', data, 12)
+        header.guid = uuid.UUID(bytes_le=bytes(data[24:40]))
+        header.part_number, header.total_parts, header.image_count = struct.unpack_from('<HHI', data, 40)
+        header.offset_table = ResourceHeader.unpack(data, 48)
+        header.xml_data = ResourceHeader.unpack(data, 72)
+        header.boot_metadata = ResourceHeader.unpack(data, 96)
+        header.boot_index, = struct.unpack_from('<I', data, 120)
+        header.integrity = ResourceHeader.unpack(data, 124)
+        return header
+
+    @property
+    def compression(self):
+        """압축 방식 이름"""
+        if not self.flags & WIM_HDR_FLAG_COMPRESSION:
+            return 'none'
+        if self.flags & WIM_HDR_FLAG_COMPRESS_LZMS:
+            return 'lzms'
+        if self.flags & WIM_HDR_FLAG_COMPRESS_LZX:
+            return 'lzx'
+        if self.flags & WIM_HDR_FLAG_COMPRESS_XPRESS:
+            return 'xpress'
+        return 'unknown'
+
+
+def read_wim_header(file_path):
+    """WIM 파일의 고정 헤더만 읽어서 반환"""
+    with open(file_path, 'rb') as f:
+        return WimHeader.unpack(f.read(WIM_HEADER_SIZE))
+
+
+def read_wim_xml(f, header, file_size):
+    """헤더가 가리키는 XML 메타데이터 리소스를 읽어 문자열로 반환"""
+    res = header.xml_data
+    if res.size == 0:
+        raise WimFormatError("XML 메타데이터 리소스가 없습니다.")
+    if res.is_compressed:
+        raise WimFormatError("압축된 XML 메타데이터는 지원하지 않습니다.")
+    if res.size > MAX_XML_SIZE or res.offset + res.size > file_size:
+        raise WimFormatError("XML 메타데이터 리소스 범위가 올바르지 않습니다.")
+
+    f.seek(res.offset)
+    data = f.read(res.size)
+    if len(data) != res.size:
+        raise WimFormatError("XML 메타데이터를 끝까지 읽지 못했습니다.")
+
+    # XML 리소스는 BOM이 포함된 UTF-16LE
+    if data[:2] == b'\xff\xfe':
+        data = data[2:]
+    try:
+        return data.decode('utf-16-le').rstrip('\0')
+    except UnicodeDecodeError as e:
+        raise WimFormatError(f"XML 메타데이터가 올바른 UTF-16이 아닙니다: {e}") from e
+
+
+def read_lookup_table(f, header, file_size):
+    """lookup 테이블의 리소스 목록 반환
+
+    항목은 (SHA-1, 플래그, 저장 크기, 원본 크기, 파트 번호, 참조 수) 튜플이다.
+    """
+    res = header.offset_table
+    if res.size == 0:
+        return []
+    if res.is_compressed:
+        raise WimFormatError("압축된 lookup 테이블은 지원하지 않습니다.")
+    if res.size > MAX_LOOKUP_TABLE_SIZE or res.offset + res.size > file_size:
+        raise WimFormatError("lookup 테이블 범위가 올바르지 않습니다.")
+    if res.size % LOOKUP_ENTRY_SIZE:
+        raise WimFormatError(f"lookup 테이블 크기가 항목 크기의 배수가 아닙니다: {res.size}")
+
+    f.seek(res.offset)
+    data = f.read(res.size)
+    if len(data) != res.size:
+        raise WimFormatError("lookup 테이블을 끝까지 읽지 못했습니다.")
+
+    return [(sha1, raw_size >> 56, raw_size & 0x00FFFFFFFFFFFFFF, original_size, part_number, ref_count)
+            for raw_size, _offset, original_size, part_number, ref_count, sha1
+            in struct.iter_unpack(LOOKUP_ENTRY_FORMAT, data)]
+
+
+def _text(element, path, default=None):
+    """하위 요소 텍스트 반환 (없으면 기본값)"""
+    if element is None:
+        return default
+    found = element.find(path)
+    if found is None or found.text is None:
+        return default
+    return found.text.strip()
+
+
+def _int(element, path, default=0):
+    """하위 요소를 정수로 변환 (16진수 표기 포함)"""
+    value = _text(element, path)
+    if not value:
+        return default
+    try:
+        return int(value, 0)
+    except ValueError:
+        return default
+
+
+def parse_wim_xml(xml_text):
+    """WIM XML 메타데이터에서 인덱스별 ImageRecord 목록 추출"""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as e:
+        raise WimFormatError(f"XML 메타데이터 파싱 실패: {e}") from e
+
+    images = []
+    for image in root.findall('IMAGE'):
+        try:
+            index = int(image.get('INDEX', len(images) + 1))
+        except ValueError as e:
+            raise WimFormatError(f"이미지 인덱스가 숫자가 아닙니다: {image.get('INDEX')!r}") from e
+        windows = image.find('WINDOWS')
+        version = windows.find('VERSION') if windows is not None else None
+
+        major = _text(version, 'MAJOR')
+        minor = _text(version, 'MINOR')
+        build = _text(version, 'BUILD')
+        arch = _text(windows, 'ARCH')
+
+        images.append(ImageRecord(
+            index=index,
+            name=_text(image, 'NAME', 'N/A'),
+            description=_text(image, 'DESCRIPTION', ''),
+            version=f"{major}.{minor}" if major is not None and minor is not None else 'N/A',
+            build=build or 'N/A',
+            spbuild=_text(version, 'SPBUILD', ''),
+            architecture=ARCH_NAMES.get(arch, arch or ''),
+            size=_int(image, 'TOTALBYTES'),
+        ))
+
+    images.sort(key=lambda img: img.index)
+    return images
+
+
+def read_wim_info(file_path):
+    """WIM 헤더와 XML 메타데이터를 읽어 WimFileRecord 반환
+
+    DISM을 실행하지 않고 헤더(208바이트)와 XML 리소스만 직접 읽는다.
+    형식이 맞지 않으면 WimFormatError를 발생시킨다.
+    """
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        header = WimHeader.unpack(f.read(WIM_HEADER_SIZE))
+        images = parse_wim_xml(read_wim_xml(f, header, file_size))
+
+    if not images:
+        raise WimFormatError("XML 메타데이터에 이미지 정보가 없습니다.")
+
+    return WimFileRecord(
+        file_path=file_path,
+        images=images,
+        file_size=file_size,
+        guid=str(header.guid),
+        image_count=header.image_count,
+        compression=header.compression,
+        source='native',
+    )
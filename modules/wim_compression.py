@@ -0,0 +1,332 @@
+from modules.wim import WimFormatError
+
+# WIM 리소스 청크 압축 해제 (Qt 비의존)
+# 이미지 내용 보기에서 메타데이터 리소스와 작은 파일만 읽으면 되므로 청크 단위 XPRESS(Huffman)와 LZX만
+# 순수 파이썬으로 구현한다. LZMS와 solid 리소스는 지원하지 않는다.
+
+MAX_HUFFMAN_CODE_LENGTH = 16
+
+# XPRESS Huffman (MS-XCA): 512개 심볼의 4비트 부호 길이 테이블(256바이트) + 16비트 단위 비트스트림
+XPRESS_NUM_SYMBOLS = 512
+XPRESS_TABLE_SIZE = XPRESS_NUM_SYMBOLS // 2
+XPRESS_MAX_CODE_LENGTH = 15
+XPRESS_MIN_MATCH = 3
+XPRESS_MAX_CHUNK_SIZE = 65536  # 부호 테이블 하나가 담당하는 출력 크기
+
+# LZX (WIM 변형): 청크마다 새 스트림, 창 크기 = 청크 크기
+LZX_NUM_CHARS = 256
+LZX_NUM_PRIMARY_LENS = 7
+LZX_NUM_LEN_SYMBOLS = 249
+LZX_NUM_PRETREE_SYMBOLS = 20
+LZX_NUM_ALIGNED_SYMBOLS = 8
+LZX_MIN_MATCH = 2
+LZX_DEFAULT_BLOCK_SIZE = 32768
+LZX_E8_FILE_SIZE = 12000000  # WIM의 E8 변환은 항상 이 파일 크기를 가정
+LZX_BLOCK_VERBATIM = 1
+LZX_BLOCK_ALIGNED = 2
+LZX_BLOCK_UNCOMPRESSED = 3
+
+# 오프셋 슬롯별 추가 비트 수와 기준 오프셋
+LZX_EXTRA_BITS = [0, 0] + [min(max(0, (slot - 2) // 2), 17) for slot in range(2, 50)]
+LZX_SLOT_BASE = [0]
+for _bits in LZX_EXTRA_BITS[:-1]:
+    LZX_SLOT_BASE.append(LZX_SLOT_BASE[-1] + (1 << _bits))
+del _bits
+# 창 크기(2^order)별 오프셋 슬롯 수 (wimlib과 같은 고정 표)
+LZX_NUM_OFFSET_SLOTS = {15: 30, 16: 32, 17: 34, 18: 36, 19: 38, 20: 42, 21: 50}
+
+
+class DecompressionError(WimFormatError):
+    """압축된 청크 데이터가 올바르지 않을 때 발생하는 예외"""
+    pass
+
+
+def build_decode_table(lengths, max_length=MAX_HUFFMAN_CODE_LENGTH):
+    """정규(canonical) 허프만 부호 길이 목록 -> (조회 테이블, 조회 비트 수)
+
+    테이블은 앞쪽 조회 비트 수만큼의 비트로 찾으며 항목은 (심볼 << 5) | 부호 길이다.
+    부호가 하나도 없으면 (None, 0)을 반환한다.
+    """
+    by_length = [[] for _ in range(max_length + 1)]
+    for symbol, length in enumerate(lengths):
+        if length:
+            if length > max_length:
+                raise DecompressionError(f"허프만 부호 길이가 너무 깁니다: {length}")
+            by_length[length].append(symbol)
+    table_bits = max((length for length in range(max_length + 1) if by_length[length]), default=0)
+    if not table_bits:
+        return None, 0
+
+    table = [0] * (1 << table_bits)
+    code = 0
+    for length in range(1, table_bits + 1):
+        fill = 1 << (table_bits - length)
+        for symbol in by_length[length]:
+            start = code * fill
+            if start + fill > len(table):
+                raise DecompressionError("허프만 부호 길이 테이블이 올바르지 않습니다.")
+            table[start:start + fill] = [(symbol << 5) | length] * fill
+            code += 1
+        code <<= 1
+    return table, table_bits
+
+
+def _copy_match(output, offset, length):
+    """출력 끝에서 offset만큼 앞의 데이터를 length바이트 복사 (겹치는 복사 포함)"""
+    start = len(output) - offset
+    if offset >= length:
+        output += output[start:start + length]
+    else:
+        pattern = output[start:]
+        output += (pattern * (length // offset + 1))[:length]
+
+
+def decompress_xpress(data, size):
+    """XPRESS Huffman 청크 압축 해제 (size: 압축 전 크기)"""
+    if size > XPRESS_MAX_CHUNK_SIZE:
+        raise DecompressionError(f"지원하지 않는 XPRESS 청크 크기입니다: {size}")
+    if len(data) < XPRESS_TABLE_SIZE + 4:
+        raise DecompressionError("XPRESS 청크가 너무 짧습니다.")
+    lengths = []
+    for byte in data[:XPRESS_TABLE_SIZE]:
+        lengths.append(byte & 0x0F)
+        lengths.append(byte >> 4)
+    table, table_bits = build_decode_table(lengths, XPRESS_MAX_CODE_LENGTH)
+    if table is None:
+        raise DecompressionError("XPRESS 부호 테이블이 비어 있습니다.")
+
+    end = len(data)
+    pos = XPRESS_TABLE_SIZE + 4
+    # bits: 아직 읽지 않은 valid개의 비트 (최상위 비트가 다음 비트)
+    bits = ((data[pos - 4] | data[pos - 3] << 8) << 16) | data[pos - 2] | data[pos - 1] << 8
+    valid = 32
+    output = bytearray()
+    while len(output) < size:
+        entry = table[bits >> (valid - table_bits)]  # 보충 후 valid는 항상 16 이상
+        length = entry & 31
+        if not length:
+            raise DecompressionError("XPRESS 비트스트림이 올바르지 않습니다.")
+        valid -= length
+        bits &= (1 << valid) - 1
+        if valid < 16:
+            bits = (bits << 16) | (int.from_bytes(data[pos:pos + 2], 'little') if pos < end else 0)
+            pos += 2
+            valid += 16
+        symbol = entry >> 5
+        if symbol < 256:
+            output.append(symbol)
+            continue
+
+        symbol -= 256
+        match_length = symbol & 0x0F
+        offset_bits = symbol >> 4
+        if match_length == 0x0F:
+            if pos >= end:
+                raise DecompressionError("XPRESS 데이터가 잘렸습니다.")
+            match_length += data[pos]
+            pos += 1
+            if match_length == 0x0F + 0xFF:
+                if pos + 2 > end:
+                    raise DecompressionError("XPRESS 데이터가 잘렸습니다.")
+                match_length = data[pos] | data[pos + 1] << 8
+                pos += 2
+        offset = 1 << offset_bits
+        if offset_bits:
+            valid -= offset_bits
+            offset |= bits >> valid
+            bits &= (1 << valid) - 1
+            if valid < 16:
+                bits = (bits << 16) | (int.from_bytes(data[pos:pos + 2], 'little') if pos < end else 0)
+                pos += 2
+                valid += 16
+        match_length += XPRESS_MIN_MATCH
+        if offset > len(output) or len(output) + match_length > size:
+            raise DecompressionError("XPRESS 일치 범위가 올바르지 않습니다.")
+        _copy_match(output, offset, match_length)
+    return bytes(output)
+
+
+class _BitReader:
+    """LZX 비트스트림 (16비트 리틀 엔디언 단위, 최상위 비트부터)"""
+    __slots__ = ('data', 'pos', 'bits', 'valid')
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.bits = 0
+        self.valid = 0
+
+    def ensure(self, count):
+        # 데이터 끝을 넘으면 0을 채운다 (잘린 스트림은 출력 크기 검사에서 걸림)
+        while self.valid < count:
+            self.bits = (self.bits << 16) | int.from_bytes(self.data[self.pos:self.pos + 2], 'little')
+            self.pos += 2
+            self.valid += 16
+
+    def read(self, count):
+        if not count:
+            return 0
+        self.ensure(count)
+        self.valid -= count
+        value = self.bits >> self.valid
+        self.bits &= (1 << self.valid) - 1
+        return value
+
+    def decode(self, table, table_bits):
+        self.ensure(table_bits)
+        entry = table[self.bits >> (self.valid - table_bits)]
+        length = entry & 31
+        if not length:
+            raise DecompressionError("LZX 비트스트림이 올바르지 않습니다.")
+        self.valid -= length
+        self.bits &= (1 << self.valid) - 1
+        return entry >> 5
+
+    def align(self):
+        """16비트 경계로 맞추고 바이트 위치 반환 (이미 경계에 있으면 16비트를 버림)"""
+        self.ensure(1)
+        self.read(self.valid % 16 or 16)
+        self.pos -= self.valid // 8  # 미리 읽어 둔 워드는 되돌림
+        self.bits = self.valid = 0
+        return self.pos
+
+
+def _lzx_read_lengths(reader, lengths, start, count):
+    """pretree로 부호화된 부호 길이(이전 블록 값과의 차이)를 읽어 lengths[start:start+count]에 반영"""
+    pretree, pretree_bits = build_decode_table([reader.read(4) for _ in range(LZX_NUM_PRETREE_SYMBOLS)])
+    if pretree is None:
+        raise DecompressionError("LZX pretree가 비어 있습니다.")
+    i = start
+    end = start + count
+    while i < end:
+        presym = reader.decode(pretree, pretree_bits)
+        if presym < 17:
+            lengths[i] = (lengths[i] - presym) % 17
+            i += 1
+            continue
+        if presym == 17:
+            run = 4 + reader.read(4)
+            value = 0
+        elif presym == 18:
+            run = 20 + reader.read(5)
+            value = 0
+        else:
+            run = 4 + reader.read(1)
+            # 17 이상의 값도 wimlib처럼 17로 나눈 나머지로 처리
+            value = (lengths[i] - reader.decode(pretree, pretree_bits)) % 17
+        if i + run > end:
+            raise DecompressionError("LZX 부호 길이 반복이 범위를 넘습니다.")
+        lengths[i:i + run] = [value] * run
+        i += run
+
+
+def _lzx_undo_e8(output):
+    """x86 CALL(E8) 명령의 절대 주소 변환을 되돌림"""
+    limit = len(output) - 10
+    i = output.find(0xE8, 0, limit)
+    while i != -1:
+        target = int.from_bytes(output[i + 1:i + 5], 'little', signed=True)
+        if 0 <= target < LZX_E8_FILE_SIZE:
+            output[i + 1:i + 5] = (target - i).to_bytes(4, 'little', signed=True)
+        elif -i <= target < 0:
+            output[i + 1:i + 5] = (target + LZX_E8_FILE_SIZE).to_bytes(4, 'little', signed=True)
+        i = output.find(0xE8, i + 5, limit)
+
+
+def decompress_lzx(data, size, chunk_size=LZX_DEFAULT_BLOCK_SIZE):
+    """LZX(WIM 변형) 청크 압축 해제 (size: 압축 전 크기, chunk_size: WIM 청크 크기 = 창 크기)"""
+    window_order = max(chunk_size - 1, 1).bit_length()
+    num_slots = LZX_NUM_OFFSET_SLOTS.get(window_order)
+    if num_slots is None or size > chunk_size:
+        raise DecompressionError(f"지원하지 않는 LZX 청크 크기입니다: {chunk_size}")
+    num_main = LZX_NUM_CHARS + num_slots * 8
+
+    reader = _BitReader(data)
+    main_lengths = [0] * num_main
+    len_lengths = [0] * LZX_NUM_LEN_SYMBOLS
+    recent = [1, 1, 1]
+    output = bytearray()
+    while len(output) < size:
+        block_type = reader.read(3)
+        if reader.read(1):
+            block_size = LZX_DEFAULT_BLOCK_SIZE
+        else:
+            block_size = reader.read(16)
+            if window_order >= 16:
+                block_size = (block_size << 8) | reader.read(8)
+        block_end = len(output) + block_size
+        if not block_size or block_end > size:
+            raise DecompressionError("LZX 블록 크기가 올바르지 않습니다.")
+
+        if block_type == LZX_BLOCK_UNCOMPRESSED:
+            pos = reader.align()
+            if pos + 12 + block_size > len(data):
+                raise DecompressionError("LZX 비압축 블록이 잘렸습니다.")
+            recent = [int.from_bytes(data[pos + n:pos + n + 4], 'little') for n in (0, 4, 8)]
+            pos += 12
+            output += data[pos:pos + block_size]
+            reader.pos = pos + block_size + (block_size & 1)
+            continue
+        if block_type not in (LZX_BLOCK_VERBATIM, LZX_BLOCK_ALIGNED):
+            raise DecompressionError(f"LZX 블록 종류가 올바르지 않습니다: {block_type}")
+
+        aligned = aligned_bits = None
+        if block_type == LZX_BLOCK_ALIGNED:
+            aligned, aligned_bits = build_decode_table([reader.read(3) for _ in range(LZX_NUM_ALIGNED_SYMBOLS)])
+            if aligned is None:
+                raise DecompressionError("LZX aligned 부호 테이블이 비어 있습니다.")
+        _lzx_read_lengths(reader, main_lengths, 0, LZX_NUM_CHARS)
+        _lzx_read_lengths(reader, main_lengths, LZX_NUM_CHARS, num_main - LZX_NUM_CHARS)
+        _lzx_read_lengths(reader, len_lengths, 0, LZX_NUM_LEN_SYMBOLS)
+        main, main_bits = build_decode_table(main_lengths)
+        lens, lens_bits = build_decode_table(len_lengths)
+        if main is None:
+            raise DecompressionError("LZX 주 부호 테이블이 비어 있습니다.")
+
+        decode = reader.decode
+        read = reader.read
+        while len(output) < block_end:
+            symbol = decode(main, main_bits)
+            if symbol < LZX_NUM_CHARS:
+                output.append(symbol)
+                continue
+            symbol -= LZX_NUM_CHARS
+            match_length = symbol & 7
+            slot = symbol >> 3
+            if match_length == LZX_NUM_PRIMARY_LENS:
+                if lens is None:
+                    raise DecompressionError("LZX 길이 부호 테이블이 비어 있습니다.")
+                match_length += decode(lens, lens_bits)
+            match_length += LZX_MIN_MATCH
+
+            if slot == 0:
+                offset = recent[0]
+            elif slot < 3:
+                offset = recent[slot]
+                recent[slot] = recent[0]
+                recent[0] = offset
+            else:
+                extra = LZX_EXTRA_BITS[slot]
+                if aligned is not None and extra >= 3:
+                    offset = LZX_SLOT_BASE[slot] + (read(extra - 3) << 3) + decode(aligned, aligned_bits) - 2
+                else:
+                    offset = LZX_SLOT_BASE[slot] + read(extra) - 2
+                recent[2] = recent[1]
+                recent[1] = recent[0]
+                recent[0] = offset
+            if offset > len(output) or len(output) + match_length > block_end:
+                raise DecompressionError("LZX 일치 범위가 올바르지 않습니다.")
+            _copy_match(output, offset, match_length)
+
+    if len(output) > 10:
+        _lzx_undo_e8(output)
+    return bytes(output)
+
+
+def decompress_chunk(compression, data, size, chunk_size):
+    """WIM 압축 방식 이름('xpress', 'lzx')에 맞게 청크 하나를 압축 해제"""
+    if compression == 'xpress':
+        return decompress_xpress(data, size)
+    if compression == 'lzx':
+        return decompress_lzx(data, size, chunk_size)
+    raise WimFormatError(f"지원하지 않는 압축 방식입니다: {compression}")
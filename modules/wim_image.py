@@ -0,0 +1,492 @@
+import os
+import struct
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from modules.tracing import count, span
+from modules.wim import (WimHeader, WimFormatError, WIM_HEADER_SIZE, LOOKUP_ENTRY_FORMAT, LOOKUP_ENTRY_SIZE,
+                         MAX_LOOKUP_TABLE_SIZE, RESHDR_FLAG_METADATA, RESHDR_FLAG_COMPRESSED)
+from modules.wim_compression import decompress_chunk
+
+# WIM 이미지 내용 읽기 (Qt 비의존)
+# 마운트하지 않고 이미지의 메타데이터 리소스(보안 데이터 + 디렉터리 항목(dentry) 트리)를 직접 읽는다.
+# 디렉터리는 처음 열 때 한 단계씩만 해석하고, 압축된 리소스는 필요한 청크만 풀어 LRU 캐시에 둔다.
+# 파일 크기는 lookup 테이블의 원본 크기로 알 수 있으므로 내용을 풀지 않고도 경로 조회와 크기 합계를 낸다.
+
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_READ_AHEAD = 64 * 1024  # 디렉터리 항목을 읽을 때 한 번에 가져오는 크기
+DEFAULT_MAX_FILE_READ = 16 * 1024 * 1024  # read_file()이 읽는 최대 크기
+MAX_CHUNK_SIZE = 1 << 21
+MAX_DIRECTORY_DEPTH = 256  # 손상된 메타데이터의 순환 참조 방지
+
+RESHDR_FLAG_SOLID = 0x10
+
+# 디렉터리 항목 (WIM_DENTRY) 고정 부분 102바이트, 뒤에 UTF-16LE 긴 이름/짧은 이름 (각각 NUL 2바이트 포함)
+DENTRY_FORMAT = '<QIiQQQQQQ20sIQHHH'
+DENTRY_SIZE = struct.calcsize(DENTRY_FORMAT)
+# 추가 스트림 항목 (WIM_STREAM_ENTRY) 고정 부분 38바이트, 뒤에 UTF-16LE 스트림 이름
+STREAM_ENTRY_FORMAT = '<QQ20sH'
+STREAM_ENTRY_SIZE = struct.calcsize(STREAM_ENTRY_FORMAT)
+
+FILE_ATTRIBUTE_READONLY = 0x0001
+FILE_ATTRIBUTE_HIDDEN = 0x0002
+FILE_ATTRIBUTE_SYSTEM = 0x0004
+FILE_ATTRIBUTE_DIRECTORY = 0x0010
+FILE_ATTRIBUTE_REPARSE_POINT = 0x0400
+FILE_ATTRIBUTE_COMPRESSED = 0x0800
+
+ATTRIBUTE_LETTERS = (
+    (FILE_ATTRIBUTE_READONLY, 'R'),
+    (FILE_ATTRIBUTE_HIDDEN, 'H'),
+    (FILE_ATTRIBUTE_SYSTEM, 'S'),
+    (FILE_ATTRIBUTE_DIRECTORY, 'D'),
+    (FILE_ATTRIBUTE_REPARSE_POINT, 'L'),
+    (FILE_ATTRIBUTE_COMPRESSED, 'C'),
+)
+
+EMPTY_HASH = bytes(20)
+FILETIME_EPOCH = datetime(1601, 1, 1, tzinfo=timezone.utc)
+
+
+def _align8(value):
+    return (value + 7) & ~7
+
+
+class ChunkCache:
+    """압축 해제한 청크의 LRU 캐시 (합계가 max_bytes를 넘으면 가장 오래 쓰지 않은 청크부터 버림)"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            return {'chunks': len(self._items), 'bytes': self.size, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+class ResourceEntry:
+    """lookup 테이블 항목 (리소스 위치 포함)"""
+    __slots__ = ('hash', 'flags', 'size', 'offset', 'original_size', 'part_number', 'ref_count')
+
+    def __init__(self, hash, flags, size, offset, original_size, part_number, ref_count):
+        self.hash = hash
+        self.flags = flags
+        self.size = size
+        self.offset = offset
+        self.original_size = original_size
+        self.part_number = part_number
+        self.ref_count = ref_count
+
+    @property
+    def is_compressed(self):
+        return bool(self.flags & RESHDR_FLAG_COMPRESSED)
+
+    @property
+    def is_metadata(self):
+        return bool(self.flags & RESHDR_FLAG_METADATA)
+
+
+class DirEntry:
+    """이미지 안의 파일 또는 디렉터리 하나"""
+    __slots__ = ('name', 'short_name', 'attributes', 'hash', 'size', 'last_write_time', 'subdir_offset',
+                 'parent', 'children', '_index', 'stream_count')
+
+    def __init__(self, name, short_name, attributes, hash, size, last_write_time, subdir_offset, parent):
+        self.name = name
+        self.short_name = short_name
+        self.attributes = attributes
+        self.hash = hash                       # 이름 없는 데이터 스트림의 SHA-1 (빈 파일/디렉터리는 0)
+        self.size = size                       # 데이터 크기 (lookup 테이블에 없으면 None)
+        self.last_write_time = last_write_time  # FILETIME
+        self.subdir_offset = subdir_offset     # 메타데이터 리소스 안의 자식 목록 위치 (0이면 없음)
+        self.parent = parent
+        self.children = None                   # 처음 열 때 채움
+        self._index = None
+        self.stream_count = 0                  # 이름 있는 추가 스트림 수
+
+    @property
+    def is_directory(self):
+        return bool(self.attributes & FILE_ATTRIBUTE_DIRECTORY)
+
+    @property
+    def path(self):
+        parts = []
+        entry = self
+        while entry.parent is not None:
+            parts.append(entry.name)
+            entry = entry.parent
+        return '\\' + '\\'.join(reversed(parts))
+
+    @property
+    def modified(self):
+        """마지막 수정 시각 (UTC datetime, 없으면 None)"""
+        if not self.last_write_time:
+            return None
+        try:
+            return FILETIME_EPOCH + timedelta(microseconds=self.last_write_time // 10)
+        except OverflowError:
+            return None
+
+    @property
+    def attribute_text(self):
+        return ''.join(letter for flag, letter in ATTRIBUTE_LETTERS if self.attributes & flag)
+
+    def __repr__(self):
+        return f"DirEntry({self.path!r}, size={self.size})"
+
+
+def read_resource_table(f, header, file_size):
+    """lookup 테이블을 읽어 SHA-1 -> ResourceEntry 딕셔너리와 메타데이터 리소스 목록(이미지 순서) 반환"""
+    res = header.offset_table
+    if res.size == 0:
+        return {}, []
+    if res.is_compressed:
+        raise WimFormatError("압축된 lookup 테이블은 지원하지 않습니다.")
+    if res.size > MAX_LOOKUP_TABLE_SIZE or res.offset + res.size > file_size:
+        raise WimFormatError("lookup 테이블 범위가 올바르지 않습니다.")
+    if res.size % LOOKUP_ENTRY_SIZE:
+        raise WimFormatError(f"lookup 테이블 크기가 항목 크기의 배수가 아닙니다: {res.size}")
+
+    f.seek(res.offset)
+    data = f.read(res.size)
+    if len(data) != res.size:
+        raise WimFormatError("lookup 테이블을 끝까지 읽지 못했습니다.")
+
+    resources = {}
+    metadata = []
+    for raw_size, offset, original_size, part_number, ref_count, sha1 in struct.iter_unpack(LOOKUP_ENTRY_FORMAT,
+                                                                                               data):
+        entry = ResourceEntry(sha1, raw_size >> 56, raw_size & 0x00FFFFFFFFFFFFFF, offset, original_size,
+                              part_number, ref_count)
+        if entry.is_metadata:
+            metadata.append(entry)
+        else:
+            resources[sha1] = entry
+    return resources, metadata
+
+
+class ResourceReader:
+    """리소스 하나를 원하는 위치부터 읽기 (압축된 리소스는 필요한 청크만 압축 해제)"""
+
+    def __init__(self, wim, entry):
+        self.wim = wim
+        self.entry = entry
+        self.size = entry.original_size
+        self._chunk_starts = self._chunk_ends = None
+        self._data_offset = entry.offset
+
+    def read(self, offset, size):
+        if offset < 0 or offset + size > self.size:
+            raise WimFormatError(f"리소스 범위를 벗어난 읽기입니다: {offset}+{size} > {self.size}")
+        if size == 0:
+            return b''
+        if not self.entry.is_compressed:
+            return self.wim._read_at(self.entry.offset + offset, size)
+
+        chunk_size = self.wim.chunk_size
+        first = offset // chunk_size
+        last = (offset + size - 1) // chunk_size
+        if first == last:
+            start = offset - first * chunk_size
+            return self._chunk(first)[start:start + size]
+        data = b''.join(self._chunk(i) for i in range(first, last + 1))
+        start = offset - first * chunk_size
+        return data[start:start + size]
+
+    def _load_chunk_table(self):
+        """리소스 앞의 청크 오프셋 테이블 (첫 청크를 뺀 청크 수 x 4 또는 8바이트)"""
+        chunk_count = (self.size + self.wim.chunk_size - 1) // self.wim.chunk_size
+        entry_size = 8 if self.size > 0xFFFFFFFF else 4
+        table_size = (chunk_count - 1) * entry_size
+        if table_size > self.entry.size:
+            raise WimFormatError("청크 테이블이 리소스보다 큽니다.")
+        raw = self.wim._read_at(self.entry.offset, table_size)
+        starts = [0] + list(struct.unpack(f"<{chunk_count - 1}{'Q' if entry_size == 8 else 'I'}", raw))
+        ends = starts[1:] + [self.entry.size - table_size]
+        if any(end < start for start, end in zip(starts, ends)):
+            raise WimFormatError("청크 테이블이 올바르지 않습니다.")
+        self._data_offset = self.entry.offset + table_size
+        self._chunk_starts = starts
+        self._chunk_ends = ends
+
+    def _chunk(self, index):
+        key = (self.entry.part_number, self.entry.offset, index)
+        data = self.wim.cache.get(key)
+        if data is not None:
+            return data
+        if self._chunk_ends is None:
+            self._load_chunk_table()
+        chunk_size = self.wim.chunk_size
+        original = min(chunk_size, self.size - index * chunk_size)
+        start = self._chunk_starts[index]
+        raw = self.wim._read_at(self._data_offset + start, self._chunk_ends[index] - start)
+        # 압축해도 줄지 않은 청크는 그대로 저장됨
+        data = raw if len(raw) == original else decompress_chunk(self.wim.compression, raw, original, chunk_size)
+        if len(data) != original:
+            raise WimFormatError("압축 해제한 청크 크기가 맞지 않습니다.")
+        count('wim_chunks_decompressed')
+        self.wim.cache.put(key, data)
+        return data
+
+
+class _BufferedView:
+    """리소스를 DEFAULT_READ_AHEAD 단위로 미리 읽어 두고 작은 조각을 잘라 주는 보기"""
+
+    def __init__(self, reader, read_ahead=DEFAULT_READ_AHEAD):
+        self.reader = reader
+        self.read_ahead = read_ahead
+        self._start = 0
+        self._data = b''
+
+    def get(self, offset, size):
+        if offset + size > self.reader.size:
+            raise WimFormatError("디렉터리 항목이 메타데이터 리소스를 벗어납니다.")
+        if not (self._start <= offset and offset + size <= self._start + len(self._data)):
+            self._start = offset
+            self._data = self.reader.read(offset, min(self.reader.size - offset, max(size, self.read_ahead)))
+        start = offset - self._start
+        return self._data[start:start + size]
+
+
+class WimImage:
+    """이미지 하나의 디렉터리 트리 (자식 목록은 처음 요청할 때 읽음)"""
+
+    def __init__(self, wim, index, metadata):
+        self.wim = wim
+        self.index = index
+        self._reader = ResourceReader(wim, metadata)
+        self._lock = threading.Lock()
+        with span('wim_browse_open', file=os.path.basename(wim.path), index=index):
+            view = _BufferedView(self._reader)
+            security_length, = struct.unpack('<I', view.get(0, 4))
+            # 보안 데이터 다음 8바이트 경계에 루트 항목 (보안 데이터가 없으면 8)
+            root_offset = _align8(security_length) if security_length else 8
+            self.root, _ = self._read_entry(view, root_offset, None)
+        if self.root is None or not self.root.is_directory:
+            raise WimFormatError("이미지의 루트 디렉터리 항목이 올바르지 않습니다.")
+
+    def _read_entry(self, view, offset, parent):
+        """offset의 디렉터리 항목 하나를 읽어 (DirEntry, 다음 항목 위치) 반환 (목록 끝이면 DirEntry는 None)"""
+        length, = struct.unpack('<Q', view.get(offset, 8))
+        if length <= 8:
+            return None, offset + 8
+        if length < DENTRY_SIZE:
+            raise WimFormatError(f"디렉터리 항목 길이가 올바르지 않습니다: {length}")
+        fields = struct.unpack(DENTRY_FORMAT, view.get(offset, DENTRY_SIZE))
+        (_, attributes, _, subdir_offset, _, _, _, _, last_write_time, sha1, _, _,
+         stream_count, short_name_bytes, name_bytes) = fields
+        if DENTRY_SIZE + name_bytes + short_name_bytes > length:
+            raise WimFormatError("디렉터리 항목 이름이 항목 길이를 넘습니다.")
+        names = view.get(offset + DENTRY_SIZE, length - DENTRY_SIZE)
+        try:
+            name = names[:name_bytes].decode('utf-16-le')
+            start = name_bytes + 2 if name_bytes else 0
+            short_name = names[start:start + short_name_bytes].decode('utf-16-le')
+        except UnicodeDecodeError as e:
+            raise WimFormatError(f"디렉터리 항목 이름을 읽을 수 없습니다: {e}") from e
+
+        next_offset = offset + _align8(length)
+        named_streams = 0
+        for _ in range(stream_count):
+            stream_length, _, stream_hash, stream_name_bytes = struct.unpack(
+                STREAM_ENTRY_FORMAT, view.get(next_offset, STREAM_ENTRY_SIZE))
+            if stream_length < STREAM_ENTRY_SIZE:
+                raise WimFormatError("추가 스트림 항목 길이가 올바르지 않습니다.")
+            if stream_name_bytes:
+                named_streams += 1
+            elif sha1 == EMPTY_HASH:
+                sha1 = stream_hash  # 이름 없는 스트림이 추가 스트림으로 들어 있는 경우 (리파스 포인트 등)
+            next_offset += _align8(stream_length)
+
+        resource = self.wim.resources.get(sha1)
+        size = 0 if sha1 == EMPTY_HASH else (resource.original_size if resource else None)
+        entry = DirEntry(name, short_name, attributes, sha1, size, last_write_time,
+                         subdir_offset if attributes & FILE_ATTRIBUTE_DIRECTORY else 0, parent)
+        entry.stream_count = named_streams
+        return entry, next_offset
+
+    def list_dir(self, entry=None):
+        """디렉터리의 자식 목록 (처음 요청할 때 메타데이터에서 읽어 둠)"""
+        entry = entry or self.root
+        if entry.children is not None:
+            return entry.children
+        with self._lock:
+            if entry.children is None:
+                entry.children = self._read_children(entry)
+        return entry.children
+
+    def _read_children(self, entry):
+        if not entry.subdir_offset:
+            return []
+        depth = 0
+        parent = entry.parent
+        while parent is not None:
+            depth += 1
+            parent = parent.parent
+        if depth >= MAX_DIRECTORY_DEPTH:
+            raise WimFormatError(f"디렉터리가 너무 깊습니다: {entry.path}")
+
+        with span('wim_browse_dir', path=entry.path) as s:
+            view = _BufferedView(self._reader)
+            children = []
+            offset = entry.subdir_offset
+            while True:
+                child, offset = self._read_entry(view, offset, entry)
+                if child is None:
+                    break
+                children.append(child)
+            s.set(entries=len(children))
+        count('wim_browse_entries', len(children))
+        return children
+
+    def lookup(self, path):
+        """이미지 안의 경로('\\' 또는 '/' 구분, 대소문자 무시)에 해당하는 DirEntry (없으면 None)"""
+        entry = self.root
+        for part in path.replace('/', '\\').split('\\'):
+            if not part or part == '.':
+                continue
+            if not entry.is_directory:
+                return None
+            if entry._index is None:
+                entry._index = {child.name.casefold(): child for child in self.list_dir(entry)}
+            entry = entry._index.get(part.casefold())
+            if entry is None:
+                return None
+        return entry
+
+    def tree_size(self, entry=None, cancel_event=None):
+        """하위 전체의 (파일 수, 디렉터리 수, 데이터 크기 합계) (크기를 모르는 파일은 0으로 셈)
+
+        같은 데이터를 가리키는 하드 링크/중복 파일도 각각 더한다 (탐색기의 '크기'와 같은 기준).
+        """
+        entry = entry or self.root
+        files = dirs = total = 0
+        stack = [entry]
+        while stack:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            current = stack.pop()
+            if not current.is_directory:
+                files += 1
+                total += current.size or 0
+                continue
+            if current is not entry:
+                dirs += 1
+            stack.extend(self.list_dir(current))
+        return files, dirs, total
+
+    def read_file(self, entry, max_size=DEFAULT_MAX_FILE_READ):
+        """파일 내용 읽기 (드라이버 .inf 같은 작은 파일 확인용)"""
+        if entry.is_directory:
+            raise WimFormatError(f"'{entry.path}'은(는) 디렉터리입니다.")
+        if entry.hash == EMPTY_HASH:
+            return b''
+        resource = self.wim.resources.get(entry.hash)
+        if resource is None:
+            raise WimFormatError(f"'{entry.path}' 파일 데이터가 이 파일에 없습니다 (분할 WIM의 다른 파트일 수 있음).")
+        if resource.original_size > max_size:
+            raise WimFormatError(f"'{entry.path}' 파일이 너무 큽니다: {resource.original_size}바이트")
+        return ResourceReader(self.wim, resource).read(0, resource.original_size)
+
+
+class WimImageReader:
+    """WIM 파일의 이미지 내용 읽기 (with 문 사용)"""
+
+    def __init__(self, path, cache=None):
+        self.path = path
+        self.cache = cache or ChunkCache()
+        self._file = open(path, 'rb')
+        self._lock = threading.Lock()
+        self._images = {}
+        try:
+            self.file_size = os.fstat(self._file.fileno()).st_size
+            self.header = WimHeader.unpack(self._file.read(WIM_HEADER_SIZE))
+            self.compression = self.header.compression
+            self.chunk_size = self.header.chunk_size or 32768
+            if self.compression not in ('none', 'xpress', 'lzx'):
+                raise WimFormatError(f"지원하지 않는 압축 방식입니다: {self.compression}")
+            if not 0 < self.chunk_size <= MAX_CHUNK_SIZE:
+                raise WimFormatError(f"청크 크기가 올바르지 않습니다: {self.chunk_size}")
+            self.resources, self.metadata = read_resource_table(self._file, self.header, self.file_size)
+        except struct.error as e:
+            self._file.close()
+            raise WimFormatError(f"WIM 구조를 읽을 수 없습니다: {e}") from e
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    @property
+    def image_count(self):
+        return len(self.metadata)
+
+    def _read_at(self, offset, size):
+        if offset + size > self.file_size:
+            raise WimFormatError("리소스가 파일 끝을 넘습니다.")
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(size)
+        if len(data) != size:
+            raise WimFormatError("WIM 파일이 잘렸습니다.")
+        return data
+
+    def image(self, index):
+        """인덱스(1부터)의 이미지 (처음 요청할 때 루트 디렉터리 항목까지만 읽음)"""
+        image = self._images.get(index)
+        if image is not None:
+            return image
+        if not 1 <= index <= len(self.metadata):
+            raise WimFormatError(f"이미지 인덱스가 범위를 벗어났습니다: {index} (이미지 {len(self.metadata)}개)")
+        metadata = self.metadata[index - 1]
+        if metadata.flags & RESHDR_FLAG_SOLID:
+            raise WimFormatError("solid 리소스에 든 메타데이터는 지원하지 않습니다.")
+        try:
+            image = WimImage(self, index, metadata)
+        except struct.error as e:
+            raise WimFormatError(f"메타데이터 리소스를 읽을 수 없습니다: {e}") from e
+        self._images[index] = image
+        return image
@@ -0,0 +1,355 @@
+import os
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QSize
+from PyQt6.QtGui import QIcon, QPixmap, QPainter, QPen, QColor
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+# 컬럼 구성
+COL_FILE, COL_NAME, COL_VERSION, COL_BUILD, COL_SIZE, COL_VERIFY = range(6)
+COLUMN_TITLES = ('파일', '이름', '버전', '빌드', '크기', '검사')
+
+# 무결성 검사 상태 표시 (modules.integrity의 VERIFY_* 값)
+VERIFY_TEXTS = {'ok': '정상', 'corrupt': '손상', 'error': '오류'}
+VERIFY_COLORS = {'ok': QColor('#198754'), 'corrupt': QColor('#dc3545'), 'error': QColor('#fd7e14')}
+
+# 업데이트 대상 선택 여부 (delegate가 체크 아이콘을 그릴 때 사용)
+SELECTED_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# 이 상태의 파일은 업데이트 대상으로 선택할 수 없음
+BLOCKING_STATUSES = ('corrupt',)
+_INVERT = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+
+
+def format_size(size_bytes):
+    """파일 크기를 읽기 쉬운 형태로 변환"""
+    if not size_bytes:
+        return "N/A"
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024**2:
+        return f"{size_bytes/1024:.1f} KB"
+    elif size_bytes < 1024**3:
+        return f"{size_bytes/(1024**2):.1f} MB"
+    else:
+        return f"{size_bytes/(1024**3):.1f} GB"
+
+
+def _number_key(text):
+    """'10.0', '22631' 같은 값을 숫자 순서로 비교하기 위한 키 (숫자가 아니면 맨 앞)"""
+    try:
+        return tuple(int(part) for part in text.split('.'))
+    except (AttributeError, ValueError):
+        return (-1,)
+
+
+class WimListModel(QAbstractTableModel):
+    """WIM 파일 목록 모델 (컬럼별 리스트에 저장)
+
+    행은 도착 순서대로 뒤에 붙이고 정렬/필터는 프록시 모델이 맡는다.
+    선택 상태는 bytearray로, 선택 개수는 변경될 때마다 갱신하므로
+    선택 개수 조회와 항목 하나의 선택 토글은 O(1)이다.
+    파일 크기는 스캔 결과(record.file_size)를 그대로 사용하고 디스크를 다시 읽지 않는다.
+    무결성 검사에서 손상으로 확인된 행은 선택이 해제되고 다시 선택할 수 없다.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.selected_count = 0
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self._records = []      # WimFileRecord
+        self._paths = []
+        self._file_names = []
+        self._names = []        # 표시용 이름 (여러 인덱스면 "외 N개")
+        self._versions = []
+        self._builds = []
+        self._sizes = []        # 바이트
+        self._size_texts = []
+        self._verify = []       # 무결성 검사 상태 (검사 전이면 None)
+        self._verify_messages = []
+        self._selected = bytearray()
+        self._blocked = bytearray()  # 1이면 선택 불가 (손상된 파일)
+        self._rows = {}         # 파일 경로 -> 행 번호
+        self.selected_count = 0
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_TITLES)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMN_TITLES[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COL_FILE:
+                return self._file_names[row]
+            if column == COL_NAME:
+                return self._names[row]
+            if column == COL_VERSION:
+                return self._versions[row]
+            if column == COL_BUILD:
+                return self._builds[row]
+            if column == COL_SIZE:
+                return self._size_texts[row]
+            if column == COL_VERIFY:
+                return VERIFY_TEXTS.get(self._verify[row], '')
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if self._blocked[row] or column == COL_VERIFY:
+                return VERIFY_COLORS.get(self._verify[row])
+        elif role == SELECTED_ROLE:
+            return bool(self._selected[row])
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            return self._tooltip(row)
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (COL_BUILD, COL_SIZE):
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            if column == COL_VERIFY:
+                return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def _tooltip(self, row):
+        """경로와 인덱스별 정보 (마우스를 올렸을 때만 만듦)"""
+        record = self._records[row]
+        lines = [f"경로: {record.file_path}"]
+        for image in record.images:
+            lines.append(
+                f"[{image.index}] {image.name} - {image.version}.{image.build} {image.architecture}".rstrip()
+            )
+        if self._verify[row] is not None:
+            status = VERIFY_TEXTS.get(self._verify[row], self._verify[row])
+            message = self._verify_messages[row]
+            lines.append(f"무결성 검사: {status}{' - ' + message if message else ''}")
+        return "\n".join(lines)
+
+    def sort_key(self, row, column):
+        """프록시 모델 정렬 키 (버전/빌드/크기는 숫자 순서)"""
+        if column == COL_NAME:
+            return self._names[row].lower()
+        if column == COL_VERSION:
+            return _number_key(self._versions[row])
+        if column == COL_BUILD:
+            return _number_key(self._builds[row])
+        if column == COL_SIZE:
+            return self._sizes[row]
+        if column == COL_VERIFY:
+            return self._verify[row] or ''
+        return (self._file_names[row].lower(), self._paths[row].lower())
+
+    # --- 데이터 변경 ---
+
+    def clear(self):
+        self.beginResetModel()
+        self._reset_columns()
+        self.endResetModel()
+
+    def upsert(self, records):
+        """스캔 결과 추가 (이미 있는 경로는 선택 상태를 유지한 채 내용만 교체)"""
+        new_records = []
+        for record in records:
+            row = self._rows.get(record.file_path)
+            if row is None:
+                new_records.append(record)
+                continue
+            self._set_row(row, record)
+            self._set_verify(row, None, '')  # 파일이 바뀌었으므로 이전 검사 결과는 무효
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMN_TITLES) - 1))
+
+        # 같은 배치 안의 중복 경로는 마지막 결과만 사용
+        unique = {}
+        for record in new_records:
+            unique[record.file_path] = record
+        if not unique:
+            return
+
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(unique) - 1)
+        for record in unique.values():
+            self._rows[record.file_path] = len(self._paths)
+            self._paths.append(record.file_path)
+            self._records.append(None)
+            self._file_names.append(None)
+            self._names.append(None)
+            self._versions.append(None)
+            self._builds.append(None)
+            self._sizes.append(0)
+            self._size_texts.append(None)
+            self._verify.append(None)
+            self._verify_messages.append('')
+            self._selected.append(1)  # 기본값: 선택됨
+            self._blocked.append(0)
+            self._set_row(len(self._paths) - 1, record)
+        self.selected_count += len(unique)
+        self.endInsertRows()
+
+    def _set_row(self, row, record):
+        extra_images = len(record.images) - 1
+        self._records[row] = record
+        self._file_names[row] = os.path.basename(record.file_path)
+        self._names[row] = f"{record.name} 외 {extra_images}개" if extra_images > 0 else record.name
+        self._versions[row] = record.version
+        self._builds[row] = record.build
+        self._sizes[row] = record.file_size or 0
+        self._size_texts[row] = format_size(record.file_size)
+
+    def remove_paths(self, file_paths):
+        """경로 목록에 해당하는 행 제거 (제거한 행 수 반환)"""
+        rows = sorted({self._rows[path] for path in file_paths if path in self._rows}, reverse=True)
+        if not rows:
+            return 0
+
+        columns = (self._records, self._paths, self._file_names, self._names, self._versions,
+                   self._builds, self._sizes, self._size_texts, self._verify, self._verify_messages,
+                   self._selected, self._blocked)
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.selected_count -= self._selected[row]
+            for column in columns:
+                del column[row]
+            self.endRemoveRows()
+
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+        return len(rows)
+
+    def toggle(self, row):
+        """행 하나의 선택 상태 토글 (손상된 파일은 무시)"""
+        self.set_selected(row, not self._selected[row])
+
+    def set_selected(self, row, selected):
+        selected = 1 if selected and not self._blocked[row] else 0
+        if self._selected[row] == selected:
+            return
+        self._selected[row] = selected
+        self.selected_count += 1 if selected else -1
+        index = self.index(row, COL_FILE)
+        self.dataChanged.emit(index, index, [SELECTED_ROLE])
+
+    def set_all_selected(self, selected):
+        """전체 선택/해제 (행마다 알리지 않고 변경 알림 한 번, 손상된 파일은 선택하지 않음)"""
+        count = len(self._selected)
+        if not count:
+            return
+        if selected:
+            self._selected[:] = self._blocked.translate(_INVERT)
+            self.selected_count = count - self._blocked.count(1)
+        else:
+            self._selected[:] = bytes(count)
+            self.selected_count = 0
+        self.dataChanged.emit(self.index(0, COL_FILE), self.index(count - 1, COL_FILE), [SELECTED_ROLE])
+
+    def _set_verify(self, row, status, message):
+        self._verify[row] = status
+        self._verify_messages[row] = message
+        blocked = 1 if status in BLOCKING_STATUSES else 0
+        if blocked and self._selected[row]:
+            self._selected[row] = 0
+            self.selected_count -= 1
+        self._blocked[row] = blocked
+
+    def set_verify_results(self, results):
+        """무결성 검사 결과(VerifyResult 목록) 반영 (손상된 파일은 선택 해제, 반영한 행 수 반환)"""
+        rows = []
+        for result in results:
+            row = self._rows.get(result.file_path)
+            if row is None or result.status not in VERIFY_TEXTS:
+                continue  # 목록에 없거나 취소된 검사
+            self._set_verify(row, result.status, result.message)
+            rows.append(row)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(COLUMN_TITLES) - 1))
+        return len(rows)
+
+    # --- 조회 ---
+
+    def record(self, file_path):
+        """파일 경로의 스캔 결과 (없으면 None)"""
+        row = self._rows.get(file_path)
+        return self._records[row] if row is not None else None
+
+    def record_at(self, row):
+        """행 번호의 스캔 결과 (범위 밖이면 None)"""
+        return self._records[row] if 0 <= row < len(self._records) else None
+
+    def selectable_count(self):
+        """선택할 수 있는(손상되지 않은) 행 수"""
+        return len(self._blocked) - self._blocked.count(1)
+
+    def paths(self):
+        return list(self._paths)
+
+    def selected_paths(self):
+        """선택된 파일 경로 목록 (파일 이름 순)"""
+        rows = [row for row, selected in enumerate(self._selected) if selected]
+        rows.sort(key=lambda row: self.sort_key(row, COL_FILE))
+        return [self._paths[row] for row in rows]
+
+
+class WimSortFilterProxyModel(QSortFilterProxyModel):
+    """컬럼별 정렬(버전/빌드/크기는 숫자 순서)과 전체 컬럼 텍스트 필터"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterKeyColumn(-1)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def lessThan(self, left, right):
+        source = self.sourceModel()
+        return source.sort_key(left.row(), left.column()) < source.sort_key(right.row(), right.column())
+
+
+class WimItemDelegate(QStyledItemDelegate):
+    """파일 컬럼에 선택 상태 아이콘을 그리고 긴 이름은 가운데를 생략하는 delegate"""
+
+    # 클래스 변수로 아이콘 저장 (QApplication 생성 후 처음 사용할 때 만듦)
+    checked_icon = None
+    unchecked_icon = None
+
+    @classmethod
+    def create_icons(cls):
+        """10x10 크기의 체크/언체크 아이콘 생성"""
+        if cls.checked_icon is None:
+            # 체크된 아이콘 (녹색 배경 + 흰색 체크마크)
+            checked_pixmap = QPixmap(10, 10)
+            checked_pixmap.fill(Qt.GlobalColor.green)
+            painter = QPainter(checked_pixmap)
+            painter.setPen(QPen(Qt.GlobalColor.white, 1))
+            painter.drawLine(2, 5, 4, 7)
+            painter.drawLine(4, 7, 8, 3)
+            painter.end()
+            cls.checked_icon = QIcon(checked_pixmap)
+
+            # 체크 안된 아이콘 (흰색 배경 + 검은 테두리)
+            unchecked_pixmap = QPixmap(10, 10)
+            unchecked_pixmap.fill(Qt.GlobalColor.white)
+            painter = QPainter(unchecked_pixmap)
+            painter.setPen(QPen(Qt.GlobalColor.black, 1))
+            painter.drawRect(0, 0, 9, 9)
+            painter.end()
+            cls.unchecked_icon = QIcon(unchecked_pixmap)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        WimItemDelegate.create_icons()
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        if index.column() == COL_FILE:
+            option.icon = self.checked_icon if index.data(SELECTED_ROLE) else self.unchecked_icon
+            option.features |= QStyleOptionViewItem.ViewItemFeature.HasDecoration
+            option.decorationSize = QSize(10, 10)
+            option.textElideMode = Qt.TextElideMode.ElideMiddle
@@ -1,45 +1,163 @@
-import time
-import os
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from modules.core import (create_update_jobs, plan_packages, skip_installed, resume_jobs, discard_orphans,
+                          run_update)
+from modules.scheduling import EtaEstimator, ORDER_USER, format_duration
+from modules.tracing import span
+from modules.update_engine import DismBackend, STAGE_LABELS
+from modules.wim_list_model import format_size
+
 class Worker(QThread):
     """WIM 업데이트 작업을 수행하는 스레드"""
     progress = pyqtSignal(int, str)  # 진행률 (값, 메시지)
     finished = pyqtSignal()          # 작업 완료
     log_message = pyqtSignal(str)    # 로그 메시지
 
-    def __init__(self, file_list):
+    def __init__(self, file_list, backend=None, packages=None, images=None,
+                 stage_limits=None, export=False, channel=None, sink=None, journal=None, resume_state=None,
+                 sizes=None, order=ORDER_USER, package_folder=None, records=None, inventory=None):
+        """
+        file_list: 업데이트할 WIM 파일 경로 목록
+        packages: 모든 이미지에 적용할 패키지 경로 목록
+        package_folder, records: 패키지 폴더와 스캔 결과(WimFileRecord 목록) (함께 지정 시 패키지 색인으로
+            이미지마다 적용할 패키지를 고르고, 스캔 결과에 없는 파일에는 packages를 모두 적용)
+        images: 파일 경로 -> 업데이트할 인덱스 목록 (없으면 인덱스 1)
+        sizes: 파일 경로 -> {인덱스: 바이트} (진행률/처리 순서 계산용)
+        order: 처리 순서 정책 (ORDER_POLICIES)
+        journal: UpdateJournal (지정 시 진행 상태를 기록하여 중단되어도 이어서 실행 가능)
+        inventory: InventoryCache (지정 시 이미 설치된 패키지와 적용할 것이 없는 이미지를 건너뛰고,
+            커밋한 이미지의 설치된 패키지 목록을 저장)
+        resume_state: JournalState (지정 시 file_list 대신 기록에서 완료되지 않은 이미지를 이어서 실행)
+        """
         super().__init__()
         self.file_list = file_list
+        self.backend = backend or DismBackend()
+        self.packages = packages or []
+        self.images = images or {}
+        self.sizes = sizes or {}
+        self.order = order
+        self.package_folder = package_folder
+        self.records = records or []
+        self.stage_limits = stage_limits
+        self.export = export
+        self.channel = channel  # UiChannel (지정 시 진행률을 묶어서 전달)
+        self.sink = sink        # LogSink (지정 시 모든 로그를 구조화된 이벤트로 기록)
+        self.journal = journal
+        self.inventory = inventory
+        self.resume_state = resume_state
+        if resume_state is not None:
+            self.export = resume_state.export
+            self.order = resume_state.order
         self.is_running = True
+        self.jobs = []
+        self.error = None          # 작업 생성/실행 중 발생한 예외 메시지
+        self.eta = EtaEstimator()  # 처리 속도를 평활하여 남은 시간 표시
+
+    def create_jobs(self):
+        """파일/인덱스별 업데이트 작업 생성"""
+        if self.resume_state is not None:
+            return resume_jobs(self.resume_state)
+        plans = None
+        if self.package_folder and self.records and self.packages:
+            with span('update.plan', 'update', packages=len(self.packages)):
+                plans = plan_packages(self.records, self.package_folder, indexes=self.images, log=self.log)
+        jobs = create_update_jobs(self.file_list, self.images, self.packages, self.sizes, plans=plans, log=self.log)
+        if self.inventory is not None:
+            infos = {package.path: package for plan in (plans or {}).values() for package in plan.packages}
+            jobs, up_to_date = skip_installed(jobs, self.inventory, infos, log=self.log)
+            if up_to_date:
+                self.log(f"패키지가 모두 설치되어 있는 이미지 {len(up_to_date)}개를 건너뜁니다.")
+        return jobs
 
     def run(self):
-        """스레드 실행 함수"""
-        total_files = len(self.file_list)
-        for i, file_path in enumerate(self.file_list):
-            if not self.is_running:
-                break # 중지 신호가 오면 루프 종료
-
-            file_name = os.path.basename(file_path)
-            self.log_message.emit(f"'{file_name}' 업데이트 시작...")
-            
-            # TODO: 실제 WIM 업데이트 로직 구현
-            # 예시로 5초간의 지연을 시뮬레이션합니다.
-            for step in range(101):
-                if not self.is_running:
-                    break
-                time.sleep(0.05) # 0.05초 * 100 = 5초
-                
-                # 진행률 업데이트 (전체 진행률 기준)
-                overall_progress = int(((i + (step / 100)) / total_files) * 100)
-                status_message = f"({i+1}/{total_files}) {file_name} 처리 중... {step}%"
-                self.progress.emit(overall_progress, status_message)
-            
-            if self.is_running:
-                self.log_message.emit(f"'{file_name}' 업데이트 완료.")
+        """스레드 실행 함수 (작업 생성이나 실행이 실패해도 finished는 항상 보냄)"""
+        try:
+            # 패키지 폴더/색인을 읽다가 실패할 수도 있으므로 작업 생성도 예외 처리 안에서 (QThread.run 밖으로
+            # 예외가 나가면 finished가 오지 않아 대기열의 업데이트 슬롯이 풀리지 않음)
+            self.jobs = self.create_jobs()
+            if self.resume_state is not None:
+                self.log(f"이전 업데이트를 이어서 진행합니다: 남은 이미지 {len(self.jobs)}개")
+            with span('update.run', 'update', images=len(self.jobs)):
+                run_update(
+                    self.jobs,
+                    self.backend,
+                    stage_limits=self.stage_limits,
+                    export=self.export,
+                    log=self.log,
+                    on_progress=self.on_progress,
+                    should_stop=lambda: not self.is_running,
+                    journal=self.journal,
+                    order=self.order,
+                    inventory=self.inventory,
+                    resume_of=self.resume_state.run_id if self.resume_state is not None else None
+                )
+        except Exception as e:
+            self.error = str(e)
+            self.log(f"업데이트 중 오류 발생: {str(e)}", level='error')
+        finally:
+            self.finished.emit()
 
-        self.finished.emit()
+    def on_progress(self, done, total, job, stage):
+        """파이프라인 단계 완료 시 이미지 크기로 가중한 전체 진행률과 남은 시간 갱신"""
+        if job is None:  # 실행 시작 (이어서 실행하면 이미 끝난 양부터 시작)
+            self.eta.reset(done, total)
+            return
+        self.eta.update(done, total, measured=stage is not None)
+        overall_progress = int(done / total * 100) if total else 100
+        if stage is None:
+            status_message = f"'{job.file_name}' [{job.index}] 중단됨"
+        else:
+            status_message = f"'{job.file_name}' [{job.index}] {STAGE_LABELS[stage]} 완료"
+        remaining = self.eta.eta()
+        if remaining is not None:
+            status_message += f" · {format_size(self.eta.rate)}/s · 남은 시간 약 {format_duration(remaining)}"
+        if self.channel is not None:
+            self.channel.post_progress(overall_progress, status_message, job='update')
+        else:
+            self.progress.emit(overall_progress, status_message)
+
+    def log(self, message, **fields):
+        """로그 전달 (로그 싱크가 있으면 싱크로, 없으면 시그널로)"""
+        if self.sink is not None:
+            self.sink.emit(message, job='update', **fields)
+        elif fields.get('level') != 'debug':
+            self.log_message.emit(message)
 
     def stop(self):
-        """스레드 중지"""
-        self.is_running = False
\ No newline at end of file
+        """스레드 중지 (실행 중인 DISM 명령도 종료하고, 마운트된 이미지는 변경 없이 해제)"""
+        self.is_running = False
+        self.backend.cancel()
+
+
+class MountCleanupWorker(QThread):
+    """이전 실행이 남긴 마운트를 정리하고 작업 기록을 지우는 스레드"""
+    finished = pyqtSignal()          # 정리 완료
+    log_message = pyqtSignal(str)    # 로그 메시지
+
+    def __init__(self, backend=None, journal=None, state=None, sink=None):
+        """
+        journal: UpdateJournal (지정 시 정리 후 기록 삭제)
+        state: JournalState (기록에 남은 마운트 폴더도 함께 정리)
+        """
+        super().__init__()
+        self.backend = backend or DismBackend()
+        self.journal = journal
+        self.state = state
+        self.sink = sink
+
+    def run(self):
+        """스레드 실행 함수"""
+        try:
+            discard_orphans(self.backend, self.state, log=self.log)
+            if self.journal is not None:
+                self.journal.discard()
+        except Exception as e:
+            self.log(f"남은 마운트 정리 중 오류 발생: {str(e)}", level='error')
+        self.finished.emit()
+
+    def log(self, message, **fields):
+        """로그 전달 (로그 싱크가 있으면 싱크로, 없으면 시그널로)"""
+        if self.sink is not None:
+            self.sink.emit(message, job='cleanup', **fields)
+        elif fields.get('level') != 'debug':
+            self.log_message.emit(message)